@@ -0,0 +1,37 @@
+"""keyset pagination indexes
+
+Adds ``(<sort column>, id)`` indexes for the keyset-paginated listings, so
+each page is a bounded range scan that starts at the cursor: politicians by
+transparency score, alerts by date reported, and news mentions by
+publication date, overall and per politician.
+
+Revision ID: 0002
+Revises: 0001
+Create Date: 2026-10-18 02:35:00.000000+00:00
+"""
+from typing import Sequence, Union
+
+from alembic import op
+
+revision: str = '0002'
+down_revision: Union[str, None] = '0001'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+# (index name, table, columns)
+KEYSET_INDEXES = [
+    ('ix_politicians_transparency_score_id', 'politicians', ['transparency_score', 'id']),
+    ('ix_flagged_reports_date_reported_id', 'flagged_reports', ['date_reported', 'id']),
+    ('ix_news_mentions_published_at_id', 'news_mentions', ['published_at', 'id']),
+    ('ix_news_mentions_politician_published_at_id', 'news_mentions', ['politician_id', 'published_at', 'id']),
+]
+
+
+def upgrade() -> None:
+    for name, table, columns in KEYSET_INDEXES:
+        op.create_index(name, table, columns, unique=False)
+
+
+def downgrade() -> None:
+    for name, table, _ in reversed(KEYSET_INDEXES):
+        op.drop_index(name, table_name=table)
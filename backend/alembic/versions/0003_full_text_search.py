@@ -0,0 +1,75 @@
+"""full-text search
+
+Adds generated, weighted ``tsvector`` columns with GIN indexes to
+politicians, legal cases, promises and news mentions, and ``pg_trgm``
+trigram indexes on their names and titles for fuzzy matching.
+
+Adding a stored generated column rewrites the table, and the indexes are
+built in the same transaction; on large tables run this in a maintenance
+window.
+
+Revision ID: 0003
+Revises: 0002
+Create Date: 2026-10-18 02:40:00.000000+00:00
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+from sqlalchemy.dialects import postgresql
+
+revision: str = '0003'
+down_revision: Union[str, None] = '0002'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+# table -> (generated tsvector expression, trigram-indexed column)
+SEARCH_COLUMNS = {
+    'politicians': (
+        "setweight(to_tsvector('english', coalesce(name, '')), 'A') || "
+        "setweight(to_tsvector('english', coalesce(position, '')), 'B') || "
+        "setweight(to_tsvector('english', coalesce(bio, '')), 'C')",
+        'name',
+    ),
+    'legal_cases': (
+        "setweight(to_tsvector('english', coalesce(title, '')), 'A') || "
+        "setweight(to_tsvector('english', coalesce(description, '')), 'B')",
+        'title',
+    ),
+    'promises': (
+        "setweight(to_tsvector('english', coalesce(title, '')), 'A') || "
+        "setweight(to_tsvector('english', coalesce(description, '')), 'B')",
+        'title',
+    ),
+    'news_mentions': (
+        "setweight(to_tsvector('english', coalesce(title, '')), 'A') || "
+        "setweight(to_tsvector('english', coalesce(content_summary, '')), 'B')",
+        'title',
+    ),
+}
+
+
+def upgrade() -> None:
+    op.execute('CREATE EXTENSION IF NOT EXISTS pg_trgm')
+    for table, (expression, trigram_column) in SEARCH_COLUMNS.items():
+        op.add_column(
+            table,
+            sa.Column('search_vector', postgresql.TSVECTOR(), sa.Computed(expression, persisted=True), nullable=True),
+        )
+        op.create_index(f'ix_{table}_search_vector', table, ['search_vector'], unique=False, postgresql_using='gin')
+        op.create_index(
+            f'ix_{table}_{trigram_column}_trgm',
+            table,
+            [trigram_column],
+            unique=False,
+            postgresql_using='gin',
+            postgresql_ops={trigram_column: 'gin_trgm_ops'},
+        )
+
+
+def downgrade() -> None:
+    for table, (_, trigram_column) in SEARCH_COLUMNS.items():
+        op.drop_index(f'ix_{table}_{trigram_column}_trgm', table_name=table)
+        op.drop_index(f'ix_{table}_search_vector', table_name=table)
+        op.drop_column(table, 'search_vector')
+    # pg_trgm is left installed; other objects may depend on it
@@ -0,0 +1,94 @@
+"""statistics materialized views
+
+Adds the materialized views behind the ``/stats`` endpoints, each with the
+unique index ``REFRESH MATERIALIZED VIEW CONCURRENTLY`` needs. The views are
+populated on creation.
+
+Revision ID: 0004
+Revises: 0003
+Create Date: 2026-10-18 03:30:00.000000+00:00
+"""
+from typing import Sequence, Union
+
+from alembic import op
+
+revision: str = '0004'
+down_revision: Union[str, None] = '0003'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+# View name -> (defining query, columns of its unique index)
+STATS_VIEWS = {
+    'stats_overview': (
+        """
+        SELECT
+            1 AS id,
+            (SELECT count(*) FROM politicians) AS politicians,
+            (SELECT count(*) FROM politicians WHERE is_active) AS active_politicians,
+            (SELECT avg(transparency_score) FROM politicians WHERE is_active) AS average_score,
+            (SELECT percentile_cont(0.5) WITHIN GROUP (ORDER BY transparency_score)
+               FROM politicians WHERE is_active) AS median_score,
+            (SELECT count(*) FROM news_mentions
+              WHERE published_at >= now() - interval '30 days') AS news_mentions_last_30_days,
+            now() AS refreshed_at
+        """,
+        ('id',),
+    ),
+    'stats_score_buckets': (
+        """
+        SELECT
+            least(floor(transparency_score / 10)::int, 9) AS bucket,
+            count(*) AS politicians,
+            avg(transparency_score) AS average_score
+        FROM politicians
+        WHERE is_active
+        GROUP BY 1
+        """,
+        ('bucket',),
+    ),
+    'stats_report_counts': (
+        """
+        SELECT
+            status::text AS status,
+            priority::text AS priority,
+            count(*) AS reports,
+            count(*) FILTER (WHERE date_reported >= now() - interval '30 days') AS reports_last_30_days
+        FROM flagged_reports
+        GROUP BY 1, 2
+        """,
+        ('status', 'priority'),
+    ),
+    'stats_case_counts': (
+        """
+        SELECT
+            status::text AS status,
+            coalesce(severity::text, '') AS severity,
+            count(*) AS cases
+        FROM legal_cases
+        GROUP BY 1, 2
+        """,
+        ('status', 'severity'),
+    ),
+    'stats_promise_counts': (
+        """
+        SELECT
+            status::text AS status,
+            count(*) AS promises,
+            avg(fulfillment_percentage) AS average_fulfillment
+        FROM promises
+        GROUP BY 1
+        """,
+        ('status',),
+    ),
+}
+
+
+def upgrade() -> None:
+    for name, (query, unique_columns) in STATS_VIEWS.items():
+        op.execute(f'CREATE MATERIALIZED VIEW {name} AS {query}')
+        op.execute(f'CREATE UNIQUE INDEX ix_{name}_unique ON {name} ({", ".join(unique_columns)})')
+
+
+def downgrade() -> None:
+    for name in reversed(list(STATS_VIEWS)):
+        op.execute(f'DROP MATERIALIZED VIEW IF EXISTS {name}')
@@ -0,0 +1,38 @@
+"""timeline indexes
+
+Adds ``(politician_id, <date column>, id)`` indexes for every event date on
+a politician's timeline, so each source is read as a bounded, ordered index
+range. News mentions already have theirs.
+
+Revision ID: 0005
+Revises: 0004
+Create Date: 2026-10-18 05:10:00.000000+00:00
+"""
+from typing import Sequence, Union
+
+from alembic import op
+
+revision: str = '0005'
+down_revision: Union[str, None] = '0004'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+# (index name, table, date column)
+TIMELINE_INDEXES = [
+    ('ix_legal_cases_politician_date_filed_id', 'legal_cases', 'date_filed'),
+    ('ix_legal_cases_politician_date_resolved_id', 'legal_cases', 'date_resolved'),
+    ('ix_promises_politician_date_made_id', 'promises', 'date_made'),
+    ('ix_promises_politician_deadline_id', 'promises', 'deadline'),
+    ('ix_flagged_reports_politician_date_reported_id', 'flagged_reports', 'date_reported'),
+    ('ix_score_history_politician_calculated_at_id', 'score_history', 'calculated_at'),
+]
+
+
+def upgrade() -> None:
+    for name, table, column in TIMELINE_INDEXES:
+        op.create_index(name, table, ['politician_id', column, 'id'], unique=False)
+
+
+def downgrade() -> None:
+    for name, table, _ in reversed(TIMELINE_INDEXES):
+        op.drop_index(name, table_name=table)
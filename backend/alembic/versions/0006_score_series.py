@@ -0,0 +1,65 @@
+"""score time series
+
+Adds ``score_series``, the compact score time series charts read, and
+backfills its raw resolution from ``score_history``, skipping
+recalculations that repeated the previous score and breakdown. The first
+``compact_score_series`` run afterwards rolls the backfilled history up into
+days, weeks and months.
+
+Revision ID: 0006
+Revises: 0005
+Create Date: 2026-10-18 05:50:00.000000+00:00
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+revision: str = '0006'
+down_revision: Union[str, None] = '0005'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+COMPONENTS = ['legal_record', 'promise_fulfillment', 'public_sentiment', 'credential_verification']
+
+
+def upgrade() -> None:
+    op.create_table('score_series',
+    sa.Column('politician_id', sa.UUID(), nullable=False),
+    sa.Column('resolution', sa.Enum('RAW', 'DAY', 'WEEK', 'MONTH', name='seriesresolution'), nullable=False),
+    sa.Column('period_start', sa.DateTime(timezone=True), nullable=False),
+    sa.Column('samples', sa.Integer(), nullable=False),
+    sa.Column('score_avg', sa.REAL(), nullable=False),
+    sa.Column('score_min', sa.REAL(), nullable=False),
+    sa.Column('score_max', sa.REAL(), nullable=False),
+    sa.Column('score_last', sa.REAL(), nullable=False),
+    *(sa.Column(name, sa.REAL(), nullable=True) for name in COMPONENTS),
+    sa.ForeignKeyConstraint(['politician_id'], ['politicians.id'], ondelete='CASCADE'),
+    sa.PrimaryKeyConstraint('politician_id', 'resolution', 'period_start')
+    )
+
+    values = ', '.join(f"(score_breakdown->>'{name}')::real AS {name}" for name in COMPONENTS)
+    current = ', '.join(['score'] + COMPONENTS)
+    previous = ', '.join(f'lag({column}) OVER w' for column in ['score'] + COMPONENTS)
+    op.execute(f"""
+        INSERT INTO score_series (
+            politician_id, resolution, period_start, samples,
+            score_avg, score_min, score_max, score_last, {', '.join(COMPONENTS)}
+        )
+        SELECT politician_id, 'RAW', calculated_at, 1, score, score, score, score, {', '.join(COMPONENTS)}
+        FROM (
+            SELECT *, ({current}) IS DISTINCT FROM ({previous}) AS changed
+            FROM (
+                SELECT politician_id, calculated_at, round(transparency_score, 2)::real AS score, {values}
+                FROM score_history
+            ) AS history
+            WINDOW w AS (PARTITION BY politician_id ORDER BY calculated_at)
+        ) AS points
+        WHERE changed
+        ON CONFLICT DO NOTHING
+    """)
+
+
+def downgrade() -> None:
+    op.drop_table('score_series')
+    sa.Enum(name='seriesresolution').drop(op.get_bind(), checkfirst=True)
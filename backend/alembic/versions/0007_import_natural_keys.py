@@ -0,0 +1,48 @@
+"""import natural keys
+
+Adds the unique constraints data imports upsert on when a row has no id:
+politicians by name and position, promises by politician, title and date
+made, and news mentions by politician and URL.
+
+Re-imports before this revision duplicated promises and news mentions, so
+their duplicates are deleted first, keeping the earliest row of each.
+Duplicate politicians are not merged automatically, since deleting one
+would cascade to its records: merge them by hand if the constraint fails.
+
+Revision ID: 0007
+Revises: 0006
+Create Date: 2026-10-18 07:40:00.000000+00:00
+"""
+from typing import Sequence, Union
+
+from alembic import op
+
+revision: str = '0007'
+down_revision: Union[str, None] = '0006'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+# (constraint name, table, columns, column ordering which row of duplicates is kept)
+NATURAL_KEYS = [
+    ('uq_politicians_name_position', 'politicians', ['name', 'position'], None),
+    ('uq_promises_politician_title_date_made', 'promises', ['politician_id', 'title', 'date_made'], 'created_at'),
+    ('uq_news_mentions_politician_url', 'news_mentions', ['politician_id', 'url'], 'scraped_at'),
+]
+
+
+def upgrade() -> None:
+    for name, table, columns, kept_first in NATURAL_KEYS:
+        if kept_first is not None:
+            key = ', '.join(columns)
+            op.execute(
+                f"DELETE FROM {table} WHERE id IN ("
+                f"SELECT id FROM (SELECT id, row_number() OVER "
+                f"(PARTITION BY {key} ORDER BY {kept_first}, id) AS duplicate FROM {table}) AS ranked "
+                f"WHERE duplicate > 1)"
+            )
+        op.create_unique_constraint(name, table, columns)
+
+
+def downgrade() -> None:
+    for name, table, _, _ in reversed(NATURAL_KEYS):
+        op.drop_constraint(name, table, type_='unique')
@@ -0,0 +1,53 @@
+"""search tombstones
+
+Adds ``search_tombstones`` and the ``AFTER DELETE`` triggers that fill it
+for politicians, legal cases and promises, so search indexes catch up with
+deletes by reading recent tombstones instead of every id.
+
+Revision ID: 0008
+Revises: 0007
+Create Date: 2026-10-18 08:20:00.000000+00:00
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+revision: str = '0008'
+down_revision: Union[str, None] = '0007'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+TOMBSTONED_TABLES = ['politicians', 'legal_cases', 'promises']
+
+
+def upgrade() -> None:
+    op.create_table('search_tombstones',
+    sa.Column('id', sa.BigInteger(), autoincrement=True, nullable=False),
+    sa.Column('table_name', sa.String(length=63), nullable=False),
+    sa.Column('row_id', sa.UUID(), nullable=False),
+    sa.Column('deleted_at', sa.DateTime(timezone=True), server_default=sa.text('now()'), nullable=False),
+    sa.PrimaryKeyConstraint('id')
+    )
+    op.create_index(op.f('ix_search_tombstones_deleted_at'), 'search_tombstones', ['deleted_at'], unique=False)
+    op.execute("""
+        CREATE OR REPLACE FUNCTION record_search_tombstone() RETURNS trigger AS $$
+        BEGIN
+            INSERT INTO search_tombstones (table_name, row_id) VALUES (TG_TABLE_NAME, OLD.id);
+            RETURN NULL;
+        END;
+        $$ LANGUAGE plpgsql
+    """)
+    for table in TOMBSTONED_TABLES:
+        op.execute(
+            f"CREATE TRIGGER {table}_search_tombstone AFTER DELETE ON {table} "
+            f"FOR EACH ROW EXECUTE FUNCTION record_search_tombstone()"
+        )
+
+
+def downgrade() -> None:
+    for table in reversed(TOMBSTONED_TABLES):
+        op.execute(f"DROP TRIGGER IF EXISTS {table}_search_tombstone ON {table}")
+    op.execute("DROP FUNCTION IF EXISTS record_search_tombstone()")
+    op.drop_index(op.f('ix_search_tombstones_deleted_at'), table_name='search_tombstones')
+    op.drop_table('search_tombstones')
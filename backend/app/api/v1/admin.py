@@ -0,0 +1,52 @@
+from fastapi import APIRouter, Depends, File, Query, UploadFile, status
+from sqlalchemy.orm import Session
+from typing import Optional
+import uuid
+from app.core.auth_cache import UserPrincipal
+from app.core.exceptions import NotFoundException
+from app.database import get_db
+from app.dependencies import get_current_admin_user
+from app.models.politician import Politician
+from app.schemas.data_import import ImportReport
+from app.schemas.score import ScoreRecalculationResponse
+from app.services.import_service import ImportEntity, ImportFormat, detect_format, import_records
+from app.tasks.scoring_tasks import recalculate_politician_score
+
+router = APIRouter(prefix="/admin", tags=["admin"])
+
+
+@router.post("/data/import", response_model=ImportReport)
+def import_data(
+    entity: ImportEntity = Query(...),
+    file: UploadFile = File(...),
+    file_format: Optional[ImportFormat] = Query(None, alias="format"),
+    db: Session = Depends(get_db),
+    current_user: UserPrincipal = Depends(get_current_admin_user),
+) -> ImportReport:
+    """
+    Bulk import politicians, cases, promises or news from a CSV or NDJSON file.
+    Rows are committed in chunks; rejected rows are listed in the report
+    and do not stop the import.
+    """
+    import_format = file_format or detect_format(file.filename)
+    return import_records(db, entity, file.file, import_format)
+
+
+@router.post(
+    "/politicians/{politician_id}/score",
+    response_model=ScoreRecalculationResponse,
+    status_code=status.HTTP_202_ACCEPTED,
+)
+def recalculate_score(
+    politician_id: uuid.UUID,
+    db: Session = Depends(get_db),
+    current_user: UserPrincipal = Depends(get_current_admin_user),
+) -> ScoreRecalculationResponse:
+    """
+    Queue a recalculation of one politician's transparency score. Requests
+    made while one is already queued for the politician are folded into it.
+    """
+    if db.get(Politician, politician_id) is None:
+        raise NotFoundException("Politician not found")
+    result = recalculate_politician_score.enqueue(politician_id)
+    return ScoreRecalculationResponse(politician_id=politician_id, queued=result is not None)
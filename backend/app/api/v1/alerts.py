@@ -0,0 +1,105 @@
+import asyncio
+from fastapi import APIRouter, Depends, Header, Query, WebSocket, status
+from fastapi.responses import StreamingResponse
+from sqlalchemy.orm import Session
+from typing import Optional
+import uuid
+from app.config import get_settings
+from app.core.exceptions import ServiceUnavailableException
+from app.database import get_db
+from app.models.report import ReportStatus, ReportPriority
+from app.schemas.common import CursorPage
+from app.schemas.report import AlertResponse
+from app.services.alert_feed import AlertFeedFullError, format_sse, format_ws, get_alert_hub
+from app.services.report_service import list_alerts
+
+settings = get_settings()
+
+router = APIRouter(prefix="/alerts", tags=["alerts"])
+
+
+@router.get("", response_model=CursorPage[AlertResponse])
+def get_alerts(
+    status: Optional[ReportStatus] = None,
+    priority: Optional[ReportPriority] = None,
+    county: Optional[str] = None,
+    cursor: Optional[str] = None,
+    page_size: int = Query(settings.default_page_size, ge=1, le=settings.max_page_size),
+    db: Session = Depends(get_db),
+) -> CursorPage[AlertResponse]:
+    """Get recent alerts. Pass the returned ``next_cursor`` to continue."""
+    return list_alerts(db, status=status, priority=priority, county=county, cursor=cursor, limit=page_size)
+
+
+@router.get("/feed", response_class=StreamingResponse)
+async def get_alerts_feed(
+    politician_id: Optional[uuid.UUID] = None,
+    county: Optional[str] = None,
+    party: Optional[str] = None,
+    last_event_id: Optional[int] = Header(None),
+) -> StreamingResponse:
+    """
+    Stream alerts as server-sent events, optionally for one politician,
+    county or party. Reconnecting ``EventSource`` clients send
+    ``Last-Event-ID`` and receive what they missed, or a ``reset`` event if
+    it is too old (refetch ``/alerts``). An ``overflow`` event means the
+    client fell behind and was disconnected.
+    """
+    hub = get_alert_hub()
+    try:
+        subscription = hub.subscribe(politician_id, county=county, party=party, last_event_id=last_event_id)
+    except AlertFeedFullError:
+        raise ServiceUnavailableException("Too many alert feed connections")
+
+    async def stream():
+        try:
+            yield "retry: 3000\n\n"
+            async for item in hub.events(subscription):
+                yield format_sse(item)
+        finally:
+            hub.unsubscribe(subscription)
+
+    return StreamingResponse(
+        stream(),
+        media_type="text/event-stream",
+        headers={"Cache-Control": "no-cache", "X-Accel-Buffering": "no"},
+    )
+
+
+@router.websocket("/ws")
+async def alerts_websocket(
+    websocket: WebSocket,
+    politician_id: Optional[uuid.UUID] = None,
+    county: Optional[str] = None,
+    party: Optional[str] = None,
+    last_event_id: Optional[int] = None,
+) -> None:
+    """The alerts feed over a WebSocket, as JSON messages; same filters and replay as ``/alerts/feed``."""
+    hub = get_alert_hub()
+    try:
+        subscription = hub.subscribe(politician_id, county=county, party=party, last_event_id=last_event_id)
+    except AlertFeedFullError:
+        await websocket.close(code=status.WS_1013_TRY_AGAIN_LATER)
+        return
+    await websocket.accept()
+
+    async def forward() -> None:
+        async for item in hub.events(subscription):
+            await websocket.send_text(format_ws(item))
+
+    async def receive() -> None:
+        # Nothing is expected from the client; this notices it leaving
+        while (await websocket.receive())["type"] != "websocket.disconnect":
+            pass
+
+    tasks = [asyncio.create_task(forward()), asyncio.create_task(receive())]
+    try:
+        done, pending = await asyncio.wait(tasks, return_when=asyncio.FIRST_COMPLETED)
+        if tasks[0] in done and tasks[1] in pending:
+            # Dropped after an overflow message
+            await websocket.close()
+    finally:
+        for task in tasks:
+            task.cancel()
+        await asyncio.gather(*tasks, return_exceptions=True)
+        hub.unsubscribe(subscription)
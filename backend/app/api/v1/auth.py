@@ -0,0 +1,26 @@
+from fastapi import APIRouter, Depends, status
+from sqlalchemy.ext.asyncio import AsyncSession
+from app.core.exceptions import UnauthorizedException
+from app.core.security import create_access_token, create_refresh_token
+from app.database import get_async_db
+from app.schemas.user import LoginRequest, TokenResponse, UserCreate, UserResponse
+from app.services.auth_service import authenticate_user, register_user
+
+router = APIRouter(prefix="/auth", tags=["auth"])
+
+
+@router.post("/register", response_model=UserResponse, status_code=status.HTTP_201_CREATED)
+async def register(data: UserCreate, db: AsyncSession = Depends(get_async_db)) -> UserResponse:
+    """Create an account."""
+    user = await register_user(db, data)
+    return UserResponse.model_validate(user)
+
+
+@router.post("/login", response_model=TokenResponse)
+async def login(data: LoginRequest, db: AsyncSession = Depends(get_async_db)) -> TokenResponse:
+    """Exchange an email and password for access and refresh tokens."""
+    user = await authenticate_user(db, data.email, data.password)
+    if user is None:
+        raise UnauthorizedException("Incorrect email or password")
+    claims = {"sub": str(user.id)}
+    return TokenResponse(access_token=create_access_token(claims), refresh_token=create_refresh_token(claims))
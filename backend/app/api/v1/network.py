@@ -0,0 +1,67 @@
+from fastapi import APIRouter, Query
+from typing import List, Optional
+import uuid
+from app.core.exceptions import NotFoundException
+from app.schemas.network import CentralityEntry, NetworkResponse, PathResponse, SharedEntity
+from app.services.linkage_graph_service import ENTITY, POLITICIAN, get_linkage_graph
+
+router = APIRouter(prefix="/network", tags=["network"])
+
+
+@router.get("/politicians/{politician_id}", response_model=NetworkResponse)
+def get_politician_network(
+    politician_id: uuid.UUID,
+    hops: int = Query(2, ge=1, le=4),
+    min_strength: float = Query(0.0, ge=0.0, le=1.0),
+    verified_only: bool = False,
+    max_nodes: int = Query(200, ge=1, le=2000),
+) -> NetworkResponse:
+    """A politician's linkage network within ``hops``, ready to render. Answered from memory."""
+    network = get_linkage_graph().neighbourhood(
+        politician_id, hops=hops, min_strength=min_strength, verified_only=verified_only, max_nodes=max_nodes
+    )
+    if network is None:
+        raise NotFoundException("Politician not found")
+    return network
+
+
+@router.get("/politicians/{politician_id}/shared/{other_id}", response_model=List[SharedEntity])
+def get_shared_entities(
+    politician_id: uuid.UUID,
+    other_id: uuid.UUID,
+    min_strength: float = Query(0.0, ge=0.0, le=1.0),
+    verified_only: bool = False,
+) -> List[SharedEntity]:
+    """Entities (and politicians) both politicians are linked to."""
+    shared = get_linkage_graph().shared_entities(
+        politician_id, other_id, min_strength=min_strength, verified_only=verified_only
+    )
+    if shared is None:
+        raise NotFoundException("Politician not found")
+    return shared
+
+
+@router.get("/politicians/{politician_id}/path/{other_id}", response_model=PathResponse)
+def get_strongest_path(
+    politician_id: uuid.UUID,
+    other_id: uuid.UUID,
+    min_strength: float = Query(0.0, ge=0.0, le=1.0),
+    verified_only: bool = False,
+    max_hops: int = Query(6, ge=1, le=12),
+) -> PathResponse:
+    """The chain of linkages connecting two politicians with the greatest combined strength."""
+    path = get_linkage_graph().strongest_path(
+        politician_id, other_id, min_strength=min_strength, verified_only=verified_only, max_hops=max_hops
+    )
+    if path is None:
+        raise NotFoundException("Politician not found")
+    return path
+
+
+@router.get("/centrality", response_model=List[CentralityEntry])
+def get_centrality(
+    kind: Optional[str] = Query(POLITICIAN, pattern=f"^({POLITICIAN}|{ENTITY})$"),
+    limit: int = Query(20, ge=1, le=100),
+) -> List[CentralityEntry]:
+    """The most central politicians (or entities) of the linkage network."""
+    return get_linkage_graph().centrality(limit=limit, kind=kind)
@@ -0,0 +1,127 @@
+from fastapi import APIRouter, Depends, Query, Request, Response
+from fastapi.responses import StreamingResponse
+from sqlalchemy.orm import Session
+from datetime import datetime
+from typing import List, Optional
+import uuid
+from app.config import get_settings
+from app.core.exceptions import NotFoundException
+from app.database import get_db
+from app.schemas.common import CursorPage
+from app.schemas.news import NewsMentionResponse
+from app.models.score import SeriesResolution
+from app.schemas.politician import PoliticianCardResponse, PoliticianProfileResponse, TrendingPoliticianResponse
+from app.schemas.score import ScoreSeriesResponse
+from app.schemas.timeline import TimelineEventType
+from app.services.politician_service import get_politician_profile, list_politician_news, list_politicians
+from app.services.profile_cache import get_profile_cache
+from app.services.score_series_service import load_score_series
+from app.services.timeline_service import stream_timeline
+from app.services.trending_service import list_trending
+from app.utils.helpers import etag_matches
+
+settings = get_settings()
+
+router = APIRouter(prefix="/politicians", tags=["politicians"])
+
+
+@router.get("", response_model=CursorPage[PoliticianCardResponse])
+def get_politicians(
+    party: Optional[str] = None,
+    county: Optional[str] = None,
+    cursor: Optional[str] = None,
+    page_size: int = Query(settings.default_page_size, ge=1, le=settings.max_page_size),
+    db: Session = Depends(get_db),
+) -> CursorPage[PoliticianCardResponse]:
+    """
+    List active politicians, highest transparency score first.
+    Pass the returned ``next_cursor`` to get the following page.
+    """
+    return list_politicians(db, party=party, county=county, cursor=cursor, limit=page_size)
+
+
+@router.get("/trending", response_model=List[TrendingPoliticianResponse])
+def get_trending_politicians(
+    limit: int = Query(10, ge=1, le=settings.max_page_size),
+    db: Session = Depends(get_db),
+) -> List[TrendingPoliticianResponse]:
+    """
+    Politicians with the most recent activity (news mentions, flagged
+    reports, score swings), decayed over time.
+    """
+    return list_trending(db, limit=limit)
+
+
+@router.get("/{politician_id}", response_model=PoliticianProfileResponse)
+def get_politician(
+    politician_id: uuid.UUID,
+    request: Request,
+    db: Session = Depends(get_db),
+) -> Response:
+    """
+    Get a politician's full profile.
+    Served from the profile cache; clients revalidating with a matching
+    ``If-None-Match`` get a 304.
+    """
+    cached = get_profile_cache().get(politician_id, lambda: get_politician_profile(db, politician_id))
+    if cached is None:
+        raise NotFoundException("Politician not found")
+
+    headers = {"ETag": cached.etag, "Cache-Control": "no-cache"}
+    if etag_matches(request.headers.get("if-none-match"), cached.etag):
+        return Response(status_code=304, headers=headers)
+    return Response(content=cached.body, media_type="application/json", headers=headers)
+
+
+@router.get("/{politician_id}/news", response_model=CursorPage[NewsMentionResponse])
+def get_politician_news(
+    politician_id: uuid.UUID,
+    cursor: Optional[str] = None,
+    page_size: int = Query(settings.default_page_size, ge=1, le=settings.max_page_size),
+    db: Session = Depends(get_db),
+) -> CursorPage[NewsMentionResponse]:
+    """Get a politician's news mentions, newest first."""
+    return list_politician_news(db, politician_id, cursor=cursor, limit=page_size)
+
+
+@router.get("/{politician_id}/timeline", response_class=StreamingResponse)
+def get_politician_timeline(
+    politician_id: uuid.UUID,
+    since: Optional[datetime] = None,
+    until: Optional[datetime] = None,
+    kind: Optional[List[TimelineEventType]] = Query(None),
+    cursor: Optional[str] = None,
+    page_size: int = Query(settings.default_page_size, ge=1, le=settings.max_page_size),
+    db: Session = Depends(get_db),
+) -> StreamingResponse:
+    """
+    Get a politician's timeline (cases, promises, reports, score changes and
+    news), newest first, as NDJSON: one entry per line, then a final
+    ``{"next_cursor": ...}`` line. Filter with ``since``/``until`` and
+    repeated ``kind`` parameters; pass ``next_cursor`` back to continue.
+    """
+    lines = stream_timeline(
+        db, politician_id, since=since, until=until, kinds=kind, cursor=cursor, limit=page_size
+    )
+    return StreamingResponse(lines, media_type="application/x-ndjson")
+
+
+@router.get("/{politician_id}/scores", response_model=ScoreSeriesResponse)
+def get_politician_score_series(
+    politician_id: uuid.UUID,
+    since: Optional[datetime] = None,
+    until: Optional[datetime] = None,
+    interval: Optional[str] = Query(None, pattern="^(day|week|month)$"),
+    db: Session = Depends(get_db),
+) -> ScoreSeriesResponse:
+    """
+    Get a politician's transparency score over time for charting, in day,
+    week or month buckets (by default the finest that fits the range).
+    """
+    return load_score_series(
+        db,
+        politician_id,
+        since=since,
+        until=until,
+        interval=SeriesResolution(interval) if interval else None,
+    )
@@ -0,0 +1,46 @@
+from fastapi import APIRouter, Depends, Request, status
+from sqlalchemy.ext.asyncio import AsyncSession
+import uuid
+from app.core.auth_cache import UserPrincipal
+from app.database import get_async_db
+from app.dependencies import get_current_active_user
+from app.schemas.report import EvidenceUploadResponse
+from app.services.storage_service import receive_evidence
+
+router = APIRouter(prefix="/reports", tags=["reports"])
+
+EVIDENCE_UPLOAD_BODY = {
+    "requestBody": {
+        "required": True,
+        "content": {
+            "multipart/form-data": {
+                "schema": {
+                    "type": "object",
+                    "properties": {
+                        "files": {"type": "array", "items": {"type": "string", "format": "binary"}},
+                    },
+                    "required": ["files"],
+                },
+            },
+        },
+    },
+}
+
+
+@router.post(
+    "/{report_id}/evidence",
+    response_model=EvidenceUploadResponse,
+    status_code=status.HTTP_201_CREATED,
+    openapi_extra=EVIDENCE_UPLOAD_BODY,
+)
+async def upload_evidence(
+    report_id: uuid.UUID,
+    request: Request,
+    db: AsyncSession = Depends(get_async_db),
+    current_user: UserPrincipal = Depends(get_current_active_user),
+) -> EvidenceUploadResponse:
+    """
+    Attach evidence files to a report, as a multipart upload of one or more
+    ``files`` parts. Only the reporter or a moderator may add evidence.
+    """
+    return await receive_evidence(request, report_id, current_user, db)
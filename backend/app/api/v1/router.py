@@ -0,0 +1,12 @@
+from fastapi import APIRouter
+from app.api.v1 import admin, alerts, auth, network, politicians, reports, search, stats
+
+api_router = APIRouter()
+api_router.include_router(auth.router)
+api_router.include_router(politicians.router)
+api_router.include_router(alerts.router)
+api_router.include_router(reports.router)
+api_router.include_router(search.router)
+api_router.include_router(stats.router)
+api_router.include_router(network.router)
+api_router.include_router(admin.router)
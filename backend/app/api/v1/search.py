@@ -0,0 +1,57 @@
+from fastapi import APIRouter, Depends, Query
+from sqlalchemy.orm import Session
+from typing import List, Optional
+from app.config import get_settings
+from app.database import get_db
+from app.schemas.search import AdvancedSearchPage, SearchSuggestion
+from app.services.fulltext_search_service import SearchScope, advanced_search
+from app.services.search_service import SearchKind, autocomplete
+
+settings = get_settings()
+
+router = APIRouter(prefix="/search", tags=["search"])
+
+
+@router.get("/autocomplete", response_model=List[SearchSuggestion])
+def get_autocomplete(
+    q: str = Query(..., min_length=1, max_length=100),
+    kind: Optional[SearchKind] = None,
+    limit: int = Query(10, ge=1, le=25),
+) -> List[SearchSuggestion]:
+    """
+    Suggest politicians, cases and promises for a partially typed query.
+    Answered from the in-memory search index without a database query.
+    """
+    return autocomplete(q, limit=limit, kind=kind)
+
+
+@router.get("/advanced", response_model=AdvancedSearchPage)
+def get_advanced_search(
+    q: str = Query(..., min_length=2, max_length=200),
+    scope: SearchScope = SearchScope.POLITICIANS,
+    party: Optional[str] = None,
+    county: Optional[str] = None,
+    status: Optional[str] = None,
+    min_score: Optional[float] = Query(None, ge=0, le=100),
+    max_score: Optional[float] = Query(None, ge=0, le=100),
+    page: int = Query(1, ge=1),
+    page_size: int = Query(settings.default_page_size, ge=1, le=settings.max_page_size),
+    db: Session = Depends(get_db),
+) -> AdvancedSearchPage:
+    """
+    Full-text search with relevance ranking and filters.
+    ``status`` applies to cases and promises; score and location filters
+    apply to the politician each result belongs to.
+    """
+    return advanced_search(
+        db,
+        q,
+        scope=scope,
+        party=party,
+        county=county,
+        status=status,
+        min_score=min_score,
+        max_score=max_score,
+        page=page,
+        page_size=page_size,
+    )
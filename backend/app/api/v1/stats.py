@@ -0,0 +1,25 @@
+from fastapi import APIRouter, Depends
+from sqlalchemy.orm import Session
+from app.database import get_db
+from app.schemas.stats import ReportStats, ScoreDistribution, StatsOverview
+from app.services.stats_service import get_stats_snapshot
+
+router = APIRouter(prefix="/stats", tags=["stats"])
+
+
+@router.get("/overview", response_model=StatsOverview)
+def get_overview(db: Session = Depends(get_db)) -> StatsOverview:
+    """Headline numbers, as of ``refreshed_at``."""
+    return get_stats_snapshot(db).overview
+
+
+@router.get("/scores", response_model=ScoreDistribution)
+def get_score_distribution(db: Session = Depends(get_db)) -> ScoreDistribution:
+    """Distribution of active politicians' transparency scores."""
+    return get_stats_snapshot(db).scores
+
+
+@router.get("/reports", response_model=ReportStats)
+def get_report_stats(db: Session = Depends(get_db)) -> ReportStats:
+    """Flagged report counts by status and priority."""
+    return get_stats_snapshot(db).reports
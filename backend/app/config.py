@@ -16,14 +16,69 @@ class Settings(BaseSettings):
 
     # Database
     database_url: str
+    async_database_url: str = ""  # derived from database_url when empty
+    database_replica_urls: str = ""  # comma-separated read replicas for API reads
     db_echo: bool = False
+    # Per engine: the primary and each replica have a sync and an async pool
+    db_pool_size: int = 10
+    db_max_overflow: int = 20
+    db_pool_timeout_seconds: float = 30.0  # wait for a connection before failing the checkout
+    db_pool_recycle_seconds: int = 1800  # replace connections older than this; -1 never
+    db_replica_pin_seconds: int = 5  # after a client writes, its reads go to the primary this long
 
     # Redis
     redis_url: str = "redis://localhost:6379/0"
 
+    # Profile cache
+    profile_cache_local_size: int = 1000
+    profile_cache_local_ttl_seconds: int = 5
+    profile_cache_ttl_seconds: int = 3600
+
+    # Search
+    search_snapshot_path: str = ""  # empty disables index snapshots
+    search_refresh_interval_seconds: float = 30.0  # catch up with other processes' writes; 0 disables
+    search_tombstone_retention_hours: int = 168  # indexes further behind than this reload in full
+
+    # Data import
+    import_batch_size: int = 2000
+    import_max_reported_errors: int = 1000
+
+    # News scraper
+    scraper_sources_path: str = ""  # JSON list of news sources
+    scraper_interval_minutes: int = 30
+    # httpcore's pool bookkeeping grows quadratically with open connections;
+    # past ~20 it costs more CPU than the extra parallelism saves
+    scraper_max_connections: int = 20
+    scraper_timeout_seconds: float = 15.0
+    scraper_user_agent: str = "KenyaNiYetuBot/1.0 (+https://kenyaniyetu.org)"
+    scraper_source_concurrency: int = 2
+    scraper_source_rate_per_second: float = 1.0
+    scraper_parse_workers: int = 4
+    scraper_validator_cache_size: int = 50000
+    scraper_seen_url_capacity: int = 1000000
+
+    # Entity linking
+    entity_link_processes: int = 4
+    entity_link_chunk_size: int = 500  # articles per process pool task
+    entity_link_min_relevance: float = 0.1
+    entity_link_backfill_batch_size: int = 20000
+
     # Celery
     celery_broker_url: str = "redis://localhost:6379/0"
     celery_result_backend: str = "redis://localhost:6379/0"
+    celery_task_always_eager: bool = False  # run tasks inline, without a broker (tests)
+    # Messages a worker reserves per process, by queue; long tasks take one at a time
+    celery_scoring_prefetch: int = 1
+    celery_scraping_prefetch: int = 1
+    celery_notification_prefetch: int = 16
+    celery_max_tasks_per_child: int = 200
+    celery_score_chunk_size: int = 500  # politicians per recalculation task
+    celery_full_rescore_interval_hours: int = 24
+    celery_unique_task_ttl_seconds: int = 3600
+    celery_lease_seconds: int = 60  # exclusive-run leases lapse this long after their worker dies
+    # A full recalculation's lease is renewed by each finished chunk
+    celery_full_rescore_lease_seconds: int = 900
+    celery_unique_task_retry_seconds: int = 10
 
     # JWT
     jwt_secret_key: str
@@ -31,23 +86,86 @@ class Settings(BaseSettings):
     access_token_expire_minutes: int = 30
     refresh_token_expire_days: int = 7
 
+    # Auth caches
+    auth_token_cache_size: int = 10000
+    auth_token_cache_ttl_seconds: int = 300
+    auth_principal_cache_size: int = 10000
+    auth_principal_cache_ttl_seconds: int = 30
+
+    # Password hashing
+    password_bcrypt_rounds: int = 12  # hashes with fewer rounds are upgraded on login
+    password_hash_workers: int = 4  # threads; bcrypt releases the GIL
+    password_hash_max_queue: int = 64  # hashes waiting for a thread before further ones get a 503
+
     # AWS S3 (Optional)
     aws_access_key_id: str = ""
     aws_secret_access_key: str = ""
     aws_region: str = "us-east-1"
     s3_bucket_name: str = ""
+    s3_endpoint_url: str = ""  # for S3-compatible stores (MinIO, LocalStack)
 
     # OpenAI (Optional)
     openai_api_key: str = ""
 
+    # Sentiment analysis
+    sentiment_backend: str = "auto"  # "openai", "lexicon", or "auto" (openai when a key is set)
+    sentiment_model: str = "gpt-4o-mini"
+    sentiment_batch_size: int = 50  # texts per API call
+    sentiment_max_concurrency: int = 4  # API calls in flight
+    sentiment_timeout_seconds: float = 60.0
+    sentiment_cache_ttl_seconds: int = 90 * 24 * 3600
+    sentiment_lexicon_path: str = ""  # JSON object of extra word valences (-4..4)
+
     # Email
     sendgrid_api_key: str = ""
     email_from: str = "noreply@kenyaniyetu.org"
     email_from_name: str = "Kenya ni Yetu"
 
+    # Scoring
+    score_dirty_set_backend: str = "memory"  # "memory" or "redis"
+    score_flush_interval_seconds: int = 30
+
+    # Score time series
+    score_series_raw_days: int = 30  # every distinct recalculation is kept this long, then rolled up daily
+    score_series_daily_days: int = 180  # then weekly
+    score_series_weekly_days: int = 730  # then monthly, kept indefinitely
+    score_series_max_points: int = 400  # most buckets a chart request may return
+    score_series_compact_interval_hours: int = 24
+    score_history_retention_days: int = 90  # full score_history rows; each politician's latest is always kept
+
+    # Statistics
+    stats_refresh_check_seconds: int = 30  # how often the scheduler considers a refresh
+    stats_refresh_change_threshold: int = 200  # pending changes that trigger a refresh
+    stats_refresh_min_interval_seconds: int = 60
+    stats_refresh_max_interval_seconds: int = 900  # refresh at least this often regardless
+    stats_snapshot_ttl_seconds: float = 30.0  # how long a process serves its in-memory snapshot
+
+    # Trending
+    trending_backend: str = "redis"  # "redis" (shared by every process) or "memory" (per process, rebuilt)
+    trending_half_life_hours: float = 24.0
+    trending_mention_weight: float = 1.0
+    trending_report_weight: float = 3.0
+    trending_score_swing_weight: float = 0.5  # per point of transparency score change
+    trending_rebuild_days: int = 14  # history replayed on a cold start
+    trending_rebuild_interval_seconds: float = 300.0  # how often in-process counters are rebuilt
+
+    # Real-time alerts feed
+    alert_feed_backend: str = "memory"  # "memory" or "redis" (pub/sub across processes)
+    alert_feed_queue_size: int = 256  # events buffered per subscriber before it is dropped
+    alert_feed_replay_size: int = 2000  # recent events kept for reconnecting clients
+    alert_feed_heartbeat_seconds: float = 15.0
+    alert_feed_max_subscribers: int = 10000  # per worker process
+
     # Rate Limiting
     rate_limit_per_minute: int = 60
     rate_limit_per_hour: int = 1000
+    rate_limit_enabled: bool = True
+    rate_limit_backend: str = "redis"  # "redis" (shared by every process) or "memory" (per process)
+    rate_limit_anonymous_auth_per_minute: int = 10  # anonymous POSTs to /auth (login, register)
+    rate_limit_anonymous_auth_per_hour: int = 60
+    rate_limit_redis_timeout_seconds: float = 0.05
+    rate_limit_redis_retry_seconds: float = 5.0  # limit in-process this long after Redis fails
+    rate_limit_local_max_keys: int = 100000  # clients tracked by the in-process limiter
 
     # Pagination
     default_page_size: int = 20
@@ -56,6 +174,22 @@ class Settings(BaseSettings):
     # File Upload
     max_upload_size: int = 10485760  # 10MB
     allowed_extensions: str = "pdf,png,jpg,jpeg,gif,mp4,mov"
+    storage_backend: str = "local"  # "local" or "s3"
+    storage_local_path: str = "storage"
+    upload_chunk_size: int = 1048576  # bytes buffered per upload before each write to disk
+    max_evidence_files: int = 10  # per upload request
+    max_concurrent_uploads: int = 16  # per process; further uploads are turned away with a 503
+    evidence_processing_workers: int = 2  # processes sniffing and thumbnailing uploads
+    evidence_thumbnail_size: int = 320
+
+    # Observability
+    metrics_enabled: bool = True  # serve /metrics on a port per process
+    metrics_host: str = "127.0.0.1"
+    metrics_port: int = 9100  # first port tried; each process takes the next free one
+    metrics_port_count: int = 16  # ports tried, at least the number of uvicorn workers
+    metrics_token: str = ""  # bearer token required to scrape, when set
+    request_log_sample_rate: float = 0.01  # share of requests logged
+    request_log_slow_ms: float = 1000.0  # requests at least this slow are always logged
 
     # Sentry
     sentry_dsn: str = ""
@@ -65,6 +199,11 @@ class Settings(BaseSettings):
         """Parse allowed origins into a list."""
         return [origin.strip() for origin in self.allowed_origins.split(",")]
 
+    @property
+    def database_replica_urls_list(self) -> List[str]:
+        """Parse read replica URLs into a list."""
+        return [url.strip() for url in self.database_replica_urls.split(",") if url.strip()]
+
     @property
     def allowed_extensions_list(self) -> List[str]:
         """Parse allowed extensions into a list."""
@@ -1,6 +1,10 @@
 from app.core.security import (
     verify_password,
     get_password_hash,
+    verify_password_async,
+    get_password_hash_async,
+    verify_and_update_password,
+    password_hasher,
     create_access_token,
     create_refresh_token,
     decode_token,
@@ -13,12 +17,25 @@ from app.core.exceptions import (
     ForbiddenException,
     BadRequestException,
     ConflictException,
+    PayloadTooLargeException,
+    ServiceUnavailableException,
+)
+from app.core.middleware import ObservabilityMiddleware, RateLimitMiddleware, setup_cors
+from app.core.model_events import ModelChange, record_changes, subscribe
+from app.core.auth_cache import (
+    UserPrincipal,
+    invalidate_all_principals,
+    invalidate_principal,
+    register_auth_cache_listeners,
 )
-from app.core.middleware import LoggingMiddleware, setup_cors
 
 __all__ = [
     "verify_password",
     "get_password_hash",
+    "verify_password_async",
+    "get_password_hash_async",
+    "verify_and_update_password",
+    "password_hasher",
     "create_access_token",
     "create_refresh_token",
     "decode_token",
@@ -29,6 +46,16 @@ __all__ = [
     "ForbiddenException",
     "BadRequestException",
     "ConflictException",
-    "LoggingMiddleware",
+    "PayloadTooLargeException",
+    "ServiceUnavailableException",
+    "ObservabilityMiddleware",
+    "RateLimitMiddleware",
     "setup_cors",
+    "ModelChange",
+    "record_changes",
+    "subscribe",
+    "UserPrincipal",
+    "invalidate_principal",
+    "invalidate_all_principals",
+    "register_auth_cache_listeners",
 ]
@@ -0,0 +1,171 @@
+"""
+Cached user principals for authentication.
+
+The auth dependencies only need a user's id, role and account flags, so
+those are cached per token ``sub`` with a short TTL and LRU eviction. Changes
+to a user's role or flags evict the entry explicitly once committed, in the
+committing process and, through Redis pub/sub, in every API process running
+``PrincipalInvalidationListener``. Bulk ``update(User)``/``delete(User)``
+statements carry no per-row events, so they evict every cached principal.
+
+A listener that loses its Redis connection clears its cache when it
+reconnects, since it may have missed evictions. The TTL still bounds the
+remaining window: an eviction published while a listener is disconnected,
+or any eviction with ``REDIS_URL=memory://`` (one process only), is seen by
+other processes at most ``auth_principal_cache_ttl_seconds`` late.
+"""
+import asyncio
+from dataclasses import dataclass
+import logging
+from typing import List, Optional
+import uuid
+
+from sqlalchemy import event
+from sqlalchemy.orm import ORMExecuteState, Session
+
+from app.config import get_settings
+from app.core.model_events import DELETE, UPDATE, ModelChange, record_changes, subscribe
+from app.models.user import User, UserRole
+from app.utils.cache import TTLCache
+from app.utils.redis_client import MEMORY_URL_SCHEME, get_redis
+
+settings = get_settings()
+logger = logging.getLogger(__name__)
+
+# Columns that principals are built from
+PRINCIPAL_COLUMNS = ("role", "is_active", "is_verified")
+
+INVALIDATIONS_CHANNEL = "auth:principal-invalidations"
+ALL_PRINCIPALS = "*"
+
+
+@dataclass(frozen=True)
+class UserPrincipal:
+    """The authenticated identity attached to a request."""
+
+    id: uuid.UUID
+    role: UserRole
+    is_active: bool
+    is_verified: bool
+
+    @classmethod
+    def from_user(cls, user: User) -> "UserPrincipal":
+        return cls(id=user.id, role=user.role, is_active=user.is_active, is_verified=user.is_verified)
+
+
+principal_cache: TTLCache[UserPrincipal] = TTLCache(
+    maxsize=settings.auth_principal_cache_size,
+    ttl=settings.auth_principal_cache_ttl_seconds,
+)
+
+
+def get_cached_principal(user_id: uuid.UUID) -> Optional[UserPrincipal]:
+    """Return the cached principal for a user, if any."""
+    return principal_cache.get(user_id)
+
+
+def cache_principal(principal: UserPrincipal) -> None:
+    """Cache a freshly loaded principal."""
+    principal_cache.set(principal.id, principal)
+
+
+def _broadcast(message: str) -> None:
+    if settings.redis_url.startswith(MEMORY_URL_SCHEME):
+        return
+    try:
+        get_redis().publish(INVALIDATIONS_CHANNEL, message)
+    except Exception:
+        logger.exception("Failed to broadcast a principal invalidation")
+
+
+def invalidate_principal(user_id: uuid.UUID) -> None:
+    """Drop a user's cached principal in every process."""
+    principal_cache.pop(user_id)
+    _broadcast(str(user_id))
+
+
+def invalidate_all_principals() -> None:
+    """Drop every cached principal in every process."""
+    principal_cache.clear()
+    _broadcast(ALL_PRINCIPALS)
+
+
+def _apply_invalidation(message: str) -> None:
+    if message == ALL_PRINCIPALS:
+        principal_cache.clear()
+    else:
+        principal_cache.pop(uuid.UUID(message))
+
+
+def _on_model_changes(changes: List[ModelChange]) -> None:
+    for change in changes:
+        if change.table != User.__tablename__:
+            continue
+        if change.operation == DELETE or change.changed & set(PRINCIPAL_COLUMNS):
+            user_id = change.values.get("id")
+            if user_id is None:
+                invalidate_all_principals()
+                return
+            invalidate_principal(user_id)
+
+
+def _on_orm_execute(state: ORMExecuteState) -> None:
+    if not (state.is_update or state.is_delete):
+        return
+    table = getattr(state.statement, "table", None)
+    if getattr(table, "name", None) == User.__tablename__:
+        # Which rows the statement touches is unknown; report a change with no id
+        operation = DELETE if state.is_delete else UPDATE
+        record_changes(state.session, [ModelChange(User.__tablename__, operation, {}, frozenset(PRINCIPAL_COLUMNS))])
+
+
+def register_auth_cache_listeners() -> None:
+    """Evict principals when a user's role or flags change or it is deleted."""
+    subscribe(_on_model_changes)
+    if not event.contains(Session, "do_orm_execute", _on_orm_execute):
+        event.listen(Session, "do_orm_execute", _on_orm_execute)
+
+
+class PrincipalInvalidationListener:
+    """Applies principal evictions published by other processes."""
+
+    def __init__(self):
+        self._task: Optional[asyncio.Task] = None
+
+    async def start(self, redis_url: str) -> None:
+        if self._task is None and not redis_url.startswith(MEMORY_URL_SCHEME):
+            self._task = asyncio.create_task(self._listen(redis_url))
+
+    async def stop(self) -> None:
+        if self._task is not None:
+            self._task.cancel()
+            try:
+                await self._task
+            except asyncio.CancelledError:
+                pass
+            self._task = None
+
+    async def _listen(self, redis_url: str) -> None:
+        import redis.asyncio as aioredis
+
+        while True:
+            client = aioredis.from_url(redis_url)
+            try:
+                async with client.pubsub() as pubsub:
+                    await pubsub.subscribe(INVALIDATIONS_CHANNEL)
+                    # Evictions published while disconnected were missed
+                    principal_cache.clear()
+                    async for message in pubsub.listen():
+                        if message["type"] == "message":
+                            data = message["data"]
+                            _apply_invalidation(data.decode() if isinstance(data, bytes) else data)
+            except asyncio.CancelledError:
+                raise
+            except Exception:
+                logger.exception("Principal invalidation subscription failed; reconnecting")
+                await asyncio.sleep(1)
+            finally:
+                await client.aclose()
+
+
+principal_invalidations = PrincipalInvalidationListener()
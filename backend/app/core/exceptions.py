@@ -33,3 +33,19 @@ class ConflictException(HTTPException):
     """Exception raised when there's a conflict (e.g., duplicate resource)."""
     def __init__(self, detail: str = "Resource already exists"):
         super().__init__(status_code=status.HTTP_409_CONFLICT, detail=detail)
+
+
+class PayloadTooLargeException(HTTPException):
+    """Exception raised when a request body exceeds the accepted size."""
+    def __init__(self, detail: str = "Request body too large"):
+        super().__init__(status_code=status.HTTP_413_REQUEST_ENTITY_TOO_LARGE, detail=detail)
+
+
+class ServiceUnavailableException(HTTPException):
+    """Exception raised when the server is temporarily unable to take the request."""
+    def __init__(self, detail: str = "Service temporarily unavailable", retry_after: int = 5):
+        super().__init__(
+            status_code=status.HTTP_503_SERVICE_UNAVAILABLE,
+            detail=detail,
+            headers={"Retry-After": str(retry_after)},
+        )
@@ -0,0 +1,313 @@
+"""
+In-process metrics in the Prometheus text exposition format.
+
+A deliberately small registry: counters, gauges and histograms with fixed
+label names, plus collector callbacks that report values owned elsewhere
+(pool sizes, queue depths) at scrape time. Updates are plain arithmetic
+on dicts with no per-sample allocation once a label set has been seen.
+
+Metrics are per process. Rather than sharing the API port, where a scrape
+would reach whichever uvicorn worker accepted it, each process serves its
+own registry from a ``MetricsServer`` on the first free port of
+``metrics_port`` onwards, and every sample carries the process's ``pid``
+label; point Prometheus at the port range and sum over ``pid`` to
+aggregate. The server binds ``metrics_host`` (loopback by default) and, when
+``metrics_token`` is set, requires it as a bearer token.
+"""
+from bisect import bisect_left
+import hmac
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+import logging
+import math
+import os
+import threading
+from typing import Callable, Dict, Iterable, List, Optional, Sequence, Tuple
+
+logger = logging.getLogger(__name__)
+
+LabelValues = Tuple[str, ...]
+Sample = Tuple[str, Dict[str, str], float]  # name suffix, labels, value
+
+# Seconds; covers fast cache hits through slow report exports
+DEFAULT_BUCKETS = (0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0)
+
+
+def _escape(value: str) -> str:
+    return value.replace("\\", "\\\\").replace("\n", "\\n").replace('"', '\\"')
+
+
+def _format_labels(labels: Dict[str, str]) -> str:
+    if not labels:
+        return ""
+    return "{" + ",".join(f'{name}="{_escape(value)}"' for name, value in labels.items()) + "}"
+
+
+def _format_value(value: float) -> str:
+    if math.isinf(value):
+        return "+Inf" if value > 0 else "-Inf"
+    return repr(float(value)) if not float(value).is_integer() else str(int(value))
+
+
+class Metric:
+    kind = "untyped"
+
+    def __init__(self, name: str, documentation: str, labelnames: Sequence[str] = ()):
+        self.name = name
+        self.documentation = documentation
+        self.labelnames = tuple(labelnames)
+        self._lock = threading.Lock()
+
+    def _labels(self, values: LabelValues) -> Dict[str, str]:
+        return dict(zip(self.labelnames, values))
+
+    def samples(self) -> Iterable[Sample]:
+        raise NotImplementedError
+
+
+class Counter(Metric):
+    """A monotonically increasing value per label set; name it ``*_total``."""
+
+    kind = "counter"
+
+    def __init__(self, name: str, documentation: str, labelnames: Sequence[str] = ()):
+        super().__init__(name, documentation, labelnames)
+        self._values: Dict[LabelValues, float] = {}
+
+    def inc(self, amount: float = 1.0, labels: LabelValues = ()) -> None:
+        with self._lock:
+            self._values[labels] = self._values.get(labels, 0.0) + amount
+
+    def value(self, labels: LabelValues = ()) -> float:
+        return self._values.get(labels, 0.0)
+
+    def samples(self) -> Iterable[Sample]:
+        with self._lock:
+            items = list(self._values.items())
+        for labels, value in items:
+            yield "", self._labels(labels), value
+
+
+class Gauge(Metric):
+    """A value that goes up and down, per label set."""
+
+    kind = "gauge"
+
+    def __init__(self, name: str, documentation: str, labelnames: Sequence[str] = ()):
+        super().__init__(name, documentation, labelnames)
+        self._values: Dict[LabelValues, float] = {}
+
+    def inc(self, amount: float = 1.0, labels: LabelValues = ()) -> None:
+        with self._lock:
+            self._values[labels] = self._values.get(labels, 0.0) + amount
+
+    def dec(self, amount: float = 1.0, labels: LabelValues = ()) -> None:
+        self.inc(-amount, labels)
+
+    def set(self, value: float, labels: LabelValues = ()) -> None:
+        with self._lock:
+            self._values[labels] = value
+
+    def value(self, labels: LabelValues = ()) -> float:
+        return self._values.get(labels, 0.0)
+
+    def samples(self) -> Iterable[Sample]:
+        with self._lock:
+            items = list(self._values.items())
+        for labels, value in items:
+            yield "", self._labels(labels), value
+
+
+class Histogram(Metric):
+    """Observations counted into cumulative ``le`` buckets, per label set."""
+
+    kind = "histogram"
+
+    def __init__(
+        self,
+        name: str,
+        documentation: str,
+        labelnames: Sequence[str] = (),
+        buckets: Sequence[float] = DEFAULT_BUCKETS,
+    ):
+        super().__init__(name, documentation, labelnames)
+        self.buckets = tuple(sorted(buckets))
+        # Per label set: a count per bucket (last is +Inf), the sum, the count
+        self._series: Dict[LabelValues, List[float]] = {}
+
+    def observe(self, value: float, labels: LabelValues = ()) -> None:
+        index = bisect_left(self.buckets, value)
+        with self._lock:
+            series = self._series.get(labels)
+            if series is None:
+                series = self._series[labels] = [0.0] * (len(self.buckets) + 3)
+            series[index] += 1
+            series[-2] += value
+            series[-1] += 1
+
+    def count(self, labels: LabelValues = ()) -> int:
+        series = self._series.get(labels)
+        return int(series[-1]) if series else 0
+
+    def samples(self) -> Iterable[Sample]:
+        with self._lock:
+            items = [(labels, list(series)) for labels, series in self._series.items()]
+        for labels, series in items:
+            base = self._labels(labels)
+            cumulative = 0.0
+            for bound, count in zip(self.buckets + (math.inf,), series):
+                cumulative += count
+                yield "_bucket", {**base, "le": _format_value(bound)}, cumulative
+            yield "_sum", base, series[-2]
+            yield "_count", base, series[-1]
+
+
+class Registry:
+    """Metrics and scrape-time collectors rendered together by ``/metrics``."""
+
+    def __init__(self):
+        self._metrics: Dict[str, Metric] = {}
+        self.constant_labels: Dict[str, str] = {}  # added to every sample
+        self._collectors: List[Callable[[], Iterable[Tuple[str, str, str, Dict[str, str], float]]]] = []
+
+    def register(self, metric: Metric) -> Metric:
+        self._metrics[metric.name] = metric
+        return metric
+
+    def counter(self, name: str, documentation: str, labelnames: Sequence[str] = ()) -> Counter:
+        return self.register(Counter(name, documentation, labelnames))
+
+    def gauge(self, name: str, documentation: str, labelnames: Sequence[str] = ()) -> Gauge:
+        return self.register(Gauge(name, documentation, labelnames))
+
+    def histogram(
+        self,
+        name: str,
+        documentation: str,
+        labelnames: Sequence[str] = (),
+        buckets: Sequence[float] = DEFAULT_BUCKETS,
+    ) -> Histogram:
+        return self.register(Histogram(name, documentation, labelnames, buckets))
+
+    def add_collector(self, collector: Callable[[], Iterable[Tuple[str, str, str, Dict[str, str], float]]]) -> None:
+        """
+        Register a callback yielding ``(name, kind, documentation, labels,
+        value)`` samples, read at every scrape.
+        """
+        self._collectors.append(collector)
+
+    def get(self, name: str) -> Optional[Metric]:
+        return self._metrics.get(name)
+
+    def render(self) -> str:
+        constant = self.constant_labels
+        lines: List[str] = []
+        for metric in self._metrics.values():
+            lines.append(f"# HELP {metric.name} {metric.documentation}")
+            lines.append(f"# TYPE {metric.name} {metric.kind}")
+            for suffix, labels, value in metric.samples():
+                lines.append(f"{metric.name}{suffix}{_format_labels({**constant, **labels})} {_format_value(value)}")
+        described = set()
+        for collector in self._collectors:
+            for name, kind, documentation, labels, value in collector():
+                if name not in described:
+                    described.add(name)
+                    lines.append(f"# HELP {name} {documentation}")
+                    lines.append(f"# TYPE {name} {kind}")
+                lines.append(f"{name}{_format_labels({**constant, **labels})} {_format_value(value)}")
+        return "\n".join(lines) + "\n"
+
+
+registry = Registry()
+
+CONTENT_TYPE = "text/plain; version=0.0.4; charset=utf-8"
+
+
+class _MetricsHandler(BaseHTTPRequestHandler):
+    server: "_MetricsHTTPServer"
+
+    def do_GET(self) -> None:
+        if self.path.split("?", 1)[0] != "/metrics":
+            self.send_error(404)
+            return
+        token = self.server.token
+        if token:
+            scheme, _, supplied = self.headers.get("Authorization", "").partition(" ")
+            if scheme.lower() != "bearer" or not hmac.compare_digest(supplied.encode(), token.encode()):
+                self.send_response(401)
+                self.send_header("WWW-Authenticate", "Bearer")
+                self.send_header("Content-Length", "0")
+                self.end_headers()
+                return
+        body = self.server.registry.render().encode()
+        self.send_response(200)
+        self.send_header("Content-Type", CONTENT_TYPE)
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def log_message(self, format: str, *args) -> None:
+        pass
+
+
+class _MetricsHTTPServer(ThreadingHTTPServer):
+    daemon_threads = True
+
+    def __init__(self, address: Tuple[str, int], registry: Registry, token: str):
+        super().__init__(address, _MetricsHandler)
+        self.registry = registry
+        self.token = token
+
+
+class MetricsServer:
+    """
+    Serves this process's registry at ``/metrics`` on the first free port
+    of ``port`` to ``port + port_count - 1``, labelling samples by ``pid``.
+    """
+
+    def __init__(
+        self,
+        host: str,
+        port: int,
+        port_count: int = 1,
+        token: str = "",
+        metrics: Registry = registry,
+    ):
+        self.host = host
+        self.port = port
+        self.port_count = port_count
+        self.token = token
+        self.registry = metrics
+        self.bound_port: Optional[int] = None
+        self._server: Optional[_MetricsHTTPServer] = None
+        self._thread: Optional[threading.Thread] = None
+
+    def start(self) -> None:
+        if self._thread is not None:
+            return
+        self.registry.constant_labels["pid"] = str(os.getpid())
+        for port in range(self.port, self.port + self.port_count):
+            try:
+                self._server = _MetricsHTTPServer((self.host, port), self.registry, self.token)
+                break
+            except OSError:
+                continue
+        else:
+            logger.warning(
+                f"No free metrics port in {self.port}-{self.port + self.port_count - 1}; "
+                f"this process's metrics are not served"
+            )
+            return
+        self.bound_port = self._server.server_address[1]
+        self._thread = threading.Thread(target=self._server.serve_forever, name="metrics-server", daemon=True)
+        self._thread.start()
+        logger.info(f"Serving metrics on {self.host}:{self.bound_port}")
+
+    def stop(self, timeout: Optional[float] = None) -> None:
+        if self._server is not None:
+            self._server.shutdown()
+            self._server.server_close()
+            self._server = None
+        if self._thread is not None:
+            self._thread.join(timeout)
+            self._thread = None
+        self.bound_port = None
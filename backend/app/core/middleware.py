@@ -1,36 +1,96 @@
-from fastapi import Request, Response
-from starlette.middleware.base import BaseHTTPMiddleware
+from fastapi.responses import JSONResponse
 from starlette.middleware.cors import CORSMiddleware
-from typing import Callable
+from starlette.types import ASGIApp, Message, Receive, Scope, Send
+from typing import Optional
+import math
 import time
-import logging
+from app.core.observability import HTTP_IN_FLIGHT, RequestStats, current_request, record_request
+from app.core.rate_limit import RateLimiter, get_rate_limiter, request_identity
 
-logger = logging.getLogger(__name__)
 
+class ObservabilityMiddleware:
+    """
+    Record per-route latency, status, in-flight and database metrics for
+    HTTP requests (``app.core.observability``) and set ``X-Process-Time``.
+    Written as plain ASGI so streamed responses pass straight through.
+    """
 
-class LoggingMiddleware(BaseHTTPMiddleware):
-    """Middleware to log requests and responses."""
+    def __init__(self, app: ASGIApp):
+        self.app = app
 
-    async def dispatch(self, request: Request, call_next: Callable) -> Response:
-        start_time = time.time()
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+        started = time.perf_counter_ns()
+        method = scope["method"]
+        status = 500
+        stats = RequestStats()
+        token = current_request.set(stats)
+        HTTP_IN_FLIGHT.inc(labels=(method,))
 
-        # Log request
-        logger.info(f"Request: {request.method} {request.url.path}")
+        async def send_with_timing(message: Message) -> None:
+            nonlocal status
+            if message["type"] == "http.response.start":
+                status = message["status"]
+                elapsed = (time.perf_counter_ns() - started) / 1e9
+                message["headers"] = list(message.get("headers", [])) + [(b"x-process-time", str(elapsed).encode())]
+            await send(message)
 
-        # Process request
-        response = await call_next(request)
+        try:
+            await self.app(scope, receive, send_with_timing)
+        finally:
+            current_request.reset(token)
+            HTTP_IN_FLIGHT.dec(labels=(method,))
+            record_request(scope, status, time.perf_counter_ns() - started, stats)
 
-        # Calculate processing time
-        process_time = time.time() - start_time
-        response.headers["X-Process-Time"] = str(process_time)
 
-        # Log response
-        logger.info(
-            f"Response: {request.method} {request.url.path} - "
-            f"Status: {response.status_code} - Time: {process_time:.4f}s"
-        )
+class RateLimitMiddleware:
+    """
+    Enforce ``RateLimiter`` limits on HTTP requests. Refused requests get a
+    429 with ``Retry-After``; limited responses carry ``X-RateLimit-Limit``
+    and ``X-RateLimit-Remaining``. Written as plain ASGI so streamed
+    responses pass straight through.
+    """
 
-        return response
+    def __init__(self, app: ASGIApp, limiter: Optional[RateLimiter] = None):
+        self.app = app
+        self.limiter = limiter or get_rate_limiter()
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        if scope["type"] != "http" or scope["method"] == "OPTIONS":
+            await self.app(scope, receive, send)
+            return
+        identity, anonymous = request_identity(scope)
+        rule = self.limiter.rule_for(scope["method"], scope["path"], anonymous)
+        if rule is None:
+            await self.app(scope, receive, send)
+            return
+
+        result = await self.limiter.hit(identity, rule)
+        headers = [
+            (b"x-ratelimit-limit", str(result.limit).encode()),
+            (b"x-ratelimit-remaining", str(result.remaining).encode()),
+        ]
+        if not result.allowed:
+            response = JSONResponse(
+                {"detail": "Rate limit exceeded"},
+                status_code=429,
+                headers={
+                    "Retry-After": str(max(1, math.ceil(result.retry_after))),
+                    "X-RateLimit-Limit": str(result.limit),
+                    "X-RateLimit-Remaining": "0",
+                },
+            )
+            await response(scope, receive, send)
+            return
+
+        async def send_with_headers(message: Message) -> None:
+            if message["type"] == "http.response.start":
+                message["headers"] = list(message.get("headers", [])) + headers
+            await send(message)
+
+        await self.app(scope, receive, send_with_headers)
 
 
 def setup_cors(app, allowed_origins: list):
@@ -0,0 +1,157 @@
+"""
+Committed model change feed.
+
+Mapper listeners record every insert, update and delete of a mapped model on
+the owning session as a ``ModelChange``. When the transaction commits, the
+batch is handed to each subscriber, so subscribers (caches, indexes, score
+invalidation, alerts) only ever see committed changes. Rolled back changes
+are discarded.
+
+Bulk statements executed directly (``db.execute(insert(Model), rows)``)
+bypass the unit of work and fire no mapper events; code issuing them must
+report the rows it wrote with ``record_changes``.
+"""
+from dataclasses import dataclass, field
+import logging
+from typing import Any, Callable, Dict, FrozenSet, Iterable, List, Optional
+import uuid
+
+from sqlalchemy import event, inspect
+from sqlalchemy.orm import Session
+
+from app.database import Base
+
+logger = logging.getLogger(__name__)
+
+SESSION_INFO_KEY = "model_changes"
+
+INSERT = "insert"
+UPDATE = "update"
+DELETE = "delete"
+
+
+@dataclass
+class ModelChange:
+    """One committed row change."""
+
+    table: str
+    operation: str
+    # Loaded column values after the change (the last known values for deletes)
+    values: Dict[str, Any]
+    # Columns modified by an update, with their previous values
+    changed: FrozenSet[str] = frozenset()
+    previous: Dict[str, Any] = field(default_factory=dict)
+
+    @property
+    def politician_id(self) -> Optional[uuid.UUID]:
+        """The politician this row belongs to (or is)."""
+        if self.table == "politicians":
+            return self.values.get("id")
+        return self.values.get("politician_id")
+
+    def politician_ids(self) -> List[uuid.UUID]:
+        """The politician(s) affected, including the old owner of a moved row."""
+        ids = [self.politician_id, self.previous.get("politician_id")]
+        return [politician_id for politician_id in dict.fromkeys(ids) if politician_id is not None]
+
+
+Subscriber = Callable[[List[ModelChange]], None]
+
+_subscribers: List[Subscriber] = []
+_installed = False
+
+
+def _snapshot(mapper, target: Any, operation: str) -> ModelChange:
+    state = inspect(target)
+    column_keys = [attr.key for attr in mapper.column_attrs]
+    values = {key: state.dict[key] for key in column_keys if key in state.dict}
+
+    changed = set()
+    previous: Dict[str, Any] = {}
+    if operation == UPDATE:
+        for key in column_keys:
+            history = state.attrs[key].history
+            if history.has_changes():
+                changed.add(key)
+                previous[key] = history.deleted[0] if history.deleted else None
+
+    return ModelChange(
+        table=mapper.local_table.name,
+        operation=operation,
+        values=values,
+        changed=frozenset(changed),
+        previous=previous,
+    )
+
+
+def record_changes(session: Session, changes: Iterable[ModelChange]) -> None:
+    """Queue changes on ``session`` for dispatch when it commits."""
+    session.info.setdefault(SESSION_INFO_KEY, []).extend(changes)
+
+
+def _make_mapper_listener(operation: str) -> Callable:
+    def listener(mapper, connection, target):
+        session = Session.object_session(target)
+        if session is None:
+            return
+        change = _snapshot(mapper, target, operation)
+        if operation == UPDATE and not change.changed:
+            return
+        record_changes(session, [change])
+
+    return listener
+
+
+def _after_commit(session: Session) -> None:
+    changes = session.info.pop(SESSION_INFO_KEY, None)
+    if not changes:
+        return
+    for subscriber in list(_subscribers):
+        try:
+            subscriber(changes)
+        except Exception:
+            logger.exception(f"Model change subscriber {subscriber!r} failed")
+
+
+def _after_rollback(session: Session) -> None:
+    session.info.pop(SESSION_INFO_KEY, None)
+
+
+def _track_previous_owner(mapper, class_) -> None:
+    # Assigning an unloaded (e.g. expired after commit) attribute records no
+    # old value unless the attribute has active history; without it a row
+    # moved to another politician would never report its previous owner
+    if "politician_id" in mapper.column_attrs and not event.contains(class_.politician_id, "set", _ignore_set):
+        event.listen(class_.politician_id, "set", _ignore_set, active_history=True)
+
+
+def _ignore_set(target, value, oldvalue, initiator):
+    return value
+
+
+def install_model_event_listeners() -> None:
+    """Install the mapper and session listeners feeding subscribers."""
+    global _installed
+    if _installed:
+        return
+    for operation in (INSERT, UPDATE, DELETE):
+        event.listen(Base, f"after_{operation}", _make_mapper_listener(operation), propagate=True)
+    for mapper in Base.registry.mappers:
+        _track_previous_owner(mapper, mapper.class_)
+    event.listen(Base, "mapper_configured", _track_previous_owner, propagate=True)
+    event.listen(Session, "after_commit", _after_commit)
+    event.listen(Session, "after_rollback", _after_rollback)
+    _installed = True
+
+
+def subscribe(subscriber: Subscriber) -> None:
+    """Call ``subscriber`` with each batch of committed changes."""
+    install_model_event_listeners()
+    if subscriber not in _subscribers:
+        _subscribers.append(subscriber)
+
+
+def unsubscribe(subscriber: Subscriber) -> None:
+    """Stop delivering changes to ``subscriber``."""
+    if subscriber in _subscribers:
+        _subscribers.remove(subscriber)
@@ -0,0 +1,191 @@
+"""
+Request observability.
+
+``ObservabilityMiddleware`` times every HTTP request with
+``perf_counter_ns`` and records, per method and route template
+(``/api/v1/politicians/{politician_id}``, never the raw path, so label sets
+stay bounded):
+
+* ``http_requests_total`` by status, and ``http_request_duration_seconds``
+* ``http_requests_in_flight``
+* ``http_request_db_queries`` and ``http_request_db_seconds``: the SQL
+  statements a request ran and the time spent in them, attributed through
+  a context variable by engine events on every engine, sync or async,
+  including sessions used from the threadpool
+
+and, per connection pool (primary and replicas, sync and async), how long
+checkouts wait for a connection, how many time out, how long connections
+are held, and the pool's size, use and saturation at scrape time.
+
+Metrics are served at ``/metrics`` on a port per process
+(``app.core.metrics``). A JSON log line is written for a
+``request_log_sample_rate`` sample of requests, and for every request that
+is slower than ``request_log_slow_ms`` or fails with a 5xx, instead of two
+log lines for every request.
+"""
+from contextvars import ContextVar
+from dataclasses import dataclass
+import json
+import logging
+import random
+import time
+from typing import Optional
+
+from sqlalchemy import event
+from sqlalchemy.engine import Engine
+from sqlalchemy.pool import QueuePool
+
+from app.config import get_settings
+from app.core.metrics import registry
+from app.database import all_engines, checkout_observers
+
+settings = get_settings()
+logger = logging.getLogger(__name__)
+
+UNMATCHED_ROUTE = "unmatched"
+
+HTTP_REQUESTS = registry.counter(
+    "http_requests_total", "HTTP requests by method, route template and status.", ("method", "route", "status")
+)
+HTTP_DURATION = registry.histogram(
+    "http_request_duration_seconds", "HTTP request latency by method and route template.", ("method", "route")
+)
+HTTP_IN_FLIGHT = registry.gauge("http_requests_in_flight", "HTTP requests being served.", ("method",))
+DB_QUERIES = registry.histogram(
+    "http_request_db_queries",
+    "SQL statements executed per HTTP request.",
+    ("method", "route"),
+    buckets=(0, 1, 2, 3, 5, 10, 20, 50, 100),
+)
+DB_DURATION = registry.histogram(
+    "http_request_db_seconds", "Time per HTTP request spent executing SQL statements.", ("method", "route")
+)
+
+DB_POOL_WAIT = registry.histogram(
+    "db_pool_checkout_wait_seconds",
+    "Time spent waiting for a pooled database connection.",
+    ("pool",),
+    buckets=(0.0001, 0.0005, 0.001, 0.005, 0.01, 0.05, 0.1, 0.5, 1.0, 5.0, 30.0),
+)
+DB_POOL_TIMEOUTS = registry.counter(
+    "db_pool_checkout_timeouts_total", "Checkouts that gave up waiting for a database connection.", ("pool",)
+)
+DB_POOL_HELD = registry.histogram(
+    "db_pool_connection_held_seconds", "Time a database connection was checked out of its pool.", ("pool",)
+)
+
+
+@dataclass
+class RequestStats:
+    """Database work done on behalf of one request."""
+
+    queries: int = 0
+    query_ns: int = 0
+
+
+current_request: ContextVar[Optional[RequestStats]] = ContextVar("current_request", default=None)
+
+
+def _before_cursor_execute(conn, cursor, statement, parameters, context, executemany) -> None:
+    if current_request.get() is not None:
+        conn.info["query_started_ns"] = time.perf_counter_ns()
+
+
+def _after_cursor_execute(conn, cursor, statement, parameters, context, executemany) -> None:
+    stats = current_request.get()
+    if stats is None:
+        return
+    started = conn.info.pop("query_started_ns", None)
+    stats.queries += 1
+    if started is not None:
+        stats.query_ns += time.perf_counter_ns() - started
+
+
+def register_query_metrics() -> None:
+    """Attribute SQL statements on every engine to the request running them."""
+    if not event.contains(Engine, "before_cursor_execute", _before_cursor_execute):
+        event.listen(Engine, "before_cursor_execute", _before_cursor_execute)
+        event.listen(Engine, "after_cursor_execute", _after_cursor_execute)
+
+
+def _observe_checkout(pool: str, waited: float, timed_out: bool) -> None:
+    if timed_out:
+        DB_POOL_TIMEOUTS.inc(labels=(pool,))
+    DB_POOL_WAIT.observe(waited, labels=(pool,))
+
+
+def _time_connections_held(engine: Engine) -> None:
+    labels = (engine.pool.logging_name,)
+
+    def on_checkout(dbapi_connection, connection_record, connection_proxy) -> None:
+        connection_record.info["checked_out_at"] = time.perf_counter()
+
+    def on_checkin(dbapi_connection, connection_record) -> None:
+        started = connection_record.info.pop("checked_out_at", None)
+        if started is not None:
+            DB_POOL_HELD.observe(time.perf_counter() - started, labels=labels)
+
+    event.listen(engine, "checkout", on_checkout)
+    event.listen(engine, "checkin", on_checkin)
+
+
+def _pool_samples():
+    for engine in all_engines():
+        pool = engine.pool
+        if not isinstance(pool, QueuePool):
+            continue
+        labels = {"pool": pool.logging_name}
+        capacity = pool.size() + max(pool._max_overflow, 0)
+        checked_out = pool.checkedout()
+        yield "db_pool_size", "gauge", "Connections a pool keeps open.", labels, pool.size()
+        yield "db_pool_checked_out", "gauge", "Connections checked out of a pool.", labels, checked_out
+        yield "db_pool_overflow", "gauge", "Connections open beyond a pool's size.", labels, max(pool.overflow(), 0)
+        yield (
+            "db_pool_saturation",
+            "gauge",
+            "Checked out connections as a fraction of a pool's size plus overflow.",
+            labels,
+            checked_out / capacity if capacity else 0.0,
+        )
+
+
+def register_pool_metrics() -> None:
+    """Instrument every connection pool; call once at startup."""
+    if _observe_checkout in checkout_observers:
+        return
+    checkout_observers.append(_observe_checkout)
+    for engine in all_engines():
+        _time_connections_held(engine)
+    registry.add_collector(_pool_samples)
+
+
+def route_template(scope: dict) -> str:
+    """The path template of the route that served ``scope``, once routed."""
+    route = scope.get("route")
+    return getattr(route, "path", None) or UNMATCHED_ROUTE
+
+
+def record_request(scope: dict, status: int, duration_ns: int, stats: RequestStats) -> None:
+    method = scope["method"]
+    route = route_template(scope)
+    duration = duration_ns / 1e9
+    HTTP_REQUESTS.inc(labels=(method, route, str(status)))
+    HTTP_DURATION.observe(duration, labels=(method, route))
+    DB_QUERIES.observe(stats.queries, labels=(method, route))
+    DB_DURATION.observe(stats.query_ns / 1e9, labels=(method, route))
+
+    duration_ms = duration_ns / 1e6
+    if (
+        status >= 500
+        or duration_ms >= settings.request_log_slow_ms
+        or random.random() < settings.request_log_sample_rate
+    ):
+        logger.info(json.dumps({
+            "method": method,
+            "route": route,
+            "path": scope["path"],
+            "status": status,
+            "duration_ms": round(duration_ms, 3),
+            "db_queries": stats.queries,
+            "db_ms": round(stats.query_ns / 1e6, 3),
+        }))
@@ -0,0 +1,274 @@
+"""
+Request rate limiting.
+
+Limits are enforced with GCRA, the generic cell rate algorithm: a key holds
+a single "theoretical arrival time" (TAT) that each request pushes forward
+by ``period / limit``, and a request is refused while the TAT would run more
+than ``period`` ahead of now. That is a sliding window (a token bucket of
+``limit`` tokens refilling continuously) kept in one integer per key, with
+no per-request entries and no burst at fixed window boundaries.
+
+With ``rate_limit_backend = "redis"`` every limit of a request (per minute
+and per hour) is checked and charged by one Lua script, in a single atomic
+round trip, against the Redis server's clock, so limits hold across uvicorn
+workers and nodes. If Redis fails or is slower than
+``rate_limit_redis_timeout_seconds``, requests are limited by the same
+algorithm in process memory, per process, for
+``rate_limit_redis_retry_seconds`` before Redis is tried again: a Redis
+outage loosens limits rather than failing or stalling requests. The
+in-process limiter is used outright for the ``memory`` backend and for
+``REDIS_URL=memory://``.
+
+Requests are keyed per user (the ``sub`` of a valid bearer token) or, when
+anonymous, per client IP as the server sees it (run uvicorn with
+``--proxy-headers`` behind a proxy). The first matching ``RateLimitRule``
+applies; each rule counts separately. Anonymous logins and registrations
+get their own, tighter rule against password guessing and signup spam.
+"""
+from collections import OrderedDict
+from dataclasses import dataclass
+from functools import lru_cache
+import logging
+import time
+from typing import Any, List, Optional, Sequence, Tuple
+
+import redis
+
+from app.config import get_settings
+from app.core.security import decode_token
+from app.utils.redis_client import MEMORY_URL_SCHEME
+
+settings = get_settings()
+logger = logging.getLogger(__name__)
+
+KEY_PREFIX = "ratelimit"
+MICROSECONDS = 1_000_000
+
+# KEYS: one per limit. ARGV: each limit's period and emission interval, in
+# microseconds. Returns {allowed, binding limit (1-based), remaining, wait}.
+GCRA_SCRIPT = """
+local clock = redis.call('TIME')
+local now = tonumber(clock[1]) * 1000000 + tonumber(clock[2])
+local tats = {}
+local allowed, binding, remaining, wait = 1, 1, -1, 0
+for i, key in ipairs(KEYS) do
+    local period = tonumber(ARGV[2 * i - 1])
+    local interval = tonumber(ARGV[2 * i])
+    local tat = math.max(tonumber(redis.call('GET', key) or 0), now) + interval
+    tats[i] = tat
+    if tat - now > period then
+        allowed = 0
+        if tat - now - period > wait then
+            wait = tat - now - period
+            binding = i
+        end
+    elseif allowed == 1 then
+        local left = math.floor((period - (tat - now)) / interval)
+        if remaining < 0 or left < remaining then
+            remaining = left
+            binding = i
+        end
+    end
+end
+if allowed == 0 then
+    return {0, binding, 0, wait}
+end
+for i, key in ipairs(KEYS) do
+    redis.call('SET', key, string.format('%.0f', tats[i]), 'PX', math.ceil((tats[i] - now) / 1000))
+end
+return {1, binding, remaining, 0}
+"""
+
+
+@dataclass(frozen=True)
+class Limit:
+    """``count`` requests per ``period`` seconds."""
+
+    count: int
+    period: int
+
+    @property
+    def period_us(self) -> int:
+        return self.period * MICROSECONDS
+
+    @property
+    def interval_us(self) -> int:
+        return self.period_us // self.count
+
+
+@dataclass(frozen=True)
+class RateLimitRule:
+    """Limits for requests matching ``method`` (any when None) and ``path_prefix``."""
+
+    name: str
+    limits: Tuple[Limit, ...]
+    path_prefix: str = "/"
+    method: Optional[str] = None
+    anonymous_only: bool = False
+
+    def matches(self, method: str, path: str, anonymous: bool) -> bool:
+        return (
+            path.startswith(self.path_prefix)
+            and (self.method is None or self.method == method)
+            and (anonymous or not self.anonymous_only)
+        )
+
+
+@dataclass(frozen=True)
+class RateLimitResult:
+    allowed: bool
+    limit: int  # the binding limit's count
+    remaining: int
+    retry_after: float  # seconds until a refused request would be allowed
+
+
+def gcra(tats: Sequence[Optional[int]], now: int, limits: Sequence[Limit]) -> Tuple[RateLimitResult, List[int]]:
+    """
+    Check one request against ``limits`` given each limit's stored TAT
+    (None when unset), all in microseconds. Returns the result and the TATs
+    to store if it is allowed. Mirrors ``GCRA_SCRIPT``.
+    """
+    new_tats = []
+    allowed, binding, remaining, wait = True, 0, -1, 0
+    for index, (tat, limit) in enumerate(zip(tats, limits)):
+        tat = max(tat or 0, now) + limit.interval_us
+        new_tats.append(tat)
+        if tat - now > limit.period_us:
+            allowed = False
+            if tat - now - limit.period_us > wait:
+                wait = tat - now - limit.period_us
+                binding = index
+        elif allowed:
+            left = (limit.period_us - (tat - now)) // limit.interval_us
+            if remaining < 0 or left < remaining:
+                remaining = left
+                binding = index
+    result = RateLimitResult(allowed, limits[binding].count, max(remaining, 0) if allowed else 0, wait / MICROSECONDS)
+    return result, new_tats
+
+
+class LocalRateLimitStore:
+    """GCRA state in process memory, for at most ``max_keys`` keys (LRU)."""
+
+    def __init__(self, max_keys: int):
+        self.max_keys = max_keys
+        self._tats: "OrderedDict[str, int]" = OrderedDict()
+
+    def hit(self, keys: Sequence[str], limits: Sequence[Limit]) -> RateLimitResult:
+        now = time.time_ns() // 1000
+        result, new_tats = gcra([self._tats.get(key) for key in keys], now, limits)
+        if result.allowed:
+            for key, tat in zip(keys, new_tats):
+                self._tats[key] = tat
+                self._tats.move_to_end(key)
+            while len(self._tats) > self.max_keys:
+                self._tats.popitem(last=False)
+        return result
+
+
+class RedisRateLimitStore:
+    """GCRA state in Redis, checked and updated by ``GCRA_SCRIPT``."""
+
+    def __init__(self, client: Any):
+        self.client = client
+        self._script = client.register_script(GCRA_SCRIPT)
+
+    async def hit(self, keys: Sequence[str], limits: Sequence[Limit]) -> RateLimitResult:
+        args: List[int] = []
+        for limit in limits:
+            args += [limit.period_us, limit.interval_us]
+        allowed, binding, remaining, wait = await self._script(keys=list(keys), args=args)
+        return RateLimitResult(bool(allowed), limits[int(binding) - 1].count, int(remaining), int(wait) / MICROSECONDS)
+
+
+class RateLimiter:
+    """Applies the first matching rule's limits to a request's identity."""
+
+    def __init__(
+        self,
+        rules: Sequence[RateLimitRule],
+        redis_store: Optional[RedisRateLimitStore] = None,
+        local_max_keys: int = 100000,
+    ):
+        self.rules = list(rules)
+        self.redis_store = redis_store
+        self.local_store = LocalRateLimitStore(local_max_keys)
+        self._redis_retry_at = 0.0
+
+    def rule_for(self, method: str, path: str, anonymous: bool) -> Optional[RateLimitRule]:
+        for rule in self.rules:
+            if rule.matches(method, path, anonymous):
+                return rule
+        return None
+
+    async def hit(self, identity: str, rule: RateLimitRule) -> RateLimitResult:
+        """Count one request by ``identity`` against ``rule``."""
+        keys = [f"{KEY_PREFIX}:{rule.name}:{limit.period}:{identity}" for limit in rule.limits]
+        if self.redis_store is not None and time.monotonic() >= self._redis_retry_at:
+            try:
+                return await self.redis_store.hit(keys, rule.limits)
+            except (redis.RedisError, OSError) as exc:
+                logger.warning(
+                    f"Rate limit store unavailable ({exc!r}); limiting in-process for "
+                    f"{settings.rate_limit_redis_retry_seconds}s"
+                )
+                self._redis_retry_at = time.monotonic() + settings.rate_limit_redis_retry_seconds
+        return self.local_store.hit(keys, rule.limits)
+
+    async def close(self) -> None:
+        if self.redis_store is not None:
+            await self.redis_store.client.aclose()
+
+
+def limits(per_minute: int, per_hour: int) -> Tuple[Limit, ...]:
+    """Per-minute and per-hour limits; a count of 0 or less disables that limit."""
+    return tuple(Limit(count, period) for count, period in ((per_minute, 60), (per_hour, 3600)) if count > 0)
+
+
+def default_rules() -> List[RateLimitRule]:
+    api = f"/api/{settings.api_version}"
+    rules = [
+        RateLimitRule(
+            "anonymous-auth",
+            limits(settings.rate_limit_anonymous_auth_per_minute, settings.rate_limit_anonymous_auth_per_hour),
+            path_prefix=f"{api}/auth/",
+            method="POST",
+            anonymous_only=True,
+        ),
+        RateLimitRule(
+            "api",
+            limits(settings.rate_limit_per_minute, settings.rate_limit_per_hour),
+            path_prefix=f"{api}/",
+        ),
+    ]
+    return [rule for rule in rules if rule.limits]
+
+
+def request_identity(scope: dict) -> Tuple[str, bool]:
+    """The key a request is limited under, and whether it is anonymous."""
+    for name, value in scope.get("headers", ()):
+        if name == b"authorization":
+            scheme, _, token = value.decode("latin-1").partition(" ")
+            if scheme.lower() == "bearer" and token:
+                payload = decode_token(token)
+                if payload is not None and payload.get("sub"):
+                    return f"user:{payload['sub']}", False
+            break
+    client = scope.get("client")
+    return f"ip:{client[0] if client else 'unknown'}", True
+
+
+@lru_cache()
+def get_rate_limiter() -> RateLimiter:
+    """Get the configured rate limiter."""
+    redis_store = None
+    if settings.rate_limit_backend == "redis" and not settings.redis_url.startswith(MEMORY_URL_SCHEME):
+        import redis.asyncio as aioredis
+
+        client = aioredis.from_url(
+            settings.redis_url,
+            socket_timeout=settings.rate_limit_redis_timeout_seconds,
+            socket_connect_timeout=settings.rate_limit_redis_timeout_seconds,
+        )
+        redis_store = RedisRateLimitStore(client)
+    return RateLimiter(default_rules(), redis_store, settings.rate_limit_local_max_keys)
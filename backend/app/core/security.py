@@ -1,13 +1,32 @@
+import asyncio
+from concurrent.futures import ThreadPoolExecutor
 from datetime import datetime, timedelta
-from typing import Optional, Dict, Any
+from typing import Optional, Dict, Any, Callable, Iterator, Tuple
+import time
 from jose import JWTError, jwt
 from passlib.context import CryptContext
 from app.config import get_settings
+from app.core.exceptions import ServiceUnavailableException
+from app.core.metrics import registry
+from app.utils.cache import TTLCache
 
 settings = get_settings()
 
-# Password hashing context
-pwd_context = CryptContext(schemes=["bcrypt"], deprecated="auto")
+# Password hashing context. Hashes below the configured cost are reported as
+# needing an update, so raising password_bcrypt_rounds upgrades them on login.
+pwd_context = CryptContext(
+    schemes=["bcrypt"],
+    deprecated="auto",
+    bcrypt__rounds=settings.password_bcrypt_rounds,
+    bcrypt__min_rounds=settings.password_bcrypt_rounds,
+)
+
+# Payloads of tokens whose signature has already been verified, keyed by the
+# exact token string. An entry never outlives the token's own expiry.
+verified_token_cache: TTLCache[Dict[str, Any]] = TTLCache(
+    maxsize=settings.auth_token_cache_size,
+    ttl=settings.auth_token_cache_ttl_seconds,
+)
 
 
 def verify_password(plain_password: str, hashed_password: str) -> bool:
@@ -20,6 +39,106 @@ def get_password_hash(password: str) -> str:
     return pwd_context.hash(password)
 
 
+class PasswordHasher:
+    """
+    Runs bcrypt on a bounded thread pool, off the event loop.
+
+    A hash takes a few hundred milliseconds of CPU; on the event loop it
+    would stall every other request on the worker. bcrypt releases the GIL,
+    so the pool's threads hash in parallel while the loop keeps serving.
+    Once ``max_queue`` hashes are waiting for a thread, further ones are
+    refused with a 503 rather than queueing: a login burst is shed instead
+    of growing every caller's wait without bound.
+    """
+
+    def __init__(self, workers: int, max_queue: int):
+        self.workers = workers
+        self.max_queue = max_queue
+        self._executor: Optional[ThreadPoolExecutor] = None
+        self.in_flight = 0  # submitted and not yet finished: running plus queued
+        self.completed = 0
+        self.rejected = 0
+        self.wait_seconds_total = 0.0  # time spent queued for a thread
+        self.hash_seconds_total = 0.0
+
+    @property
+    def queued(self) -> int:
+        return max(0, self.in_flight - self.workers)
+
+    def stats(self) -> Dict[str, Any]:
+        return {
+            "workers": self.workers,
+            "in_flight": self.in_flight,
+            "queued": self.queued,
+            "completed": self.completed,
+            "rejected": self.rejected,
+            "wait_seconds_total": self.wait_seconds_total,
+            "hash_seconds_total": self.hash_seconds_total,
+        }
+
+    def collect(self) -> Iterator[Tuple[str, str, str, Dict[str, str], float]]:
+        """Samples for the metrics registry."""
+        yield "password_hash_in_flight", "gauge", "Password hashes running or queued.", {}, self.in_flight
+        yield "password_hash_queued", "gauge", "Password hashes waiting for a thread.", {}, self.queued
+        yield "password_hash_completed_total", "counter", "Password hashes completed.", {}, self.completed
+        yield "password_hash_rejected_total", "counter", "Password hashes shed with a 503.", {}, self.rejected
+        yield "password_hash_wait_seconds_total", "counter", "Time hashes spent queued.", {}, self.wait_seconds_total
+
+    async def run(self, fn: Callable, *args: Any) -> Any:
+        if self.in_flight >= self.workers + self.max_queue:
+            self.rejected += 1
+            raise ServiceUnavailableException("Too many sign-in attempts in progress, try again shortly", retry_after=1)
+        if self._executor is None:
+            self._executor = ThreadPoolExecutor(self.workers, thread_name_prefix="password-hash")
+        submitted = time.perf_counter()
+
+        def timed() -> Tuple[Any, float, float]:
+            started = time.perf_counter()
+            return fn(*args), started, time.perf_counter()
+
+        self.in_flight += 1
+        try:
+            result, started, finished = await asyncio.get_running_loop().run_in_executor(self._executor, timed)
+        finally:
+            self.in_flight -= 1
+        self.completed += 1
+        self.wait_seconds_total += started - submitted
+        self.hash_seconds_total += finished - started
+        return result
+
+    def shutdown(self) -> None:
+        if self._executor is not None:
+            self._executor.shutdown(wait=True)
+            self._executor = None
+
+
+password_hasher = PasswordHasher(settings.password_hash_workers, settings.password_hash_max_queue)
+registry.add_collector(password_hasher.collect)
+
+
+async def verify_password_async(plain_password: str, hashed_password: str) -> bool:
+    """``verify_password`` on the password hashing pool."""
+    return await password_hasher.run(pwd_context.verify, plain_password, hashed_password)
+
+
+async def get_password_hash_async(password: str) -> str:
+    """``get_password_hash`` on the password hashing pool."""
+    return await password_hasher.run(pwd_context.hash, password)
+
+
+async def verify_and_update_password(plain_password: str, hashed_password: str) -> Tuple[bool, Optional[str]]:
+    """
+    Verify a password and, if its hash uses deprecated settings, rehash it.
+    Returns whether it matched and the replacement hash to store, if any.
+    """
+    return await password_hasher.run(pwd_context.verify_and_update, plain_password, hashed_password)
+
+
+async def dummy_verify_password() -> None:
+    """Spend as long as a real verification, for logins to unknown accounts."""
+    await password_hasher.run(pwd_context.dummy_verify)
+
+
 def create_access_token(data: Dict[str, Any], expires_delta: Optional[timedelta] = None) -> str:
     """Create a JWT access token."""
     to_encode = data.copy()
@@ -45,17 +164,34 @@ def create_refresh_token(data: Dict[str, Any]) -> str:
 
 
 def decode_token(token: str) -> Optional[Dict[str, Any]]:
-    """Decode and validate a JWT token."""
+    """
+    Decode and validate a JWT token.
+    Hot tokens are served from ``verified_token_cache`` without re-verifying
+    the signature; expiry is still checked on every call.
+    """
+    now = time.time()
+    payload = verified_token_cache.get(token)
+    if payload is not None:
+        if payload.get("exp", now + 1) > now:
+            return dict(payload)
+        verified_token_cache.pop(token)
+        return None
+
     try:
         payload = jwt.decode(
             token,
             settings.jwt_secret_key,
             algorithms=[settings.jwt_algorithm]
         )
-        return payload
     except JWTError:
         return None
 
+    ttl = settings.auth_token_cache_ttl_seconds
+    if "exp" in payload:
+        ttl = min(ttl, payload["exp"] - now)
+    verified_token_cache.set(token, payload, ttl=ttl)
+    return dict(payload)
+
 
 def create_verification_token(email: str) -> str:
     """Create a token for email verification."""
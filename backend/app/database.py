@@ -1,39 +1,258 @@
-from sqlalchemy import create_engine
+"""
+Database engines, sessions and read routing.
+
+The pools are ``QueuePool`` subclasses that time each checkout by wrapping
+``QueuePool._do_get``, a private SQLAlchemy method. That relies on the
+SQLAlchemy 2.0 pool internals, which is why ``requirements.txt`` pins
+SQLAlchemy to an exact version; re-check ``_CheckoutTimingMixin`` when
+upgrading it.
+"""
+import random
+import time
+from fastapi import Response
+from sqlalchemy import create_engine, exc, text
+from sqlalchemy.engine import Engine, make_url
+from sqlalchemy.ext.asyncio import AsyncEngine, AsyncSession, async_sessionmaker, create_async_engine
 from sqlalchemy.ext.declarative import declarative_base
 from sqlalchemy.orm import sessionmaker, Session
-from typing import Generator
+from sqlalchemy.pool import AsyncAdaptedQueuePool, QueuePool
+from starlette.requests import HTTPConnection
+from typing import Any, AsyncGenerator, Callable, Dict, Generator, List
 from app.config import get_settings
 
 settings = get_settings()
 
+# asyncio drivers for each sync database backend
+ASYNC_DRIVERS = {
+    "postgresql": "postgresql+asyncpg",
+    "sqlite": "sqlite+aiosqlite",
+}
+
+
+def get_async_database_url(database_url: str) -> str:
+    """Map a sync database URL onto the asyncio driver for the same backend."""
+    url = make_url(database_url)
+    driver = ASYNC_DRIVERS.get(url.get_backend_name())
+    if driver is None:
+        return database_url
+    return url.set(drivername=driver).render_as_string(hide_password=False)
+
+
+# Connection pools
+
+# Called with (pool name, seconds waited, timed out) after every checkout
+# that had to go to the pool; ``app.core.observability`` turns these into
+# metrics. Kept here as plain callbacks so this module imports nothing from
+# ``app.core``, whose package imports the models, which import this module.
+checkout_observers: List[Callable[[str, float, bool], None]] = []
+
+
+class _CheckoutTimingMixin:
+    """
+    Time how long each checkout waits for a free connection. Overrides the
+    private ``QueuePool._do_get`` (see the module docstring).
+    """
+
+    def _do_get(self):
+        started = time.perf_counter()
+        try:
+            record = super()._do_get()
+        except exc.TimeoutError:
+            self._observe_checkout(time.perf_counter() - started, True)
+            raise
+        self._observe_checkout(time.perf_counter() - started, False)
+        return record
+
+    def _observe_checkout(self, waited: float, timed_out: bool) -> None:
+        for observer in checkout_observers:
+            observer(self.logging_name, waited, timed_out)
+
+
+class InstrumentedQueuePool(_CheckoutTimingMixin, QueuePool):
+    pass
+
+
+class InstrumentedAsyncQueuePool(_CheckoutTimingMixin, AsyncAdaptedQueuePool):
+    pass
+
+
+def _engine_options(url: str, name: str, poolclass: type) -> Dict[str, Any]:
+    # ``pool_logging_name`` survives the pool being recreated on dispose, so
+    # it doubles as the pool's metric label
+    options: Dict[str, Any] = {"echo": settings.db_echo, "pool_pre_ping": True, "pool_logging_name": name}
+    parsed = make_url(url)
+    # Backends the dialect doesn't queue connections for (SQLite in memory,
+    # aiosqlite) keep their own pool
+    if issubclass(parsed.get_dialect().get_pool_class(parsed), QueuePool):
+        options.update(
+            poolclass=poolclass,
+            pool_size=settings.db_pool_size,
+            max_overflow=settings.db_max_overflow,
+            pool_timeout=settings.db_pool_timeout_seconds,
+            pool_recycle=settings.db_pool_recycle_seconds,
+        )
+    return options
+
+
 # Create database engine
 engine = create_engine(
-    settings.database_url,
-    echo=settings.db_echo,
-    pool_pre_ping=True,
-    pool_size=10,
-    max_overflow=20,
+    settings.database_url, **_engine_options(settings.database_url, "primary", InstrumentedQueuePool)
 )
 
-# Create session factory
-SessionLocal = sessionmaker(autocommit=False, autoflush=False, bind=engine)
+# Create async database engine for request handlers; the sync engine above
+# stays in use for Celery tasks and scripts
+async_database_url = settings.async_database_url or get_async_database_url(settings.database_url)
+async_engine = create_async_engine(
+    async_database_url, **_engine_options(async_database_url, "primary-async", InstrumentedAsyncQueuePool)
+)
+
+# Read replicas, used only by sessions from the request dependencies below
+replica_engines: List[Engine] = [
+    create_engine(url, **_engine_options(url, f"replica{index}", InstrumentedQueuePool))
+    for index, url in enumerate(settings.database_replica_urls_list, start=1)
+]
+async_replica_engines: List[AsyncEngine] = [
+    create_async_engine(async_url, **_engine_options(async_url, f"replica{index}-async", InstrumentedAsyncQueuePool))
+    for index, async_url in enumerate(map(get_async_database_url, settings.database_replica_urls_list), start=1)
+]
+
+
+def all_engines() -> List[Engine]:
+    """Every engine, async ones as their sync core, for pool instrumentation."""
+    return [
+        engine,
+        async_engine.sync_engine,
+        *replica_engines,
+        *(replica.sync_engine for replica in async_replica_engines),
+    ]
+
+
+# Read routing
+#
+# Request sessions of safe (GET, HEAD, OPTIONS) requests send plain SELECTs
+# to a replica and everything else (flushes, DML, SELECT ... FOR UPDATE, raw
+# ``session.connection()`` use) to the primary. Once a session has written,
+# it stays on the primary, and the client gets a ``REPLICA_PIN_COOKIE`` that
+# keeps its requests on the primary for ``db_replica_pin_seconds``, long
+# enough for replication to catch up, so users read their own writes. Other
+# requests (writes, and logins and registrations, which are POSTs) read from
+# the primary throughout, so they never decide on a lagging replica's rows,
+# and pin the client like any other session that writes.
+# Sessions created directly (Celery tasks, scripts, startup jobs) never
+# enable replica reads.
+
+REPLICA_PIN_COOKIE = "ketu_db_pin"
+REPLICA_METHODS = frozenset({"GET", "HEAD", "OPTIONS"})
+READ_REPLICA = "read_replica"  # session.info keys
+WROTE = "wrote_primary"
+PIN_RESPONSE = "replica_pin_response"
+
+
+def _is_read(clause: Any) -> bool:
+    return bool(getattr(clause, "is_select", False)) and getattr(clause, "_for_update_arg", None) is None
+
+
+class RoutingSession(Session):
+    """Session choosing the primary or a replica per statement."""
+
+    primary: Engine = engine
+    replicas: List[Engine] = replica_engines
+
+    def get_bind(self, mapper=None, clause=None, **kw):
+        if self._flushing or (clause is not None and not _is_read(clause)):
+            self._mark_write()
+        elif clause is not None and self.replicas and self.info.get(READ_REPLICA) and not self.info.get(WROTE):
+            # One replica per session, so its reads see one replica's state
+            replica = self.info.get("replica")
+            if replica is None:
+                replica = self.info["replica"] = random.choice(self.replicas)
+            return replica
+        return self.primary
+
+    def _mark_write(self) -> None:
+        if self.info.get(WROTE):
+            return
+        self.info[WROTE] = True
+        response = self.info.pop(PIN_RESPONSE, None)
+        if response is not None:
+            response.set_cookie(
+                REPLICA_PIN_COOKIE,
+                "1",
+                max_age=settings.db_replica_pin_seconds,
+                httponly=True,
+                samesite="lax",
+            )
+
+
+class AsyncRoutingSession(RoutingSession):
+    """The sync session behind ``AsyncSession``, routing to async engines."""
+
+    primary = async_engine.sync_engine
+    replicas = [replica.sync_engine for replica in async_replica_engines]
+
+
+# Create session factories
+SessionLocal = sessionmaker(autocommit=False, autoflush=False, bind=engine, class_=RoutingSession)
+AsyncSessionLocal = async_sessionmaker(
+    bind=async_engine,
+    class_=AsyncSession,
+    sync_session_class=AsyncRoutingSession,
+    autoflush=False,
+    expire_on_commit=False,
+)
+
+
+def _routing_info(connection: HTTPConnection, response: Response) -> Dict[str, Any]:
+    if not replica_engines:
+        return {}
+    # Every request that writes pins its client, whichever reads it may make
+    info: Dict[str, Any] = {PIN_RESPONSE: response}
+    if connection.scope.get("method") in REPLICA_METHODS and REPLICA_PIN_COOKIE not in connection.cookies:
+        info[READ_REPLICA] = True
+    return info
+
 
 # Create base class for models
 Base = declarative_base()
 
 
-def get_db() -> Generator[Session, None, None]:
+def get_db(connection: HTTPConnection, response: Response) -> Generator[Session, None, None]:
     """
     Dependency function to get database session.
     Yields a database session and ensures it's closed after use.
+    Reads go to a replica when one is configured (see Read routing).
     """
-    db = SessionLocal()
+    db = SessionLocal(info=_routing_info(connection, response))
     try:
         yield db
     finally:
         db.close()
 
 
+async def get_async_db(connection: HTTPConnection, response: Response) -> AsyncGenerator[AsyncSession, None]:
+    """
+    Dependency function to get an async database session.
+    Queries on it are awaited, so they never block the event loop.
+    Reads go to a replica when one is configured (see Read routing).
+    """
+    async with AsyncSessionLocal(info=_routing_info(connection, response)) as db:
+        yield db
+
+
 def init_db() -> None:
-    """Initialize database tables."""
+    """
+    Initialize database tables.
+    Production databases are managed with Alembic (``alembic upgrade head``).
+    """
+    from app import models  # noqa: F401  (register models on Base.metadata)
+    from app.models.search_tombstone import create_search_tombstone_triggers
+    from app.models.stats import create_stats_views
+
+    if engine.dialect.name == "postgresql":
+        with engine.begin() as conn:
+            conn.execute(text("CREATE EXTENSION IF NOT EXISTS pg_trgm"))
     Base.metadata.create_all(bind=engine)
+    if engine.dialect.name == "postgresql":
+        with engine.begin() as conn:
+            create_stats_views(conn)
+            create_search_tombstone_triggers(conn)
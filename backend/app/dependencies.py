@@ -1,20 +1,49 @@
 from fastapi import Depends, HTTPException, status
 from fastapi.security import HTTPBearer, HTTPAuthorizationCredentials
-from sqlalchemy.orm import Session
+from sqlalchemy import select
+from sqlalchemy.ext.asyncio import AsyncSession
 from typing import Optional
-from app.database import get_db
+import uuid
+from app.database import get_async_db
 from app.core.security import decode_token
+from app.core.auth_cache import UserPrincipal, cache_principal, get_cached_principal
 from app.models.user import User
 
 security = HTTPBearer()
 
 
+def _parse_user_id(payload: dict) -> Optional[uuid.UUID]:
+    """Extract the user id from a token payload's ``sub`` claim."""
+    try:
+        return uuid.UUID(str(payload["sub"]))
+    except (KeyError, ValueError):
+        return None
+
+
+async def _get_principal(db: AsyncSession, user_id: uuid.UUID) -> Optional[UserPrincipal]:
+    """Get a user's principal from the cache, loading it on a miss."""
+    principal = get_cached_principal(user_id)
+    if principal is not None:
+        return principal
+
+    result = await db.execute(
+        select(User.id, User.role, User.is_active, User.is_verified).where(User.id == user_id)
+    )
+    row = result.one_or_none()
+    if row is None:
+        return None
+    principal = UserPrincipal(id=row.id, role=row.role, is_active=row.is_active, is_verified=row.is_verified)
+    cache_principal(principal)
+    return principal
+
+
 async def get_current_user(
     credentials: HTTPAuthorizationCredentials = Depends(security),
-    db: Session = Depends(get_db)
-) -> User:
+    db: AsyncSession = Depends(get_async_db)
+) -> UserPrincipal:
     """
     Dependency to get current authenticated user from JWT token.
+    Returns the cached principal; the database is only queried on a miss.
     """
     token = credentials.credentials
     payload = decode_token(token)
@@ -26,14 +55,14 @@ async def get_current_user(
             headers={"WWW-Authenticate": "Bearer"},
         )
 
-    user_id: str = payload.get("sub")
+    user_id = _parse_user_id(payload)
     if user_id is None:
         raise HTTPException(
             status_code=status.HTTP_401_UNAUTHORIZED,
             detail="Could not validate credentials",
         )
 
-    user = db.query(User).filter(User.id == user_id).first()
+    user = await _get_principal(db, user_id)
     if user is None:
         raise HTTPException(
             status_code=status.HTTP_404_NOT_FOUND,
@@ -50,8 +79,8 @@ async def get_current_user(
 
 
 async def get_current_active_user(
-    current_user: User = Depends(get_current_user),
-) -> User:
+    current_user: UserPrincipal = Depends(get_current_user),
+) -> UserPrincipal:
     """Dependency to get current active user."""
     if not current_user.is_active:
         raise HTTPException(status_code=400, detail="Inactive user")
@@ -59,8 +88,8 @@ async def get_current_active_user(
 
 
 async def get_current_admin_user(
-    current_user: User = Depends(get_current_user),
-) -> User:
+    current_user: UserPrincipal = Depends(get_current_user),
+) -> UserPrincipal:
     """Dependency to get current admin user."""
     if current_user.role != "admin":
         raise HTTPException(
@@ -71,8 +100,8 @@ async def get_current_admin_user(
 
 
 async def get_current_moderator_user(
-    current_user: User = Depends(get_current_user),
-) -> User:
+    current_user: UserPrincipal = Depends(get_current_user),
+) -> UserPrincipal:
     """Dependency to get current moderator or admin user."""
     if current_user.role not in ["moderator", "admin"]:
         raise HTTPException(
@@ -84,8 +113,8 @@ async def get_current_moderator_user(
 
 async def get_optional_current_user(
     credentials: Optional[HTTPAuthorizationCredentials] = Depends(HTTPBearer(auto_error=False)),
-    db: Session = Depends(get_db)
-) -> Optional[User]:
+    db: AsyncSession = Depends(get_async_db)
+) -> Optional[UserPrincipal]:
     """
     Dependency to get current user if authenticated, None otherwise.
     Useful for endpoints that work for both authenticated and anonymous users.
@@ -100,11 +129,28 @@ async def get_optional_current_user(
         if payload is None:
             return None
 
-        user_id: str = payload.get("sub")
+        user_id = _parse_user_id(payload)
         if user_id is None:
             return None
 
-        user = db.query(User).filter(User.id == user_id).first()
+        user = await _get_principal(db, user_id)
         return user if user and user.is_active else None
-    except:
+    except Exception:
         return None
+
+
+async def get_current_user_record(
+    current_user: UserPrincipal = Depends(get_current_user),
+    db: AsyncSession = Depends(get_async_db)
+) -> User:
+    """
+    Dependency to get the full ``User`` row of the authenticated user.
+    Only for endpoints that need profile fields beyond the principal.
+    """
+    user = await db.get(User, current_user.id)
+    if user is None:
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND,
+            detail="User not found",
+        )
+    return user
@@ -0,0 +1,137 @@
+from contextlib import asynccontextmanager
+from fastapi import FastAPI
+from fastapi.concurrency import run_in_threadpool
+import logging
+from app.api.v1.router import api_router
+from app.config import get_settings
+from app.core.auth_cache import principal_invalidations, register_auth_cache_listeners
+from app.core.metrics import MetricsServer
+from app.core.middleware import ObservabilityMiddleware, RateLimitMiddleware, setup_cors
+from app.core.observability import register_pool_metrics, register_query_metrics
+from app.core.rate_limit import get_rate_limiter
+from app.core.security import password_hasher
+from app.database import SessionLocal, async_engine
+from app.services.alert_feed import (
+    get_alert_hub,
+    register_alert_listeners,
+    shutdown_alert_publisher,
+    start_alert_hub,
+)
+from app.services.entity_linking_service import register_entity_linking_listeners
+from app.services.linkage_graph_service import get_linkage_graph, load_linkage_graph, register_linkage_graph_listeners
+from app.services.profile_cache import register_profile_cache_listeners
+from app.services.score_invalidation import ScoreFlusher, register_score_listeners
+from app.services.search_service import (
+    SearchIndexRefresher,
+    register_search_listeners,
+    save_search_index_snapshot,
+    warm_start_search_index,
+)
+from app.services.stats_service import register_stats_listeners
+from app.services.storage_service import shutdown_evidence_workers
+from app.services.trending_service import (
+    TrendingRebuilder,
+    register_trending_listeners,
+    trending_is_shared,
+    warm_start_trending,
+)
+from app.tasks.notification_tasks import register_notification_listeners
+
+settings = get_settings()
+logger = logging.getLogger(__name__)
+
+
+def _warm_start_search_index() -> None:
+    db = SessionLocal()
+    try:
+        warm_start_search_index(db)
+    except Exception:
+        logger.exception("Failed to load the search index")
+    finally:
+        db.close()
+
+
+def _load_linkage_graph() -> None:
+    db = SessionLocal()
+    try:
+        load_linkage_graph(get_linkage_graph(), db)
+    except Exception:
+        logger.exception("Failed to load the linkage graph")
+    finally:
+        db.close()
+
+
+def _warm_start_trending() -> None:
+    db = SessionLocal()
+    try:
+        warm_start_trending(db)
+    except Exception:
+        logger.exception("Failed to rebuild the trending counters")
+    finally:
+        db.close()
+
+
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    """Start background services on startup and stop them on shutdown."""
+    register_query_metrics()
+    register_pool_metrics()
+    metrics_server = MetricsServer(
+        settings.metrics_host,
+        settings.metrics_port,
+        settings.metrics_port_count,
+        settings.metrics_token,
+    )
+    if settings.metrics_enabled:
+        metrics_server.start()
+    register_auth_cache_listeners()
+    register_score_listeners()
+    register_profile_cache_listeners()
+    register_search_listeners()
+    register_entity_linking_listeners()
+    register_stats_listeners()
+    register_trending_listeners()
+    register_alert_listeners()
+    register_linkage_graph_listeners()
+    register_notification_listeners()
+    await start_alert_hub()
+    await principal_invalidations.start(settings.redis_url)
+    await run_in_threadpool(_warm_start_search_index)
+    await run_in_threadpool(_warm_start_trending)
+    await run_in_threadpool(_load_linkage_graph)
+    score_flusher = ScoreFlusher(settings.score_flush_interval_seconds)
+    score_flusher.start()
+    search_refresher = SearchIndexRefresher(settings.search_refresh_interval_seconds)
+    search_refresher.start()
+    trending_rebuilder = TrendingRebuilder(settings.trending_rebuild_interval_seconds)
+    if not trending_is_shared():
+        trending_rebuilder.start()
+    try:
+        yield
+    finally:
+        score_flusher.stop()
+        search_refresher.stop()
+        trending_rebuilder.stop()
+        metrics_server.stop()
+        await get_alert_hub().stop()
+        await principal_invalidations.stop()
+        if settings.rate_limit_enabled:
+            await get_rate_limiter().close()
+        await run_in_threadpool(shutdown_alert_publisher)
+        await run_in_threadpool(save_search_index_snapshot)
+        await run_in_threadpool(shutdown_evidence_workers)
+        await run_in_threadpool(password_hasher.shutdown)
+        await async_engine.dispose()
+
+
+app = FastAPI(
+    title=settings.app_name,
+    debug=settings.debug,
+    lifespan=lifespan,
+)
+
+if settings.rate_limit_enabled:
+    app.add_middleware(RateLimitMiddleware)
+app.add_middleware(ObservabilityMiddleware)
+setup_cors(app, settings.allowed_origins_list)
+app.include_router(api_router, prefix=f"/api/{settings.api_version}")
@@ -4,8 +4,9 @@ from app.models.case import LegalCase, CaseStatus, CaseSeverity
 from app.models.promise import Promise, PromiseStatus
 from app.models.linkage import PoliticalLinkage, LinkedEntityType
 from app.models.report import FlaggedReport, ReportStatus, ReportPriority
-from app.models.score import ScoreHistory
+from app.models.score import ScoreHistory, ScoreSeriesPoint, SeriesResolution
 from app.models.news import NewsMention
+from app.models.search_tombstone import SearchTombstone
 
 __all__ = [
     "User",
@@ -22,5 +23,8 @@ __all__ = [
     "ReportStatus",
     "ReportPriority",
     "ScoreHistory",
+    "ScoreSeriesPoint",
+    "SeriesResolution",
     "NewsMention",
+    "SearchTombstone",
 ]
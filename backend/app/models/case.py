@@ -1,7 +1,7 @@
-from sqlalchemy import Column, String, Text, Date, DateTime, DECIMAL, ForeignKey, Enum as SQLEnum
-from sqlalchemy.dialects.postgresql import UUID, JSONB
+from sqlalchemy import Column, String, Text, Date, DateTime, DECIMAL, ForeignKey, Index, Computed, Enum as SQLEnum
+from sqlalchemy.dialects.postgresql import UUID, JSONB, TSVECTOR
 from sqlalchemy.sql import func
-from sqlalchemy.orm import relationship
+from sqlalchemy.orm import relationship, deferred
 import uuid
 import enum
 from app.database import Base
@@ -28,6 +28,14 @@ class LegalCase(Base):
     """Legal case model."""
 
     __tablename__ = "legal_cases"
+    __table_args__ = (
+        # Full-text and fuzzy title search
+        Index("ix_legal_cases_search_vector", "search_vector", postgresql_using="gin"),
+        Index("ix_legal_cases_title_trgm", "title", postgresql_using="gin", postgresql_ops={"title": "gin_trgm_ops"}),
+        # Per-politician timeline
+        Index("ix_legal_cases_politician_date_filed_id", "politician_id", "date_filed", "id"),
+        Index("ix_legal_cases_politician_date_resolved_id", "politician_id", "date_resolved", "id"),
+    )
 
     id = Column(UUID(as_uuid=True), primary_key=True, default=uuid.uuid4)
     politician_id = Column(UUID(as_uuid=True), ForeignKey("politicians.id", ondelete="CASCADE"), nullable=False, index=True)
@@ -43,6 +51,14 @@ class LegalCase(Base):
     outcome = Column(Text, nullable=True)
     source_urls = Column(JSONB, nullable=True)
     impact_score = Column(DECIMAL(5, 2), nullable=True)
+    search_vector = deferred(Column(
+        TSVECTOR,
+        Computed(
+            "setweight(to_tsvector('english', coalesce(title, '')), 'A') || "
+            "setweight(to_tsvector('english', coalesce(description, '')), 'B')",
+            persisted=True,
+        ),
+    ))
     created_at = Column(DateTime(timezone=True), server_default=func.now(), nullable=False)
     updated_at = Column(DateTime(timezone=True), server_default=func.now(), onupdate=func.now(), nullable=False)
 
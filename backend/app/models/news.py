@@ -1,7 +1,7 @@
-from sqlalchemy import Column, String, Text, DateTime, DECIMAL, ForeignKey
-from sqlalchemy.dialects.postgresql import UUID
+from sqlalchemy import Column, String, Text, DateTime, DECIMAL, ForeignKey, Index, Computed, UniqueConstraint
+from sqlalchemy.dialects.postgresql import UUID, TSVECTOR
 from sqlalchemy.sql import func
-from sqlalchemy.orm import relationship
+from sqlalchemy.orm import relationship, deferred
 import uuid
 from app.database import Base
 
@@ -10,6 +10,16 @@ class NewsMention(Base):
     """News mention model to track media coverage of politicians."""
 
     __tablename__ = "news_mentions"
+    __table_args__ = (
+        # One mention of an article per politician; natural key of imported rows
+        UniqueConstraint("politician_id", "url", name="uq_news_mentions_politician_url"),
+        # Keyset pagination of the global and per-politician news feeds
+        Index("ix_news_mentions_published_at_id", "published_at", "id"),
+        Index("ix_news_mentions_politician_published_at_id", "politician_id", "published_at", "id"),
+        # Full-text and fuzzy title search
+        Index("ix_news_mentions_search_vector", "search_vector", postgresql_using="gin"),
+        Index("ix_news_mentions_title_trgm", "title", postgresql_using="gin", postgresql_ops={"title": "gin_trgm_ops"}),
+    )
 
     id = Column(UUID(as_uuid=True), primary_key=True, default=uuid.uuid4)
     politician_id = Column(UUID(as_uuid=True), ForeignKey("politicians.id", ondelete="CASCADE"), nullable=False, index=True)
@@ -21,6 +31,14 @@ class NewsMention(Base):
     published_at = Column(DateTime(timezone=True), nullable=False, index=True)
     scraped_at = Column(DateTime(timezone=True), server_default=func.now(), nullable=False)
     relevance_score = Column(DECIMAL(3, 2), nullable=True)
+    search_vector = deferred(Column(
+        TSVECTOR,
+        Computed(
+            "setweight(to_tsvector('english', coalesce(title, '')), 'A') || "
+            "setweight(to_tsvector('english', coalesce(content_summary, '')), 'B')",
+            persisted=True,
+        ),
+    ))
 
     # Relationships
     politician = relationship("Politician", back_populates="news_mentions")
@@ -1,7 +1,7 @@
-from sqlalchemy import Column, String, Text, Date, Boolean, DateTime, DECIMAL
-from sqlalchemy.dialects.postgresql import UUID, JSONB
+from sqlalchemy import Column, String, Text, Date, Boolean, DateTime, DECIMAL, Index, Computed, UniqueConstraint
+from sqlalchemy.dialects.postgresql import UUID, JSONB, TSVECTOR
 from sqlalchemy.sql import func
-from sqlalchemy.orm import relationship
+from sqlalchemy.orm import relationship, deferred
 import uuid
 from app.database import Base
 
@@ -10,6 +10,15 @@ class Politician(Base):
     """Politician model."""
 
     __tablename__ = "politicians"
+    __table_args__ = (
+        # Natural key of imported rows
+        UniqueConstraint("name", "position", name="uq_politicians_name_position"),
+        # Keyset pagination by score
+        Index("ix_politicians_transparency_score_id", "transparency_score", "id"),
+        # Full-text and fuzzy name search
+        Index("ix_politicians_search_vector", "search_vector", postgresql_using="gin"),
+        Index("ix_politicians_name_trgm", "name", postgresql_using="gin", postgresql_ops={"name": "gin_trgm_ops"}),
+    )
 
     id = Column(UUID(as_uuid=True), primary_key=True, default=uuid.uuid4)
     name = Column(String(255), nullable=False, index=True)
@@ -25,6 +34,16 @@ class Politician(Base):
     transparency_score = Column(DECIMAL(5, 2), default=0.00, nullable=False)
     confidence_level = Column(DECIMAL(5, 2), default=0.00, nullable=False)
     is_active = Column(Boolean, default=True, nullable=False)
+    # Generated by the database; deferred so it is only loaded when asked for
+    search_vector = deferred(Column(
+        TSVECTOR,
+        Computed(
+            "setweight(to_tsvector('english', coalesce(name, '')), 'A') || "
+            "setweight(to_tsvector('english', coalesce(position, '')), 'B') || "
+            "setweight(to_tsvector('english', coalesce(bio, '')), 'C')",
+            persisted=True,
+        ),
+    ))
     created_at = Column(DateTime(timezone=True), server_default=func.now(), nullable=False)
     updated_at = Column(DateTime(timezone=True), server_default=func.now(), onupdate=func.now(), nullable=False)
 
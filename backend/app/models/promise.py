@@ -1,7 +1,9 @@
-from sqlalchemy import Column, String, Text, Date, DateTime, Integer, ForeignKey, Enum as SQLEnum
-from sqlalchemy.dialects.postgresql import UUID, JSONB
+from sqlalchemy import (
+    Column, String, Text, Date, DateTime, Integer, ForeignKey, Index, Computed, UniqueConstraint, Enum as SQLEnum,
+)
+from sqlalchemy.dialects.postgresql import UUID, JSONB, TSVECTOR
 from sqlalchemy.sql import func
-from sqlalchemy.orm import relationship
+from sqlalchemy.orm import relationship, deferred
 import uuid
 import enum
 from app.database import Base
@@ -20,6 +22,16 @@ class Promise(Base):
     """Promise model."""
 
     __tablename__ = "promises"
+    __table_args__ = (
+        # Natural key of imported rows
+        UniqueConstraint("politician_id", "title", "date_made", name="uq_promises_politician_title_date_made"),
+        # Full-text and fuzzy title search
+        Index("ix_promises_search_vector", "search_vector", postgresql_using="gin"),
+        Index("ix_promises_title_trgm", "title", postgresql_using="gin", postgresql_ops={"title": "gin_trgm_ops"}),
+        # Per-politician timeline
+        Index("ix_promises_politician_date_made_id", "politician_id", "date_made", "id"),
+        Index("ix_promises_politician_deadline_id", "politician_id", "deadline", "id"),
+    )
 
     id = Column(UUID(as_uuid=True), primary_key=True, default=uuid.uuid4)
     politician_id = Column(UUID(as_uuid=True), ForeignKey("politicians.id", ondelete="CASCADE"), nullable=False, index=True)
@@ -33,6 +45,14 @@ class Promise(Base):
     fulfillment_percentage = Column(Integer, default=0, nullable=False)
     verification_sources = Column(JSONB, nullable=True)
     impact_area = Column(String(100), nullable=True)
+    search_vector = deferred(Column(
+        TSVECTOR,
+        Computed(
+            "setweight(to_tsvector('english', coalesce(title, '')), 'A') || "
+            "setweight(to_tsvector('english', coalesce(description, '')), 'B')",
+            persisted=True,
+        ),
+    ))
     created_at = Column(DateTime(timezone=True), server_default=func.now(), nullable=False)
     updated_at = Column(DateTime(timezone=True), server_default=func.now(), onupdate=func.now(), nullable=False)
 
@@ -1,4 +1,4 @@
-from sqlalchemy import Column, String, Text, Date, DateTime, Boolean, ForeignKey, Enum as SQLEnum
+from sqlalchemy import Column, String, Text, Date, DateTime, Boolean, ForeignKey, Index, Enum as SQLEnum
 from sqlalchemy.dialects.postgresql import UUID, JSONB
 from sqlalchemy.sql import func
 from sqlalchemy.orm import relationship
@@ -28,6 +28,12 @@ class FlaggedReport(Base):
     """Flagged report model."""
 
     __tablename__ = "flagged_reports"
+    __table_args__ = (
+        # Keyset pagination of the alerts feed
+        Index("ix_flagged_reports_date_reported_id", "date_reported", "id"),
+        # Per-politician timeline
+        Index("ix_flagged_reports_politician_date_reported_id", "politician_id", "date_reported", "id"),
+    )
 
     id = Column(UUID(as_uuid=True), primary_key=True, default=uuid.uuid4)
     politician_id = Column(UUID(as_uuid=True), ForeignKey("politicians.id", ondelete="CASCADE"), nullable=False, index=True)
@@ -1,15 +1,28 @@
-from sqlalchemy import Column, String, DateTime, DECIMAL, ForeignKey
+from sqlalchemy import Column, String, DateTime, DECIMAL, REAL, Integer, ForeignKey, Index, Enum as SQLEnum
 from sqlalchemy.dialects.postgresql import UUID, JSONB
 from sqlalchemy.sql import func
 from sqlalchemy.orm import relationship
 import uuid
+import enum
 from app.database import Base
 
 
+class SeriesResolution(str, enum.Enum):
+    """Resolution of a score series point, finest first."""
+    RAW = "raw"
+    DAY = "day"
+    WEEK = "week"
+    MONTH = "month"
+
+
 class ScoreHistory(Base):
     """Score history model to track transparency score changes over time."""
 
     __tablename__ = "score_history"
+    __table_args__ = (
+        # Per-politician timeline
+        Index("ix_score_history_politician_calculated_at_id", "politician_id", "calculated_at", "id"),
+    )
 
     id = Column(UUID(as_uuid=True), primary_key=True, default=uuid.uuid4)
     politician_id = Column(UUID(as_uuid=True), ForeignKey("politicians.id", ondelete="CASCADE"), nullable=False, index=True)
@@ -24,3 +37,28 @@ class ScoreHistory(Base):
 
     def __repr__(self):
         return f"<ScoreHistory(id={self.id}, politician_id={self.politician_id}, score={self.transparency_score})>"
+
+
+class ScoreSeriesPoint(Base):
+    """
+    Compact score time series: one row per distinct recalculation (``raw``)
+    or per politician per day, week or month once rolled up.
+    """
+
+    __tablename__ = "score_series"
+
+    politician_id = Column(UUID(as_uuid=True), ForeignKey("politicians.id", ondelete="CASCADE"), primary_key=True)
+    resolution = Column(SQLEnum(SeriesResolution), primary_key=True)
+    period_start = Column(DateTime(timezone=True), primary_key=True)
+    samples = Column(Integer, nullable=False, default=1)
+    score_avg = Column(REAL, nullable=False)
+    score_min = Column(REAL, nullable=False)
+    score_max = Column(REAL, nullable=False)
+    score_last = Column(REAL, nullable=False)
+    legal_record = Column(REAL, nullable=True)
+    promise_fulfillment = Column(REAL, nullable=True)
+    public_sentiment = Column(REAL, nullable=True)
+    credential_verification = Column(REAL, nullable=True)
+
+    def __repr__(self):
+        return f"<ScoreSeriesPoint(politician_id={self.politician_id}, {self.resolution}, {self.period_start})>"
@@ -0,0 +1,51 @@
+"""
+Tombstones of deleted searchable rows.
+
+A Postgres trigger records every deleted politician, legal case and
+promise here, including rows removed by cascades, so the in-memory search
+index of every process can drop them by reading the tombstones newer than
+its watermark rather than listing every id. Tombstones are pruned after
+``search_tombstone_retention_hours``; an index further behind than that
+reloads in full.
+"""
+from sqlalchemy import BigInteger, Column, DateTime, String, text
+from sqlalchemy.dialects.postgresql import UUID
+from sqlalchemy.engine import Connection
+from sqlalchemy.sql import func
+from app.database import Base
+
+TOMBSTONED_TABLES = ("politicians", "legal_cases", "promises")
+
+TOMBSTONE_FUNCTION = """
+CREATE OR REPLACE FUNCTION record_search_tombstone() RETURNS trigger AS $$
+BEGIN
+    INSERT INTO search_tombstones (table_name, row_id) VALUES (TG_TABLE_NAME, OLD.id);
+    RETURN NULL;
+END;
+$$ LANGUAGE plpgsql
+"""
+
+
+class SearchTombstone(Base):
+    """A deleted row of a table indexed for search."""
+
+    __tablename__ = "search_tombstones"
+
+    id = Column(BigInteger, primary_key=True, autoincrement=True)
+    table_name = Column(String(63), nullable=False)
+    row_id = Column(UUID(as_uuid=True), nullable=False)
+    deleted_at = Column(DateTime(timezone=True), server_default=func.now(), nullable=False, index=True)
+
+    def __repr__(self):
+        return f"<SearchTombstone(table_name={self.table_name}, row_id={self.row_id})>"
+
+
+def create_search_tombstone_triggers(connection: Connection) -> None:
+    """Create (or replace) the triggers recording deletes as tombstones."""
+    connection.execute(text(TOMBSTONE_FUNCTION))
+    for table in TOMBSTONED_TABLES:
+        connection.execute(text(f"DROP TRIGGER IF EXISTS {table}_search_tombstone ON {table}"))
+        connection.execute(text(
+            f"CREATE TRIGGER {table}_search_tombstone AFTER DELETE ON {table} "
+            f"FOR EACH ROW EXECUTE FUNCTION record_search_tombstone()"
+        ))
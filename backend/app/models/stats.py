@@ -0,0 +1,140 @@
+"""
+Materialized statistics views.
+
+Each view pre-aggregates one dashboard's numbers, so reading them costs the
+same however large the underlying tables grow. Every view has a unique
+index, which ``REFRESH MATERIALIZED VIEW CONCURRENTLY`` requires; readers
+are never blocked by a refresh. Enum columns are stored as their names.
+
+The views live on their own ``MetaData``: ``Base.metadata.create_all``
+must not create them as tables.
+"""
+from typing import Dict, Tuple
+
+from sqlalchemy import BigInteger, Column, DateTime, Integer, MetaData, Numeric, String, Table, text
+from sqlalchemy.engine import Connection
+
+stats_metadata = MetaData()
+
+SCORE_BUCKET_WIDTH = 10
+SCORE_BUCKETS = 10
+
+# View name -> (defining query, columns of its unique index)
+STATS_VIEWS: Dict[str, Tuple[str, Tuple[str, ...]]] = {
+    "stats_overview": (
+        """
+        SELECT
+            1 AS id,
+            (SELECT count(*) FROM politicians) AS politicians,
+            (SELECT count(*) FROM politicians WHERE is_active) AS active_politicians,
+            (SELECT avg(transparency_score) FROM politicians WHERE is_active) AS average_score,
+            (SELECT percentile_cont(0.5) WITHIN GROUP (ORDER BY transparency_score)
+               FROM politicians WHERE is_active) AS median_score,
+            (SELECT count(*) FROM news_mentions
+              WHERE published_at >= now() - interval '30 days') AS news_mentions_last_30_days,
+            now() AS refreshed_at
+        """,
+        ("id",),
+    ),
+    "stats_score_buckets": (
+        f"""
+        SELECT
+            least(floor(transparency_score / {SCORE_BUCKET_WIDTH})::int, {SCORE_BUCKETS - 1}) AS bucket,
+            count(*) AS politicians,
+            avg(transparency_score) AS average_score
+        FROM politicians
+        WHERE is_active
+        GROUP BY 1
+        """,
+        ("bucket",),
+    ),
+    "stats_report_counts": (
+        """
+        SELECT
+            status::text AS status,
+            priority::text AS priority,
+            count(*) AS reports,
+            count(*) FILTER (WHERE date_reported >= now() - interval '30 days') AS reports_last_30_days
+        FROM flagged_reports
+        GROUP BY 1, 2
+        """,
+        ("status", "priority"),
+    ),
+    "stats_case_counts": (
+        """
+        SELECT
+            status::text AS status,
+            coalesce(severity::text, '') AS severity,
+            count(*) AS cases
+        FROM legal_cases
+        GROUP BY 1, 2
+        """,
+        ("status", "severity"),
+    ),
+    "stats_promise_counts": (
+        """
+        SELECT
+            status::text AS status,
+            count(*) AS promises,
+            avg(fulfillment_percentage) AS average_fulfillment
+        FROM promises
+        GROUP BY 1
+        """,
+        ("status",),
+    ),
+}
+
+stats_overview = Table(
+    "stats_overview",
+    stats_metadata,
+    Column("id", Integer, primary_key=True),
+    Column("politicians", BigInteger),
+    Column("active_politicians", BigInteger),
+    Column("average_score", Numeric),
+    Column("median_score", Numeric),
+    Column("news_mentions_last_30_days", BigInteger),
+    Column("refreshed_at", DateTime(timezone=True)),
+)
+
+stats_score_buckets = Table(
+    "stats_score_buckets",
+    stats_metadata,
+    Column("bucket", Integer, primary_key=True),
+    Column("politicians", BigInteger),
+    Column("average_score", Numeric),
+)
+
+stats_report_counts = Table(
+    "stats_report_counts",
+    stats_metadata,
+    Column("status", String, primary_key=True),
+    Column("priority", String, primary_key=True),
+    Column("reports", BigInteger),
+    Column("reports_last_30_days", BigInteger),
+)
+
+stats_case_counts = Table(
+    "stats_case_counts",
+    stats_metadata,
+    Column("status", String, primary_key=True),
+    # Empty when the severity is not set
+    Column("severity", String, primary_key=True),
+    Column("cases", BigInteger),
+)
+
+stats_promise_counts = Table(
+    "stats_promise_counts",
+    stats_metadata,
+    Column("status", String, primary_key=True),
+    Column("promises", BigInteger),
+    Column("average_fulfillment", Numeric),
+)
+
+
+def create_stats_views(connection: Connection) -> None:
+    """Create (and populate) any missing statistics views."""
+    for name, (query, unique_columns) in STATS_VIEWS.items():
+        connection.execute(text(f"CREATE MATERIALIZED VIEW IF NOT EXISTS {name} AS {query}"))
+        connection.execute(text(
+            f"CREATE UNIQUE INDEX IF NOT EXISTS ix_{name}_unique ON {name} ({', '.join(unique_columns)})"
+        ))
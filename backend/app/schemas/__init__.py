@@ -0,0 +1,53 @@
+from app.schemas.common import CursorPage
+from app.schemas.case import LegalCaseResponse
+from app.schemas.promise import PromiseResponse
+from app.schemas.linkage import PoliticalLinkageResponse
+from app.schemas.score import ScoreHistoryResponse, ScoreRecalculationResponse, ScoreSeriesResponse
+from app.schemas.news import NewsMentionResponse
+from app.schemas.politician import (
+    PoliticianCardResponse,
+    PoliticianResponse,
+    PoliticianProfileResponse,
+    TrendingPoliticianResponse,
+)
+from app.schemas.report import AlertResponse, EvidenceUploadResponse
+from app.schemas.search import SearchSuggestion, AdvancedSearchHit, AdvancedSearchPage
+from app.schemas.data_import import ImportReport, ImportRowError
+from app.schemas.stats import StatsOverview, ScoreDistribution, ReportStats
+from app.schemas.network import NetworkResponse, SharedEntity, PathResponse, CentralityEntry
+from app.schemas.timeline import TimelineEntry
+from app.schemas.user import UserCreate, LoginRequest, TokenResponse, UserResponse
+
+__all__ = [
+    "CursorPage",
+    "LegalCaseResponse",
+    "PromiseResponse",
+    "PoliticalLinkageResponse",
+    "ScoreHistoryResponse",
+    "ScoreRecalculationResponse",
+    "ScoreSeriesResponse",
+    "NewsMentionResponse",
+    "PoliticianCardResponse",
+    "PoliticianResponse",
+    "PoliticianProfileResponse",
+    "TrendingPoliticianResponse",
+    "AlertResponse",
+    "EvidenceUploadResponse",
+    "SearchSuggestion",
+    "AdvancedSearchHit",
+    "AdvancedSearchPage",
+    "ImportReport",
+    "ImportRowError",
+    "StatsOverview",
+    "ScoreDistribution",
+    "ReportStats",
+    "NetworkResponse",
+    "SharedEntity",
+    "PathResponse",
+    "CentralityEntry",
+    "TimelineEntry",
+    "UserCreate",
+    "LoginRequest",
+    "TokenResponse",
+    "UserResponse",
+]
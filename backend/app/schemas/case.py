@@ -0,0 +1,28 @@
+from pydantic import BaseModel, ConfigDict
+from typing import Any, Optional
+from datetime import date, datetime
+from decimal import Decimal
+import uuid
+from app.models.case import CaseStatus, CaseSeverity
+
+
+class LegalCaseResponse(BaseModel):
+    """Legal case as returned by the API."""
+    model_config = ConfigDict(from_attributes=True)
+
+    id: uuid.UUID
+    politician_id: uuid.UUID
+    case_number: Optional[str] = None
+    title: str
+    court: Optional[str] = None
+    status: CaseStatus
+    date_filed: Optional[date] = None
+    date_resolved: Optional[date] = None
+    severity: Optional[CaseSeverity] = None
+    category: Optional[str] = None
+    description: Optional[str] = None
+    outcome: Optional[str] = None
+    source_urls: Optional[Any] = None
+    impact_score: Optional[Decimal] = None
+    created_at: datetime
+    updated_at: datetime
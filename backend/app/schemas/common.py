@@ -0,0 +1,11 @@
+from pydantic import BaseModel
+from typing import Generic, List, Optional, TypeVar
+
+T = TypeVar("T")
+
+
+class CursorPage(BaseModel, Generic[T]):
+    """A page of results from a keyset-paginated listing."""
+
+    items: List[T]
+    next_cursor: Optional[str] = None
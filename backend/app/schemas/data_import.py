@@ -0,0 +1,127 @@
+from pydantic import BaseModel, Field, field_validator, model_validator
+from typing import Any, List, Optional
+from datetime import date, datetime
+from decimal import Decimal
+import json
+import uuid
+from app.models.case import CaseStatus, CaseSeverity
+from app.models.promise import PromiseStatus
+
+
+def _parse_json(value: Any) -> Any:
+    """JSON columns arrive as encoded strings from CSV files."""
+    if isinstance(value, str):
+        return json.loads(value)
+    return value
+
+
+class PoliticianReferenceRow(BaseModel):
+    """An import row belonging to a politician, given by id or exact name."""
+
+    politician_id: Optional[uuid.UUID] = None
+    politician_name: Optional[str] = None
+
+    @model_validator(mode="after")
+    def check_politician_reference(self):
+        if self.politician_id is None and not self.politician_name:
+            raise ValueError("politician_id or politician_name is required")
+        return self
+
+
+class PoliticianImportRow(BaseModel):
+    """A politician to import; upserted on ``id``, else on name and position."""
+
+    id: Optional[uuid.UUID] = None
+    name: str = Field(..., min_length=1, max_length=255)
+    position: str = Field(..., min_length=1, max_length=255)
+    party: Optional[str] = Field(None, max_length=100)
+    county: Optional[str] = Field(None, max_length=100)
+    photo_url: Optional[str] = None
+    bio: Optional[str] = None
+    date_of_birth: Optional[date] = None
+    education: Optional[Any] = None
+    contact_info: Optional[Any] = None
+    social_media: Optional[Any] = None
+    is_active: bool = True
+
+    @field_validator("education", "contact_info", "social_media", mode="before")
+    @classmethod
+    def parse_json_columns(cls, value: Any) -> Any:
+        return _parse_json(value)
+
+
+class LegalCaseImportRow(PoliticianReferenceRow):
+    """A legal case to import; upserted on ``id``, else on ``case_number`` when given."""
+
+    id: Optional[uuid.UUID] = None
+    case_number: Optional[str] = Field(None, max_length=100)
+    title: str = Field(..., min_length=1, max_length=500)
+    court: Optional[str] = Field(None, max_length=255)
+    status: CaseStatus = CaseStatus.PENDING
+    date_filed: Optional[date] = None
+    date_resolved: Optional[date] = None
+    severity: Optional[CaseSeverity] = None
+    category: Optional[str] = Field(None, max_length=100)
+    description: Optional[str] = None
+    outcome: Optional[str] = None
+    source_urls: Optional[Any] = None
+    impact_score: Optional[Decimal] = Field(None, ge=0, le=100)
+
+    @field_validator("source_urls", mode="before")
+    @classmethod
+    def parse_json_columns(cls, value: Any) -> Any:
+        return _parse_json(value)
+
+
+class PromiseImportRow(PoliticianReferenceRow):
+    """A promise to import; upserted on ``id``, else on politician, title and ``date_made``."""
+
+    id: Optional[uuid.UUID] = None
+    title: str = Field(..., min_length=1, max_length=500)
+    description: str = Field(..., min_length=1)
+    date_made: date
+    deadline: Optional[date] = None
+    status: PromiseStatus = PromiseStatus.PENDING
+    category: Optional[str] = Field(None, max_length=100)
+    evidence: Optional[Any] = None
+    fulfillment_percentage: int = Field(0, ge=0, le=100)
+    verification_sources: Optional[Any] = None
+    impact_area: Optional[str] = Field(None, max_length=100)
+
+    @field_validator("evidence", "verification_sources", mode="before")
+    @classmethod
+    def parse_json_columns(cls, value: Any) -> Any:
+        return _parse_json(value)
+
+
+class NewsMentionImportRow(PoliticianReferenceRow):
+    """A news mention to import; upserted on ``id``, else on politician and ``url``."""
+
+    id: Optional[uuid.UUID] = None
+    title: str = Field(..., min_length=1, max_length=500)
+    source: str = Field(..., min_length=1, max_length=255)
+    url: str = Field(..., min_length=1)
+    content_summary: Optional[str] = None
+    sentiment: Optional[Decimal] = Field(None, ge=-1, le=1)
+    published_at: datetime
+    relevance_score: Optional[Decimal] = Field(None, ge=0, le=1)
+
+
+class ImportRowError(BaseModel):
+    """A rejected import row."""
+
+    line: int
+    error: str
+
+
+class ImportReport(BaseModel):
+    """Outcome of a data import."""
+
+    entity: str
+    total_rows: int = 0
+    inserted: int = 0
+    updated: int = 0
+    failed: int = 0
+    errors: List[ImportRowError] = []
+    errors_truncated: bool = False
+    elapsed_seconds: float = 0.0
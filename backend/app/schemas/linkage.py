@@ -0,0 +1,24 @@
+from pydantic import BaseModel, ConfigDict
+from typing import Any, Optional
+from datetime import date, datetime
+from decimal import Decimal
+import uuid
+from app.models.linkage import LinkedEntityType
+
+
+class PoliticalLinkageResponse(BaseModel):
+    """Political linkage as returned by the API."""
+    model_config = ConfigDict(from_attributes=True)
+
+    id: uuid.UUID
+    politician_id: uuid.UUID
+    linked_entity_type: LinkedEntityType
+    linked_entity_id: Optional[uuid.UUID] = None
+    linked_entity_name: str
+    relationship_type: str
+    description: Optional[str] = None
+    strength: Decimal
+    evidence: Optional[Any] = None
+    is_verified: bool
+    date_established: Optional[date] = None
+    created_at: datetime
@@ -0,0 +1,60 @@
+from pydantic import BaseModel
+from typing import List, Optional
+import uuid
+
+
+class NetworkNode(BaseModel):
+    """A politician or linked entity in the linkage graph."""
+
+    id: str
+    kind: str
+    name: str
+    entity_type: Optional[str] = None
+    politician_id: Optional[uuid.UUID] = None
+    hops: Optional[int] = None
+
+
+class NetworkEdge(BaseModel):
+    """A linkage between two nodes."""
+
+    linkage_id: uuid.UUID
+    source: str
+    target: str
+    relationship_type: str
+    strength: float
+    is_verified: bool
+
+
+class NetworkResponse(BaseModel):
+    """A politician's neighbourhood in the linkage graph."""
+
+    center: NetworkNode
+    nodes: List[NetworkNode]
+    edges: List[NetworkEdge]
+    truncated: bool = False
+
+
+class SharedEntity(BaseModel):
+    """A node linked to both politicians, with each politician's strongest link to it."""
+
+    node: NetworkNode
+    strength: float
+    other_strength: float
+
+
+class PathResponse(BaseModel):
+    """The strongest path between two politicians; ``strength`` is the product of its links."""
+
+    found: bool
+    nodes: List[NetworkNode]
+    edges: List[NetworkEdge]
+    strength: float
+
+
+class CentralityEntry(BaseModel):
+    """A node's centrality in the linkage graph."""
+
+    node: NetworkNode
+    pagerank: float
+    weighted_degree: float
+    links: int
@@ -0,0 +1,21 @@
+from pydantic import BaseModel, ConfigDict
+from typing import Optional
+from datetime import datetime
+from decimal import Decimal
+import uuid
+
+
+class NewsMentionResponse(BaseModel):
+    """News mention as returned by the API."""
+    model_config = ConfigDict(from_attributes=True)
+
+    id: uuid.UUID
+    politician_id: uuid.UUID
+    title: str
+    source: str
+    url: str
+    content_summary: Optional[str] = None
+    sentiment: Optional[Decimal] = None
+    published_at: datetime
+    scraped_at: datetime
+    relevance_score: Optional[Decimal] = None
@@ -0,0 +1,65 @@
+from pydantic import BaseModel, ConfigDict
+from typing import Any, List, Optional
+from datetime import date, datetime
+from decimal import Decimal
+import uuid
+from app.schemas.case import LegalCaseResponse
+from app.schemas.promise import PromiseResponse
+from app.schemas.linkage import PoliticalLinkageResponse
+from app.schemas.score import ScoreHistoryResponse
+from app.schemas.news import NewsMentionResponse
+
+
+class PoliticianCardResponse(BaseModel):
+    """Politician summary shown on list pages and cards."""
+    model_config = ConfigDict(from_attributes=True)
+
+    id: uuid.UUID
+    name: str
+    position: str
+    party: Optional[str] = None
+    county: Optional[str] = None
+    photo_url: Optional[str] = None
+    transparency_score: Decimal
+    confidence_level: Decimal
+    is_active: bool
+    updated_at: datetime
+
+
+class TrendingPoliticianResponse(BaseModel):
+    """A politician ranked by recent, time-decayed activity."""
+
+    politician: PoliticianCardResponse
+    trending_score: float
+
+
+class PoliticianResponse(BaseModel):
+    """Politician as returned by the API."""
+    model_config = ConfigDict(from_attributes=True)
+
+    id: uuid.UUID
+    name: str
+    position: str
+    party: Optional[str] = None
+    county: Optional[str] = None
+    photo_url: Optional[str] = None
+    bio: Optional[str] = None
+    date_of_birth: Optional[date] = None
+    education: Optional[Any] = None
+    contact_info: Optional[Any] = None
+    social_media: Optional[Any] = None
+    transparency_score: Decimal
+    confidence_level: Decimal
+    is_active: bool
+    created_at: datetime
+    updated_at: datetime
+
+
+class PoliticianProfileResponse(PoliticianResponse):
+    """Politician with all of its public related records."""
+
+    cases: List[LegalCaseResponse] = []
+    promises: List[PromiseResponse] = []
+    linkages: List[PoliticalLinkageResponse] = []
+    score_history: List[ScoreHistoryResponse] = []
+    news_mentions: List[NewsMentionResponse] = []
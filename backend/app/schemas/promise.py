@@ -0,0 +1,25 @@
+from pydantic import BaseModel, ConfigDict
+from typing import Any, Optional
+from datetime import date, datetime
+import uuid
+from app.models.promise import PromiseStatus
+
+
+class PromiseResponse(BaseModel):
+    """Promise as returned by the API."""
+    model_config = ConfigDict(from_attributes=True)
+
+    id: uuid.UUID
+    politician_id: uuid.UUID
+    title: str
+    description: str
+    date_made: date
+    deadline: Optional[date] = None
+    status: PromiseStatus
+    category: Optional[str] = None
+    evidence: Optional[Any] = None
+    fulfillment_percentage: int
+    verification_sources: Optional[Any] = None
+    impact_area: Optional[str] = None
+    created_at: datetime
+    updated_at: datetime
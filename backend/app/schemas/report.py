@@ -0,0 +1,44 @@
+from pydantic import BaseModel, ConfigDict
+from typing import List, Optional
+from datetime import date, datetime
+import uuid
+from app.models.report import ReportStatus, ReportPriority
+from app.schemas.politician import PoliticianCardResponse
+
+
+class AlertResponse(BaseModel):
+    """Public view of a flagged report in the alerts feed."""
+    model_config = ConfigDict(from_attributes=True)
+
+    id: uuid.UUID
+    politician_id: uuid.UUID
+    issue_type: str
+    title: str
+    status: ReportStatus
+    priority: ReportPriority
+    location: Optional[str] = None
+    incident_date: Optional[date] = None
+    date_reported: datetime
+    politician: PoliticianCardResponse
+
+
+class EvidenceFile(BaseModel):
+    """A stored evidence file, as recorded in a report's ``evidence_files``."""
+
+    key: str
+    filename: str
+    content_type: str
+    size: int
+    sha256: str
+    thumbnail_key: Optional[str] = None
+    width: Optional[int] = None
+    height: Optional[int] = None
+    uploaded_by: Optional[uuid.UUID] = None
+    uploaded_at: datetime
+
+
+class EvidenceUploadResponse(BaseModel):
+    """Evidence files attached to a report by one upload."""
+
+    report_id: uuid.UUID
+    files: List[EvidenceFile]
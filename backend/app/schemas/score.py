@@ -0,0 +1,47 @@
+from pydantic import BaseModel, ConfigDict
+from typing import Any, Dict, List, Optional
+from datetime import datetime
+from decimal import Decimal
+import uuid
+
+
+class ScoreHistoryResponse(BaseModel):
+    """Score history entry as returned by the API."""
+    model_config = ConfigDict(from_attributes=True)
+
+    id: uuid.UUID
+    politician_id: uuid.UUID
+    transparency_score: Decimal
+    score_breakdown: Dict[str, Any]
+    factors_analyzed: Optional[Dict[str, Any]] = None
+    calculation_method: Optional[str] = None
+    calculated_at: datetime
+
+
+class ScoreRecalculationResponse(BaseModel):
+    """Outcome of a request to recalculate a politician's score."""
+
+    politician_id: uuid.UUID
+    # False when a recalculation was already queued for the politician
+    queued: bool
+
+
+class ScoreSeriesBucket(BaseModel):
+    """One chart bucket of a politician's score series."""
+
+    period_start: datetime
+    samples: int
+    # Score in effect at the end of the bucket (carried over from earlier buckets)
+    score: Optional[float] = None
+    average: Optional[float] = None
+    minimum: Optional[float] = None
+    maximum: Optional[float] = None
+    components: Dict[str, Optional[float]] = {}
+
+
+class ScoreSeriesResponse(BaseModel):
+    """A politician's transparency score over time, resampled for charting."""
+
+    politician_id: uuid.UUID
+    interval: str
+    points: List[ScoreSeriesBucket]
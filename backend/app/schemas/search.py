@@ -0,0 +1,36 @@
+from pydantic import BaseModel
+from typing import List, Optional
+import uuid
+from app.schemas.politician import PoliticianCardResponse
+
+
+class SearchSuggestion(BaseModel):
+    """An autocomplete suggestion."""
+
+    kind: str
+    id: uuid.UUID
+    label: str
+    detail: Optional[str] = None
+    politician_id: uuid.UUID
+    politician_name: Optional[str] = None
+    score: float
+
+
+class AdvancedSearchHit(BaseModel):
+    """A ranked full-text search result."""
+
+    kind: str
+    id: uuid.UUID
+    title: str
+    snippet: Optional[str] = None
+    rank: float
+    politician: PoliticianCardResponse
+
+
+class AdvancedSearchPage(BaseModel):
+    """A page of full-text search results."""
+
+    items: List[AdvancedSearchHit]
+    page: int
+    page_size: int
+    has_more: bool
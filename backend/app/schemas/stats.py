@@ -0,0 +1,84 @@
+from pydantic import BaseModel
+from typing import Dict, List, Optional
+from datetime import datetime
+from app.models.case import CaseSeverity, CaseStatus
+from app.models.promise import PromiseStatus
+from app.models.report import ReportPriority, ReportStatus
+
+
+class ScoreBucket(BaseModel):
+    """Active politicians whose score falls in ``[min_score, max_score)``."""
+
+    min_score: int
+    max_score: int
+    politicians: int
+    average_score: Optional[float] = None
+
+
+class ScoreDistribution(BaseModel):
+    """Histogram of active politicians' transparency scores."""
+
+    refreshed_at: datetime
+    active_politicians: int
+    average_score: Optional[float] = None
+    median_score: Optional[float] = None
+    buckets: List[ScoreBucket]
+
+
+class ReportCount(BaseModel):
+    """Flagged reports of one status and priority."""
+
+    status: ReportStatus
+    priority: ReportPriority
+    reports: int
+    reports_last_30_days: int
+
+
+class ReportStats(BaseModel):
+    """Flagged report counts."""
+
+    refreshed_at: datetime
+    total: int
+    last_30_days: int
+    by_status: Dict[ReportStatus, int]
+    by_priority: Dict[ReportPriority, int]
+    counts: List[ReportCount]
+
+
+class CaseStats(BaseModel):
+    """Legal case counts; ``by_severity`` leaves out cases with no severity."""
+
+    total: int
+    by_status: Dict[CaseStatus, int]
+    by_severity: Dict[CaseSeverity, int]
+
+
+class PromiseCount(BaseModel):
+    """Promises of one status and their average fulfilment."""
+
+    status: PromiseStatus
+    promises: int
+    average_fulfillment: Optional[float] = None
+
+
+class PromiseStats(BaseModel):
+    """Promise counts and fulfilment."""
+
+    total: int
+    average_fulfillment: Optional[float] = None
+    by_status: List[PromiseCount]
+
+
+class StatsOverview(BaseModel):
+    """Headline numbers for the dashboard."""
+
+    refreshed_at: datetime
+    politicians: int
+    active_politicians: int
+    average_score: Optional[float] = None
+    median_score: Optional[float] = None
+    news_mentions_last_30_days: int
+    reports_total: int
+    reports_last_30_days: int
+    cases: CaseStats
+    promises: PromiseStats
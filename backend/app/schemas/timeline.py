@@ -0,0 +1,30 @@
+from pydantic import BaseModel
+from typing import Optional
+from datetime import datetime
+from decimal import Decimal
+import enum
+import uuid
+
+
+class TimelineEventType(str, enum.Enum):
+    """Kinds of event on a politician's timeline."""
+    CASE_FILED = "case_filed"
+    CASE_RESOLVED = "case_resolved"
+    PROMISE_MADE = "promise_made"
+    PROMISE_DEADLINE = "promise_deadline"
+    REPORT_FLAGGED = "report_flagged"
+    SCORE_CALCULATED = "score_calculated"
+    NEWS_MENTION = "news_mention"
+
+
+class TimelineEntry(BaseModel):
+    """One event on a politician's timeline; ``id`` is the source row's id."""
+
+    kind: TimelineEventType
+    occurred_at: datetime
+    id: uuid.UUID
+    title: Optional[str] = None
+    status: Optional[str] = None
+    detail: Optional[str] = None
+    url: Optional[str] = None
+    score: Optional[Decimal] = None
@@ -0,0 +1,40 @@
+from pydantic import BaseModel, ConfigDict, EmailStr, Field
+from typing import Optional
+from datetime import datetime
+import uuid
+from app.models.user import UserRole
+
+
+class UserCreate(BaseModel):
+    """Registration details."""
+
+    email: EmailStr
+    password: str = Field(..., min_length=8, max_length=72)  # bcrypt ignores bytes past 72
+    full_name: Optional[str] = Field(None, max_length=255)
+    phone_number: Optional[str] = Field(None, max_length=20)
+
+
+class LoginRequest(BaseModel):
+    email: EmailStr
+    password: str = Field(..., max_length=72)
+
+
+class TokenResponse(BaseModel):
+    access_token: str
+    refresh_token: str
+    token_type: str = "bearer"
+
+
+class UserResponse(BaseModel):
+    """A user's own account details."""
+    model_config = ConfigDict(from_attributes=True)
+
+    id: uuid.UUID
+    email: str
+    full_name: Optional[str] = None
+    phone_number: Optional[str] = None
+    role: UserRole
+    is_active: bool
+    is_verified: bool
+    created_at: datetime
+    last_login: Optional[datetime] = None
@@ -0,0 +1,499 @@
+"""
+Real-time alerts feed.
+
+Committed changes (from ``app.core.model_events``) become alert events: a
+report flagged, a report's status or priority changed, a score that moved
+by at least ``MIN_SCORE_SWING``. Events are numbered and published to a
+broker: straight to this process's hub, or with ``alert_feed_backend =
+"redis"`` through Redis pub/sub, so events committed by any API or worker
+process reach every API process. Redis numbers events with a shared counter.
+Attaching politician details and publishing run on one background thread,
+in commit order, so a commit (possibly on the event loop, through an async
+session) never waits on a database lookup or the broker.
+
+Each API process runs one ``AlertHub`` on its event loop. Subscribers (SSE or
+WebSocket connections) filter by politician, county or party; the hub
+indexes them by filter, so an event only visits the subscribers that want
+it. Every subscriber has a bounded queue: one that falls
+``alert_feed_queue_size`` events behind is dropped rather than letting its
+backlog grow; it is told so and reconnects. A reconnecting client sends the
+last event id it saw and is replayed what it missed from a ring buffer of
+recent events, or told to reset when that is no longer there. An idle
+subscriber is only a queue and a waiting coroutine, so a worker holds
+thousands.
+"""
+import asyncio
+from collections import deque
+from concurrent.futures import Future, ThreadPoolExecutor
+from dataclasses import dataclass, field
+from datetime import datetime, timezone
+from functools import lru_cache
+import itertools
+import json
+import logging
+import time
+from typing import Any, AsyncIterator, Deque, Dict, Iterable, List, Optional, Set, Tuple, Union
+import uuid
+
+from fastapi.encoders import jsonable_encoder
+from sqlalchemy import select
+
+from app.config import get_settings
+from app.core.model_events import INSERT, UPDATE, ModelChange, subscribe
+from app.database import SessionLocal
+from app.models.politician import Politician
+from app.models.report import FlaggedReport
+from app.models.score import ScoreHistory
+from app.services.trending_service import MIN_SCORE_SWING
+from app.utils.cache import TTLCache
+from app.utils.redis_client import get_redis
+
+settings = get_settings()
+logger = logging.getLogger(__name__)
+
+ALERTS_CHANNEL = "alerts:events"
+SEQUENCE_KEY = "alerts:sequence"
+
+REPORT_FLAGGED = "report_flagged"
+REPORT_UPDATED = "report_updated"
+SCORE_UPDATED = "score_updated"
+
+# Markers yielded by ``AlertHub.events`` between events
+HEARTBEAT = "heartbeat"
+RESET = "reset"
+OVERFLOW = "overflow"
+
+REPORT_FIELDS = ("id", "title", "issue_type", "status", "priority", "location", "date_reported")
+REPORT_UPDATE_COLUMNS = {"status", "priority"}
+
+
+class AlertFeedFullError(Exception):
+    """This process already holds ``alert_feed_max_subscribers`` subscribers."""
+
+
+@dataclass(frozen=True)
+class AlertEvent:
+    """One alert, as published to subscribers."""
+
+    id: int
+    type: str
+    politician_id: uuid.UUID
+    county: Optional[str]
+    party: Optional[str]
+    data: Dict[str, Any]
+
+    def to_json(self) -> str:
+        return json.dumps({
+            "id": self.id,
+            "type": self.type,
+            "politician_id": str(self.politician_id),
+            "county": self.county,
+            "party": self.party,
+            "data": self.data,
+        })
+
+    @classmethod
+    def from_json(cls, raw: Union[str, bytes]) -> "AlertEvent":
+        payload = json.loads(raw)
+        return cls(
+            id=payload["id"],
+            type=payload["type"],
+            politician_id=uuid.UUID(payload["politician_id"]),
+            county=payload["county"],
+            party=payload["party"],
+            data=payload["data"],
+        )
+
+
+# Turning changes into alerts
+
+# (type, politician_id, data) before the politician's details are attached
+PendingAlert = Tuple[str, uuid.UUID, Dict[str, Any]]
+
+
+def _score_swings(changes: Iterable[ModelChange]) -> Dict[uuid.UUID, Optional[float]]:
+    """
+    Politicians whose score moved enough to alert about, with their previous
+    score; a change whose previous score is unknown counts as a swing.
+    """
+    swings: Dict[uuid.UUID, Optional[float]] = {}
+    for change in changes:
+        if change.table != Politician.__tablename__ or "transparency_score" not in change.changed:
+            continue
+        score, before = change.values.get("transparency_score"), change.previous.get("transparency_score")
+        if score is None:
+            continue
+        if before is None or abs(float(score) - float(before)) >= MIN_SCORE_SWING:
+            swings[change.politician_id] = float(before) if before is not None else None
+    return swings
+
+
+def pending_alerts(changes: Iterable[ModelChange]) -> List[PendingAlert]:
+    changes = list(changes)
+    swings = _score_swings(changes)
+    alerts: List[PendingAlert] = []
+    for change in changes:
+        if change.politician_id is None:
+            continue
+        if change.table == FlaggedReport.__tablename__:
+            if change.operation == INSERT:
+                alert_type = REPORT_FLAGGED
+            elif change.operation == UPDATE and change.changed & REPORT_UPDATE_COLUMNS:
+                alert_type = REPORT_UPDATED
+            else:
+                continue
+            data = {key: change.values[key] for key in REPORT_FIELDS if key in change.values}
+            if alert_type == REPORT_UPDATED:
+                data["changed"] = sorted(change.changed & REPORT_UPDATE_COLUMNS)
+            alerts.append((alert_type, change.politician_id, jsonable_encoder(data)))
+        elif (
+            change.table == ScoreHistory.__tablename__
+            and change.operation == INSERT
+            and change.politician_id in swings
+        ):
+            data = {
+                "transparency_score": change.values.get("transparency_score"),
+                "previous_score": swings[change.politician_id],
+                "calculated_at": change.values.get("calculated_at") or datetime.now(timezone.utc),
+            }
+            alerts.append((SCORE_UPDATED, change.politician_id, jsonable_encoder(data)))
+    return alerts
+
+
+# (name, county, party)
+PoliticianDetails = Tuple[Optional[str], Optional[str], Optional[str]]
+
+_politician_details: TTLCache[PoliticianDetails] = TTLCache(maxsize=20000, ttl=300)
+
+
+def politician_details(politician_ids: Iterable[uuid.UUID]) -> Dict[uuid.UUID, PoliticianDetails]:
+    """Name, county and party of each politician (cached for a few minutes)."""
+    details = {}
+    missing = []
+    for politician_id in set(politician_ids):
+        cached = _politician_details.get(politician_id)
+        if cached is None:
+            missing.append(politician_id)
+        else:
+            details[politician_id] = cached
+    if missing:
+        db = SessionLocal()
+        try:
+            rows = db.execute(
+                select(Politician.id, Politician.name, Politician.county, Politician.party)
+                .where(Politician.id.in_(missing))
+            )
+            for politician_id, name, county, party in rows:
+                details[politician_id] = (name, county, party)
+                _politician_details.set(politician_id, details[politician_id])
+        finally:
+            db.close()
+    return details
+
+
+# Publishers
+
+class InProcessAlertPublisher:
+    """Numbers events and hands them to this process's hub."""
+
+    def __init__(self):
+        # Keeps increasing across restarts, so stale Last-Event-IDs are detected
+        self._sequence = itertools.count(int(time.time() * 1000))
+
+    def next_ids(self, count: int) -> List[int]:
+        return [next(self._sequence) for _ in range(count)]
+
+    def deliver(self, events: List[AlertEvent]) -> None:
+        get_alert_hub().publish_threadsafe(events)
+
+
+class RedisAlertPublisher:
+    """Numbers events with a Redis counter and publishes them on a channel."""
+
+    def __init__(self, client: Any):
+        self.client = client
+
+    def next_ids(self, count: int) -> List[int]:
+        last = self.client.incr(SEQUENCE_KEY, count)
+        return list(range(last - count + 1, last + 1))
+
+    def deliver(self, events: List[AlertEvent]) -> None:
+        with self.client.pipeline(transaction=False) as pipe:
+            for event in events:
+                pipe.publish(ALERTS_CHANNEL, event.to_json())
+            pipe.execute()
+
+
+@lru_cache()
+def get_alert_publisher():
+    """Get the configured publisher (``memory`` or ``redis``)."""
+    if settings.alert_feed_backend == "redis":
+        return RedisAlertPublisher(get_redis())
+    return InProcessAlertPublisher()
+
+
+def publish_alerts(alerts: List[PendingAlert]) -> List[AlertEvent]:
+    """Attach politician details, number and publish alerts."""
+    if not alerts:
+        return []
+    publisher = get_alert_publisher()
+    details = politician_details(politician_id for _, politician_id, _ in alerts)
+    events = []
+    for event_id, (alert_type, politician_id, data) in zip(publisher.next_ids(len(alerts)), alerts):
+        name, county, party = details.get(politician_id, (None, None, None))
+        events.append(AlertEvent(
+            id=event_id,
+            type=alert_type,
+            politician_id=politician_id,
+            county=county,
+            party=party,
+            data={**data, "politician_name": name},
+        ))
+    publisher.deliver(events)
+    return events
+
+
+_publisher_pool: Optional[ThreadPoolExecutor] = None
+
+
+def _publisher_executor() -> ThreadPoolExecutor:
+    global _publisher_pool
+    if _publisher_pool is None:
+        # One thread keeps events in commit order
+        _publisher_pool = ThreadPoolExecutor(1, thread_name_prefix="alert-publisher")
+    return _publisher_pool
+
+
+def _publish_logged(alerts: List[PendingAlert]) -> None:
+    try:
+        publish_alerts(alerts)
+    except Exception:
+        logger.exception(f"Failed to publish {len(alerts)} alerts")
+
+
+def publish_alerts_in_background(alerts: List[PendingAlert]) -> Optional[Future]:
+    """Hand alerts to the publisher thread; returns its future, if any were queued."""
+    if not alerts:
+        return None
+    return _publisher_executor().submit(_publish_logged, alerts)
+
+
+def shutdown_alert_publisher() -> None:
+    """Publish the alerts still queued, then stop the publisher thread."""
+    global _publisher_pool
+    if _publisher_pool is not None:
+        _publisher_pool.shutdown(wait=True)
+        _publisher_pool = None
+
+
+def _on_model_changes(changes: List[ModelChange]) -> None:
+    publish_alerts_in_background(pending_alerts(changes))
+
+
+def register_alert_listeners() -> None:
+    """Publish committed reports and score changes to the alerts feed."""
+    subscribe(_on_model_changes)
+
+
+# Fan-out hub
+
+@dataclass(eq=False)
+class AlertSubscription:
+    """One connected client: its filters, queue, and what it missed."""
+
+    politician_id: Optional[uuid.UUID]
+    county: Optional[str]
+    party: Optional[str]
+    queue: "asyncio.Queue[AlertEvent]"
+    backlog: List[AlertEvent] = field(default_factory=list)
+    reset: bool = False
+    dropped: bool = False
+
+    def index_keys(self) -> List[Tuple[str, Any]]:
+        keys = [
+            (name, value)
+            for name, value in (("politician", self.politician_id), ("county", self.county), ("party", self.party))
+            if value is not None
+        ]
+        return keys or [("all", None)]
+
+    def matches(self, event: AlertEvent) -> bool:
+        return (
+            (self.politician_id is None or event.politician_id == self.politician_id)
+            and (self.county is None or event.county == self.county)
+            and (self.party is None or event.party == self.party)
+        )
+
+
+class AlertHub:
+    """Fans alert events out to this process's subscribers."""
+
+    def __init__(self, queue_size: int, replay_size: int, max_subscribers: int, heartbeat_seconds: float):
+        self.queue_size = queue_size
+        self.max_subscribers = max_subscribers
+        self.heartbeat_seconds = heartbeat_seconds
+        self._ring: Deque[AlertEvent] = deque(maxlen=replay_size)
+        # Each subscription is indexed under its most selective filter
+        self._index: Dict[Tuple[str, Any], Set[AlertSubscription]] = {}
+        self._count = 0
+        self._loop: Optional[asyncio.AbstractEventLoop] = None
+        self._listener: Optional[asyncio.Task] = None
+
+    def __len__(self) -> int:
+        return self._count
+
+    async def start(self, redis_url: Optional[str] = None) -> None:
+        """Bind to the running loop; with ``redis_url``, listen for published events."""
+        self._loop = asyncio.get_running_loop()
+        if redis_url and self._listener is None:
+            self._listener = asyncio.create_task(self._listen(redis_url))
+
+    async def stop(self) -> None:
+        if self._listener is not None:
+            self._listener.cancel()
+            try:
+                await self._listener
+            except asyncio.CancelledError:
+                pass
+            self._listener = None
+        self._loop = None
+
+    async def _listen(self, redis_url: str) -> None:
+        import redis.asyncio as aioredis
+
+        while True:
+            client = aioredis.from_url(redis_url)
+            try:
+                async with client.pubsub() as pubsub:
+                    await pubsub.subscribe(ALERTS_CHANNEL)
+                    async for message in pubsub.listen():
+                        if message["type"] == "message":
+                            self.dispatch([AlertEvent.from_json(message["data"])])
+            except asyncio.CancelledError:
+                raise
+            except Exception:
+                logger.exception("Alert feed subscription failed; reconnecting")
+                await asyncio.sleep(1)
+            finally:
+                await client.aclose()
+
+    def publish_threadsafe(self, events: List[AlertEvent]) -> None:
+        """Dispatch events from any thread; a no-op until the hub is started."""
+        loop = self._loop
+        if loop is not None and not loop.is_closed():
+            loop.call_soon_threadsafe(self.dispatch, events)
+
+    def dispatch(self, events: List[AlertEvent]) -> None:
+        """Queue events for matching subscribers, dropping any that are full. Runs on the loop."""
+        for event in events:
+            self._ring.append(event)
+            candidates = [
+                self._index.get(key, ())
+                for key in (
+                    ("all", None),
+                    ("politician", event.politician_id),
+                    ("county", event.county),
+                    ("party", event.party),
+                )
+            ]
+            for subscription in [subscription for group in candidates for subscription in group]:
+                if not subscription.matches(event):
+                    continue
+                try:
+                    subscription.queue.put_nowait(event)
+                except asyncio.QueueFull:
+                    logger.info("Dropping an alert feed subscriber that fell behind")
+                    subscription.dropped = True
+                    self.unsubscribe(subscription)
+
+    def subscribe(
+        self,
+        politician_id: Optional[uuid.UUID] = None,
+        county: Optional[str] = None,
+        party: Optional[str] = None,
+        last_event_id: Optional[int] = None,
+    ) -> AlertSubscription:
+        """
+        Register a subscriber. With ``last_event_id``, the events it missed
+        are in ``backlog``, or ``reset`` is set if they have left the ring.
+        """
+        if self._count >= self.max_subscribers:
+            raise AlertFeedFullError()
+        subscription = AlertSubscription(politician_id, county, party, asyncio.Queue(maxsize=self.queue_size))
+        if last_event_id is not None and self._ring:
+            if last_event_id < self._ring[0].id - 1:
+                subscription.reset = True
+            else:
+                subscription.backlog = [
+                    event for event in self._ring if event.id > last_event_id and subscription.matches(event)
+                ]
+        # Registered in the same step as the backlog is taken: nothing is missed or repeated
+        key = subscription.index_keys()[0]
+        self._index.setdefault(key, set()).add(subscription)
+        self._count += 1
+        return subscription
+
+    def unsubscribe(self, subscription: AlertSubscription) -> None:
+        key = subscription.index_keys()[0]
+        group = self._index.get(key)
+        if group is not None and subscription in group:
+            group.discard(subscription)
+            if not group:
+                del self._index[key]
+            self._count -= 1
+
+    async def events(self, subscription: AlertSubscription) -> AsyncIterator[Union[AlertEvent, str]]:
+        """
+        A subscriber's stream: ``RESET`` if its history is gone, the backlog,
+        then live events, with ``HEARTBEAT`` when idle and a final
+        ``OVERFLOW`` if it is dropped. Unsubscribes when closed.
+        """
+        try:
+            if subscription.reset:
+                yield RESET
+            for event in subscription.backlog:
+                yield event
+            subscription.backlog = []
+            while True:
+                if subscription.dropped:
+                    yield OVERFLOW
+                    return
+                try:
+                    event = await asyncio.wait_for(subscription.queue.get(), self.heartbeat_seconds)
+                except asyncio.TimeoutError:
+                    yield HEARTBEAT
+                    continue
+                yield event
+        finally:
+            self.unsubscribe(subscription)
+
+
+@lru_cache()
+def get_alert_hub() -> AlertHub:
+    """This process's alert hub."""
+    return AlertHub(
+        queue_size=settings.alert_feed_queue_size,
+        replay_size=settings.alert_feed_replay_size,
+        max_subscribers=settings.alert_feed_max_subscribers,
+        heartbeat_seconds=settings.alert_feed_heartbeat_seconds,
+    )
+
+
+async def start_alert_hub() -> None:
+    await get_alert_hub().start(settings.redis_url if settings.alert_feed_backend == "redis" else None)
+
+
+def format_sse(item: Union[AlertEvent, str]) -> str:
+    """Server-sent event framing of a hub stream item."""
+    if isinstance(item, AlertEvent):
+        return f"id: {item.id}\nevent: {item.type}\ndata: {item.to_json()}\n\n"
+    if item == HEARTBEAT:
+        return ": heartbeat\n\n"
+    return f"event: {item}\ndata: {{}}\n\n"
+
+
+def format_ws(item: Union[AlertEvent, str]) -> str:
+    """WebSocket message for a hub stream item."""
+    if isinstance(item, AlertEvent):
+        return item.to_json()
+    return json.dumps({"type": item})
@@ -0,0 +1,79 @@
+"""
+Account registration and login.
+
+Password hashing runs on the bounded pool in ``app.core.security``, never on
+the event loop. The database connection is released before hashing starts,
+so a login burst ties up hashing threads, not pooled connections. Logins
+whose stored hash uses deprecated settings (e.g. fewer bcrypt rounds than
+``password_bcrypt_rounds``) store the rehash produced while verifying.
+Both are POSTs, so their sessions read the primary, never a replica (see
+Read routing in ``app.database``).
+"""
+from datetime import datetime, timezone
+import logging
+from typing import Optional
+
+from sqlalchemy import select
+from sqlalchemy.exc import IntegrityError
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.core.exceptions import BadRequestException, ConflictException
+from app.core.security import dummy_verify_password, get_password_hash_async, verify_and_update_password
+from app.models.user import User
+from app.schemas.user import UserCreate
+
+logger = logging.getLogger(__name__)
+
+
+async def register_user(db: AsyncSession, data: UserCreate) -> User:
+    """Create an account; raises ``ConflictException`` if the email is taken."""
+    taken = (await db.execute(select(User.id).where(User.email == data.email))).first()
+    await db.rollback()
+    if taken is not None:
+        raise ConflictException("Email already registered")
+
+    hashed_password = await get_password_hash_async(data.password)
+    user = User(
+        email=data.email,
+        hashed_password=hashed_password,
+        full_name=data.full_name,
+        phone_number=data.phone_number,
+    )
+    db.add(user)
+    try:
+        await db.commit()
+    except IntegrityError:
+        await db.rollback()
+        raise ConflictException("Email already registered")
+    await db.refresh(user)
+    return user
+
+
+async def authenticate_user(db: AsyncSession, email: str, password: str) -> Optional[User]:
+    """
+    Return the user whose credentials these are, recording the login, or
+    None. Unknown emails take as long to refuse as wrong passwords; inactive
+    accounts raise ``BadRequestException``.
+    """
+    row = (await db.execute(select(User.id, User.hashed_password).where(User.email == email))).first()
+    await db.rollback()
+    if row is None:
+        await dummy_verify_password()
+        return None
+
+    valid, new_hash = await verify_and_update_password(password, row.hashed_password)
+    if not valid:
+        return None
+
+    user = await db.get(User, row.id)
+    if user is None:
+        return None
+    if not user.is_active:
+        raise BadRequestException("Inactive user")
+    if new_hash is not None and user.hashed_password == row.hashed_password:
+        user.hashed_password = new_hash
+        logger.info(f"Upgraded password hash of user {user.id}")
+    user.last_login = datetime.now(timezone.utc)
+    await db.commit()
+    await db.refresh(user)
+    return user
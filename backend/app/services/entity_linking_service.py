@@ -0,0 +1,461 @@
+"""
+Politician entity linking.
+
+Attributes news articles to the politicians they mention. Every active
+politician's name and aliases are compiled into one Aho-Corasick automaton,
+so an article is scanned once however many politicians there are:
+
+- the full name, and first + last name when the name has middle names, are
+  strong patterns;
+- aliases listed under ``aliases`` / ``nicknames`` (and similar keys) in the
+  ``social_media`` and ``contact_info`` JSONB, and social media handles, are
+  strong patterns too;
+- the surname alone links a politician only if no other politician goes by
+  it; a shared surname is a weak pattern, counting towards the relevance of
+  politicians otherwise mentioned but linking nobody by itself.
+
+Text is matched as normalized tokens joined by single spaces, and patterns
+only match whole words. A match inside a longer strong match of another
+politician ("Moi" in "Gideon Moi") is dropped.
+
+Relevance (0-1, stored in ``relevance_score``) rewards a mention in the
+title, repeated mentions in the body and an early first mention.
+
+The automaton is cached per process and rebuilt only when the politician
+set changes: committed politician changes mark it stale, and a cheap
+count / ``updated_at`` query catches changes made by other processes; the
+names and aliases are then reloaded and the automaton rebuilt only if they
+actually differ. Large batches are linked across a process pool.
+"""
+from collections import Counter
+from concurrent.futures import Executor, ProcessPoolExecutor
+from dataclasses import dataclass
+from decimal import Decimal
+import hashlib
+import logging
+import multiprocessing
+import threading
+import time
+from typing import Any, Dict, Iterable, List, Optional, Sequence, Set, Tuple
+from urllib.parse import urlsplit
+import uuid
+
+from sqlalchemy import func, select, update
+from sqlalchemy.dialects.postgresql import insert as pg_insert
+from sqlalchemy.orm import Session
+
+from app.config import get_settings
+from app.core.model_events import INSERT, UPDATE, ModelChange, record_changes, subscribe
+from app.models.news import NewsMention
+from app.models.politician import Politician
+from app.services.scraper_service import ScrapedArticle
+from app.utils.aho_corasick import AhoCorasick
+from app.utils.helpers import tokenize
+
+settings = get_settings()
+logger = logging.getLogger(__name__)
+
+# JSONB keys holding alternative names
+ALIAS_KEYS = ("aliases", "alias", "also_known_as", "aka", "known_as", "nicknames", "nickname", "other_names")
+# social_media keys holding handles (or profile URLs)
+HANDLE_KEYS = ("twitter", "x", "instagram", "tiktok", "threads", "facebook")
+
+# Columns whose changes alter the patterns
+LINKED_COLUMNS = {"name", "social_media", "contact_info", "is_active"}
+
+# Shorter single-word aliases, handles and surnames match too much by accident
+MIN_SINGLE_WORD_LENGTH = 4
+
+# Relevance weights; they sum to 1
+TITLE_WEIGHT = 0.5
+FREQUENCY_WEIGHT = 0.35
+PROMINENCE_WEIGHT = 0.15
+
+# Tokens never contain this, so no pattern matches across title and body
+_FIELD_SEPARATOR = " | "
+
+RELEVANCE_QUANTUM = Decimal("0.01")
+
+
+@dataclass(frozen=True)
+class PoliticianEntity:
+    """A politician and the names they are referred to by."""
+
+    id: uuid.UUID
+    name: str
+    aliases: Tuple[str, ...] = ()
+
+
+@dataclass
+class EntityLink:
+    """A politician mentioned by an article."""
+
+    politician_id: uuid.UUID
+    relevance: Decimal
+    mentions: int
+
+
+def _normalize(text: Optional[str]) -> str:
+    return " ".join(tokenize(text))
+
+
+def _strings(value: Any) -> List[str]:
+    if isinstance(value, str):
+        return [value]
+    if isinstance(value, (list, tuple)):
+        return [item for item in value if isinstance(item, str)]
+    return []
+
+
+def _handle(value: str) -> Optional[str]:
+    """The handle in ``@handle`` or a profile URL."""
+    value = value.strip()
+    if "/" in value:
+        path = urlsplit(value if "://" in value else f"https://{value}").path
+        segments = [segment for segment in path.split("/") if segment]
+        value = segments[-1] if segments else ""
+    return value.lstrip("@") or None
+
+
+def extract_aliases(social_media: Any, contact_info: Any) -> Tuple[str, ...]:
+    """Alternative names and handles found in a politician's JSONB columns."""
+    aliases: List[str] = []
+    for column in (social_media, contact_info):
+        if not isinstance(column, dict):
+            continue
+        for key in ALIAS_KEYS:
+            aliases.extend(_strings(column.get(key)))
+    if isinstance(social_media, dict):
+        for key in HANDLE_KEYS:
+            for value in _strings(social_media.get(key)):
+                handle = _handle(value)
+                if handle:
+                    aliases.append(handle)
+    return tuple(dict.fromkeys(alias.strip() for alias in aliases if alias.strip()))
+
+
+def _is_usable(pattern: str) -> bool:
+    return " " in pattern or len(pattern) >= MIN_SINGLE_WORD_LENGTH
+
+
+def entity_patterns(entity: PoliticianEntity) -> Tuple[Set[str], Set[str]]:
+    """The strong and weak normalized patterns of a politician."""
+    strong: Set[str] = set()
+    tokens = tokenize(entity.name)
+    if tokens:
+        strong.add(" ".join(tokens))
+        if len(tokens) > 2:
+            strong.add(f"{tokens[0]} {tokens[-1]}")
+    for alias in entity.aliases:
+        pattern = _normalize(alias)
+        if pattern and _is_usable(pattern):
+            strong.add(pattern)
+    weak = {tokens[-1]} if len(tokens) > 1 and _is_usable(tokens[-1]) else set()
+    return strong, weak - strong
+
+
+def entities_fingerprint(entities: Iterable[PoliticianEntity]) -> str:
+    """Digest of the politicians and names an automaton is built from."""
+    digest = hashlib.sha1()
+    for entity in sorted(entities, key=lambda entity: entity.id):
+        digest.update(f"{entity.id}\x1f{entity.name}\x1f{chr(0x1f).join(entity.aliases)}\x1e".encode("utf-8"))
+    return digest.hexdigest()
+
+
+class EntityLinker:
+    """Finds and scores the politicians mentioned by a text."""
+
+    def __init__(self, entities: Sequence[PoliticianEntity], min_relevance: float = 0.0):
+        self.min_relevance = min_relevance
+        self.fingerprint = entities_fingerprint(entities)
+        self.politician_ids = [entity.id for entity in entities]
+        entity_strong: List[Set[str]] = []
+        entity_weak: List[Set[str]] = []
+        for entity in entities:
+            strong, weak = entity_patterns(entity)
+            entity_strong.append(strong)
+            entity_weak.append(weak)
+        # A surname nobody else is known by identifies its politician
+        owners = Counter(pattern for patterns in entity_strong + entity_weak for pattern in patterns)
+        patterns: List[Tuple[str, Tuple[int, bool]]] = []
+        for number, (strong, weak) in enumerate(zip(entity_strong, entity_weak)):
+            patterns.extend((pattern, (number, True)) for pattern in strong)
+            patterns.extend((pattern, (number, owners[pattern] == 1)) for pattern in weak)
+        self._automaton = AhoCorasick(patterns)
+
+    def __len__(self) -> int:
+        return len(self.politician_ids)
+
+    def link(self, title: Optional[str], body: Optional[str] = None) -> List[EntityLink]:
+        """The politicians mentioned by an article, most relevant first."""
+        title_text = _normalize(title)
+        body_text = _normalize(body)
+        body_offset = len(title_text) + len(_FIELD_SEPARATOR)
+        text = f"{title_text}{_FIELD_SEPARATOR}{body_text}"
+
+        matches = sorted(self._automaton.iter_matches(text), key=lambda match: (match[0], -match[1]))
+        # entity -> [title mentions, body mentions, strong mentions, first body offset]
+        counts: Dict[int, List[int]] = {}
+        covering: List[Tuple[int, int, int, bool]] = []
+        for start, end, (entity, strong) in matches:
+            covering = [span for span in covering if span[1] > start]
+            if any(
+                span[1] >= end and span[1] - span[0] > end - start and (span[3] or span[2] == entity)
+                for span in covering
+            ):
+                continue
+            covering.append((start, end, entity, strong))
+
+            entry = counts.setdefault(entity, [0, 0, 0, -1])
+            if start < body_offset:
+                entry[0] += 1
+            else:
+                entry[1] += 1
+                if entry[3] < 0:
+                    entry[3] = start - body_offset
+            if strong:
+                entry[2] += 1
+
+        links = []
+        for entity, (title_mentions, body_mentions, strong_mentions, first_offset) in counts.items():
+            if not strong_mentions:
+                continue
+            relevance = self._relevance(title_mentions, body_mentions, first_offset, len(body_text))
+            if relevance < self.min_relevance:
+                continue
+            links.append(EntityLink(
+                politician_id=self.politician_ids[entity],
+                relevance=Decimal(str(relevance)).quantize(RELEVANCE_QUANTUM),
+                mentions=title_mentions + body_mentions,
+            ))
+        links.sort(key=lambda link: (-link.relevance, -link.mentions))
+        return links
+
+    @staticmethod
+    def _relevance(title_mentions: int, body_mentions: int, first_offset: int, body_length: int) -> float:
+        relevance = TITLE_WEIGHT if title_mentions else 0.0
+        if body_mentions:
+            relevance += FREQUENCY_WEIGHT * (1 - 0.5 ** body_mentions)
+            relevance += PROMINENCE_WEIGHT * (1 - first_offset / max(body_length, 1))
+        return min(1.0, relevance)
+
+
+# Process pool
+
+_worker_linker: Optional[EntityLinker] = None
+
+
+def _init_worker(linker: EntityLinker) -> None:
+    global _worker_linker
+    _worker_linker = linker
+
+
+def _link_chunk(texts: List[Tuple[Optional[str], Optional[str]]]) -> List[List[EntityLink]]:
+    return [_worker_linker.link(title, body) for title, body in texts]
+
+
+def linking_pool(linker: EntityLinker, processes: Optional[int] = None) -> ProcessPoolExecutor:
+    """A process pool whose workers each hold a copy of ``linker``."""
+    # Spawned rather than forked: the parent may be running threads and
+    # holding database connections
+    return ProcessPoolExecutor(
+        max_workers=processes or settings.entity_link_processes,
+        mp_context=multiprocessing.get_context("spawn"),
+        initializer=_init_worker,
+        initargs=(linker,),
+    )
+
+
+def link_texts(
+    linker: EntityLinker,
+    texts: Sequence[Tuple[Optional[str], Optional[str]]],
+    executor: Optional[Executor] = None,
+    chunk_size: Optional[int] = None,
+) -> List[List[EntityLink]]:
+    """
+    Link each ``(title, body)`` pair, in chunks across ``executor`` when one
+    is given (see ``linking_pool``) and there is more than one chunk of work.
+    """
+    chunk_size = chunk_size or settings.entity_link_chunk_size
+    if executor is None or len(texts) <= chunk_size:
+        return [linker.link(title, body) for title, body in texts]
+    chunks = [list(texts[start:start + chunk_size]) for start in range(0, len(texts), chunk_size)]
+    results: List[List[EntityLink]] = []
+    for chunk_links in executor.map(_link_chunk, chunks):
+        results.extend(chunk_links)
+    return results
+
+
+# The process-wide linker
+
+def load_politician_entities(db: Session) -> List[PoliticianEntity]:
+    """Names and aliases of all active politicians."""
+    rows = db.execute(
+        select(Politician.id, Politician.name, Politician.social_media, Politician.contact_info)
+        .where(Politician.is_active.is_(True))
+        .order_by(Politician.id)
+    )
+    return [
+        PoliticianEntity(id=row.id, name=row.name, aliases=extract_aliases(row.social_media, row.contact_info))
+        for row in rows
+    ]
+
+
+class _LinkerCache:
+    """The current linker and what it was built from."""
+
+    def __init__(self):
+        self.linker: Optional[EntityLinker] = None
+        self.stale = True
+        self.version: Optional[Tuple[Any, ...]] = None
+        self.lock = threading.Lock()
+
+
+_cache = _LinkerCache()
+
+
+def get_entity_linker(db: Session) -> EntityLinker:
+    """
+    The process-wide linker, reloading the politicians if they may have
+    changed and rebuilding the automaton only if their names did.
+    """
+    version = tuple(db.execute(
+        select(func.count(), func.max(Politician.updated_at)).where(Politician.is_active.is_(True))
+    ).one())
+    with _cache.lock:
+        if _cache.linker is not None and not _cache.stale and _cache.version == version:
+            return _cache.linker
+        _cache.stale = False
+        entities = load_politician_entities(db)
+        if _cache.linker is None or entities_fingerprint(entities) != _cache.linker.fingerprint:
+            started = time.perf_counter()
+            _cache.linker = EntityLinker(entities, min_relevance=settings.entity_link_min_relevance)
+            elapsed_ms = (time.perf_counter() - started) * 1000
+            logger.info(f"Entity linker built for {len(entities)} politicians in {elapsed_ms:.0f}ms")
+        _cache.version = version
+        return _cache.linker
+
+
+def _on_model_changes(changes: List[ModelChange]) -> None:
+    for change in changes:
+        if change.table == Politician.__tablename__ and (
+            change.operation != UPDATE or change.changed & LINKED_COLUMNS
+        ):
+            _cache.stale = True
+            return
+
+
+def register_entity_linking_listeners() -> None:
+    """Mark the linker stale when politicians change."""
+    subscribe(_on_model_changes)
+
+
+# Storage
+
+def store_articles(
+    db: Session,
+    articles: Sequence[ScrapedArticle],
+    executor: Optional[Executor] = None,
+    commit: bool = True,
+) -> int:
+    """
+    Link scraped articles to politicians and store a news mention per
+    politician mentioned. Articles mentioning nobody are dropped.
+
+    Returns the number of news mentions created.
+    """
+    if not articles:
+        return 0
+    linker = get_entity_linker(db)
+    links = link_texts(linker, [(article.title, article.summary) for article in articles], executor=executor)
+    rows = []
+    for article, article_links in zip(articles, links):
+        for link in article_links:
+            rows.append({
+                "id": uuid.uuid4(),
+                "politician_id": link.politician_id,
+                "title": article.title[:500],
+                "source": article.source[:255],
+                "url": article.url,
+                "content_summary": article.summary,
+                "published_at": article.published_at or article.scraped_at,
+                "scraped_at": article.scraped_at,
+                "relevance_score": link.relevance,
+            })
+    stored = []
+    if rows:
+        # An article already stored for a politician (by a concurrent run, or
+        # an import) is skipped rather than failing the batch
+        stmt = pg_insert(NewsMention).on_conflict_do_nothing(
+            index_elements=[NewsMention.politician_id, NewsMention.url]
+        ).returning(NewsMention.id)
+        inserted = set(db.execute(stmt, rows).scalars())
+        stored = [row for row in rows if row["id"] in inserted]
+        # Bulk statements bypass mapper events; report the writes to the change feed
+        record_changes(db, [ModelChange(NewsMention.__tablename__, INSERT, row) for row in stored])
+    if commit:
+        db.commit()
+    return len(stored)
+
+
+def backfill_relevance(
+    db: Session,
+    executor: Optional[Executor] = None,
+    batch_size: Optional[int] = None,
+) -> int:
+    """
+    Recompute ``relevance_score`` of every stored news mention from its title
+    and summary, committing per batch. A mention whose text no longer names
+    its politician scores 0.
+
+    Returns the number of mentions whose score changed.
+    """
+    batch_size = batch_size or settings.entity_link_backfill_batch_size
+    linker = get_entity_linker(db)
+    started = time.perf_counter()
+    updated = 0
+    scanned = 0
+    last_id: Optional[uuid.UUID] = None
+    while True:
+        stmt = (
+            select(
+                NewsMention.id, NewsMention.politician_id, NewsMention.title,
+                NewsMention.content_summary, NewsMention.relevance_score,
+            )
+            .order_by(NewsMention.id)
+            .limit(batch_size)
+        )
+        if last_id is not None:
+            stmt = stmt.where(NewsMention.id > last_id)
+        batch = db.execute(stmt).all()
+        if not batch:
+            break
+        last_id = batch[-1].id
+        scanned += len(batch)
+
+        links = link_texts(linker, [(row.title, row.content_summary) for row in batch], executor=executor)
+        rows = []
+        changes = []
+        for row, row_links in zip(batch, links):
+            relevance = next(
+                (link.relevance for link in row_links if link.politician_id == row.politician_id),
+                Decimal("0.00"),
+            )
+            if relevance != row.relevance_score:
+                rows.append({"id": row.id, "relevance_score": relevance})
+                changes.append(ModelChange(
+                    NewsMention.__tablename__,
+                    UPDATE,
+                    {"id": row.id, "politician_id": row.politician_id, "relevance_score": relevance},
+                    changed=frozenset({"relevance_score"}),
+                    previous={"relevance_score": row.relevance_score},
+                ))
+        if rows:
+            db.execute(update(NewsMention), rows)
+            record_changes(db, changes)
+            updated += len(rows)
+        db.commit()
+
+    elapsed = time.perf_counter() - started
+    logger.info(f"Relevance backfill scanned {scanned} news mentions, updated {updated} in {elapsed:.1f}s")
+    return updated
@@ -0,0 +1,155 @@
+"""
+Full-text search over politicians, cases, promises and news, in Postgres.
+
+Each searchable table has a generated, weighted ``search_vector`` column with
+a GIN index, and a ``pg_trgm`` index on its name or title. A query matches
+rows whose vector matches the web-style query (``"quoted phrases"``, ``or``,
+``-excluded``), or whose name or title contains words trigram-similar to it,
+which catches misspellings. Matches are ranked by ``ts_rank_cd`` plus a share
+of the trigram word similarity and can be narrowed by the politician's
+party, county and transparency score and by the record's status. Only
+active politicians and their records are searched.
+
+Unlike the in-memory autocomplete index, this also searches long text (bios,
+descriptions, article summaries) and news.
+"""
+from dataclasses import dataclass
+import enum
+from typing import Any, Optional, Type
+
+from sqlalchemy import cast, func, literal, or_, select
+from sqlalchemy.dialects.postgresql import REGCONFIG
+from sqlalchemy.orm import Session
+
+from app.core.exceptions import BadRequestException
+from app.models.case import CaseStatus, LegalCase
+from app.models.news import NewsMention
+from app.models.politician import Politician
+from app.models.promise import Promise, PromiseStatus
+from app.schemas.politician import PoliticianCardResponse
+from app.schemas.search import AdvancedSearchHit, AdvancedSearchPage
+from app.utils.query_options import CARD_COLUMNS
+
+TEXT_SEARCH_CONFIG = "english"
+
+# Share of the trigram word similarity (0-1) added to the text rank
+TRIGRAM_WEIGHT = 0.5
+
+# ts_rank_cd normalization 32 scales the rank into 0-1 (rank / (rank + 1))
+RANK_NORMALIZATION = 32
+
+HEADLINE_OPTIONS = "MaxFragments=2, MaxWords=25, MinWords=8, FragmentDelimiter= … "
+
+
+class SearchScope(str, enum.Enum):
+    """What an advanced search looks through."""
+    POLITICIANS = "politicians"
+    CASES = "cases"
+    PROMISES = "promises"
+    NEWS = "news"
+
+
+@dataclass(frozen=True)
+class _Target:
+    model: Any
+    title_column: Any
+    snippet_column: Any
+    status_enum: Optional[Type[enum.Enum]] = None
+
+
+TARGETS = {
+    SearchScope.POLITICIANS: _Target(Politician, Politician.name, Politician.bio),
+    SearchScope.CASES: _Target(LegalCase, LegalCase.title, LegalCase.description, CaseStatus),
+    SearchScope.PROMISES: _Target(Promise, Promise.title, Promise.description, PromiseStatus),
+    SearchScope.NEWS: _Target(NewsMention, NewsMention.title, NewsMention.content_summary),
+}
+
+
+def _parse_status(target: _Target, scope: SearchScope, status: Optional[str]) -> Optional[enum.Enum]:
+    if status is None:
+        return None
+    if target.status_enum is None:
+        raise BadRequestException(f"Status filter is not supported when searching {scope.value}")
+    try:
+        return target.status_enum(status)
+    except ValueError:
+        allowed = ", ".join(member.value for member in target.status_enum)
+        raise BadRequestException(f"Invalid status '{status}'; expected one of: {allowed}")
+
+
+def advanced_search(
+    db: Session,
+    q: str,
+    scope: SearchScope = SearchScope.POLITICIANS,
+    party: Optional[str] = None,
+    county: Optional[str] = None,
+    status: Optional[str] = None,
+    min_score: Optional[float] = None,
+    max_score: Optional[float] = None,
+    page: int = 1,
+    page_size: int = 20,
+) -> AdvancedSearchPage:
+    """Rank the records in ``scope`` matching ``q`` and the filters (1 query)."""
+    target = TARGETS[scope]
+    model = target.model
+    status_value = _parse_status(target, scope, status)
+
+    config = cast(TEXT_SEARCH_CONFIG, REGCONFIG)
+    tsquery = func.websearch_to_tsquery(config, q)
+    rank = (
+        func.ts_rank_cd(model.search_vector, tsquery, RANK_NORMALIZATION)
+        + TRIGRAM_WEIGHT * func.word_similarity(q, target.title_column)
+    ).label("rank")
+
+    stmt = select(
+        model.id.label("record_id"),
+        target.title_column.label("title"),
+        rank,
+        *CARD_COLUMNS,
+    ).where(or_(model.search_vector.op("@@")(tsquery), literal(q).op("<%")(target.title_column)))
+    if model is not Politician:
+        stmt = stmt.join(Politician, model.politician_id == Politician.id)
+    # Deactivated politicians, and everything about them, are hidden as in listings
+    stmt = stmt.where(Politician.is_active.is_(True))
+
+    if party:
+        stmt = stmt.where(Politician.party == party)
+    if county:
+        stmt = stmt.where(Politician.county == county)
+    if min_score is not None:
+        stmt = stmt.where(Politician.transparency_score >= min_score)
+    if max_score is not None:
+        stmt = stmt.where(Politician.transparency_score <= max_score)
+    if status_value is not None:
+        stmt = stmt.where(model.status == status_value)
+
+    ranked = (
+        stmt.order_by(rank.desc(), model.id.desc())
+        .offset((page - 1) * page_size)
+        .limit(page_size + 1)
+        .subquery()
+    )
+    # Headlines are costly, so only build them for the page, not every match
+    snippet = func.ts_headline(
+        config, func.coalesce(target.snippet_column, target.title_column), tsquery, HEADLINE_OPTIONS
+    ).label("snippet")
+    rows = db.execute(
+        select(ranked, snippet)
+        .join(model, model.id == ranked.c.record_id)
+        .order_by(ranked.c.rank.desc(), ranked.c.record_id.desc())
+    ).all()
+
+    items = [
+        AdvancedSearchHit(
+            kind=scope.value,
+            id=row.record_id,
+            title=row.title,
+            snippet=row.snippet or None,
+            rank=round(float(row.rank), 4),
+            politician=PoliticianCardResponse.model_validate(
+                {column.key: row._mapping[column.key] for column in CARD_COLUMNS}
+            ),
+        )
+        for row in rows[:page_size]
+    ]
+    return AdvancedSearchPage(items=items, page=page, page_size=page_size, has_more=len(rows) > page_size)
@@ -0,0 +1,463 @@
+"""
+Bulk data import.
+
+Files are streamed as CSV (with a header row) or NDJSON (one JSON object per
+line) and processed in chunks of ``settings.import_batch_size`` rows, so
+memory stays bounded whatever the file size. Each chunk is:
+
+1. validated row by row against the entity's import schema, with politician
+   references resolved through an in-memory name -> id lookup;
+2. ``COPY``-ed into a temporary staging table and upserted into the target
+   table with a single ``INSERT ... SELECT ... ON CONFLICT DO UPDATE``;
+3. committed, and reported to the model change feed.
+
+A row that fails validation is reported and skipped. If the database rejects
+a chunk (a foreign key or constraint violation), the chunk is replayed row by
+row in savepoints so only the offending rows are rejected.
+
+Rows that give an ``id`` are matched on it. Others are matched on their
+entity's natural key: a politician's name and position; a case's
+``case_number``, when it has one; a promise's politician, title and
+``date_made``; a news mention's politician and URL. Re-importing a file
+therefore updates the rows it created instead of duplicating them. A matched
+row is replaced with the imported values, and a row moved to another
+politician reports its previous owner in ``ModelChange.previous``, so the
+old owner's caches and scores are invalidated too.
+"""
+from dataclasses import dataclass
+import csv
+import enum
+import io
+import json
+import logging
+import time
+from typing import Any, BinaryIO, Callable, Dict, Iterable, Iterator, List, Optional, Tuple, Type, Union
+import uuid
+
+from pydantic import BaseModel, ValidationError
+from sqlalchemy import and_, column, func, literal_column, select, table, text
+from sqlalchemy.dialects.postgresql import JSONB, insert as pg_insert
+from sqlalchemy.exc import DBAPIError
+from sqlalchemy.orm import Session
+
+from app.config import get_settings
+from app.core.exceptions import BadRequestException
+from app.core.model_events import INSERT, UPDATE, ModelChange, record_changes
+from app.models.case import LegalCase
+from app.models.news import NewsMention
+from app.models.politician import Politician
+from app.models.promise import Promise
+from app.schemas.data_import import (
+    ImportReport,
+    ImportRowError,
+    LegalCaseImportRow,
+    NewsMentionImportRow,
+    PoliticianImportRow,
+    PoliticianReferenceRow,
+    PromiseImportRow,
+)
+from app.utils.helpers import normalize_text
+
+settings = get_settings()
+logger = logging.getLogger(__name__)
+
+# Columns the database maintains; never taken from an import
+MANAGED_COLUMNS = {"id", "created_at", "updated_at", "search_vector"}
+
+
+class ImportEntity(str, enum.Enum):
+    """What a data import loads."""
+    POLITICIANS = "politicians"
+    CASES = "cases"
+    PROMISES = "promises"
+    NEWS = "news"
+
+
+class ImportFormat(str, enum.Enum):
+    """Supported import file formats."""
+    CSV = "csv"
+    NDJSON = "ndjson"
+
+
+@dataclass(frozen=True)
+class _EntitySpec:
+    model: Any
+    row_schema: Type[BaseModel]
+    # Uniquely constrained columns matched by upserts of rows without an id
+    # that have values for all of them
+    natural_key: Tuple[str, ...] = ()
+
+
+SPECS = {
+    ImportEntity.POLITICIANS: _EntitySpec(Politician, PoliticianImportRow, natural_key=("name", "position")),
+    ImportEntity.CASES: _EntitySpec(LegalCase, LegalCaseImportRow, natural_key=("case_number",)),
+    ImportEntity.PROMISES: _EntitySpec(
+        Promise, PromiseImportRow, natural_key=("politician_id", "title", "date_made")
+    ),
+    ImportEntity.NEWS: _EntitySpec(NewsMention, NewsMentionImportRow, natural_key=("politician_id", "url")),
+}
+
+ConflictKey = Tuple[str, ...]
+PreparedRow = Tuple[int, Dict[str, Any], ConflictKey]  # line number, column values, matched columns
+
+FORMAT_EXTENSIONS = {
+    ".csv": ImportFormat.CSV,
+    ".ndjson": ImportFormat.NDJSON,
+    ".jsonl": ImportFormat.NDJSON,
+}
+
+
+def detect_format(filename: Optional[str]) -> ImportFormat:
+    """Pick the import format from a file name's extension."""
+    name = (filename or "").lower()
+    for extension, import_format in FORMAT_EXTENSIONS.items():
+        if name.endswith(extension):
+            return import_format
+    raise BadRequestException(f"Cannot tell the format of '{filename}'; use a .csv or .ndjson file")
+
+
+# Reading
+
+Record = Union[Dict[str, Any], str]
+
+
+def read_records(stream: BinaryIO, import_format: ImportFormat) -> Iterator[Tuple[int, Record]]:
+    """
+    Yield ``(line number, record)`` pairs from a binary stream.
+    Unparseable records are yielded as an error message instead of a dict.
+    """
+    if import_format == ImportFormat.CSV:
+        reader = csv.DictReader(io.TextIOWrapper(stream, encoding="utf-8-sig", newline=""))
+        try:
+            for record in reader:
+                # Empty cells are missing values; cells beyond the header are dropped
+                yield reader.line_num, {
+                    key: value for key, value in record.items() if key is not None and value not in ("", None)
+                }
+        except (csv.Error, UnicodeDecodeError) as exc:
+            yield reader.line_num, f"Unreadable CSV: {exc}"
+        return
+
+    for line_number, line in enumerate(stream, start=1):
+        if not line.strip():
+            continue
+        try:
+            record = json.loads(line)
+        except ValueError as exc:
+            yield line_number, f"Invalid JSON: {exc}"
+            continue
+        if not isinstance(record, dict):
+            yield line_number, "Expected a JSON object"
+            continue
+        yield line_number, record
+
+
+def iter_chunks(records: Iterable[Tuple[int, Record]], size: int) -> Iterator[List[Tuple[int, Record]]]:
+    """Group records into lists of at most ``size``."""
+    chunk: List[Tuple[int, Record]] = []
+    for record in records:
+        chunk.append(record)
+        if len(chunk) >= size:
+            yield chunk
+            chunk = []
+    if chunk:
+        yield chunk
+
+
+def _describe_validation_error(exc: ValidationError) -> str:
+    return "; ".join(
+        f"{'.'.join(str(part) for part in error['loc']) or 'row'}: {error['msg']}" for error in exc.errors()
+    )
+
+
+def _describe_database_error(exc: Exception) -> str:
+    return str(getattr(exc, "orig", exc)).strip().splitlines()[0]
+
+
+class PoliticianLookup:
+    """Resolves politician references by id or exact (case-insensitive) name."""
+
+    def __init__(self, db: Session):
+        self.ids = set()
+        self.by_name: Dict[str, Optional[uuid.UUID]] = {}
+        for politician_id, name in db.execute(select(Politician.id, Politician.name)):
+            self.ids.add(politician_id)
+            key = self.normalize(name)
+            # Names shared by several politicians cannot be resolved
+            self.by_name[key] = None if key in self.by_name else politician_id
+
+    @staticmethod
+    def normalize(name: str) -> str:
+        return " ".join(normalize_text(name).split())
+
+    def resolve(self, politician_id: Optional[uuid.UUID], politician_name: Optional[str]) -> uuid.UUID:
+        """Return the politician's id, or raise ``ValueError`` saying why not."""
+        if politician_id is not None:
+            if politician_id not in self.ids:
+                raise ValueError(f"Unknown politician_id {politician_id}")
+            return politician_id
+        key = self.normalize(politician_name or "")
+        if key not in self.by_name:
+            raise ValueError(f"Unknown politician '{politician_name}'")
+        resolved = self.by_name[key]
+        if resolved is None:
+            raise ValueError(f"Several politicians are named '{politician_name}'; give politician_id instead")
+        return resolved
+
+
+# Loading
+
+class _ChunkLoader:
+    """Upserts validated rows of one entity, one chunk per transaction."""
+
+    def __init__(self, db: Session, spec: _EntitySpec):
+        self.db = db
+        self.spec = spec
+        self.table = spec.model.__table__
+        self.columns = [name for name in spec.row_schema.model_fields if name in self.table.c]
+        # Python-side column defaults the import does not supply; only applied to new rows
+        self.defaults = {
+            name: table_column.default.arg
+            for name, table_column in self.table.c.items()
+            if name not in self.columns
+            and name not in MANAGED_COLUMNS
+            and table_column.default is not None
+            and table_column.default.is_scalar
+        }
+        self.columns += list(self.defaults)
+        self.json_columns = {name for name in self.columns if isinstance(self.table.c[name].type, JSONB)}
+        self.stage_name = f"import_stage_{self.table.name}"
+        # COPY goes through the driver directly, so its errors are not wrapped
+        self.database_errors = (DBAPIError, db.get_bind().dialect.dbapi.Error)
+
+    def _values(self, row: Dict[str, Any]) -> Dict[str, Any]:
+        return {name: row[name] if name in row else self.defaults[name] for name in self.columns}
+
+    def conflict_key(self, row: Dict[str, Any]) -> ConflictKey:
+        """The columns a row is matched on: its id if given, else its natural key."""
+        key = self.spec.natural_key
+        if row.get("id") is None and key and all(row.get(name) is not None for name in key):
+            return key
+        return ("id",)
+
+    def _update_columns(self, conflict_key: ConflictKey) -> List[str]:
+        return [
+            name for name in self.columns
+            if name not in MANAGED_COLUMNS and name not in self.defaults and name not in conflict_key
+        ]
+
+    def _upsert_statement(self, conflict_key: ConflictKey, source: Any = None, row: Optional[Dict[str, Any]] = None):
+        if source is not None:
+            stmt = pg_insert(self.table).from_select(self.columns, source)
+        else:
+            stmt = pg_insert(self.table).values(self._values(row))
+        update_columns = {name: stmt.excluded[name] for name in self._update_columns(conflict_key)}
+        if "updated_at" in self.table.c:
+            update_columns["updated_at"] = func.now()
+        return stmt.on_conflict_do_update(index_elements=list(conflict_key), set_=update_columns).returning(
+            self.table.c.id,
+            *(self.table.c[name] for name in conflict_key),
+            literal_column("xmax = 0").label("inserted"),
+        )
+
+    def _previous_owners(self, conflict_key: ConflictKey, matches: Any) -> Dict[Tuple[Any, ...], uuid.UUID]:
+        """
+        Lock the existing rows an upsert will update and return their
+        politician, by conflict key value, before the upsert overwrites it.
+        """
+        if "politician_id" not in self.table.c or "politician_id" in conflict_key:
+            return {}
+        key_columns = [self.table.c[name] for name in conflict_key]
+        stmt = select(*key_columns, self.table.c.politician_id).where(matches).with_for_update(of=self.table)
+        return {tuple(row[:-1]): row.politician_id for row in self.db.execute(stmt)}
+
+    def _copy_value(self, name: str, value: Any) -> str:
+        # In COPY's CSV format an unquoted empty field is NULL and a quoted
+        # one an empty string, so every value is quoted
+        if value is None:
+            return ""
+        if name in self.json_columns:
+            value = json.dumps(value, default=str)
+        elif isinstance(value, enum.Enum):
+            # SQLAlchemy Enum columns store member names
+            value = value.name
+        elif hasattr(value, "isoformat"):
+            value = value.isoformat()
+        return '"' + str(value).replace('"', '""') + '"'
+
+    def _copy_rows(self, rows: List[Dict[str, Any]]) -> None:
+        buffer = io.StringIO()
+        for row in rows:
+            buffer.write(",".join(self._copy_value(name, value) for name, value in self._values(row).items()))
+            buffer.write("\n")
+        buffer.seek(0)
+
+        column_list = ", ".join(self.columns)
+        raw_connection = self.db.connection().connection.driver_connection
+        with raw_connection.cursor() as cursor:
+            cursor.copy_expert(f"COPY {self.stage_name} ({column_list}) FROM STDIN WITH (FORMAT csv)", buffer)
+
+    def load(self, rows: List[PreparedRow], report: ImportReport) -> List[ModelChange]:
+        """Upsert ``rows`` (line number, column values, matched columns); returns the changes made."""
+        groups: Dict[ConflictKey, List[Tuple[int, Dict[str, Any]]]] = {}
+        for line, row, conflict_key in rows:
+            groups.setdefault(conflict_key, []).append((line, row))
+
+        changes = []
+        for conflict_key, group in groups.items():
+            try:
+                with self.db.begin_nested():
+                    changes.extend(self._load_bulk(conflict_key, group))
+            except self.database_errors as exc:
+                logger.warning(
+                    f"Bulk load of {len(group)} {self.table.name} rows failed "
+                    f"({_describe_database_error(exc)}); retrying row by row"
+                )
+                changes.extend(self._load_rows(conflict_key, group, report))
+
+        inserted = sum(1 for change in changes if change.operation == INSERT)
+        report.inserted += inserted
+        report.updated += len(changes) - inserted
+        return changes
+
+    def _load_bulk(self, conflict_key: ConflictKey, group: List[Tuple[int, Dict[str, Any]]]) -> List[ModelChange]:
+        # Typed like the target's columns, without its constraints
+        column_list = ", ".join(self.columns)
+        self.db.execute(
+            text(f"CREATE TEMP TABLE {self.stage_name} AS SELECT {column_list} FROM {self.table.name} WITH NO DATA")
+        )
+        self._copy_rows([row for _, row in group])
+        stage = table(self.stage_name, *(column(name) for name in self.columns))
+        owners = self._previous_owners(
+            conflict_key,
+            self.table.c[conflict_key[0]].in_(select(stage.c[conflict_key[0]]))
+            if len(conflict_key) == 1
+            else select(stage).where(and_(*(self.table.c[name] == stage.c[name] for name in conflict_key))).exists(),
+        )
+        result = self.db.execute(self._upsert_statement(conflict_key, source=select(*stage.c)))
+        outcomes = {tuple(row[1:-1]): (row.id, row.inserted) for row in result}
+        self.db.execute(text(f"DROP TABLE {self.stage_name}"))
+        changes = []
+        for _, row in group:
+            key = tuple(row[name] for name in conflict_key)
+            changes.append(self._change(conflict_key, row, *outcomes[key], owners.get(key)))
+        return changes
+
+    def _load_rows(
+        self, conflict_key: ConflictKey, group: List[Tuple[int, Dict[str, Any]]], report: ImportReport
+    ) -> List[ModelChange]:
+        changes = []
+        for line, row in group:
+            key = tuple(row[name] for name in conflict_key)
+            try:
+                with self.db.begin_nested():
+                    owners = self._previous_owners(
+                        conflict_key, and_(*(self.table.c[name] == row[name] for name in conflict_key))
+                    )
+                    outcome = self.db.execute(self._upsert_statement(conflict_key, row=row)).one()
+            except DBAPIError as exc:
+                _add_row_error(report, line, _describe_database_error(exc))
+                continue
+            changes.append(self._change(conflict_key, row, outcome.id, outcome.inserted, owners.get(key)))
+        return changes
+
+    def _change(
+        self,
+        conflict_key: ConflictKey,
+        row: Dict[str, Any],
+        row_id: uuid.UUID,
+        inserted: bool,
+        previous_owner: Optional[uuid.UUID] = None,
+    ) -> ModelChange:
+        values = dict(row, id=row_id)
+        if inserted:
+            return ModelChange(self.table.name, INSERT, values)
+        previous = {"politician_id": previous_owner} if previous_owner is not None else {}
+        return ModelChange(
+            self.table.name, UPDATE, values, changed=frozenset(self._update_columns(conflict_key)), previous=previous
+        )
+
+
+def _add_row_error(report: ImportReport, line: int, error: str) -> None:
+    """Count a rejected row, keeping its details up to the reporting limit."""
+    report.failed += 1
+    if len(report.errors) < settings.import_max_reported_errors:
+        report.errors.append(ImportRowError(line=line, error=error))
+    else:
+        report.errors_truncated = True
+
+
+def _prepare_chunk(
+    chunk: List[Tuple[int, Record]],
+    spec: _EntitySpec,
+    loader: _ChunkLoader,
+    lookup: Optional[PoliticianLookup],
+    report: ImportReport,
+) -> List[PreparedRow]:
+    """Validate a chunk into insertable rows, reporting rejected ones."""
+    report.total_rows += len(chunk)
+    rows: Dict[Tuple[ConflictKey, Tuple[Any, ...]], PreparedRow] = {}
+    for line, record in chunk:
+        if isinstance(record, str):
+            _add_row_error(report, line, record)
+            continue
+        try:
+            validated = spec.row_schema.model_validate(record)
+        except ValidationError as exc:
+            _add_row_error(report, line, _describe_validation_error(exc))
+            continue
+
+        row = validated.model_dump()
+        if lookup is not None:
+            try:
+                row["politician_id"] = lookup.resolve(row["politician_id"], row.pop("politician_name"))
+            except ValueError as exc:
+                _add_row_error(report, line, str(exc))
+                continue
+        conflict_key = loader.conflict_key(row)
+        if row.get("id") is None:
+            row["id"] = uuid.uuid4()
+
+        # An upsert cannot touch the same row twice; the last occurrence wins
+        key = (conflict_key, tuple(row[name] for name in conflict_key))
+        if key in rows:
+            previous_line = rows.pop(key)[0]
+            _add_row_error(report, previous_line, f"Superseded by line {line} with the same {', '.join(conflict_key)}")
+        rows[key] = (line, row, conflict_key)
+    return list(rows.values())
+
+
+def import_records(
+    db: Session,
+    entity: ImportEntity,
+    stream: BinaryIO,
+    import_format: ImportFormat,
+    batch_size: Optional[int] = None,
+    progress: Optional[Callable[[ImportReport], None]] = None,
+) -> ImportReport:
+    """
+    Import ``entity`` rows from ``stream``, committing chunk by chunk.
+    ``progress`` is called with the running report after each chunk.
+    """
+    spec = SPECS[entity]
+    loader = _ChunkLoader(db, spec)
+    lookup = PoliticianLookup(db) if issubclass(spec.row_schema, PoliticianReferenceRow) else None
+    report = ImportReport(entity=entity.value)
+    started = time.perf_counter()
+
+    for chunk in iter_chunks(read_records(stream, import_format), batch_size or settings.import_batch_size):
+        rows = _prepare_chunk(chunk, spec, loader, lookup, report)
+        if rows:
+            # Bulk statements bypass mapper events; report the writes to the change feed
+            record_changes(db, loader.load(rows, report))
+        db.commit()
+        report.elapsed_seconds = round(time.perf_counter() - started, 3)
+        logger.info(
+            f"Imported {report.total_rows} {entity.value} rows so far: {report.inserted} inserted, "
+            f"{report.updated} updated, {report.failed} failed"
+        )
+        if progress is not None:
+            progress(report)
+
+    report.elapsed_seconds = round(time.perf_counter() - started, 3)
+    return report
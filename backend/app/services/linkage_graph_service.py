@@ -0,0 +1,523 @@
+"""
+Political linkage graph.
+
+Linkages are held in process memory as an undirected graph between
+politicians and the entities they are linked to, so network queries never
+run recursive joins:
+
+- every politician and entity is interned to a dense integer node id (an
+  entity is keyed by ``linked_entity_id``, or by type and normalized name
+  when it has none; a linked entity whose id is a politician's is that
+  politician's node);
+- the edges are compiled into a CSR adjacency (NumPy ``indptr``/``indices``
+  arrays with per-edge strength, verification and linkage), each edge
+  stored in both directions.
+
+Neighbourhoods expand a whole BFS level per NumPy step; shared entities are
+an intersection of two adjacency slices; the strongest path is hop-bounded
+Bellman-Ford over ``-log(strength)`` (maximizing the product of strengths),
+one NumPy step per hop; centrality is
+weighted PageRank by power iteration, cached until the graph changes.
+
+The graph follows committed linkage and politician changes: the change feed
+patches the interned nodes and the edge table, and the CSR arrays are
+recompiled on the next read, once per burst of changes.
+"""
+from dataclasses import dataclass
+from functools import lru_cache
+import logging
+import math
+import threading
+import time
+from typing import Any, Dict, Iterable, List, Optional, Tuple
+import uuid
+
+import numpy as np
+from sqlalchemy import select
+from sqlalchemy.orm import Session
+
+from app.core.model_events import DELETE, ModelChange, subscribe
+from app.models.linkage import PoliticalLinkage
+from app.models.politician import Politician
+from app.schemas.network import (
+    CentralityEntry,
+    NetworkEdge,
+    NetworkNode,
+    NetworkResponse,
+    PathResponse,
+    SharedEntity,
+)
+
+logger = logging.getLogger(__name__)
+
+POLITICIAN = "politician"
+ENTITY = "entity"
+
+# Strengths below this are treated as this when costing paths
+MIN_PATH_STRENGTH = 0.01
+PAGERANK_DAMPING = 0.85
+PAGERANK_TOLERANCE = 1e-9
+PAGERANK_MAX_ITERATIONS = 100
+
+NodeKey = Tuple[Any, ...]
+
+
+@dataclass
+class NodeInfo:
+    """A politician or linked entity."""
+
+    key: NodeKey
+    kind: str
+    name: str
+    entity_type: Optional[str] = None
+
+    @property
+    def public_id(self) -> str:
+        """Stable identifier used in API responses."""
+        if self.kind == POLITICIAN:
+            return str(self.key[1])
+        return ":".join(str(part) for part in self.key)
+
+
+@dataclass(frozen=True)
+class EdgeRecord:
+    """One linkage between two interned nodes."""
+
+    source: int
+    target: int
+    strength: float
+    is_verified: bool
+    relationship_type: str
+
+
+class CompiledGraph:
+    """Immutable CSR adjacency; every undirected edge appears once from each end."""
+
+    def __init__(self, node_count: int, linkage_ids: List[uuid.UUID], records: List[EdgeRecord]):
+        self.node_count = node_count
+        self.linkage_ids = linkage_ids
+        self.records = records
+        edge_count = len(records)
+        sources = np.fromiter((record.source for record in records), dtype=np.int64, count=edge_count)
+        targets = np.fromiter((record.target for record in records), dtype=np.int64, count=edge_count)
+        strength = np.fromiter((record.strength for record in records), dtype=np.float64, count=edge_count)
+        verified = np.fromiter((record.is_verified for record in records), dtype=bool, count=edge_count)
+        edge_ids = np.arange(edge_count, dtype=np.int64)
+
+        owners = np.concatenate([sources, targets])
+        order = np.argsort(owners, kind="stable")
+        self.owner = owners[order]
+        self.indices = np.concatenate([targets, sources])[order]
+        self.strength = np.concatenate([strength, strength])[order]
+        self.verified = np.concatenate([verified, verified])[order]
+        self.edge = np.concatenate([edge_ids, edge_ids])[order]
+        self.indptr = np.zeros(node_count + 1, dtype=np.int64)
+        np.cumsum(np.bincount(self.owner, minlength=node_count), out=self.indptr[1:])
+        # Strongest paths minimize the sum of -log(strength)
+        self.path_cost = -np.log(np.maximum(self.strength, MIN_PATH_STRENGTH))
+        self._pagerank: Optional[np.ndarray] = None
+        self._lock = threading.Lock()
+
+    def positions(self, nodes: np.ndarray) -> np.ndarray:
+        """Adjacency positions of every edge leaving ``nodes``."""
+        starts = self.indptr[nodes]
+        lengths = self.indptr[nodes + 1] - starts
+        total = int(lengths.sum())
+        if not total:
+            return np.empty(0, dtype=np.int64)
+        offsets = np.repeat(starts - np.cumsum(lengths) + lengths, lengths)
+        return offsets + np.arange(total, dtype=np.int64)
+
+    def usable(self, positions: np.ndarray, min_strength: float, verified_only: bool) -> np.ndarray:
+        keep = self.strength[positions] >= min_strength
+        if verified_only:
+            keep &= self.verified[positions]
+        return positions[keep]
+
+    def weighted_degree(self) -> np.ndarray:
+        return np.bincount(self.owner, weights=self.strength, minlength=self.node_count)
+
+    def pagerank(self) -> np.ndarray:
+        """Strength-weighted PageRank of every node (computed once per compiled graph)."""
+        with self._lock:
+            if self._pagerank is None:
+                self._pagerank = self._compute_pagerank()
+            return self._pagerank
+
+    def _compute_pagerank(self) -> np.ndarray:
+        n = self.node_count
+        if not n:
+            return np.zeros(0)
+        out_weight = self.weighted_degree()
+        dangling = out_weight == 0
+        share = np.divide(
+            self.strength, out_weight[self.owner], out=np.zeros_like(self.strength), where=~dangling[self.owner]
+        )
+        rank = np.full(n, 1.0 / n)
+        for _ in range(PAGERANK_MAX_ITERATIONS):
+            spread = np.bincount(self.indices, weights=share * rank[self.owner], minlength=n)
+            updated = (1 - PAGERANK_DAMPING) / n + PAGERANK_DAMPING * (spread + rank[dangling].sum() / n)
+            converged = np.abs(updated - rank).sum() < PAGERANK_TOLERANCE
+            rank = updated
+            if converged:
+                break
+        return rank
+
+
+class LinkageGraph:
+    """Interned nodes and linkage edges, compiled to CSR on demand."""
+
+    def __init__(self):
+        self.nodes: List[NodeInfo] = []
+        self.node_index: Dict[NodeKey, int] = {}
+        self.edges: Dict[uuid.UUID, EdgeRecord] = {}
+        self._compiled: Optional[CompiledGraph] = None
+        self._lock = threading.RLock()
+
+    def __len__(self) -> int:
+        return len(self.edges)
+
+    # Building
+
+    def _intern(self, key: NodeKey, kind: str, name: str, entity_type: Optional[str] = None) -> int:
+        node = self.node_index.get(key)
+        if node is None:
+            node = len(self.nodes)
+            self.nodes.append(NodeInfo(key=key, kind=kind, name=name, entity_type=entity_type))
+            self.node_index[key] = node
+            self._compiled = None
+        elif kind == POLITICIAN:
+            self.nodes[node].name = name
+        return node
+
+    def _entity_node(self, values: Dict[str, Any]) -> int:
+        entity_id = values.get("linked_entity_id")
+        if entity_id is not None and (POLITICIAN, entity_id) in self.node_index:
+            return self.node_index[(POLITICIAN, entity_id)]
+        entity_type = values.get("linked_entity_type")
+        entity_type = getattr(entity_type, "value", entity_type)
+        name = values.get("linked_entity_name") or ""
+        if entity_id is not None:
+            key: NodeKey = (ENTITY, entity_id)
+        else:
+            key = (ENTITY, entity_type, " ".join(name.lower().split()))
+        return self._intern(key, ENTITY, name, entity_type)
+
+    def set_politician(self, politician_id: uuid.UUID, name: str) -> None:
+        with self._lock:
+            self._intern((POLITICIAN, politician_id), POLITICIAN, name)
+
+    def set_linkage(self, values: Dict[str, Any]) -> None:
+        """Add or replace a linkage from its column values."""
+        with self._lock:
+            politician_id = values["politician_id"]
+            source = self.node_index.get((POLITICIAN, politician_id))
+            if source is None:
+                source = self._intern((POLITICIAN, politician_id), POLITICIAN, "")
+            target = self._entity_node(values)
+            strength = values.get("strength")
+            self.edges[values["id"]] = EdgeRecord(
+                source=source,
+                target=target,
+                strength=float(strength) if strength is not None else 0.5,
+                is_verified=bool(values.get("is_verified")),
+                relationship_type=values.get("relationship_type") or "",
+            )
+            self._compiled = None
+
+    def remove_linkage(self, linkage_id: uuid.UUID) -> None:
+        with self._lock:
+            if self.edges.pop(linkage_id, None) is not None:
+                self._compiled = None
+
+    def remove_politician(self, politician_id: uuid.UUID) -> None:
+        """Drop a deleted politician's linkages (its node stays interned, unconnected)."""
+        with self._lock:
+            node = self.node_index.get((POLITICIAN, politician_id))
+            if node is None:
+                return
+            for linkage_id in [key for key, edge in self.edges.items() if node in (edge.source, edge.target)]:
+                del self.edges[linkage_id]
+            self._compiled = None
+
+    def load(self, politicians: Iterable[Tuple[uuid.UUID, str]], linkages: Iterable[Dict[str, Any]]) -> None:
+        with self._lock:
+            self.nodes, self.node_index, self.edges = [], {}, {}
+            for politician_id, name in politicians:
+                self._intern((POLITICIAN, politician_id), POLITICIAN, name)
+            for values in linkages:
+                self.set_linkage(values)
+            self._compiled = None
+
+    def compiled(self) -> CompiledGraph:
+        """The CSR arrays for the current edges, recompiled if anything changed."""
+        with self._lock:
+            if self._compiled is None:
+                started = time.perf_counter()
+                linkage_ids = list(self.edges)
+                self._compiled = CompiledGraph(len(self.nodes), linkage_ids, [self.edges[key] for key in linkage_ids])
+                elapsed_ms = (time.perf_counter() - started) * 1000
+                logger.debug(
+                    f"Compiled linkage graph: {len(self.nodes)} nodes, {len(self.edges)} edges in {elapsed_ms:.0f}ms"
+                )
+            return self._compiled
+
+    # Responses
+
+    def _node(self, node: int, hops: Optional[int] = None) -> NetworkNode:
+        info = self.nodes[node]
+        return NetworkNode(
+            id=info.public_id,
+            kind=info.kind,
+            name=info.name,
+            entity_type=info.entity_type,
+            politician_id=info.key[1] if info.kind == POLITICIAN else None,
+            hops=hops,
+        )
+
+    def _edge(self, graph: CompiledGraph, edge: int) -> NetworkEdge:
+        record = graph.records[edge]
+        return NetworkEdge(
+            linkage_id=graph.linkage_ids[edge],
+            source=self.nodes[record.source].public_id,
+            target=self.nodes[record.target].public_id,
+            relationship_type=record.relationship_type,
+            strength=record.strength,
+            is_verified=record.is_verified,
+        )
+
+    def _politician_node(self, politician_id: uuid.UUID) -> Optional[int]:
+        return self.node_index.get((POLITICIAN, politician_id))
+
+    # Queries
+
+    def neighbourhood(
+        self,
+        politician_id: uuid.UUID,
+        hops: int = 2,
+        min_strength: float = 0.0,
+        verified_only: bool = False,
+        max_nodes: int = 200,
+    ) -> Optional[NetworkResponse]:
+        """
+        Nodes within ``hops`` of a politician and the edges between them.
+        When a level would exceed ``max_nodes``, its most strongly connected
+        nodes are kept and the result is marked truncated.
+        """
+        graph = self.compiled()
+        center = self._politician_node(politician_id)
+        if center is None:
+            return None
+        depth = np.full(graph.node_count, -1, dtype=np.int32)
+        depth[center] = 0
+        selected = [np.array([center], dtype=np.int64)]
+        frontier = selected[0]
+        count = 1
+        truncated = False
+        for hop in range(1, hops + 1):
+            positions = graph.usable(graph.positions(frontier), min_strength, verified_only)
+            candidates = graph.indices[positions]
+            fresh = depth[candidates] < 0
+            candidates, strengths = candidates[fresh], graph.strength[positions][fresh]
+            if not len(candidates):
+                break
+            best = np.zeros(graph.node_count)
+            np.maximum.at(best, candidates, strengths)
+            reached = np.unique(candidates)
+            if count + len(reached) > max_nodes:
+                truncated = True
+                reached = reached[np.argsort(-best[reached], kind="stable")[:max_nodes - count]]
+            depth[reached] = hop
+            selected.append(reached)
+            count += len(reached)
+            frontier = reached
+            if truncated:
+                break
+
+        nodes = np.concatenate(selected)
+        positions = graph.usable(graph.positions(nodes), min_strength, verified_only)
+        positions = positions[depth[graph.indices[positions]] >= 0]
+        edges = np.unique(graph.edge[positions])
+        return NetworkResponse(
+            center=self._node(center, 0),
+            nodes=[self._node(int(node), int(depth[node])) for node in nodes],
+            edges=[self._edge(graph, int(edge)) for edge in edges],
+            truncated=truncated,
+        )
+
+    def shared_entities(
+        self,
+        politician_id: uuid.UUID,
+        other_id: uuid.UUID,
+        min_strength: float = 0.0,
+        verified_only: bool = False,
+    ) -> Optional[List[SharedEntity]]:
+        """Nodes linked to both politicians, strongest combined link first."""
+        graph = self.compiled()
+        first, second = self._politician_node(politician_id), self._politician_node(other_id)
+        if first is None or second is None:
+            return None
+
+        def strongest(node: int) -> Dict[int, float]:
+            positions = graph.usable(graph.positions(np.array([node])), min_strength, verified_only)
+            links: Dict[int, float] = {}
+            for neighbour, strength in zip(graph.indices[positions].tolist(), graph.strength[positions].tolist()):
+                links[neighbour] = max(strength, links.get(neighbour, 0.0))
+            return links
+
+        first_links, second_links = strongest(first), strongest(second)
+        shared = [
+            SharedEntity(
+                node=self._node(node),
+                strength=first_links[node],
+                other_strength=second_links[node],
+            )
+            for node in np.intersect1d(list(first_links), list(second_links)).tolist()
+        ]
+        shared.sort(key=lambda entity: -entity.strength * entity.other_strength)
+        return shared
+
+    def strongest_path(
+        self,
+        politician_id: uuid.UUID,
+        other_id: uuid.UUID,
+        min_strength: float = 0.0,
+        verified_only: bool = False,
+        max_hops: int = 6,
+    ) -> Optional[PathResponse]:
+        """
+        The path of at most ``max_hops`` links between two politicians
+        maximizing the product of link strengths.
+
+        Runs ``max_hops`` rounds of Bellman-Ford over the CSR arrays: round
+        ``h`` relaxes the edges leaving the nodes whose best cost improved in
+        round ``h - 1``, giving the cheapest cost of every node within ``h``
+        hops. (Dijkstra with one cost per node would discard a costlier but
+        shorter route that the hop limit needs.) Each round keeps the
+        parents of the nodes it improved, to rebuild the path.
+        """
+        graph = self.compiled()
+        source, target = self._politician_node(politician_id), self._politician_node(other_id)
+        if source is None or target is None:
+            return None
+        costs = np.full(graph.node_count, np.inf)
+        costs[source] = 0.0
+        # Per round: the improved nodes (sorted), and the node and edge each was reached from
+        rounds: List[Tuple[np.ndarray, np.ndarray, np.ndarray]] = []
+        frontier = np.array([source], dtype=np.int64)
+        for _ in range(max_hops):
+            positions = graph.usable(graph.positions(frontier), min_strength, verified_only)
+            if not len(positions):
+                break
+            reached = costs[graph.owner[positions]] + graph.path_cost[positions]
+            # Cheapest last, so it wins when one neighbour is reached by several edges
+            order = np.argsort(-reached, kind="stable")
+            positions, reached = positions[order], reached[order]
+            neighbours = graph.indices[positions]
+            best = np.full(graph.node_count, np.inf)
+            best_position = np.full(graph.node_count, -1, dtype=np.int64)
+            best[neighbours] = reached
+            best_position[neighbours] = positions
+            frontier = np.flatnonzero(best < costs)
+            if not len(frontier):
+                break
+            # Costs of this round are only written once every edge was relaxed
+            # against the previous round's, so a path never exceeds its hops
+            costs[frontier] = best[frontier]
+            chosen = best_position[frontier]
+            rounds.append((frontier, graph.owner[chosen], graph.edge[chosen]))
+        if not np.isfinite(costs[target]):
+            return PathResponse(found=False, nodes=[], edges=[], strength=0.0)
+
+        nodes, edges = [target], []
+        for improved, parents, edge_ids in reversed(rounds):
+            slot = np.searchsorted(improved, nodes[-1])
+            # A node not improved in a round was already reached by then
+            if slot < len(improved) and improved[slot] == nodes[-1]:
+                edges.append(int(edge_ids[slot]))
+                nodes.append(int(parents[slot]))
+        nodes.reverse()
+        edges.reverse()
+        return PathResponse(
+            found=True,
+            nodes=[self._node(node, hop) for hop, node in enumerate(nodes)],
+            edges=[self._edge(graph, edge) for edge in edges],
+            strength=round(math.exp(-costs[target]), 6),
+        )
+
+    def centrality(self, limit: int = 20, kind: Optional[str] = POLITICIAN) -> List[CentralityEntry]:
+        """Nodes (politicians by default) ranked by strength-weighted PageRank."""
+        graph = self.compiled()
+        rank = graph.pagerank()
+        if not len(rank):
+            return []
+        candidates = np.arange(graph.node_count)
+        if kind is not None:
+            kinds = np.fromiter(
+                (info.kind == kind for info in self.nodes[:graph.node_count]), dtype=bool, count=graph.node_count
+            )
+            candidates = candidates[kinds]
+        degree = graph.weighted_degree()
+        candidates = candidates[degree[candidates] > 0]
+        if len(candidates) > limit:
+            top = np.argpartition(-rank[candidates], limit - 1)[:limit]
+            candidates = candidates[top]
+        candidates = candidates[np.argsort(-rank[candidates], kind="stable")]
+        return [
+            CentralityEntry(
+                node=self._node(int(node)),
+                pagerank=float(rank[node]),
+                weighted_degree=float(degree[node]),
+                links=int(graph.indptr[node + 1] - graph.indptr[node]),
+            )
+            for node in candidates
+        ]
+
+
+LINKAGE_COLUMNS = (
+    PoliticalLinkage.id,
+    PoliticalLinkage.politician_id,
+    PoliticalLinkage.linked_entity_type,
+    PoliticalLinkage.linked_entity_id,
+    PoliticalLinkage.linked_entity_name,
+    PoliticalLinkage.relationship_type,
+    PoliticalLinkage.strength,
+    PoliticalLinkage.is_verified,
+)
+
+
+def load_linkage_graph(graph: "LinkageGraph", db: Session) -> None:
+    """Load every politician and linkage into ``graph``."""
+    started = time.perf_counter()
+    politicians = db.execute(select(Politician.id, Politician.name)).all()
+    linkages = [row._asdict() for row in db.execute(select(*LINKAGE_COLUMNS))]
+    graph.load(politicians, linkages)
+    graph.compiled()
+    elapsed_ms = (time.perf_counter() - started) * 1000
+    logger.info(f"Linkage graph ready: {len(graph.nodes)} nodes, {len(graph)} linkages in {elapsed_ms:.0f}ms")
+
+
+@lru_cache()
+def get_linkage_graph() -> LinkageGraph:
+    """Get the process-wide linkage graph."""
+    return LinkageGraph()
+
+
+def _on_model_changes(changes: List[ModelChange]) -> None:
+    graph = get_linkage_graph()
+    for change in changes:
+        if change.table == PoliticalLinkage.__tablename__:
+            if change.operation == DELETE:
+                graph.remove_linkage(change.values["id"])
+            elif {"id", "politician_id", "linked_entity_name"} <= change.values.keys():
+                graph.set_linkage(change.values)
+        elif change.table == Politician.__tablename__:
+            if change.operation == DELETE:
+                graph.remove_politician(change.values["id"])
+            elif change.values.get("name"):
+                graph.set_politician(change.values["id"], change.values["name"])
+
+
+def register_linkage_graph_listeners() -> None:
+    """Keep the linkage graph in step with committed changes."""
+    subscribe(_on_model_changes)
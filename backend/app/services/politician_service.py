@@ -0,0 +1,62 @@
+"""Politician read operations."""
+from typing import Optional
+import uuid
+
+from sqlalchemy import select
+from sqlalchemy.orm import Session
+
+from app.models.news import NewsMention
+from app.models.politician import Politician
+from app.schemas.common import CursorPage
+from app.schemas.news import NewsMentionResponse
+from app.schemas.politician import PoliticianCardResponse, PoliticianProfileResponse
+from app.utils.pagination import keyset_paginate
+from app.utils.query_options import FULL_PROFILE, LIST_CARD, politician_loading
+
+
+def get_politician_profile(db: Session, politician_id: uuid.UUID) -> Optional[PoliticianProfileResponse]:
+    """Load a politician with its public related records (6 queries)."""
+    stmt = (
+        select(Politician)
+        .options(*politician_loading(FULL_PROFILE))
+        .where(Politician.id == politician_id)
+    )
+    politician = db.scalars(stmt).one_or_none()
+    if politician is None:
+        return None
+    return PoliticianProfileResponse.model_validate(politician)
+
+
+def list_politicians(
+    db: Session,
+    party: Optional[str] = None,
+    county: Optional[str] = None,
+    cursor: Optional[str] = None,
+    limit: int = 20,
+) -> CursorPage[PoliticianCardResponse]:
+    """List active politicians as cards, highest transparency score first (1 query)."""
+    stmt = select(Politician).options(*politician_loading(LIST_CARD)).where(Politician.is_active.is_(True))
+    if party:
+        stmt = stmt.where(Politician.party == party)
+    if county:
+        stmt = stmt.where(Politician.county == county)
+    page = keyset_paginate(db, stmt, Politician.transparency_score, Politician.id, limit=limit, cursor=cursor)
+    return CursorPage[PoliticianCardResponse](
+        items=[PoliticianCardResponse.model_validate(politician) for politician in page.items],
+        next_cursor=page.next_cursor,
+    )
+
+
+def list_politician_news(
+    db: Session,
+    politician_id: uuid.UUID,
+    cursor: Optional[str] = None,
+    limit: int = 20,
+) -> CursorPage[NewsMentionResponse]:
+    """List a politician's news mentions, most recently published first."""
+    stmt = select(NewsMention).where(NewsMention.politician_id == politician_id)
+    page = keyset_paginate(db, stmt, NewsMention.published_at, NewsMention.id, limit=limit, cursor=cursor)
+    return CursorPage[NewsMentionResponse](
+        items=[NewsMentionResponse.model_validate(mention) for mention in page.items],
+        next_cursor=page.next_cursor,
+    )
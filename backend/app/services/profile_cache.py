@@ -0,0 +1,193 @@
+"""
+Two-tier cache for politician profiles.
+
+Serialized profiles are cached in a small in-process LRU (short TTL) in
+front of Redis. Each politician has a generation counter in Redis that is
+bumped whenever the politician or any of its profile records change, and
+Redis entries are keyed by that generation, so an invalidation makes every
+worker's next Redis read miss. Local entries remember the generation they
+were loaded for and are only served while it is still current, which costs
+one small Redis read per hit instead of the whole profile; a loader that
+finishes after an invalidation therefore cannot resurrect the old profile
+either. ETags combine the politician's ``updated_at`` with the generation.
+
+Misses are computed once: concurrent requests in a process share one load
+(``SingleFlight``), and across processes the loader holds a short Redis lock
+that other workers wait on before falling back to loading themselves.
+"""
+from dataclasses import dataclass
+from datetime import datetime
+from functools import lru_cache
+import logging
+import time
+from typing import Any, Callable, List, Optional, Tuple
+import uuid
+
+from pydantic import BaseModel
+
+from app.config import get_settings
+from app.core.model_events import ModelChange, subscribe
+from app.utils.cache import SingleFlight, TTLCache
+from app.utils.redis_client import get_redis
+
+logger = logging.getLogger(__name__)
+
+# Tables whose rows are part of a politician's profile
+PROFILE_TABLES = {
+    "politicians",
+    "legal_cases",
+    "promises",
+    "political_linkages",
+    "score_history",
+    "news_mentions",
+}
+
+GENERATION_KEY = "politician_profile:{politician_id}:generation"
+ENTRY_KEY = "politician_profile:{politician_id}:{generation}"
+LOCK_POLL_INTERVAL = 0.05
+
+
+@dataclass(frozen=True)
+class CachedProfile:
+    """A serialized profile and its entity tag."""
+
+    etag: str
+    body: bytes
+
+    def encode(self) -> bytes:
+        return self.etag.encode() + b"\n" + self.body
+
+    @classmethod
+    def decode(cls, raw: bytes) -> "CachedProfile":
+        etag, body = raw.split(b"\n", 1)
+        return cls(etag=etag.decode(), body=body)
+
+
+def make_etag(politician_id: uuid.UUID, updated_at: datetime, generation: int) -> str:
+    """Entity tag for a profile version."""
+    return f'"{politician_id.hex}-{int(updated_at.timestamp() * 1_000_000)}-{generation}"'
+
+
+class ProfileCache:
+    """In-process LRU in front of Redis, with single-flight loading."""
+
+    def __init__(
+        self,
+        client: Any,
+        local_maxsize: int = 1000,
+        local_ttl: float = 5.0,
+        shared_ttl: int = 3600,
+        lock_timeout: float = 5.0,
+    ):
+        self.client = client
+        # politician_id -> (generation, profile)
+        self.local: TTLCache[Tuple[int, CachedProfile]] = TTLCache(maxsize=local_maxsize, ttl=local_ttl)
+        self.shared_ttl = shared_ttl
+        self.lock_timeout = lock_timeout
+        self._flights = SingleFlight()
+
+    def generation(self, politician_id: uuid.UUID) -> int:
+        raw = self.client.get(GENERATION_KEY.format(politician_id=politician_id))
+        return int(raw) if raw is not None else 0
+
+    def get(
+        self,
+        politician_id: uuid.UUID,
+        loader: Callable[[], Optional[BaseModel]],
+    ) -> Optional[CachedProfile]:
+        """
+        Return the cached profile, loading it with ``loader`` on a miss.
+
+        ``loader`` returns the profile schema (with ``updated_at``) or None if
+        the politician does not exist; missing politicians are not cached.
+        """
+        generation = self.generation(politician_id)
+        local = self.local.get(politician_id)
+        if local is not None and local[0] == generation:
+            return local[1]
+
+        key = ENTRY_KEY.format(politician_id=politician_id, generation=generation)
+        return self._flights.do(key, lambda: self._load(politician_id, generation, key, loader))
+
+    def _load(
+        self,
+        politician_id: uuid.UUID,
+        generation: int,
+        key: str,
+        loader: Callable[[], Optional[BaseModel]],
+    ) -> Optional[CachedProfile]:
+        locked = False
+        raw = self.client.get(key)
+        if raw is None:
+            locked = self._acquire_lock(key)
+            if not locked:
+                raw = self._wait_for(key)
+        if raw is not None:
+            cached = CachedProfile.decode(raw)
+            self.local.set(politician_id, (generation, cached))
+            return cached
+
+        try:
+            profile = loader()
+            if profile is None:
+                return None
+            cached = CachedProfile(
+                etag=make_etag(politician_id, profile.updated_at, generation),
+                body=profile.model_dump_json().encode(),
+            )
+            self.client.set(key, cached.encode(), ex=self.shared_ttl)
+            self.local.set(politician_id, (generation, cached))
+            return cached
+        finally:
+            if locked:
+                self.client.delete(f"{key}:lock")
+
+    def _acquire_lock(self, key: str) -> bool:
+        return bool(self.client.set(f"{key}:lock", b"1", nx=True, px=int(self.lock_timeout * 1000)))
+
+    def _wait_for(self, key: str) -> Optional[bytes]:
+        """Wait for another worker holding the lock to fill ``key``."""
+        deadline = time.monotonic() + self.lock_timeout
+        while time.monotonic() < deadline:
+            time.sleep(LOCK_POLL_INTERVAL)
+            raw = self.client.get(key)
+            if raw is not None:
+                return raw
+        return None
+
+    def invalidate(self, politician_id: uuid.UUID) -> None:
+        """Move a politician to a new generation, orphaning cached entries."""
+        self.client.incr(GENERATION_KEY.format(politician_id=politician_id))
+        self.local.pop(politician_id)
+
+
+@lru_cache()
+def get_profile_cache() -> ProfileCache:
+    """Get the shared profile cache."""
+    settings = get_settings()
+    return ProfileCache(
+        get_redis(),
+        local_maxsize=settings.profile_cache_local_size,
+        local_ttl=settings.profile_cache_local_ttl_seconds,
+        shared_ttl=settings.profile_cache_ttl_seconds,
+    )
+
+
+def _on_model_changes(changes: List[ModelChange]) -> None:
+    politician_ids = {
+        politician_id
+        for change in changes
+        if change.table in PROFILE_TABLES
+        for politician_id in change.politician_ids()
+    }
+    cache = get_profile_cache()
+    for politician_id in politician_ids:
+        try:
+            cache.invalidate(politician_id)
+        except Exception:
+            logger.exception(f"Failed to invalidate cached profile {politician_id}")
+
+
+def register_profile_cache_listeners() -> None:
+    """Invalidate cached profiles when a politician or its records change."""
+    subscribe(_on_model_changes)
@@ -0,0 +1,35 @@
+"""Flagged report read operations."""
+from typing import Optional
+
+from sqlalchemy import select
+from sqlalchemy.orm import Session
+
+from app.models.politician import Politician
+from app.models.report import FlaggedReport, ReportStatus, ReportPriority
+from app.schemas.common import CursorPage
+from app.schemas.report import AlertResponse
+from app.utils.pagination import keyset_paginate
+from app.utils.query_options import with_politician_card
+
+
+def list_alerts(
+    db: Session,
+    status: Optional[ReportStatus] = None,
+    priority: Optional[ReportPriority] = None,
+    county: Optional[str] = None,
+    cursor: Optional[str] = None,
+    limit: int = 20,
+) -> CursorPage[AlertResponse]:
+    """List flagged reports as alerts, most recently reported first."""
+    stmt = select(FlaggedReport).options(*with_politician_card(FlaggedReport))
+    if status:
+        stmt = stmt.where(FlaggedReport.status == status)
+    if priority:
+        stmt = stmt.where(FlaggedReport.priority == priority)
+    if county:
+        stmt = stmt.join(FlaggedReport.politician).where(Politician.county == county)
+    page = keyset_paginate(db, stmt, FlaggedReport.date_reported, FlaggedReport.id, limit=limit, cursor=cursor)
+    return CursorPage[AlertResponse](
+        items=[AlertResponse.model_validate(report) for report in page.items],
+        next_cursor=page.next_cursor,
+    )
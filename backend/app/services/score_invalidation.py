@@ -0,0 +1,202 @@
+"""
+Incremental score invalidation.
+
+Committed changes to the models that feed the transparency score (delivered
+by ``app.core.model_events``) are turned into (politician, component) marks
+in a dirty set. Because marks are only published after commit, the flusher
+never recomputes from uncommitted data. A periodic flusher drains the dirty
+set and recomputes just those components via
+``scoring_service.recalculate_partial_scores``.
+"""
+from functools import lru_cache
+import logging
+import threading
+from typing import Any, Callable, Dict, Iterable, List, Optional, Set, Tuple
+import uuid
+
+from sqlalchemy.orm import Session
+
+from app.config import get_settings
+from app.core.model_events import UPDATE, ModelChange, subscribe
+from app.database import SessionLocal
+from app.services.scoring_service import COMPONENTS, recalculate_partial_scores
+from app.utils.redis_client import decode_members, get_redis
+
+logger = logging.getLogger(__name__)
+
+DirtyMark = Tuple[uuid.UUID, str]
+
+REDIS_DIRTY_KEY = "scores:dirty"
+
+# Table -> (score component, columns whose changes affect it)
+TRACKED_TABLES = {
+    "legal_cases": ("legal_record", ("politician_id", "status", "severity", "outcome")),
+    "promises": ("promise_fulfillment", ("politician_id", "status")),
+    "news_mentions": ("public_sentiment", ("politician_id", "sentiment", "published_at")),
+}
+
+
+class InProcessDirtySet:
+    """Dirty (politician, component) marks held in this process."""
+
+    def __init__(self):
+        self._marks: Set[DirtyMark] = set()
+        self._lock = threading.Lock()
+
+    def add_many(self, marks: Iterable[DirtyMark]) -> None:
+        with self._lock:
+            self._marks.update(marks)
+
+    def drain(self) -> Dict[uuid.UUID, Set[str]]:
+        with self._lock:
+            marks, self._marks = self._marks, set()
+        return _group_marks(marks)
+
+    def __len__(self) -> int:
+        return len(self._marks)
+
+
+class RedisDirtySet:
+    """Dirty marks stored in a Redis set, shared by every worker process."""
+
+    def __init__(self, client: Any, key: str = REDIS_DIRTY_KEY, batch_size: int = 1000):
+        self.client = client
+        self.key = key
+        self.batch_size = batch_size
+
+    def add_many(self, marks: Iterable[DirtyMark]) -> None:
+        members = [f"{politician_id}:{component}" for politician_id, component in marks]
+        if members:
+            self.client.sadd(self.key, *members)
+
+    def drain(self) -> Dict[uuid.UUID, Set[str]]:
+        marks: Set[DirtyMark] = set()
+        while True:
+            popped = self.client.spop(self.key, self.batch_size)
+            if not popped:
+                break
+            for member in decode_members(popped):
+                politician_id, component = member.split(":", 1)
+                marks.add((uuid.UUID(politician_id), component))
+        return _group_marks(marks)
+
+    def __len__(self) -> int:
+        return self.client.scard(self.key)
+
+
+def _group_marks(marks: Iterable[DirtyMark]) -> Dict[uuid.UUID, Set[str]]:
+    grouped: Dict[uuid.UUID, Set[str]] = {}
+    for politician_id, component in marks:
+        grouped.setdefault(politician_id, set()).add(component)
+    return grouped
+
+
+@lru_cache()
+def get_dirty_set():
+    """Get the configured dirty set (``memory`` or ``redis``)."""
+    if get_settings().score_dirty_set_backend == "redis":
+        return RedisDirtySet(get_redis())
+    return InProcessDirtySet()
+
+
+# Change feed subscriber
+
+def _dirty_marks(changes: Iterable[ModelChange]) -> Set[DirtyMark]:
+    marks: Set[DirtyMark] = set()
+    for change in changes:
+        if change.table in TRACKED_TABLES:
+            component, columns = TRACKED_TABLES[change.table]
+            if change.operation == UPDATE and not change.changed & set(columns):
+                continue
+            marks.update((politician_id, component) for politician_id in change.politician_ids())
+        elif change.table == "politicians" and change.operation == UPDATE:
+            if "is_active" in change.changed:
+                marks.update((change.politician_id, component) for component in COMPONENTS)
+            elif "education" in change.changed:
+                marks.add((change.politician_id, "credential_verification"))
+    return marks
+
+
+def _on_model_changes(changes: List[ModelChange]) -> None:
+    marks = _dirty_marks(changes)
+    if marks:
+        get_dirty_set().add_many(marks)
+
+
+def register_score_listeners() -> None:
+    """Feed committed evidence changes into the dirty set."""
+    subscribe(_on_model_changes)
+
+
+# Flushing
+
+def flush_dirty_scores(
+    db: Session,
+    dirty_set: Optional[Any] = None,
+) -> int:
+    """
+    Recompute the components currently marked dirty.
+
+    Returns the number of politicians rescored. Marks are re-queued if the
+    recomputation fails.
+    """
+    if dirty_set is None:
+        dirty_set = get_dirty_set()
+    dirty = dirty_set.drain()
+    if not dirty:
+        return 0
+    try:
+        return recalculate_partial_scores(db, dirty)
+    except Exception:
+        db.rollback()
+        dirty_set.add_many(
+            (politician_id, component)
+            for politician_id, components in dirty.items()
+            for component in components
+        )
+        raise
+
+
+class ScoreFlusher:
+    """Background thread that periodically flushes dirty score components."""
+
+    def __init__(
+        self,
+        interval_seconds: float,
+        session_factory: Callable[[], Session] = SessionLocal,
+        dirty_set: Optional[Any] = None,
+    ):
+        self.interval_seconds = interval_seconds
+        self.session_factory = session_factory
+        self.dirty_set = dirty_set
+        self._stop = threading.Event()
+        self._thread: Optional[threading.Thread] = None
+
+    def start(self) -> None:
+        if self._thread is not None:
+            return
+        self._stop.clear()
+        self._thread = threading.Thread(target=self._run, name="score-flusher", daemon=True)
+        self._thread.start()
+
+    def stop(self, timeout: Optional[float] = None) -> None:
+        self._stop.set()
+        if self._thread is not None:
+            self._thread.join(timeout)
+            self._thread = None
+
+    def flush_once(self) -> int:
+        db = self.session_factory()
+        try:
+            return flush_dirty_scores(db, self.dirty_set)
+        finally:
+            db.close()
+
+    def _run(self) -> None:
+        while not self._stop.wait(self.interval_seconds):
+            try:
+                rescored = self.flush_once()
+                if rescored:
+                    logger.info(f"Rescored {rescored} politicians from dirty components")
+            except Exception:
+                logger.exception("Dirty score flush failed")
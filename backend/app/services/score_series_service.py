@@ -0,0 +1,382 @@
+"""
+Score time series.
+
+``score_history`` keeps a full row, JSONB breakdown included, for every
+recalculation, which is too much to chart years of history from. The score
+series keeps the transparency score and its components as typed ``REAL``
+columns in ``score_series``, at four resolutions:
+
+* ``raw``: one point per recalculation that changed the score or a
+  component; recalculations that changed nothing are dropped on write;
+* ``day``, ``week`` and ``month``: rollups holding the number of points
+  rolled in, their mean, minimum, maximum and last score, and mean
+  components.
+
+``compact_score_series`` rolls raw points older than
+``score_series_raw_days`` into days, days older than
+``score_series_daily_days`` into weeks and weeks older than
+``score_series_weekly_days`` into months. Each step is one statement that
+deletes the finer rows and upserts their rollups, and only whole periods are
+rolled, so the resolutions always cover disjoint spans of time (a week
+straddling two months rolls into the month it starts in). It also
+prunes ``score_history`` rows past ``score_history_retention_days``, keeping
+each politician's latest (partial rescoring reuses its breakdown).
+
+Charts read every resolution in the requested range and resample the points
+into calendar-aligned day, week or month buckets with NumPy.
+"""
+from datetime import datetime, timedelta, timezone
+import logging
+from typing import Any, Dict, Iterable, List, Optional, Tuple
+import uuid
+
+import numpy as np
+from sqlalchemy import delete, exists, func, select, text
+from sqlalchemy.dialects.postgresql import insert
+from sqlalchemy.orm import Session, aliased
+
+from app.config import get_settings
+from app.core.exceptions import NotFoundException
+from app.core.model_events import DELETE, ModelChange, record_changes
+from app.models.politician import Politician
+from app.models.score import ScoreHistory, ScoreSeriesPoint, SeriesResolution
+from app.schemas.score import ScoreSeriesBucket, ScoreSeriesResponse
+from app.utils.constants import SCORE_COMPONENT_WEIGHTS
+
+settings = get_settings()
+logger = logging.getLogger(__name__)
+
+COMPONENTS = tuple(SCORE_COMPONENT_WEIGHTS)
+CHART_INTERVALS = (SeriesResolution.DAY, SeriesResolution.WEEK, SeriesResolution.MONTH)
+
+
+def period_start(moment: datetime, resolution: SeriesResolution) -> datetime:
+    """Start (UTC) of the ``resolution`` period containing ``moment``; weeks start on Monday."""
+    moment = moment.astimezone(timezone.utc)
+    if resolution == SeriesResolution.RAW:
+        return moment
+    day = moment.replace(hour=0, minute=0, second=0, microsecond=0)
+    if resolution == SeriesResolution.DAY:
+        return day
+    if resolution == SeriesResolution.WEEK:
+        return day - timedelta(days=day.weekday())
+    return day.replace(day=1)
+
+
+# Writing
+
+def _point_values(score: Any, breakdown: Dict[str, Any]) -> Tuple[Optional[float], ...]:
+    """Score and components as compared for deduplication (REAL keeps about 7 digits)."""
+
+    def rounded(value: Any) -> Optional[float]:
+        return None if value is None else round(float(value), 2)
+
+    return (rounded(score), *(rounded(breakdown.get(name)) for name in COMPONENTS))
+
+
+def latest_points(db: Session, politician_ids: Iterable[uuid.UUID]) -> Dict[uuid.UUID, Tuple[Optional[float], ...]]:
+    """Each politician's most recent series values, at whatever resolution they now live."""
+    politician_ids = list(politician_ids)
+    if not politician_ids:
+        return {}
+    stmt = (
+        select(ScoreSeriesPoint)
+        .where(ScoreSeriesPoint.politician_id.in_(politician_ids))
+        .order_by(ScoreSeriesPoint.politician_id, ScoreSeriesPoint.period_start.desc())
+        .distinct(ScoreSeriesPoint.politician_id)
+    )
+    return {
+        point.politician_id: _point_values(
+            point.score_last, {name: getattr(point, name) for name in COMPONENTS}
+        )
+        for point in db.scalars(stmt)
+    }
+
+
+def append_score_points(db: Session, history_rows: List[Dict[str, Any]]) -> int:
+    """
+    Add raw series points for new ``score_history`` rows, skipping rows that
+    repeat their politician's latest values. Returns the number added.
+    """
+    if not history_rows:
+        return 0
+    latest = latest_points(db, {row["politician_id"] for row in history_rows})
+    points = []
+    for row in sorted(history_rows, key=lambda row: row["calculated_at"]):
+        values = _point_values(row["transparency_score"], row["score_breakdown"] or {})
+        if latest.get(row["politician_id"]) == values:
+            continue
+        latest[row["politician_id"]] = values
+        score = values[0]
+        points.append({
+            "politician_id": row["politician_id"],
+            "resolution": SeriesResolution.RAW,
+            "period_start": row["calculated_at"],
+            "samples": 1,
+            "score_avg": score,
+            "score_min": score,
+            "score_max": score,
+            "score_last": score,
+            **dict(zip(COMPONENTS, values[1:])),
+        })
+    if points:
+        db.execute(insert(ScoreSeriesPoint).on_conflict_do_nothing(), points)
+    return len(points)
+
+
+# Compaction
+
+def _weighted(column: str, samples: str = "samples") -> str:
+    return f"sum({column} * {samples}) / sum({samples}) FILTER (WHERE {column} IS NOT NULL)"
+
+
+def _merged(column: str) -> str:
+    # Mean of the existing rollup and the incoming one, or whichever is known
+    return (
+        f"coalesce((score_series.{column} * score_series.samples + EXCLUDED.{column} * EXCLUDED.samples)"
+        f" / (score_series.samples + EXCLUDED.samples), EXCLUDED.{column}, score_series.{column})"
+    )
+
+
+ROLLUP_SQL = text(f"""
+    WITH moved AS (
+        DELETE FROM score_series
+        WHERE resolution = :source AND period_start < :cutoff
+        RETURNING *
+    )
+    INSERT INTO score_series (
+        politician_id, resolution, period_start, samples,
+        score_avg, score_min, score_max, score_last, {", ".join(COMPONENTS)}
+    )
+    SELECT
+        politician_id,
+        :target,
+        date_trunc(:unit, period_start AT TIME ZONE 'UTC') AT TIME ZONE 'UTC',
+        sum(samples),
+        sum(score_avg * samples) / sum(samples),
+        min(score_min),
+        max(score_max),
+        (array_agg(score_last ORDER BY period_start DESC))[1],
+        {", ".join(_weighted(name) for name in COMPONENTS)}
+    FROM moved
+    GROUP BY 1, 3
+    ON CONFLICT (politician_id, resolution, period_start) DO UPDATE SET
+        samples = score_series.samples + EXCLUDED.samples,
+        score_avg = {_merged("score_avg")},
+        score_min = least(score_series.score_min, EXCLUDED.score_min),
+        score_max = greatest(score_series.score_max, EXCLUDED.score_max),
+        score_last = EXCLUDED.score_last,
+        {", ".join(f"{name} = {_merged(name)}" for name in COMPONENTS)}
+""")
+
+
+def rollup_steps() -> List[Tuple[SeriesResolution, SeriesResolution, int]]:
+    """(source resolution, target resolution, age in days at which source rows roll up)."""
+    return [
+        (SeriesResolution.RAW, SeriesResolution.DAY, settings.score_series_raw_days),
+        (SeriesResolution.DAY, SeriesResolution.WEEK, settings.score_series_daily_days),
+        (SeriesResolution.WEEK, SeriesResolution.MONTH, settings.score_series_weekly_days),
+    ]
+
+
+def roll_up_score_series(db: Session, now: Optional[datetime] = None) -> Dict[str, int]:
+    """Roll each resolution's old points into the next; returns the rows rolled per resolution."""
+    now = now or datetime.now(timezone.utc)
+    rolled: Dict[str, int] = {}
+    for source, target, age_days in rollup_steps():
+        # Only whole target periods roll, so a period never holds two resolutions
+        cutoff = period_start(now - timedelta(days=age_days), target)
+        count = db.scalar(
+            select(func.count()).select_from(ScoreSeriesPoint).where(
+                ScoreSeriesPoint.resolution == source, ScoreSeriesPoint.period_start < cutoff
+            )
+        )
+        if count:
+            db.execute(ROLLUP_SQL, {"source": source.name, "target": target.name, "unit": target.value, "cutoff": cutoff})
+        rolled[source.value] = count or 0
+    return rolled
+
+
+def prune_score_history(db: Session, now: Optional[datetime] = None) -> int:
+    """Delete ``score_history`` rows past retention except each politician's latest; returns the count."""
+    if settings.score_history_retention_days <= 0:
+        return 0
+    now = now or datetime.now(timezone.utc)
+    cutoff = now - timedelta(days=settings.score_history_retention_days)
+    newer = aliased(ScoreHistory)
+    stmt = (
+        delete(ScoreHistory)
+        .where(
+            ScoreHistory.calculated_at < cutoff,
+            exists().where(
+                newer.politician_id == ScoreHistory.politician_id,
+                newer.calculated_at > ScoreHistory.calculated_at,
+            ),
+        )
+        .returning(ScoreHistory.id, ScoreHistory.politician_id)
+    )
+    deleted = db.execute(stmt).all()
+    # Bulk statements bypass mapper events; report the deletes to the change feed
+    record_changes(
+        db,
+        [
+            ModelChange(ScoreHistory.__tablename__, DELETE, {"id": row_id, "politician_id": politician_id})
+            for row_id, politician_id in deleted
+        ],
+    )
+    return len(deleted)
+
+
+def compact_score_series(db: Session, now: Optional[datetime] = None, commit: bool = True) -> Dict[str, int]:
+    """Run the retention policy: roll up old series points and prune old score history."""
+    now = now or datetime.now(timezone.utc)
+    result = roll_up_score_series(db, now)
+    result["score_history_pruned"] = prune_score_history(db, now)
+    if commit:
+        db.commit()
+    logger.info(f"Compacted score series: {result}")
+    return result
+
+
+# Charting
+
+def bucket_edges(since: datetime, until: datetime, interval: SeriesResolution) -> np.ndarray:
+    """Epoch seconds of every ``interval`` period start from ``since``'s period up to ``until``."""
+    first = np.datetime64(period_start(since, interval).replace(tzinfo=None), "D")
+    # ``until`` is exclusive
+    last = np.datetime64((until.astimezone(timezone.utc) - timedelta(microseconds=1)).replace(tzinfo=None), "D")
+    if interval == SeriesResolution.MONTH:
+        edges = np.arange(first.astype("datetime64[M]"), last.astype("datetime64[M]") + 1).astype("datetime64[D]")
+    else:
+        step = 7 if interval == SeriesResolution.WEEK else 1
+        edges = np.arange(first, last + 1, step)
+    return edges.astype("datetime64[s]").astype(np.int64)
+
+
+def resample(points: Dict[str, np.ndarray], edges: np.ndarray) -> Dict[str, np.ndarray]:
+    """
+    Combine series points into buckets starting at ``edges``.
+
+    ``points`` holds equal-length arrays sorted by ``time`` (epoch seconds):
+    ``samples``, ``avg``, ``min``, ``max``, ``last`` and one per component.
+    Means are weighted by samples; ``score`` is the last score at or before
+    each bucket's end, carried from earlier points (NaN before the first).
+    """
+    n = len(edges)
+    idx = np.searchsorted(edges, points["time"], side="right") - 1
+    earlier = np.flatnonzero(idx < 0)
+    initial = points["last"][earlier[-1]] if len(earlier) else np.nan
+    keep = (idx >= 0) & (idx < n)
+    idx = idx[keep]
+    samples = points["samples"][keep]
+    out: Dict[str, np.ndarray] = {"samples": np.bincount(idx, weights=samples, minlength=n)}
+    has = out["samples"] > 0
+    with np.errstate(invalid="ignore", divide="ignore"):
+        out["average"] = np.bincount(idx, weights=samples * points["avg"][keep], minlength=n) / out["samples"]
+        for name in COMPONENTS:
+            values = points[name][keep]
+            known = ~np.isnan(values)
+            out[name] = (
+                np.bincount(idx[known], weights=(samples * values)[known], minlength=n)
+                / np.bincount(idx[known], weights=samples[known], minlength=n)
+            )
+
+    out["minimum"] = np.full(n, np.nan)
+    out["maximum"] = np.full(n, np.nan)
+    last = np.full(n, np.nan)
+    if len(idx):
+        starts = np.flatnonzero(np.r_[True, idx[1:] != idx[:-1]])
+        ends = np.r_[starts[1:], len(idx)] - 1
+        out["minimum"][idx[starts]] = np.minimum.reduceat(points["min"][keep], starts)
+        out["maximum"][idx[starts]] = np.maximum.reduceat(points["max"][keep], starts)
+        last[idx[starts]] = points["last"][keep][ends]
+    # Carry the last known score through empty buckets
+    carried = np.maximum.accumulate(np.where(has, np.arange(n), -1))
+    out["score"] = np.where(carried >= 0, last[np.maximum(carried, 0)], initial)
+    return out
+
+
+def choose_interval(since: datetime, until: datetime) -> SeriesResolution:
+    """The finest chart interval giving at most ``score_series_max_points`` buckets."""
+    for interval in CHART_INTERVALS[:-1]:
+        if len(bucket_edges(since, until, interval)) <= settings.score_series_max_points:
+            return interval
+    return CHART_INTERVALS[-1]
+
+
+def _optional(value: float) -> Optional[float]:
+    return None if np.isnan(value) else round(float(value), 2)
+
+
+def _as_utc(moment: datetime) -> datetime:
+    return moment.replace(tzinfo=timezone.utc) if moment.tzinfo is None else moment.astimezone(timezone.utc)
+
+
+def load_score_series(
+    db: Session,
+    politician_id: uuid.UUID,
+    since: Optional[datetime] = None,
+    until: Optional[datetime] = None,
+    interval: Optional[SeriesResolution] = None,
+) -> ScoreSeriesResponse:
+    """
+    A politician's score series in ``[since, until)``, bucketed by
+    ``interval`` (chosen from the range if not given). Defaults to the whole
+    history up to now.
+    """
+    if db.scalar(select(Politician.id).where(Politician.id == politician_id)) is None:
+        raise NotFoundException("Politician not found")
+    until = _as_utc(until) if until is not None else datetime.now(timezone.utc)
+    since = _as_utc(since) if since is not None else None
+
+    columns = [
+        ScoreSeriesPoint.period_start, ScoreSeriesPoint.samples, ScoreSeriesPoint.score_avg,
+        ScoreSeriesPoint.score_min, ScoreSeriesPoint.score_max, ScoreSeriesPoint.score_last,
+        *(getattr(ScoreSeriesPoint, name) for name in COMPONENTS),
+    ]
+    base = select(*columns).where(ScoreSeriesPoint.politician_id == politician_id)
+    stmt = base.where(ScoreSeriesPoint.period_start < until).order_by(ScoreSeriesPoint.period_start)
+    rows = []
+    if since is not None:
+        stmt = stmt.where(ScoreSeriesPoint.period_start >= since)
+        # The point before the range supplies the score in effect when it starts
+        rows = db.execute(
+            base.where(ScoreSeriesPoint.period_start < since).order_by(ScoreSeriesPoint.period_start.desc()).limit(1)
+        ).all()
+    rows += db.execute(stmt).all()
+    if since is None:
+        if not rows:
+            return ScoreSeriesResponse(politician_id=politician_id, interval=(interval or SeriesResolution.DAY).value, points=[])
+        since = rows[0][0]
+    if since >= until:
+        return ScoreSeriesResponse(politician_id=politician_id, interval=(interval or SeriesResolution.DAY).value, points=[])
+
+    interval = interval or choose_interval(since, until)
+    edges = bucket_edges(since, until, interval)
+    table = np.array([row[1:] for row in rows], dtype=np.float64).reshape(len(rows), 5 + len(COMPONENTS))
+    points = {
+        "time": np.array([row[0].timestamp() for row in rows], dtype=np.float64),
+        "samples": table[:, 0],
+        "avg": table[:, 1],
+        "min": table[:, 2],
+        "max": table[:, 3],
+        "last": table[:, 4],
+        **{name: table[:, 5 + i] for i, name in enumerate(COMPONENTS)},
+    }
+    buckets = resample(points, edges)
+    return ScoreSeriesResponse(
+        politician_id=politician_id,
+        interval=interval.value,
+        points=[
+            ScoreSeriesBucket(
+                period_start=datetime.fromtimestamp(int(edge), timezone.utc),
+                samples=int(buckets["samples"][i]),
+                score=_optional(buckets["score"][i]),
+                average=_optional(buckets["average"][i]),
+                minimum=_optional(buckets["minimum"][i]),
+                maximum=_optional(buckets["maximum"][i]),
+                components={name: _optional(buckets[name][i]) for name in COMPONENTS},
+            )
+            for i, edge in enumerate(edges.tolist())
+        ],
+    )
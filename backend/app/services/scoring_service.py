@@ -0,0 +1,528 @@
+"""
+Transparency scoring.
+
+Scores are computed column-wise: evidence for every politician is loaded with
+a handful of grouped aggregate queries into NumPy arrays, the weighted
+formula from the backend guide is applied as array operations, and the
+results are written back with one bulk insert into ``score_history`` and one
+bulk update of ``politicians``; scores that changed are also appended to the
+compact score series (see ``score_series_service``).
+"""
+from dataclasses import dataclass
+from datetime import datetime, timedelta, timezone
+from typing import Any, Dict, Iterable, List, Optional, Sequence, Set
+import uuid
+
+import numpy as np
+from sqlalchemy import case, func, insert, select, update
+from sqlalchemy.orm import Session
+
+from app.core.model_events import INSERT, UPDATE, ModelChange, record_changes
+from app.models.case import LegalCase, CaseStatus, CaseSeverity
+from app.models.news import NewsMention
+from app.models.politician import Politician
+from app.models.promise import Promise, PromiseStatus
+from app.models.score import ScoreHistory
+from app.services.score_series_service import append_score_points
+from app.utils.constants import (
+    SCORE_COMPONENT_WEIGHTS,
+    NEUTRAL_COMPONENT_SCORE,
+    CASE_SEVERITY_WEIGHTS,
+    DEFAULT_CASE_SEVERITY_WEIGHT,
+    ONGOING_CASE_DEDUCTION_FACTOR,
+    SENTIMENT_WINDOW_DAYS,
+    CONFIDENCE_SATURATION,
+    SCORE_CALCULATION_METHOD,
+)
+
+COMPONENTS = tuple(SCORE_COMPONENT_WEIGHTS)
+
+# Evidence count behind each component: (factors_analyzed key, aggregate field)
+COMPONENT_FACTORS = {
+    "legal_record": ("legal_cases", "case_count"),
+    "promise_fulfillment": ("promises", "promise_total"),
+    "public_sentiment": ("news_mentions", "sentiment_count"),
+    "credential_verification": ("credentials", "credential_total"),
+}
+
+
+@dataclass
+class ScoreAggregates:
+    """Per-politician evidence counts, one array element per politician."""
+
+    politician_ids: List[uuid.UUID]
+    case_deductions: np.ndarray
+    case_count: np.ndarray
+    promise_total: np.ndarray
+    promise_fulfilled: np.ndarray
+    promise_partial: np.ndarray
+    sentiment_avg: np.ndarray
+    sentiment_count: np.ndarray
+    credential_verified: np.ndarray
+    credential_total: np.ndarray
+
+    @classmethod
+    def empty(cls, politician_ids: List[uuid.UUID]) -> "ScoreAggregates":
+        n = len(politician_ids)
+        return cls(
+            politician_ids=politician_ids,
+            case_deductions=np.zeros(n),
+            case_count=np.zeros(n),
+            promise_total=np.zeros(n),
+            promise_fulfilled=np.zeros(n),
+            promise_partial=np.zeros(n),
+            sentiment_avg=np.zeros(n),
+            sentiment_count=np.zeros(n),
+            credential_verified=np.zeros(n),
+            credential_total=np.zeros(n),
+        )
+
+    def __len__(self) -> int:
+        return len(self.politician_ids)
+
+
+def _severity_weight_expression():
+    """SQL expression for the deduction weight of a case's severity."""
+    return case(
+        *[
+            (LegalCase.severity == severity, CASE_SEVERITY_WEIGHTS[severity.value])
+            for severity in CaseSeverity
+        ],
+        else_=DEFAULT_CASE_SEVERITY_WEIGHT,
+    )
+
+
+def _is_guilty(outcome: Optional[str]) -> bool:
+    return (outcome or "").strip().lower() == "guilty"
+
+
+def _as_utc(value: datetime) -> datetime:
+    return value if value.tzinfo else value.replace(tzinfo=timezone.utc)
+
+
+def _credential_counts(education: Any) -> tuple:
+    """Return (verified, total) credential claims from an education JSONB value."""
+    if isinstance(education, dict):
+        education = [education]
+    if not isinstance(education, list):
+        return 0, 0
+    claims = [entry for entry in education if isinstance(entry, dict)]
+    verified = sum(1 for entry in claims if entry.get("verified") is True)
+    return verified, len(claims)
+
+
+def _scatter(rows: Iterable[Sequence], index: Dict[uuid.UUID, int], columns: List[np.ndarray]) -> None:
+    """Write grouped query rows ``(politician_id, *values)`` into columnar arrays."""
+    for politician_id, *values in rows:
+        position = index.get(politician_id)
+        if position is None:
+            continue
+        for column, value in zip(columns, values):
+            column[position] = float(value or 0)
+
+
+def load_score_aggregates(
+    db: Session,
+    politician_ids: Optional[Iterable[uuid.UUID]] = None,
+    now: Optional[datetime] = None,
+    components: Optional[Iterable[str]] = None,
+) -> ScoreAggregates:
+    """
+    Load scoring evidence for active politicians into columnar arrays.
+
+    Runs one query per evidence table, each grouped by politician, regardless
+    of how many politicians are scored. Pass ``politician_ids`` to restrict
+    the load to a subset and ``components`` to skip the queries feeding the
+    other score components.
+    """
+    now = now or datetime.now(timezone.utc)
+    id_filter = list(politician_ids) if politician_ids is not None else None
+    components = set(components) if components is not None else set(COMPONENTS)
+
+    stmt = select(Politician.id, Politician.education).where(Politician.is_active.is_(True))
+    if id_filter is not None:
+        stmt = stmt.where(Politician.id.in_(id_filter))
+    politicians = db.execute(stmt.order_by(Politician.id)).all()
+
+    aggregates = ScoreAggregates.empty([row.id for row in politicians])
+    if not politicians:
+        return aggregates
+    index = {politician_id: position for position, politician_id in enumerate(aggregates.politician_ids)}
+
+    if "credential_verification" in components:
+        for position, row in enumerate(politicians):
+            verified, total = _credential_counts(row.education)
+            aggregates.credential_verified[position] = verified
+            aggregates.credential_total[position] = total
+
+    if "legal_record" in components:
+        _load_case_aggregates(db, aggregates, index, id_filter)
+    if "promise_fulfillment" in components:
+        _load_promise_aggregates(db, aggregates, index, id_filter)
+    if "public_sentiment" in components:
+        _load_sentiment_aggregates(db, aggregates, index, id_filter, now)
+
+    return aggregates
+
+
+def _load_case_aggregates(
+    db: Session,
+    aggregates: ScoreAggregates,
+    index: Dict[uuid.UUID, int],
+    id_filter: Optional[List[uuid.UUID]],
+) -> None:
+    weight = _severity_weight_expression()
+    deduction = case(
+        (
+            (LegalCase.status == CaseStatus.RESOLVED)
+            & (func.lower(func.trim(LegalCase.outcome)) == "guilty"),
+            weight,
+        ),
+        (LegalCase.status == CaseStatus.ONGOING, weight * ONGOING_CASE_DEDUCTION_FACTOR),
+        else_=0.0,
+    )
+    cases_stmt = select(
+        LegalCase.politician_id,
+        func.sum(deduction),
+        func.count(LegalCase.id),
+    ).group_by(LegalCase.politician_id)
+    if id_filter is not None:
+        cases_stmt = cases_stmt.where(LegalCase.politician_id.in_(id_filter))
+    _scatter(db.execute(cases_stmt), index, [aggregates.case_deductions, aggregates.case_count])
+
+
+def _load_promise_aggregates(
+    db: Session,
+    aggregates: ScoreAggregates,
+    index: Dict[uuid.UUID, int],
+    id_filter: Optional[List[uuid.UUID]],
+) -> None:
+    promises_stmt = select(
+        Promise.politician_id,
+        func.count(Promise.id),
+        func.sum(case((Promise.status == PromiseStatus.FULFILLED, 1), else_=0)),
+        func.sum(case((Promise.status == PromiseStatus.PARTIALLY_FULFILLED, 1), else_=0)),
+    ).group_by(Promise.politician_id)
+    if id_filter is not None:
+        promises_stmt = promises_stmt.where(Promise.politician_id.in_(id_filter))
+    _scatter(
+        db.execute(promises_stmt),
+        index,
+        [aggregates.promise_total, aggregates.promise_fulfilled, aggregates.promise_partial],
+    )
+
+
+def _load_sentiment_aggregates(
+    db: Session,
+    aggregates: ScoreAggregates,
+    index: Dict[uuid.UUID, int],
+    id_filter: Optional[List[uuid.UUID]],
+    now: datetime,
+) -> None:
+    news_stmt = (
+        select(
+            NewsMention.politician_id,
+            func.avg(NewsMention.sentiment),
+            func.count(NewsMention.sentiment),
+        )
+        .where(NewsMention.published_at >= now - timedelta(days=SENTIMENT_WINDOW_DAYS))
+        .where(NewsMention.sentiment.is_not(None))
+        .group_by(NewsMention.politician_id)
+    )
+    if id_filter is not None:
+        news_stmt = news_stmt.where(NewsMention.politician_id.in_(id_filter))
+    _scatter(db.execute(news_stmt), index, [aggregates.sentiment_avg, aggregates.sentiment_count])
+
+
+def aggregates_from_politician(politician: Politician, now: Optional[datetime] = None) -> ScoreAggregates:
+    """Build single-politician aggregates by walking its loaded ORM relationships."""
+    now = now or datetime.now(timezone.utc)
+    since = now - timedelta(days=SENTIMENT_WINDOW_DAYS)
+    aggregates = ScoreAggregates.empty([politician.id])
+
+    for legal_case in politician.cases:
+        severity = legal_case.severity.value if legal_case.severity else None
+        weight = CASE_SEVERITY_WEIGHTS.get(severity, DEFAULT_CASE_SEVERITY_WEIGHT)
+        if legal_case.status == CaseStatus.RESOLVED and _is_guilty(legal_case.outcome):
+            aggregates.case_deductions[0] += weight
+        elif legal_case.status == CaseStatus.ONGOING:
+            aggregates.case_deductions[0] += weight * ONGOING_CASE_DEDUCTION_FACTOR
+        aggregates.case_count[0] += 1
+
+    for promise in politician.promises:
+        aggregates.promise_total[0] += 1
+        if promise.status == PromiseStatus.FULFILLED:
+            aggregates.promise_fulfilled[0] += 1
+        elif promise.status == PromiseStatus.PARTIALLY_FULFILLED:
+            aggregates.promise_partial[0] += 1
+
+    sentiments = [
+        float(mention.sentiment)
+        for mention in politician.news_mentions
+        if mention.sentiment is not None and _as_utc(mention.published_at) >= since
+    ]
+    if sentiments:
+        aggregates.sentiment_avg[0] = sum(sentiments) / len(sentiments)
+        aggregates.sentiment_count[0] = len(sentiments)
+
+    verified, total = _credential_counts(politician.education)
+    aggregates.credential_verified[0] = verified
+    aggregates.credential_total[0] = total
+    return aggregates
+
+
+def compute_component_scores(
+    aggregates: ScoreAggregates,
+    components: Optional[Iterable[str]] = None,
+) -> Dict[str, np.ndarray]:
+    """Compute each 0-100 score component for every politician at once."""
+    computed = _compute_all_components(aggregates)
+    if components is None:
+        return computed
+    return {name: computed[name] for name in components}
+
+
+def _compute_all_components(aggregates: ScoreAggregates) -> Dict[str, np.ndarray]:
+    legal_record = np.clip(100.0 - aggregates.case_deductions, 0.0, 100.0)
+
+    promise_fulfillment = np.full(len(aggregates), NEUTRAL_COMPONENT_SCORE)
+    has_promises = aggregates.promise_total > 0
+    promise_fulfillment[has_promises] = (
+        aggregates.promise_fulfilled[has_promises] * 100.0
+        + aggregates.promise_partial[has_promises] * 50.0
+    ) / aggregates.promise_total[has_promises]
+
+    public_sentiment = np.where(
+        aggregates.sentiment_count > 0,
+        (np.clip(aggregates.sentiment_avg, -1.0, 1.0) + 1.0) * 50.0,
+        NEUTRAL_COMPONENT_SCORE,
+    )
+
+    credential_verification = np.full(len(aggregates), NEUTRAL_COMPONENT_SCORE)
+    has_claims = aggregates.credential_total > 0
+    credential_verification[has_claims] = (
+        aggregates.credential_verified[has_claims] / aggregates.credential_total[has_claims] * 100.0
+    )
+
+    return {
+        "legal_record": legal_record,
+        "promise_fulfillment": promise_fulfillment,
+        "public_sentiment": public_sentiment,
+        "credential_verification": credential_verification,
+    }
+
+
+def compute_transparency_scores(components: Dict[str, np.ndarray]) -> np.ndarray:
+    """Combine score components with the configured weights."""
+    total = sum(components[name] * weight for name, weight in SCORE_COMPONENT_WEIGHTS.items())
+    return np.round(np.clip(total, 0.0, 100.0), 2)
+
+
+def compute_confidence_levels(aggregates: ScoreAggregates) -> np.ndarray:
+    """Confidence grows with the amount of evidence behind a score."""
+    evidence = (
+        aggregates.case_count
+        + aggregates.promise_total
+        + aggregates.sentiment_count
+        + aggregates.credential_total
+    )
+    return np.round(100.0 * (1.0 - np.exp(-evidence / CONFIDENCE_SATURATION)), 2)
+
+
+def build_score_rows(
+    aggregates: ScoreAggregates,
+    components: Dict[str, np.ndarray],
+    scores: np.ndarray,
+    calculated_at: datetime,
+) -> List[Dict[str, Any]]:
+    """Turn computed arrays into ``score_history`` insert parameters."""
+    breakdown_columns = {name: np.round(values, 2).tolist() for name, values in components.items()}
+    score_list = scores.tolist()
+    case_count = aggregates.case_count.astype(int).tolist()
+    promise_total = aggregates.promise_total.astype(int).tolist()
+    sentiment_count = aggregates.sentiment_count.astype(int).tolist()
+    credential_total = aggregates.credential_total.astype(int).tolist()
+
+    return [
+        {
+            "id": uuid.uuid4(),
+            "politician_id": politician_id,
+            "transparency_score": score_list[i],
+            "score_breakdown": {name: breakdown_columns[name][i] for name in COMPONENTS},
+            "factors_analyzed": {
+                COMPONENT_FACTORS["legal_record"][0]: case_count[i],
+                COMPONENT_FACTORS["promise_fulfillment"][0]: promise_total[i],
+                COMPONENT_FACTORS["public_sentiment"][0]: sentiment_count[i],
+                COMPONENT_FACTORS["credential_verification"][0]: credential_total[i],
+            },
+            "calculation_method": SCORE_CALCULATION_METHOD,
+            "calculated_at": calculated_at,
+        }
+        for i, politician_id in enumerate(aggregates.politician_ids)
+    ]
+
+
+def write_scores(
+    db: Session,
+    aggregates: ScoreAggregates,
+    components: Dict[str, np.ndarray],
+    scores: np.ndarray,
+    confidence: np.ndarray,
+    calculated_at: datetime,
+) -> None:
+    """Persist computed scores with one bulk insert and one bulk update."""
+    if not len(aggregates):
+        return
+    history_rows = build_score_rows(aggregates, components, scores, calculated_at)
+    politician_rows = [
+        {"id": politician_id, "transparency_score": score, "confidence_level": level}
+        for politician_id, score, level in zip(aggregates.politician_ids, scores.tolist(), confidence.tolist())
+    ]
+    # Previous scores go to the change feed, so subscribers can tell real swings
+    previous_scores = dict(db.execute(
+        select(Politician.id, Politician.transparency_score).where(Politician.id.in_(aggregates.politician_ids))
+    ).all())
+    db.execute(insert(ScoreHistory), history_rows)
+    db.execute(update(Politician), politician_rows)
+    append_score_points(db, history_rows)
+
+    # Bulk statements bypass mapper events; report the writes to the change feed
+    record_changes(db, [ModelChange(ScoreHistory.__tablename__, INSERT, row) for row in history_rows])
+    record_changes(
+        db,
+        [
+            ModelChange(
+                Politician.__tablename__,
+                UPDATE,
+                row,
+                changed=frozenset({"transparency_score", "confidence_level"}),
+                previous={"transparency_score": previous_scores.get(row["id"])},
+            )
+            for row in politician_rows
+        ],
+    )
+
+
+def recalculate_scores(
+    db: Session,
+    politician_ids: Optional[Iterable[uuid.UUID]] = None,
+    commit: bool = True,
+) -> int:
+    """
+    Recalculate transparency scores for all active politicians (or a subset).
+
+    Returns the number of politicians scored.
+    """
+    now = datetime.now(timezone.utc)
+    aggregates = load_score_aggregates(db, politician_ids=politician_ids, now=now)
+    components = compute_component_scores(aggregates)
+    scores = compute_transparency_scores(components)
+    confidence = compute_confidence_levels(aggregates)
+    write_scores(db, aggregates, components, scores, confidence, now)
+    if commit:
+        db.commit()
+    return len(aggregates)
+
+
+def load_latest_breakdowns(db: Session, politician_ids: Iterable[uuid.UUID]) -> Dict[uuid.UUID, ScoreHistory]:
+    """Return the most recent ``ScoreHistory`` row for each given politician."""
+    politician_ids = list(politician_ids)
+    if not politician_ids:
+        return {}
+    latest = (
+        select(
+            ScoreHistory.politician_id,
+            func.max(ScoreHistory.calculated_at).label("calculated_at"),
+        )
+        .where(ScoreHistory.politician_id.in_(politician_ids))
+        .group_by(ScoreHistory.politician_id)
+        .subquery()
+    )
+    stmt = select(ScoreHistory).join(
+        latest,
+        (ScoreHistory.politician_id == latest.c.politician_id)
+        & (ScoreHistory.calculated_at == latest.c.calculated_at),
+    )
+    return {history.politician_id: history for history in db.scalars(stmt)}
+
+
+def recalculate_partial_scores(
+    db: Session,
+    dirty: Dict[uuid.UUID, Set[str]],
+    commit: bool = True,
+) -> int:
+    """
+    Recalculate only the dirty score components of the given politicians.
+
+    ``dirty`` maps politician ids to the names of components whose evidence
+    changed. Clean components are reused from each politician's latest
+    ``ScoreHistory.score_breakdown``; politicians with no usable history are
+    scored in full. Time-windowed components (public sentiment) still drift
+    without edits, so a periodic full ``recalculate_scores`` run is expected.
+
+    Returns the number of politicians scored.
+    """
+    if not dirty:
+        return 0
+    now = datetime.now(timezone.utc)
+    cached = load_latest_breakdowns(db, dirty)
+
+    def needs(politician_id: uuid.UUID) -> Set[str]:
+        history = cached.get(politician_id)
+        if history is None or not set(COMPONENTS) <= set(history.score_breakdown or {}):
+            return set(COMPONENTS)
+        return set(dirty[politician_id]) & set(COMPONENTS)
+
+    needed = {politician_id: needs(politician_id) for politician_id in dirty}
+    load_components = set().union(*needed.values())
+    aggregates = load_score_aggregates(db, politician_ids=list(dirty), now=now, components=load_components)
+    if not len(aggregates):
+        if commit:
+            db.commit()
+        return 0
+    fresh = compute_component_scores(aggregates, components=load_components)
+
+    components: Dict[str, np.ndarray] = {}
+    for name in COMPONENTS:
+        factor_key, count_field = COMPONENT_FACTORS[name]
+        recompute = np.array([name in needed[pid] for pid in aggregates.politician_ids], dtype=bool)
+        cached_values = np.zeros(len(aggregates))
+        cached_counts = np.zeros(len(aggregates))
+        for i, politician_id in enumerate(aggregates.politician_ids):
+            if not recompute[i]:
+                history = cached[politician_id]
+                cached_values[i] = float(history.score_breakdown[name])
+                cached_counts[i] = float((history.factors_analyzed or {}).get(factor_key, 0))
+        components[name] = np.where(recompute, fresh[name], cached_values) if name in fresh else cached_values
+        counts = getattr(aggregates, count_field)
+        counts[:] = np.where(recompute, counts, cached_counts)
+
+    scores = compute_transparency_scores(components)
+    confidence = compute_confidence_levels(aggregates)
+    write_scores(db, aggregates, components, scores, confidence, now)
+    if commit:
+        db.commit()
+    return len(aggregates)
+
+
+def calculate_politician_score(db: Session, politician: Politician, commit: bool = True) -> ScoreHistory:
+    """
+    Recalculate a single politician's score from its ORM relationships.
+
+    Suitable for one-off recalculation; use ``recalculate_scores`` for batches.
+    """
+    now = datetime.now(timezone.utc)
+    aggregates = aggregates_from_politician(politician, now=now)
+    components = compute_component_scores(aggregates)
+    scores = compute_transparency_scores(components)
+    confidence = compute_confidence_levels(aggregates)
+
+    row = build_score_rows(aggregates, components, scores, now)[0]
+    history = ScoreHistory(**row)
+    politician.transparency_score = row["transparency_score"]
+    politician.confidence_level = float(confidence[0])
+    db.add(history)
+    append_score_points(db, [row])
+    if commit:
+        db.commit()
+    return history
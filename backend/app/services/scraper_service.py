@@ -0,0 +1,461 @@
+"""
+News scraping.
+
+All sources are crawled concurrently over one pooled ``httpx.AsyncClient``.
+Politeness is enforced per source: at most ``max_concurrency`` requests in
+flight and at most ``requests_per_second`` started. Pages are fetched with
+conditional GETs, replaying the ETag / Last-Modified validators of earlier
+responses, so an unchanged page costs a 304 and no parsing. Parsing runs
+with lxml in a thread pool, off the event loop.
+
+A source is either an RSS/Atom feed, whose items carry everything needed, or
+an HTML listing page whose article links are followed and read for their
+title, description and publication time. Article URLs are canonicalized and
+checked against a Bloom filter of stored ``NewsMention`` URLs; positives are
+confirmed against the database, so a false positive never drops a new
+article.
+
+The scraper only produces ``ScrapedArticle`` records; they are attributed to
+politicians and stored by ``entity_linking_service.store_articles``.
+"""
+import asyncio
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import dataclass, field
+from datetime import datetime, timezone
+from email.utils import parsedate_to_datetime
+import enum
+from functools import partial
+import json
+import logging
+import time
+from typing import Any, Awaitable, Callable, Dict, List, Optional, Set
+from urllib.parse import urljoin, urlsplit
+
+import httpx
+from lxml import etree, html
+from sqlalchemy import func, select
+
+from app.config import get_settings
+from app.database import AsyncSessionLocal
+from app.models.news import NewsMention
+from app.utils.bloom import BloomFilter
+from app.utils.cache import TTLCache
+from app.utils.helpers import canonicalize_url
+
+settings = get_settings()
+logger = logging.getLogger(__name__)
+
+# How long remembered ETag / Last-Modified validators are replayed
+VALIDATOR_TTL_SECONDS = 7 * 24 * 3600
+
+
+class SourceKind(str, enum.Enum):
+    """How a news source lists its articles."""
+    FEED = "feed"
+    HTML = "html"
+
+
+@dataclass
+class NewsSource:
+    """A news site to crawl."""
+
+    name: str
+    url: str
+    kind: SourceKind = SourceKind.FEED
+    # Selects article links on an HTML listing page
+    link_xpath: str = "//article//a/@href"
+    max_articles: int = 50
+    # Politeness; settings defaults apply when unset
+    max_concurrency: Optional[int] = None
+    requests_per_second: Optional[float] = None
+
+
+@dataclass
+class ScrapedArticle:
+    """An article not yet stored as a news mention."""
+
+    url: str
+    source: str
+    title: str
+    summary: Optional[str]
+    published_at: Optional[datetime]
+    scraped_at: datetime
+
+
+@dataclass
+class ScrapeReport:
+    """Outcome of one scraping run."""
+
+    articles: List[ScrapedArticle] = field(default_factory=list)
+    requests: int = 0
+    not_modified: int = 0
+    skipped_seen: int = 0
+    # Source name -> error that stopped it
+    errors: Dict[str, str] = field(default_factory=dict)
+    elapsed_seconds: float = 0.0
+
+
+def load_sources(path: str) -> List[NewsSource]:
+    """Read sources from a JSON file holding a list of ``NewsSource`` fields."""
+    with open(path, encoding="utf-8") as handle:
+        entries = json.load(handle)
+    return [NewsSource(**dict(entry, kind=SourceKind(entry.get("kind", SourceKind.FEED)))) for entry in entries]
+
+
+# Parsing; these run in the parse thread pool
+
+def _parse_datetime(value: Optional[str]) -> Optional[datetime]:
+    if not value:
+        return None
+    value = value.strip()
+    try:
+        parsed = datetime.fromisoformat(value)
+    except ValueError:
+        try:
+            parsed = parsedate_to_datetime(value)
+        except (TypeError, ValueError):
+            return None
+    return parsed if parsed.tzinfo else parsed.replace(tzinfo=timezone.utc)
+
+
+def _plain_text(value: Optional[str]) -> Optional[str]:
+    """Strip markup from feed summaries, which are often HTML."""
+    if not value:
+        return None
+    if "<" in value:
+        try:
+            value = html.fromstring(value).text_content()
+        except etree.ParserError:
+            pass
+    value = " ".join(value.split())
+    return value or None
+
+
+def _child_text(element: Any, *names: str) -> Optional[str]:
+    for name in names:
+        text = element.xpath(f"string(*[local-name()='{name}'])")
+        if text and text.strip():
+            return text.strip()
+    return None
+
+
+def parse_feed(content: bytes) -> List[Dict[str, Any]]:
+    """Extract the items of an RSS or Atom feed."""
+    # Parsers are not thread-safe, so each call gets its own
+    parser = etree.XMLParser(recover=True, resolve_entities=False, no_network=True)
+    root = etree.fromstring(content, parser=parser)
+    if root is None:
+        return []
+    entries = []
+    for item in root.xpath("//*[local-name()='item' or local-name()='entry']"):
+        link = item.xpath(
+            "string(*[local-name()='link'][not(@rel) or @rel='alternate']/@href)"
+        ) or _child_text(item, "link")
+        entries.append({
+            "link": link,
+            "title": _child_text(item, "title"),
+            "summary": _plain_text(_child_text(item, "description", "summary", "content")),
+            "published_at": _parse_datetime(_child_text(item, "pubDate", "published", "updated", "date")),
+        })
+    return entries
+
+
+def parse_listing(content: bytes, base_url: str, link_xpath: str) -> List[str]:
+    """Extract absolute article links on the listing page's own site."""
+    document = html.fromstring(content, base_url=base_url)
+    host = (urlsplit(base_url).hostname or "").removeprefix("www.")
+    links = []
+    for href in document.xpath(link_xpath):
+        url = urljoin(base_url, str(href).strip())
+        parts = urlsplit(url)
+        if parts.scheme in ("http", "https") and (parts.hostname or "").removeprefix("www.") == host:
+            links.append(url)
+    return links
+
+
+def parse_article(content: bytes) -> Dict[str, Any]:
+    """Extract an article page's title, description and publication time."""
+    document = html.fromstring(content)
+
+    def meta(*names: str) -> Optional[str]:
+        for name in names:
+            values = document.xpath(f"//meta[@property='{name}' or @name='{name}']/@content")
+            if values and values[0].strip():
+                return values[0].strip()
+        return None
+
+    title = meta("og:title", "twitter:title") or document.findtext(".//title") or document.xpath("string(//h1)")
+    summary = meta("og:description", "description", "twitter:description") or document.xpath("string(//article//p)")
+    published = meta("article:published_time", "datePublished", "date") or document.xpath("string(//time/@datetime)")
+    return {
+        "title": " ".join((title or "").split()) or None,
+        "summary": _plain_text(summary),
+        "published_at": _parse_datetime(published),
+    }
+
+
+# Deduplication
+
+async def stored_urls(urls: List[str]) -> Set[str]:
+    """Return which of ``urls`` are already stored as news mentions."""
+    async with AsyncSessionLocal() as db:
+        result = await db.execute(select(NewsMention.url).where(NewsMention.url.in_(urls)))
+        return set(result.scalars())
+
+
+class SeenUrls:
+    """
+    Bloom filter of stored article URLs.
+    Positives are checked with ``confirm`` (the database by default), so only
+    URLs that are really stored are skipped.
+    """
+
+    def __init__(
+        self,
+        capacity: int,
+        false_positive_rate: float = 0.001,
+        confirm: Optional[Callable[[List[str]], Awaitable[Set[str]]]] = stored_urls,
+    ):
+        self.bloom = BloomFilter(capacity, false_positive_rate)
+        self.confirm = confirm
+        # Canonical forms of URLs stored in another spelling, which a lookup
+        # of the canonical URL would not find
+        self.known: Set[str] = set()
+
+    def add(self, url: str) -> None:
+        self.bloom.add(url)
+
+    def add_stored(self, stored_url: str) -> None:
+        """Add a URL as stored in the database, in whatever form it was stored."""
+        url = canonicalize_url(stored_url)
+        self.bloom.add(url)
+        if url != stored_url:
+            self.known.add(url)
+
+    async def filter_new(self, urls: List[str]) -> List[str]:
+        """Return the URLs in ``urls`` that are not stored."""
+        maybe_seen = [url for url in urls if url in self.bloom and url not in self.known]
+        seen = {url for url in urls if url in self.known}
+        if maybe_seen:
+            seen |= await self.confirm(maybe_seen) if self.confirm else set(maybe_seen)
+        return [url for url in urls if url not in seen]
+
+
+async def load_seen_urls() -> SeenUrls:
+    """Build a ``SeenUrls`` filter from the stored news mentions."""
+    async with AsyncSessionLocal() as db:
+        count = (await db.execute(select(func.count()).select_from(NewsMention))).scalar_one()
+        seen = SeenUrls(max(settings.scraper_seen_url_capacity, count * 2))
+        urls = await db.stream_scalars(select(NewsMention.url).execution_options(yield_per=5000))
+        async for url in urls:
+            seen.add_stored(url)
+    logger.info(f"Loaded {count} stored news URLs into the seen-URL filter")
+    return seen
+
+
+# Fetching
+
+class _RateLimiter:
+    """Token bucket pacing the start of one source's requests."""
+
+    def __init__(self, rate: float, burst: int = 1):
+        self.rate = rate
+        self.burst = burst
+        self._tokens = float(burst)
+        self._updated = time.monotonic()
+        self._lock = asyncio.Lock()
+
+    async def acquire(self) -> None:
+        async with self._lock:
+            now = time.monotonic()
+            self._tokens = min(self.burst, self._tokens + (now - self._updated) * self.rate)
+            self._updated = now
+            if self._tokens >= 1:
+                self._tokens -= 1
+                return
+            # Waiting under the lock keeps waiters in order
+            await asyncio.sleep((1 - self._tokens) / self.rate)
+            self._tokens = 0.0
+            self._updated = time.monotonic()
+
+
+@dataclass
+class _SourceLimits:
+    semaphore: asyncio.Semaphore
+    rate: _RateLimiter
+
+
+def create_http_client() -> httpx.AsyncClient:
+    """The pooled client shared by every request of a scraping run."""
+    return httpx.AsyncClient(
+        limits=httpx.Limits(
+            max_connections=settings.scraper_max_connections,
+            max_keepalive_connections=settings.scraper_max_connections,
+        ),
+        timeout=httpx.Timeout(settings.scraper_timeout_seconds),
+        headers={"User-Agent": settings.scraper_user_agent},
+        follow_redirects=True,
+    )
+
+
+class NewsScraper:
+    """
+    Crawls sources concurrently. Use as an async context manager; the HTTP
+    client and parse pool live for the context:
+
+        async with NewsScraper(sources, seen=await load_seen_urls()) as scraper:
+            report = await scraper.scrape()
+    """
+
+    def __init__(
+        self,
+        sources: List[NewsSource],
+        seen: Optional[SeenUrls] = None,
+        client: Optional[httpx.AsyncClient] = None,
+        validators: Optional[TTLCache] = None,
+        parse_workers: Optional[int] = None,
+    ):
+        self.sources = sources
+        self.seen = seen
+        self.validators = validators if validators is not None else TTLCache(
+            maxsize=settings.scraper_validator_cache_size, ttl=VALIDATOR_TTL_SECONDS
+        )
+        self._client = client
+        self._owns_client = client is None
+        self._parse_workers = parse_workers or settings.scraper_parse_workers
+        self._executor: Optional[ThreadPoolExecutor] = None
+        self._limits: Dict[str, _SourceLimits] = {}
+        # httpcore scans its whole queue on every pool change, so requests are
+        # only handed to it once a connection is free
+        self._connection_slots = asyncio.Semaphore(settings.scraper_max_connections)
+        self._claimed: Set[str] = set()
+        self.report = ScrapeReport()
+
+    async def __aenter__(self) -> "NewsScraper":
+        if self._client is None:
+            self._client = create_http_client()
+        self._executor = ThreadPoolExecutor(self._parse_workers, thread_name_prefix="scraper-parse")
+        return self
+
+    async def __aexit__(self, *exc_info) -> None:
+        if self._owns_client and self._client is not None:
+            await self._client.aclose()
+            self._client = None
+        if self._executor is not None:
+            self._executor.shutdown(wait=False)
+            self._executor = None
+
+    def _source_limits(self, source: NewsSource) -> _SourceLimits:
+        limits = self._limits.get(source.name)
+        if limits is None:
+            limits = _SourceLimits(
+                semaphore=asyncio.Semaphore(source.max_concurrency or settings.scraper_source_concurrency),
+                rate=_RateLimiter(source.requests_per_second or settings.scraper_source_rate_per_second),
+            )
+            self._limits[source.name] = limits
+        return limits
+
+    async def _fetch(self, source: NewsSource, url: str) -> Optional[bytes]:
+        """GET ``url`` politely; returns None when it has not changed."""
+        headers = {}
+        validators = self.validators.get(url)
+        if validators:
+            etag, last_modified = validators
+            if etag:
+                headers["If-None-Match"] = etag
+            if last_modified:
+                headers["If-Modified-Since"] = last_modified
+
+        limits = self._source_limits(source)
+        async with limits.semaphore:
+            await limits.rate.acquire()
+            async with self._connection_slots:
+                response = await self._client.get(url, headers=headers)
+        self.report.requests += 1
+
+        if response.status_code == 304:
+            self.report.not_modified += 1
+            return None
+        response.raise_for_status()
+        etag, last_modified = response.headers.get("ETag"), response.headers.get("Last-Modified")
+        if etag or last_modified:
+            self.validators.set(url, (etag, last_modified))
+        return response.content
+
+    async def _parse(self, parser: Callable, *args: Any) -> Any:
+        loop = asyncio.get_running_loop()
+        return await loop.run_in_executor(self._executor, partial(parser, *args))
+
+    async def _new_urls(self, urls: List[str]) -> List[str]:
+        """Drop URLs already stored or already claimed during this run."""
+        urls = [url for url in urls if url not in self._claimed]
+        new_urls = await self.seen.filter_new(urls) if self.seen is not None else urls
+        self.report.skipped_seen += len(urls) - len(new_urls)
+        self._claimed.update(new_urls)
+        return new_urls
+
+    def _article(self, source: NewsSource, url: str, fields: Dict[str, Any]) -> Optional[ScrapedArticle]:
+        if not fields.get("title"):
+            return None
+        if self.seen is not None:
+            self.seen.add(url)
+        return ScrapedArticle(
+            url=url,
+            source=source.name,
+            title=fields["title"][:500],
+            summary=fields.get("summary"),
+            published_at=fields.get("published_at"),
+            scraped_at=datetime.now(timezone.utc),
+        )
+
+    async def _scrape_article_page(self, source: NewsSource, url: str) -> Optional[ScrapedArticle]:
+        try:
+            content = await self._fetch(source, url)
+            if content is None:
+                return None
+            return self._article(source, url, await self._parse(parse_article, content))
+        except (httpx.HTTPError, etree.LxmlError) as exc:
+            logger.warning(f"Skipping article {url} from {source.name}: {exc}")
+            return None
+
+    async def scrape_source(self, source: NewsSource) -> List[ScrapedArticle]:
+        """Fetch one source's new articles."""
+        content = await self._fetch(source, source.url)
+        if content is None:
+            return []
+
+        if source.kind == SourceKind.FEED:
+            entries = {}
+            for entry in await self._parse(parse_feed, content):
+                if entry["link"]:
+                    entries.setdefault(canonicalize_url(urljoin(source.url, entry["link"])), entry)
+            new_urls = await self._new_urls(list(entries)[:source.max_articles])
+            articles = [self._article(source, url, entries[url]) for url in new_urls]
+        else:
+            links = await self._parse(parse_listing, content, source.url, source.link_xpath)
+            urls = list(dict.fromkeys(canonicalize_url(link) for link in links))
+            new_urls = await self._new_urls(urls[:source.max_articles])
+            articles = await asyncio.gather(*(self._scrape_article_page(source, url) for url in new_urls))
+        return [article for article in articles if article is not None]
+
+    async def scrape(self) -> ScrapeReport:
+        """Crawl every source concurrently; one failing source does not stop the others."""
+        self.report = ScrapeReport()
+        started = time.perf_counter()
+        results = await asyncio.gather(
+            *(self.scrape_source(source) for source in self.sources), return_exceptions=True
+        )
+        for source, result in zip(self.sources, results):
+            if isinstance(result, BaseException):
+                logger.warning(f"Scraping {source.name} failed: {result!r}")
+                self.report.errors[source.name] = repr(result)
+            else:
+                self.report.articles.extend(result)
+        self.report.elapsed_seconds = round(time.perf_counter() - started, 3)
+        logger.info(
+            f"Scraped {len(self.report.articles)} new articles from {len(self.sources)} sources with "
+            f"{self.report.requests} requests ({self.report.not_modified} not modified, "
+            f"{self.report.skipped_seen} already stored) in {self.report.elapsed_seconds}s"
+        )
+        self._claimed.clear()
+        return self.report
@@ -0,0 +1,770 @@
+"""
+In-memory search index for autocomplete.
+
+Politician names, parties, counties and positions, and case and promise
+titles are tokenized into an inverted index held in process memory, so
+autocomplete never queries the database:
+
+- whole words are looked up in the postings dict;
+- the last, still-being-typed word is expanded through a sorted vocabulary
+  with ``bisect`` (a prefix range scan);
+- words matching nothing are treated as typos: they are compared by bounded
+  edit distance with the tokens of candidates found by the other words, or
+  else looked up by an edit-distance walk over the sorted vocabulary
+  treated as a trie.
+
+The index follows committed model changes incrementally and catches up
+with other processes' writes from the database every
+``search_refresh_interval_seconds``: rows updated since its watermark are
+re-read, and rows deleted since are found through ``search_tombstones``. It can be snapshotted to disk so a
+restarting worker loads it and only re-reads rows changed since the
+snapshot was taken.
+"""
+from bisect import bisect_left, insort
+from collections import defaultdict
+from dataclasses import dataclass
+from datetime import datetime, timedelta, timezone
+import enum
+from functools import lru_cache
+import heapq
+import logging
+import os
+import pickle
+import tempfile
+import threading
+import time
+from typing import Any, Callable, Dict, Iterable, List, Optional, Set, Tuple
+import uuid
+
+from sqlalchemy import delete, select
+from sqlalchemy.orm import Session
+
+from app.config import get_settings
+from app.database import SessionLocal
+from app.core.model_events import DELETE, UPDATE, ModelChange, subscribe
+from app.models.case import LegalCase
+from app.models.politician import Politician
+from app.models.promise import Promise
+from app.models.search_tombstone import SearchTombstone
+from app.schemas.search import SearchSuggestion
+from app.utils.helpers import bounded_levenshtein, tokenize
+
+logger = logging.getLogger(__name__)
+
+SNAPSHOT_VERSION = 1
+
+# Rows whose updated_at falls this close to the watermark are re-read on
+# refresh, covering transactions that committed after a later timestamp
+WATERMARK_OVERLAP = timedelta(minutes=5)
+
+# Relevance of a token per field it appears in
+FIELD_WEIGHTS = {
+    "name": 3.0,
+    "title": 2.0,
+    "party": 1.5,
+    "county": 1.5,
+    "position": 1.0,
+}
+
+EXACT_MATCH = 1.0
+MIN_FUZZY_LENGTH = 3
+
+# Typo-tolerant terms are only checked against the candidates of terms
+# matching at most this many documents
+TYPO_RETRY_MAX_CANDIDATES = 1000
+
+
+class SearchKind(str, enum.Enum):
+    """Kinds of searchable records."""
+    POLITICIAN = "politician"
+    CASE = "case"
+    PROMISE = "promise"
+
+
+KIND_ORDER = {SearchKind.POLITICIAN: 0, SearchKind.CASE: 1, SearchKind.PROMISE: 2}
+
+TABLE_KINDS = {
+    "politicians": SearchKind.POLITICIAN,
+    "legal_cases": SearchKind.CASE,
+    "promises": SearchKind.PROMISE,
+}
+
+# Columns whose changes require reindexing a row
+INDEXED_COLUMNS = {
+    "politicians": {"name", "party", "county", "position", "is_active"},
+    "legal_cases": {"title", "politician_id"},
+    "promises": {"title", "politician_id"},
+}
+
+DocumentKey = Tuple[SearchKind, uuid.UUID]
+
+
+@dataclass
+class SearchDocument:
+    """One searchable record."""
+
+    kind: SearchKind
+    id: uuid.UUID
+    politician_id: uuid.UUID
+    fields: Dict[str, str]
+
+    @property
+    def key(self) -> DocumentKey:
+        return (self.kind, self.id)
+
+    @property
+    def label(self) -> str:
+        return self.fields.get("name") or self.fields.get("title") or ""
+
+    def token_weights(self) -> Dict[str, float]:
+        """Each token in the document with its highest field weight."""
+        weights: Dict[str, float] = {}
+        for field_name, text in self.fields.items():
+            weight = FIELD_WEIGHTS.get(field_name, 1.0)
+            for token in tokenize(text):
+                if weight > weights.get(token, 0.0):
+                    weights[token] = weight
+        return weights
+
+
+@dataclass
+class SearchHit:
+    """A matched document and its relevance."""
+
+    document: SearchDocument
+    score: float
+
+
+def _prefix_quality(term: str, token: str) -> float:
+    """Prefix matches rank below exact ones, more so the more is left untyped."""
+    return 0.5 + 0.4 * len(term) / len(token)
+
+
+def _fuzzy_quality(distance: int) -> float:
+    return 0.6 / (1 + distance)
+
+
+def _max_distance(term: str) -> int:
+    """Typos tolerated in a term: one, or two in long words."""
+    return 1 if len(term) < 8 else 2
+
+
+class _QueryTerm:
+    """
+    One term of a query and the vocabulary tokens it matches. A typo-tolerant
+    term also matches other tokens within a few edits, checked on demand.
+    """
+
+    def __init__(self, term: str, prefix: bool, matches: Dict[str, float], typos: bool = False):
+        self.term = term
+        self.prefix = prefix
+        self.matches = matches
+        self.typos = typos and len(term) >= MIN_FUZZY_LENGTH
+        self._checked: Dict[str, float] = {}
+
+    def typo_tolerant(self) -> "_QueryTerm":
+        return _QueryTerm(self.term, self.prefix, self.matches, typos=True)
+
+    def quality(self, token: str) -> float:
+        quality = self.matches.get(token)
+        if quality is not None:
+            return quality
+        if not (self.prefix or self.typos):
+            return 0.0
+        quality = self._checked.get(token)
+        if quality is None:
+            quality = self._checked[token] = self._unlisted_quality(token)
+        return quality
+
+    def _unlisted_quality(self, token: str) -> float:
+        # Prefix expansion is capped, so a short prefix can leave out the
+        # very completion a candidate document carries
+        if self.prefix and token.startswith(self.term):
+            return _prefix_quality(self.term, token)
+        if not self.typos:
+            return 0.0
+        distance = bounded_levenshtein(self.term, token, _max_distance(self.term), prefix=self.prefix)
+        return _fuzzy_quality(distance) if distance is not None else 0.0
+
+    def bound(self, postings: Dict[str, Dict[float, Set[int]]]) -> float:
+        """The most this term can add to a document's score."""
+        best = max((quality * max(postings[token]) for token, quality in self.matches.items()), default=0.0)
+        if self.prefix:
+            longest_prefix_quality = _prefix_quality(self.term, self.term + " ")
+            best = max(best, longest_prefix_quality * max(FIELD_WEIGHTS.values()))
+        if self.typos:
+            best = max(best, _fuzzy_quality(1) * max(FIELD_WEIGHTS.values()))
+        return best
+
+
+class SearchIndex:
+    """
+    Inverted index with prefix and typo-tolerant lookup.
+
+    Documents are numbered internally. Postings map each token to the
+    documents containing it, grouped by field weight, so a search can visit
+    the best-scoring (token, weight) groups first and stop as soon as no
+    remaining group can beat the results already found.
+    """
+
+    def __init__(self, max_expansions: int = 50):
+        self.max_expansions = max_expansions
+        self.watermark: Optional[datetime] = None
+        self._numbers: Dict[DocumentKey, int] = {}
+        self._documents: Dict[int, SearchDocument] = {}
+        self._document_tokens: Dict[int, Dict[str, float]] = {}
+        self._postings: Dict[str, Dict[float, Set[int]]] = {}
+        self._vocabulary: List[str] = []
+        self._next_number = 0
+        self._lock = threading.RLock()
+
+    def __len__(self) -> int:
+        return len(self._documents)
+
+    def get(self, key: DocumentKey) -> Optional[SearchDocument]:
+        number = self._numbers.get(key)
+        return self._documents.get(number) if number is not None else None
+
+    def keys(self) -> List[DocumentKey]:
+        with self._lock:
+            return list(self._numbers)
+
+    # Updates
+
+    def add(self, document: SearchDocument) -> None:
+        """Index a document, replacing any previous version."""
+        with self._lock:
+            self.remove(document.key)
+            number = self._next_number
+            self._next_number += 1
+            token_weights = document.token_weights()
+            self._numbers[document.key] = number
+            self._documents[number] = document
+            self._document_tokens[number] = token_weights
+            for token, weight in token_weights.items():
+                tiers = self._postings.get(token)
+                if tiers is None:
+                    tiers = self._postings[token] = {}
+                    insort(self._vocabulary, token)
+                tiers.setdefault(weight, set()).add(number)
+
+    def remove(self, key: DocumentKey) -> None:
+        """Drop a document from the index, if present."""
+        with self._lock:
+            number = self._numbers.pop(key, None)
+            if number is None:
+                return
+            del self._documents[number]
+            for token, weight in self._document_tokens.pop(number).items():
+                tiers = self._postings[token]
+                tiers[weight].discard(number)
+                if not tiers[weight]:
+                    del tiers[weight]
+                if not tiers:
+                    self._drop_token(token)
+
+    def _drop_token(self, token: str) -> None:
+        del self._postings[token]
+        position = bisect_left(self._vocabulary, token)
+        if position < len(self._vocabulary) and self._vocabulary[position] == token:
+            del self._vocabulary[position]
+
+    def apply_change(self, kind: SearchKind, values: Dict[str, Any]) -> None:
+        """
+        Reindex a row from its changed column values, filling columns the
+        change does not carry from the currently indexed document.
+        """
+        row_id = values.get("id")
+        if row_id is None:
+            return
+        key = (kind, row_id)
+        with self._lock:
+            existing = self.get(key)
+            if kind == SearchKind.POLITICIAN:
+                if values.get("is_active") is False:
+                    self.remove(key)
+                    return
+                politician_id = row_id
+                field_names = ("name", "party", "county", "position")
+            else:
+                politician_id = values.get("politician_id") or (existing.politician_id if existing else None)
+                field_names = ("title",)
+
+            fields = dict(existing.fields) if existing else {}
+            for field_name in field_names:
+                if field_name in values:
+                    fields[field_name] = values[field_name]
+            fields = {name: text for name, text in fields.items() if text}
+            if politician_id is None or not (fields.get("name") or fields.get("title")):
+                logger.debug(f"Not enough column values to index {kind.value} {row_id}")
+                return
+            self.add(SearchDocument(kind=kind, id=row_id, politician_id=politician_id, fields=fields))
+
+    # Lookup
+
+    def _expand_prefix(self, prefix: str) -> List[str]:
+        tokens = []
+        position = bisect_left(self._vocabulary, prefix)
+        while position < len(self._vocabulary) and len(tokens) < self.max_expansions:
+            token = self._vocabulary[position]
+            if not token.startswith(prefix):
+                break
+            tokens.append(token)
+            position += 1
+        return tokens
+
+    def _fuzzy_tokens(self, term: str, prefix: bool) -> Dict[str, float]:
+        """
+        Tokens within one or more edits of ``term`` (or, for a prefix term,
+        starting within them); exact and prefix matches are not repeated.
+
+        Walks the sorted vocabulary as an implicit trie: each node is a prefix
+        whose tokens form a contiguous range, found with ``bisect``. Every node
+        carries one row of the edit-distance table against ``term``, and a
+        branch is abandoned as soon as the whole row exceeds the limit, so
+        only the small part of the vocabulary near ``term`` is visited.
+        """
+        if len(term) < MIN_FUZZY_LENGTH:
+            return {}
+        max_distance = _max_distance(term)
+        vocabulary = self._vocabulary
+        # (distance, start, end) of each matching token or prefix range
+        found: List[Tuple[int, int, int]] = []
+        stack = [("", list(range(len(term) + 1)), 0, len(vocabulary))]
+        while stack:
+            node, row, start, end = stack.pop()
+            distance = row[-1]
+            if prefix and 0 < distance <= max_distance:
+                found.append((distance, start, end))
+
+            depth = len(node)
+            position = start
+            if position < end and len(vocabulary[position]) == depth:
+                if not prefix and 0 < distance <= max_distance:
+                    found.append((distance, position, position + 1))
+                position += 1
+            while position < end:
+                char = vocabulary[position][depth]
+                child_end = bisect_left(vocabulary, node + chr(ord(char) + 1), position, end)
+                child_row = [row[0] + 1]
+                for j, term_char in enumerate(term, 1):
+                    child_row.append(min(
+                        row[j] + 1,
+                        child_row[j - 1] + 1,
+                        row[j - 1] + (term_char != char),
+                    ))
+                if min(child_row) <= max_distance:
+                    stack.append((node + char, child_row, position, child_end))
+                position = child_end
+
+        # Closest first, and the most specific (smallest) ranges first
+        found.sort(key=lambda match: (match[0], match[2] - match[1]))
+        matches: Dict[str, float] = {}
+        for distance, start, end in found:
+            for token in vocabulary[start:min(end, start + self.max_expansions)]:
+                if len(matches) >= self.max_expansions:
+                    return matches
+                matches.setdefault(token, _fuzzy_quality(distance))
+        return matches
+
+    def _term_matches(self, term: str, prefix: bool) -> Dict[str, float]:
+        """
+        Vocabulary tokens matching a query term exactly or as a prefix, with
+        match quality. Completed words only match as prefixes of longer tokens
+        if they match no token exactly ("wil ru").
+        """
+        matches: Dict[str, float] = {}
+        if term in self._postings:
+            matches[term] = EXACT_MATCH
+        if prefix or not matches:
+            for token in self._expand_prefix(term):
+                if token != term:
+                    matches[token] = _prefix_quality(term, token)
+        return matches
+
+    def _term_score(self, number: int, term: "_QueryTerm") -> float:
+        """A document's best score for one query term."""
+        best = 0.0
+        for token, weight in self._document_tokens[number].items():
+            quality = term.quality(token)
+            if quality * weight > best:
+                best = quality * weight
+        return best
+
+    def search(
+        self,
+        query: str,
+        limit: int = 10,
+        kinds: Optional[Iterable[SearchKind]] = None,
+    ) -> List[SearchHit]:
+        """
+        Rank documents matching every term of ``query``.
+
+        The last term is matched as a prefix unless the query ends in a space.
+        Terms matching nothing are assumed to carry a typo: they are checked
+        against the candidates found by the other terms where those are
+        selective enough, and otherwise looked up in the vocabulary with
+        ``_fuzzy_tokens``. A typo can also turn a word into another indexed
+        word, so if no document matches every term, the search is retried
+        driven by each term in turn with the others matched with typos.
+        """
+        tokens = tokenize(query)
+        if not tokens:
+            return []
+        allowed = set(kinds) if kinds else None
+        last_is_prefix = not query[-1:].isspace()
+
+        with self._lock:
+            terms = [
+                _QueryTerm(term, prefix, self._term_matches(term, prefix))
+                for term, prefix in {term: last_is_prefix and term == tokens[-1] for term in tokens}.items()
+            ]
+            unmatched = [term for term in terms if not term.matches]
+            if any(len(term.term) < MIN_FUZZY_LENGTH for term in unmatched):
+                return []
+
+            def candidate_count(term: _QueryTerm) -> int:
+                return sum(len(numbers) for token in term.matches for numbers in self._postings[token].values())
+
+            matched = sorted((term for term in terms if term.matches), key=candidate_count)
+            if unmatched and matched and candidate_count(matched[0]) <= TYPO_RETRY_MAX_CANDIDATES:
+                others = matched[1:] + [term.typo_tolerant() for term in unmatched]
+                hits = self._rank(matched[0], others, limit, allowed)
+                if hits:
+                    return hits
+
+            for term in unmatched:
+                term.matches = self._fuzzy_tokens(term.term, term.prefix)
+                if not term.matches:
+                    return []
+
+            # Drive the search from the term with the fewest postings
+            counts = {term.term: candidate_count(term) for term in terms}
+            terms.sort(key=lambda term: counts[term.term])
+            hits = self._rank(terms[0], terms[1:], limit, allowed)
+            if hits or len(terms) == 1:
+                return hits
+            for position, driver in enumerate(terms):
+                if counts[driver.term] > TYPO_RETRY_MAX_CANDIDATES:
+                    break
+                others = [term.typo_tolerant() for term in terms[:position] + terms[position + 1:]]
+                hits = self._rank(driver, others, limit, allowed)
+                if hits:
+                    return hits
+            return []
+
+    def _rank(
+        self,
+        driver: "_QueryTerm",
+        others: List["_QueryTerm"],
+        limit: int,
+        allowed: Optional[Set[SearchKind]],
+    ) -> List[SearchHit]:
+        """Top ``limit`` documents matched by ``driver`` that all ``others`` also match."""
+        others_bound = sum(term.bound(self._postings) for term in others)
+        groups = sorted(
+            (
+                (quality * weight, token, weight)
+                for token, quality in driver.matches.items()
+                for weight in self._postings[token]
+            ),
+            reverse=True,
+        )
+
+        best: List[Tuple[float, int]] = []
+        seen: Set[int] = set()
+        for driver_score, token, weight in groups:
+            bound = driver_score + others_bound
+            if len(best) >= limit and best[0][0] >= bound:
+                break
+            for number in self._postings[token][weight]:
+                if len(best) >= limit and best[0][0] >= bound:
+                    break
+                if number in seen:
+                    continue
+                seen.add(number)
+                if allowed is not None and self._documents[number].kind not in allowed:
+                    continue
+                score = driver_score
+                for term in others:
+                    term_score = self._term_score(number, term)
+                    if not term_score:
+                        break
+                    score += term_score
+                else:
+                    if len(best) < limit:
+                        heapq.heappush(best, (score, number))
+                    elif score > best[0][0]:
+                        heapq.heapreplace(best, (score, number))
+
+        ranked = sorted(
+            best,
+            key=lambda item: (-item[0], KIND_ORDER[self._documents[item[1]].kind], self._documents[item[1]].label),
+        )
+        return [SearchHit(document=self._documents[number], score=round(score, 4)) for score, number in ranked]
+
+    def politician_name(self, politician_id: uuid.UUID) -> Optional[str]:
+        document = self.get((SearchKind.POLITICIAN, politician_id))
+        return document.fields.get("name") if document else None
+
+    # Snapshots
+
+    def snapshot(self, path: str) -> None:
+        """Write the index to ``path`` atomically."""
+        with self._lock:
+            documents = [
+                (number, document.kind.value, document.id.bytes, document.politician_id.bytes, document.fields)
+                for number, document in self._documents.items()
+            ]
+            state = {
+                "version": SNAPSHOT_VERSION,
+                "watermark": self.watermark,
+                "next_number": self._next_number,
+                "documents": documents,
+                "postings": self._postings,
+                "vocabulary": self._vocabulary,
+            }
+            data = pickle.dumps(state, protocol=pickle.HIGHEST_PROTOCOL)
+        directory = os.path.dirname(path)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+        # A unique temporary file, so concurrent writers never share one
+        fd, tmp_path = tempfile.mkstemp(dir=directory or ".", prefix=f".{os.path.basename(path)}.")
+        try:
+            with os.fdopen(fd, "wb") as f:
+                f.write(data)
+            os.replace(tmp_path, path)
+        except BaseException:
+            os.unlink(tmp_path)
+            raise
+
+    def restore(self, path: str) -> bool:
+        """Replace the index with a snapshot. Returns False if none is usable."""
+        try:
+            with open(path, "rb") as f:
+                state = pickle.load(f)
+        except FileNotFoundError:
+            return False
+        except Exception:
+            logger.exception(f"Could not read search index snapshot {path}")
+            return False
+        if state.get("version") != SNAPSHOT_VERSION:
+            logger.info(f"Ignoring search index snapshot {path} with version {state.get('version')}")
+            return False
+
+        kinds = {kind.value: kind for kind in SearchKind}
+        documents = {
+            number: SearchDocument(
+                kind=kinds[kind],
+                id=uuid.UUID(bytes=row_id),
+                politician_id=uuid.UUID(bytes=politician_id),
+                fields=fields,
+            )
+            for number, kind, row_id, politician_id, fields in state["documents"]
+        }
+        document_tokens: Dict[int, Dict[str, float]] = defaultdict(dict)
+        for token, tiers in state["postings"].items():
+            for weight, numbers in tiers.items():
+                for number in numbers:
+                    document_tokens[number][token] = weight
+
+        with self._lock:
+            self.watermark = state["watermark"]
+            self._next_number = state["next_number"]
+            self._documents = documents
+            self._numbers = {document.key: number for number, document in documents.items()}
+            self._document_tokens = dict(document_tokens)
+            self._postings = state["postings"]
+            self._vocabulary = state["vocabulary"]
+        return True
+
+
+# Loading from the database
+
+def _later(current: Optional[datetime], candidate: Optional[datetime]) -> Optional[datetime]:
+    if candidate is None:
+        return current
+    return candidate if current is None or candidate > current else current
+
+
+def refresh_from_db(index: SearchIndex, db: Session) -> None:
+    """
+    Bring ``index`` up to date with the database.
+
+    An empty index, or one older than the tombstones kept, is loaded in
+    full, dropping documents whose rows are gone. Otherwise only rows
+    updated since the index watermark are re-read, and rows whose tombstones
+    are newer than it are dropped.
+    """
+    since = index.watermark - WATERMARK_OVERLAP if index.watermark else None
+    retention = timedelta(hours=get_settings().search_tombstone_retention_hours)
+    if since is not None and since < datetime.now(timezone.utc) - retention:
+        since = None
+    watermark = index.watermark
+    seen: Set[DocumentKey] = set()
+
+    politicians = select(
+        Politician.id, Politician.name, Politician.party, Politician.county,
+        Politician.position, Politician.is_active, Politician.updated_at,
+    )
+    if since is not None:
+        politicians = politicians.where(Politician.updated_at > since)
+    for row in db.execute(politicians):
+        watermark = _later(watermark, row.updated_at)
+        seen.add((SearchKind.POLITICIAN, row.id))
+        index.apply_change(SearchKind.POLITICIAN, row._asdict())
+
+    for kind, model in ((SearchKind.CASE, LegalCase), (SearchKind.PROMISE, Promise)):
+        stmt = select(model.id, model.politician_id, model.title, model.updated_at)
+        if since is not None:
+            stmt = stmt.where(model.updated_at > since)
+        for row in db.execute(stmt):
+            watermark = _later(watermark, row.updated_at)
+            seen.add((kind, row.id))
+            index.apply_change(kind, row._asdict())
+
+    if since is None:
+        for key in index.keys():
+            if key not in seen:
+                index.remove(key)
+    else:
+        tombstones = select(SearchTombstone.table_name, SearchTombstone.row_id).where(
+            SearchTombstone.deleted_at > since
+        )
+        for table_name, row_id in db.execute(tombstones):
+            kind = TABLE_KINDS.get(table_name)
+            if kind is not None:
+                index.remove((kind, row_id))
+
+    index.watermark = watermark
+
+
+def prune_search_tombstones(db: Session) -> int:
+    """Delete tombstones past ``search_tombstone_retention_hours``; returns how many."""
+    cutoff = datetime.now(timezone.utc) - timedelta(hours=get_settings().search_tombstone_retention_hours)
+    deleted = db.execute(delete(SearchTombstone).where(SearchTombstone.deleted_at < cutoff)).rowcount
+    db.commit()
+    return deleted
+
+
+@lru_cache()
+def get_search_index() -> SearchIndex:
+    """Get the process-wide search index."""
+    return SearchIndex()
+
+
+def warm_start_search_index(db: Session) -> SearchIndex:
+    """Load the index from its snapshot (if configured), then catch up from the database."""
+    settings = get_settings()
+    index = get_search_index()
+    started = time.perf_counter()
+    restored = bool(settings.search_snapshot_path) and index.restore(settings.search_snapshot_path)
+    refresh_from_db(index, db)
+    if settings.search_snapshot_path:
+        index.snapshot(settings.search_snapshot_path)
+    elapsed_ms = (time.perf_counter() - started) * 1000
+    source = "snapshot" if restored else "database"
+    logger.info(f"Search index ready from {source}: {len(index)} documents in {elapsed_ms:.0f}ms")
+    return index
+
+
+def save_search_index_snapshot() -> None:
+    """Snapshot the index to the configured path, if any."""
+    path = get_settings().search_snapshot_path
+    if not path:
+        return
+    try:
+        get_search_index().snapshot(path)
+    except Exception:
+        logger.exception(f"Failed to write search index snapshot {path}")
+
+
+class SearchIndexRefresher:
+    """
+    Background thread that periodically catches the index up from the
+    database. Model change events only reach the process that committed,
+    so this is how an API worker sees writes made by other workers, the
+    Celery workers and the importers.
+    """
+
+    def __init__(
+        self,
+        interval_seconds: float,
+        session_factory: Callable[[], Session] = SessionLocal,
+        index: Optional[SearchIndex] = None,
+    ):
+        self.interval_seconds = interval_seconds
+        self.session_factory = session_factory
+        self.index = index
+        self._stop = threading.Event()
+        self._thread: Optional[threading.Thread] = None
+
+    def start(self) -> None:
+        if self._thread is not None or self.interval_seconds <= 0:
+            return
+        self._stop.clear()
+        self._thread = threading.Thread(target=self._run, name="search-index-refresher", daemon=True)
+        self._thread.start()
+
+    def stop(self, timeout: Optional[float] = None) -> None:
+        self._stop.set()
+        if self._thread is not None:
+            self._thread.join(timeout)
+            self._thread = None
+
+    def refresh_once(self) -> None:
+        index = self.index if self.index is not None else get_search_index()
+        db = self.session_factory()
+        try:
+            refresh_from_db(index, db)
+        finally:
+            db.close()
+
+    def _run(self) -> None:
+        while not self._stop.wait(self.interval_seconds):
+            try:
+                self.refresh_once()
+            except Exception:
+                logger.exception("Search index refresh failed")
+
+
+def autocomplete(query: str, limit: int = 10, kind: Optional[SearchKind] = None) -> List[SearchSuggestion]:
+    """Suggestions for a partially typed query."""
+    index = get_search_index()
+    hits = index.search(query, limit=limit, kinds=[kind] if kind else None)
+    suggestions = []
+    for hit in hits:
+        document = hit.document
+        if document.kind == SearchKind.POLITICIAN:
+            detail = " · ".join(filter(None, (document.fields.get("party"), document.fields.get("county"))))
+            politician_name = document.fields.get("name")
+        else:
+            politician_name = index.politician_name(document.politician_id)
+            detail = politician_name
+        suggestions.append(SearchSuggestion(
+            kind=document.kind.value,
+            id=document.id,
+            label=document.label,
+            detail=detail or None,
+            politician_id=document.politician_id,
+            politician_name=politician_name,
+            score=hit.score,
+        ))
+    return suggestions
+
+
+def _on_model_changes(changes: List[ModelChange]) -> None:
+    index = get_search_index()
+    for change in changes:
+        kind = TABLE_KINDS.get(change.table)
+        if kind is None:
+            continue
+        if change.operation == DELETE:
+            index.remove((kind, change.values.get("id")))
+        elif change.operation != UPDATE or change.changed & INDEXED_COLUMNS[change.table]:
+            index.apply_change(kind, change.values)
+
+
+def register_search_listeners() -> None:
+    """Keep the search index in step with committed changes."""
+    subscribe(_on_model_changes)
@@ -0,0 +1,391 @@
+"""
+News sentiment analysis.
+
+Scores the sentiment (-1..1) of news mentions, which feeds the public
+sentiment component of the transparency score. Texts are scored by a
+pluggable ``SentimentScorer``:
+
+- ``OpenAISentimentScorer`` sends many texts per chat completion and reads
+  back one score per text;
+- ``LexiconSentimentScorer`` is an offline word-list scorer with negation
+  and intensifier handling, used when no API key is configured, as the
+  fallback when the API fails, and for benchmarks.
+
+``SentimentService`` caches scores in Redis keyed by a hash of the
+normalized text and the scorer, so a re-scraped article (or one article
+mentioning several politicians) is scored once. Cache misses are scored in
+batches, with at most ``max_concurrency`` batches in flight. Scores from the
+fallback scorer are not cached, so the text is scored properly once the API
+is back.
+
+``score_pending_mentions`` scores every stored mention still without a
+sentiment, reporting throughput in articles per second.
+"""
+import asyncio
+from dataclasses import dataclass
+from decimal import Decimal
+import hashlib
+import json
+import logging
+import math
+import time
+from typing import Any, Dict, List, Optional, Protocol, Sequence, Tuple
+
+from openai import AsyncOpenAI
+from sqlalchemy import select, update
+
+from app.config import get_settings
+from app.core.model_events import UPDATE, ModelChange, record_changes
+from app.database import AsyncSessionLocal
+from app.models.news import NewsMention
+from app.utils.helpers import tokenize
+from app.utils.redis_client import get_redis
+
+settings = get_settings()
+logger = logging.getLogger(__name__)
+
+CACHE_KEY = "sentiment:{scorer}:{digest}"
+
+# Texts are cut to this length before scoring
+MAX_TEXT_CHARS = 2000
+
+# Word valences on a -4..4 scale
+LEXICON: Dict[str, float] = {
+    # Wrongdoing and legal trouble
+    "corruption": -3.0, "corrupt": -3.0, "graft": -3.0, "fraud": -3.0, "fraudulent": -3.0,
+    "embezzlement": -3.2, "embezzled": -3.2, "bribe": -2.8, "bribery": -2.8, "bribes": -2.8,
+    "looted": -3.0, "looting": -3.0, "theft": -2.8, "stolen": -2.8, "stole": -2.8,
+    "misappropriation": -2.8, "misappropriated": -2.8, "extortion": -2.8, "nepotism": -2.4,
+    "scandal": -2.6, "cartel": -2.2, "cartels": -2.2, "rigging": -2.6, "rigged": -2.6,
+    "arrested": -2.2, "arrest": -2.0, "charged": -1.8, "indicted": -2.2, "convicted": -2.8,
+    "jailed": -2.8, "sentenced": -2.2, "illegal": -2.2, "unlawful": -2.2, "irregular": -1.6,
+    "irregularities": -2.0, "misconduct": -2.2, "abuse": -2.4, "accused": -1.6, "allegations": -1.2,
+    "alleged": -0.8, "probe": -0.8, "investigation": -0.6, "impeachment": -1.8, "impeached": -2.2,
+    "ousted": -1.8, "sacked": -1.8, "suspended": -1.4, "lied": -2.2, "lies": -2.0, "fake": -1.8,
+    "mismanagement": -2.4, "incompetent": -2.4, "incompetence": -2.4, "controversy": -1.4,
+    "controversial": -1.2, "tribalism": -2.2,
+    # Conflict and failure
+    "violence": -2.8, "violent": -2.6, "killed": -2.8, "deaths": -2.4, "dead": -2.2, "attack": -2.0,
+    "attacked": -2.2, "threat": -1.6, "threats": -1.8, "riot": -2.2, "riots": -2.2, "chaos": -2.2,
+    "crisis": -2.0, "protest": -1.0, "protests": -1.0, "crackdown": -1.8, "clash": -1.6,
+    "clashes": -1.8, "condemned": -2.0, "condemn": -1.8, "criticised": -1.4, "criticized": -1.4,
+    "blamed": -1.6, "blame": -1.4, "rejected": -1.4, "failed": -2.0, "failure": -2.2, "fail": -1.8,
+    "stalled": -1.8, "delayed": -1.2, "collapsed": -2.2, "collapse": -2.0, "abandoned": -1.8,
+    "shortage": -1.6, "unpaid": -1.6, "strike": -1.0, "loss": -1.4, "losses": -1.6, "debt": -1.0,
+    "dispute": -1.0, "defied": -1.2, "warned": -0.8, "poor": -1.6, "bad": -2.0, "worse": -2.0,
+    "worst": -2.6, "wrong": -1.6, "dangerous": -2.0,
+    # Delivery and praise
+    "acquitted": 2.0, "cleared": 1.4, "exonerated": 2.2, "launched": 1.4, "launch": 1.2,
+    "commissioned": 1.8, "completed": 1.8, "opened": 1.2, "delivered": 2.0, "delivers": 2.0,
+    "fulfilled": 2.4, "kept": 1.0, "improved": 1.8, "improvement": 1.8, "improve": 1.4,
+    "success": 2.4, "successful": 2.4, "successfully": 2.2, "win": 2.0, "won": 2.0, "victory": 2.2,
+    "praised": 2.2, "praise": 2.0, "commended": 2.2, "award": 1.8, "awarded": 1.8, "honoured": 2.0,
+    "honored": 2.0, "support": 1.2, "supported": 1.2, "boost": 1.8, "boosted": 1.8, "growth": 1.6,
+    "progress": 1.8, "reform": 1.2, "reforms": 1.2, "transparency": 1.6, "transparent": 1.6,
+    "accountable": 1.6, "accountability": 1.4, "integrity": 1.8, "donated": 1.8, "donation": 1.6,
+    "benefit": 1.4, "benefits": 1.4, "good": 1.8, "great": 2.4, "best": 2.6, "excellent": 2.8,
+    "historic": 1.6, "peace": 2.0, "peaceful": 2.0, "unity": 1.8, "united": 1.4, "agreement": 1.2,
+    "approved": 1.2, "passed": 0.8, "funded": 1.0, "bursaries": 1.4, "bursary": 1.4, "jobs": 1.2,
+    "employment": 1.2, "investment": 1.2, "development": 1.2, "empowerment": 1.6, "welcomed": 1.6,
+    "celebrated": 2.0, "hope": 1.4, "relief": 1.6, "rescued": 1.8, "milestone": 1.8,
+    "upgraded": 1.4, "affordable": 1.4, "efficient": 1.6,
+}
+
+# Flip the valence of the next few words; tokenize splits "didn't" into "didn", "t"
+NEGATIONS = {
+    "not", "no", "never", "nor", "without", "cannot", "neither", "none", "nothing", "lack", "lacks",
+    "didn", "doesn", "isn", "wasn", "weren", "aren", "hasn", "haven", "hadn", "couldn",
+    "wouldn", "shouldn", "don",
+}
+# Words that negate only as the stem of a contraction: "won't" but "won praise"
+CONTRACTION_NEGATIONS = {"won", "can"}
+NEGATION_SCOPE = 3
+NEGATION_FACTOR = -0.74
+
+# Scale the valence of the next word
+INTENSIFIERS = {
+    "very": 0.3, "highly": 0.3, "extremely": 0.4, "massive": 0.3, "huge": 0.3, "major": 0.2,
+    "totally": 0.3, "deeply": 0.3, "gross": 0.4, "serious": 0.3, "seriously": 0.3,
+    "slightly": -0.3, "somewhat": -0.2, "partly": -0.3, "minor": -0.3,
+}
+
+# Squashes summed valence into -1..1; larger values need more evidence
+NORMALIZATION_ALPHA = 15.0
+
+BATCH_PROMPT = (
+    "You rate the sentiment of Kenyan news coverage towards the politicians it is about. "
+    "For each numbered text, give a score from -1 (very negative) through 0 (neutral) to 1 "
+    '(very positive). Reply with JSON: {"scores": [<one number per text, in order>]}.'
+)
+
+
+class SentimentError(Exception):
+    """A scorer failed to score a batch."""
+
+
+class SentimentScorer(Protocol):
+    """Scores batches of texts; ``name`` identifies its scores in the cache."""
+
+    name: str
+
+    async def score_batch(self, texts: List[str]) -> List[float]:
+        ...
+
+
+class LexiconSentimentScorer:
+    """Offline scorer summing word valences, with negation and intensifiers."""
+
+    name = "lexicon-v2"
+
+    def __init__(self, lexicon: Optional[Dict[str, float]] = None):
+        self.lexicon = dict(LEXICON)
+        if lexicon:
+            self.lexicon.update(lexicon)
+            self.name = f"{self.name}+{hashlib.sha1(json.dumps(lexicon, sort_keys=True).encode()).hexdigest()[:8]}"
+
+    @classmethod
+    def from_settings(cls) -> "LexiconSentimentScorer":
+        """The scorer with the extra words of ``sentiment_lexicon_path``, if set."""
+        if not settings.sentiment_lexicon_path:
+            return cls()
+        with open(settings.sentiment_lexicon_path, encoding="utf-8") as handle:
+            return cls({word.lower(): float(valence) for word, valence in json.load(handle).items()})
+
+    def score_text(self, text: str) -> float:
+        total = 0.0
+        negated_until = -1
+        boost = 0.0
+        tokens = tokenize(text)
+        for position, token in enumerate(tokens):
+            if token in NEGATIONS or (
+                token in CONTRACTION_NEGATIONS and position + 1 < len(tokens) and tokens[position + 1] == "t"
+            ):
+                negated_until = position + NEGATION_SCOPE
+                continue
+            if token in INTENSIFIERS:
+                boost += INTENSIFIERS[token]
+                continue
+            valence = self.lexicon.get(token)
+            if valence is not None:
+                valence *= 1 + boost
+                if position <= negated_until:
+                    valence *= NEGATION_FACTOR
+                total += valence
+            boost = 0.0
+        return total / math.sqrt(total * total + NORMALIZATION_ALPHA)
+
+    async def score_batch(self, texts: List[str]) -> List[float]:
+        return [self.score_text(text) for text in texts]
+
+
+class OpenAISentimentScorer:
+    """Scores many texts per chat completion."""
+
+    def __init__(self, api_key: str, model: str, timeout: float = 60.0):
+        self.model = model
+        self.name = f"openai:{model}"
+        self.client = AsyncOpenAI(api_key=api_key, timeout=timeout, max_retries=2)
+
+    async def score_batch(self, texts: List[str]) -> List[float]:
+        numbered = "\n".join(f"{number}. {json.dumps(text)}" for number, text in enumerate(texts, 1))
+        response = await self.client.chat.completions.create(
+            model=self.model,
+            temperature=0,
+            response_format={"type": "json_object"},
+            messages=[
+                {"role": "system", "content": BATCH_PROMPT},
+                {"role": "user", "content": numbered},
+            ],
+        )
+        try:
+            scores = json.loads(response.choices[0].message.content or "")["scores"]
+            if len(scores) != len(texts):
+                raise SentimentError(f"Expected {len(texts)} scores, got {len(scores)}")
+            return [max(-1.0, min(1.0, float(score))) for score in scores]
+        except (KeyError, TypeError, ValueError) as exc:
+            raise SentimentError(f"Malformed sentiment response: {exc}") from exc
+
+
+@dataclass
+class SentimentReport:
+    """Outcome of a sentiment scoring run."""
+
+    texts: int = 0
+    cache_hits: int = 0
+    scored: int = 0
+    fallback_scored: int = 0
+    batches: int = 0
+    updated: int = 0
+    elapsed_seconds: float = 0.0
+
+    @property
+    def articles_per_second(self) -> float:
+        return self.texts / self.elapsed_seconds if self.elapsed_seconds else 0.0
+
+
+def text_digest(text: str) -> str:
+    """Hash of a text's normalized tokens, so markup and spacing changes still hit."""
+    return hashlib.sha256(" ".join(tokenize(text)).encode("utf-8")).hexdigest()
+
+
+def mention_text(title: Optional[str], summary: Optional[str]) -> str:
+    """The text of a news mention that is scored."""
+    return "\n".join(part for part in (title, summary) if part)
+
+
+class SentimentService:
+    """Cached, batched, concurrency-bounded sentiment scoring."""
+
+    def __init__(
+        self,
+        scorer: SentimentScorer,
+        fallback: Optional[SentimentScorer] = None,
+        cache: Any = None,
+        batch_size: int = 50,
+        max_concurrency: int = 4,
+        cache_ttl: int = 90 * 24 * 3600,
+    ):
+        self.scorer = scorer
+        self.fallback = fallback
+        self.cache = cache
+        self.batch_size = batch_size
+        self.cache_ttl = cache_ttl
+        self._semaphore = asyncio.Semaphore(max_concurrency)
+
+    def cache_key(self, text: str) -> str:
+        return CACHE_KEY.format(scorer=self.scorer.name, digest=text_digest(text))
+
+    async def score(self, texts: Sequence[str], report: Optional[SentimentReport] = None) -> List[Optional[float]]:
+        """Scores for ``texts``, in order; ``None`` for texts with nothing to score."""
+        report = report if report is not None else SentimentReport()
+        started = time.perf_counter()
+        keys = [self.cache_key(text) if tokenize(text) else None for text in texts]
+        pending: Dict[str, str] = {}
+        for key, text in zip(keys, texts):
+            if key is not None:
+                pending.setdefault(key, text)
+
+        scores: Dict[str, float] = {}
+        if self.cache is not None and pending:
+            cached = await asyncio.to_thread(self.cache.mget, list(pending))
+            for key, raw in zip(list(pending), cached):
+                if raw is not None:
+                    scores[key] = float(raw)
+                    del pending[key]
+
+        items = list(pending.items())
+        batches = [items[start:start + self.batch_size] for start in range(0, len(items), self.batch_size)]
+        for batch_scores in await asyncio.gather(*(self._score_batch(batch, report) for batch in batches)):
+            scores.update(batch_scores)
+
+        report.texts += len(texts)
+        report.cache_hits += sum(1 for key in keys if key is not None and key not in pending)
+        report.batches += len(batches)
+        report.elapsed_seconds += time.perf_counter() - started
+        return [scores.get(key) if key is not None else None for key in keys]
+
+    async def _score_batch(self, batch: List[Tuple[str, str]], report: SentimentReport) -> Dict[str, float]:
+        texts = [text[:MAX_TEXT_CHARS] for _, text in batch]
+        async with self._semaphore:
+            try:
+                values = await self.scorer.score_batch(texts)
+                cacheable = True
+                report.scored += len(texts)
+            except Exception as exc:
+                if self.fallback is None:
+                    raise
+                logger.warning(f"Sentiment scorer {self.scorer.name} failed, using {self.fallback.name}: {exc}")
+                values = await self.fallback.score_batch(texts)
+                cacheable = False
+                report.fallback_scored += len(texts)
+        scores = {key: round(value, 2) for (key, _), value in zip(batch, values)}
+        if cacheable and self.cache is not None:
+            await asyncio.to_thread(self._store, scores)
+        return scores
+
+    def _store(self, scores: Dict[str, float]) -> None:
+        for key, value in scores.items():
+            self.cache.set(key, f"{value:.2f}", ex=self.cache_ttl)
+
+
+def create_sentiment_service() -> SentimentService:
+    """
+    A service for the configured backend: ``openai`` (with the lexicon as
+    fallback), ``lexicon``, or ``auto`` (``openai`` when an API key is set).
+
+    Services hold an asyncio semaphore and HTTP client, so create one per
+    event loop.
+    """
+    backend = settings.sentiment_backend
+    if backend == "auto":
+        backend = "openai" if settings.openai_api_key else "lexicon"
+    lexicon = LexiconSentimentScorer.from_settings()
+    if backend == "openai":
+        scorer: SentimentScorer = OpenAISentimentScorer(
+            settings.openai_api_key, settings.sentiment_model, settings.sentiment_timeout_seconds
+        )
+        fallback: Optional[SentimentScorer] = lexicon
+    elif backend == "lexicon":
+        scorer, fallback = lexicon, None
+    else:
+        raise ValueError(f"Unknown sentiment backend {backend!r}")
+    return SentimentService(
+        scorer,
+        fallback=fallback,
+        cache=get_redis(),
+        batch_size=settings.sentiment_batch_size,
+        max_concurrency=settings.sentiment_max_concurrency,
+        cache_ttl=settings.sentiment_cache_ttl_seconds,
+    )
+
+
+async def score_pending_mentions(
+    service: Optional[SentimentService] = None,
+    limit: Optional[int] = None,
+    chunk_size: int = 1000,
+) -> SentimentReport:
+    """Score stored news mentions that have no sentiment yet, committing per chunk."""
+    service = service or create_sentiment_service()
+    report = SentimentReport()
+    started = time.perf_counter()
+    async with AsyncSessionLocal() as db:
+        last_id = None
+        while limit is None or report.texts < limit:
+            stmt = (
+                select(NewsMention.id, NewsMention.politician_id, NewsMention.title, NewsMention.content_summary)
+                .where(NewsMention.sentiment.is_(None))
+                .order_by(NewsMention.id)
+                .limit(chunk_size if limit is None else min(chunk_size, limit - report.texts))
+            )
+            if last_id is not None:
+                stmt = stmt.where(NewsMention.id > last_id)
+            rows = (await db.execute(stmt)).all()
+            if not rows:
+                break
+            last_id = rows[-1].id
+
+            scores = await service.score([mention_text(row.title, row.content_summary) for row in rows], report)
+            values = [
+                {"id": row.id, "politician_id": row.politician_id, "sentiment": Decimal(f"{score:.2f}")}
+                for row, score in zip(rows, scores)
+                if score is not None
+            ]
+            if values:
+                await db.execute(update(NewsMention), [{"id": v["id"], "sentiment": v["sentiment"]} for v in values])
+                # Bulk statements bypass mapper events; report the writes to the change feed
+                record_changes(
+                    db.sync_session,
+                    [
+                        ModelChange(NewsMention.__tablename__, UPDATE, value, changed=frozenset({"sentiment"}))
+                        for value in values
+                    ],
+                )
+                await db.commit()
+                report.updated += len(values)
+
+    report.elapsed_seconds = time.perf_counter() - started
+    logger.info(
+        f"Scored {report.texts} news mentions ({report.cache_hits} cached, {report.fallback_scored} by fallback) "
+        f"in {report.elapsed_seconds:.1f}s, {report.articles_per_second:.0f} articles/s"
+    )
+    return report
@@ -0,0 +1,273 @@
+"""
+Dashboard statistics.
+
+The ``/stats`` endpoints read pre-aggregated materialized views
+(``app.models.stats``) instead of scanning the underlying tables, so their
+cost stays flat however much data accumulates.
+
+Views are refreshed with ``REFRESH MATERIALIZED VIEW CONCURRENTLY``, which
+never blocks readers. A refresh happens when enough relevant changes have
+been committed (counted from the change feed in Redis) or when the views
+have gone ``stats_refresh_max_interval_seconds`` without one, whichever
+comes first, and never more often than
+``stats_refresh_min_interval_seconds``. A Redis lock keeps two refreshes
+from running at once.
+
+Each process serves the views from an in-memory snapshot, reloaded at most
+every ``stats_snapshot_ttl_seconds``; concurrent reloads collapse into one.
+The numbers served are therefore at most the refresh interval plus the
+snapshot TTL old, and every response carries the time of the refresh.
+"""
+from dataclasses import dataclass
+from datetime import datetime, timezone
+from decimal import Decimal
+import logging
+import time
+from typing import Dict, Iterable, List, Optional
+
+from sqlalchemy import select, text
+from sqlalchemy.orm import Session
+
+from app.config import get_settings
+from app.core.model_events import UPDATE, ModelChange, subscribe
+from app.models.case import CaseSeverity, CaseStatus
+from app.models.promise import PromiseStatus
+from app.models.report import ReportPriority, ReportStatus
+from app.models.stats import (
+    SCORE_BUCKET_WIDTH,
+    SCORE_BUCKETS,
+    STATS_VIEWS,
+    stats_case_counts,
+    stats_overview,
+    stats_promise_counts,
+    stats_report_counts,
+    stats_score_buckets,
+)
+from app.schemas.stats import (
+    CaseStats,
+    PromiseCount,
+    PromiseStats,
+    ReportCount,
+    ReportStats,
+    ScoreBucket,
+    ScoreDistribution,
+    StatsOverview,
+)
+from app.utils.cache import SingleFlight, TTLCache
+from app.utils.redis_client import get_redis
+
+settings = get_settings()
+logger = logging.getLogger(__name__)
+
+PENDING_CHANGES_KEY = "stats:pending_changes"
+REFRESH_LOCK_KEY = "stats:refresh_lock"
+REFRESH_LOCK_TTL_SECONDS = 600
+
+# Table -> columns whose updates change the statistics; inserts and deletes always do
+TRACKED_TABLES = {
+    "politicians": {"transparency_score", "is_active"},
+    "flagged_reports": {"status", "priority"},
+    "legal_cases": {"status", "severity"},
+    "promises": {"status", "fulfillment_percentage"},
+    "news_mentions": {"published_at"},
+}
+
+
+# Change feed subscriber
+
+def count_relevant_changes(changes: Iterable[ModelChange]) -> int:
+    """Number of changes that affect the statistics."""
+    count = 0
+    for change in changes:
+        columns = TRACKED_TABLES.get(change.table)
+        if columns is None:
+            continue
+        if change.operation == UPDATE and not change.changed & columns:
+            continue
+        count += 1
+    return count
+
+
+def _on_model_changes(changes: List[ModelChange]) -> None:
+    count = count_relevant_changes(changes)
+    if count:
+        get_redis().incr(PENDING_CHANGES_KEY, count)
+
+
+def register_stats_listeners() -> None:
+    """Count committed changes that make the statistics views stale."""
+    subscribe(_on_model_changes)
+
+
+# Refreshing
+
+def last_refreshed_at(db: Session) -> Optional[datetime]:
+    return db.scalar(select(stats_overview.c.refreshed_at))
+
+
+def pending_changes() -> int:
+    return int(get_redis().get(PENDING_CHANGES_KEY) or 0)
+
+
+def refresh_stats_views(db: Session, concurrently: bool = True) -> float:
+    """
+    Refresh every statistics view, each in its own transaction; returns the
+    seconds taken. The overview goes last, so its ``refreshed_at`` marks a
+    completed refresh.
+    """
+    started = time.perf_counter()
+    keyword = " CONCURRENTLY" if concurrently else ""
+    for name in sorted(STATS_VIEWS, key=lambda name: name == stats_overview.name):
+        db.execute(text(f"REFRESH MATERIALIZED VIEW{keyword} {name}"))
+        db.commit()
+    _snapshot_cache.clear()
+    return time.perf_counter() - started
+
+
+def refresh_stats_if_needed(db: Session, force: bool = False) -> bool:
+    """Refresh the views if the change threshold or maximum age is reached; returns whether it did."""
+    pending = pending_changes()
+    refreshed_at = last_refreshed_at(db)
+    db.rollback()  # don't hold a snapshot open across the refresh
+    age = (datetime.now(timezone.utc) - refreshed_at).total_seconds() if refreshed_at else float("inf")
+    due = (
+        force
+        or age >= settings.stats_refresh_max_interval_seconds
+        or (pending >= settings.stats_refresh_change_threshold and age >= settings.stats_refresh_min_interval_seconds)
+    )
+    if not due:
+        return False
+
+    client = get_redis()
+    if not client.set(REFRESH_LOCK_KEY, "1", nx=True, ex=REFRESH_LOCK_TTL_SECONDS):
+        logger.info("Statistics refresh already running; skipping")
+        return False
+    try:
+        elapsed = refresh_stats_views(db)
+        # Changes committed during the refresh stay counted
+        if pending:
+            client.incr(PENDING_CHANGES_KEY, -pending)
+    finally:
+        client.delete(REFRESH_LOCK_KEY)
+    logger.info(f"Refreshed statistics views in {elapsed:.2f}s ({pending} pending changes, {age:.0f}s old)")
+    return True
+
+
+# Snapshot
+
+@dataclass(frozen=True)
+class StatsSnapshot:
+    """Every statistics response, built from one read of the views."""
+
+    overview: StatsOverview
+    scores: ScoreDistribution
+    reports: ReportStats
+
+
+_snapshot_cache: TTLCache[StatsSnapshot] = TTLCache(maxsize=1, ttl=settings.stats_snapshot_ttl_seconds)
+_snapshot_loads = SingleFlight()
+
+
+def _number(value: Optional[Decimal], places: int = 2) -> Optional[float]:
+    return None if value is None else round(float(value), places)
+
+
+def load_stats_snapshot(db: Session) -> StatsSnapshot:
+    """Read the statistics views; enum columns hold member names."""
+    overview = db.execute(select(stats_overview)).one()
+    buckets = {row.bucket: row for row in db.execute(select(stats_score_buckets))}
+    report_rows = db.execute(select(stats_report_counts)).all()
+    case_rows = db.execute(select(stats_case_counts)).all()
+    promise_rows = db.execute(select(stats_promise_counts)).all()
+
+    scores = ScoreDistribution(
+        refreshed_at=overview.refreshed_at,
+        active_politicians=overview.active_politicians,
+        average_score=_number(overview.average_score),
+        median_score=_number(overview.median_score),
+        buckets=[
+            ScoreBucket(
+                min_score=bucket * SCORE_BUCKET_WIDTH,
+                max_score=(bucket + 1) * SCORE_BUCKET_WIDTH,
+                politicians=buckets[bucket].politicians if bucket in buckets else 0,
+                average_score=_number(buckets[bucket].average_score) if bucket in buckets else None,
+            )
+            for bucket in range(SCORE_BUCKETS)
+        ],
+    )
+
+    report_counts = [
+        ReportCount(
+            status=ReportStatus[row.status],
+            priority=ReportPriority[row.priority],
+            reports=row.reports,
+            reports_last_30_days=row.reports_last_30_days,
+        )
+        for row in report_rows
+    ]
+    by_status: Dict[ReportStatus, int] = {status: 0 for status in ReportStatus}
+    by_priority: Dict[ReportPriority, int] = {priority: 0 for priority in ReportPriority}
+    for count in report_counts:
+        by_status[count.status] += count.reports
+        by_priority[count.priority] += count.reports
+    reports = ReportStats(
+        refreshed_at=overview.refreshed_at,
+        total=sum(count.reports for count in report_counts),
+        last_30_days=sum(count.reports_last_30_days for count in report_counts),
+        by_status=by_status,
+        by_priority=by_priority,
+        counts=report_counts,
+    )
+
+    case_status: Dict[CaseStatus, int] = {status: 0 for status in CaseStatus}
+    case_severity: Dict[CaseSeverity, int] = {severity: 0 for severity in CaseSeverity}
+    for row in case_rows:
+        case_status[CaseStatus[row.status]] += row.cases
+        if row.severity:
+            case_severity[CaseSeverity[row.severity]] += row.cases
+
+    promise_total = sum(row.promises for row in promise_rows)
+    fulfillment_sum = sum((row.average_fulfillment or 0) * row.promises for row in promise_rows)
+    promises = PromiseStats(
+        total=promise_total,
+        average_fulfillment=_number(fulfillment_sum / promise_total) if promise_total else None,
+        by_status=[
+            PromiseCount(
+                status=PromiseStatus[row.status],
+                promises=row.promises,
+                average_fulfillment=_number(row.average_fulfillment),
+            )
+            for row in promise_rows
+        ],
+    )
+
+    return StatsSnapshot(
+        overview=StatsOverview(
+            refreshed_at=overview.refreshed_at,
+            politicians=overview.politicians,
+            active_politicians=overview.active_politicians,
+            average_score=_number(overview.average_score),
+            median_score=_number(overview.median_score),
+            news_mentions_last_30_days=overview.news_mentions_last_30_days,
+            reports_total=reports.total,
+            reports_last_30_days=reports.last_30_days,
+            cases=CaseStats(total=sum(case_status.values()), by_status=case_status, by_severity=case_severity),
+            promises=promises,
+        ),
+        scores=scores,
+        reports=reports,
+    )
+
+
+def get_stats_snapshot(db: Session) -> StatsSnapshot:
+    """This process's snapshot of the statistics, reloaded once it is older than the TTL."""
+    snapshot = _snapshot_cache.get("stats")
+    if snapshot is not None:
+        return snapshot
+
+    def load() -> StatsSnapshot:
+        loaded = load_stats_snapshot(db)
+        _snapshot_cache.set("stats", loaded)
+        return loaded
+
+    return _snapshot_loads.do("stats", load)
@@ -0,0 +1,435 @@
+"""
+Evidence file storage.
+
+Evidence uploads are never held in memory whole. The multipart body is
+parsed as it arrives (``app.utils.multipart``) and each file is written to a
+spool file in ``upload_chunk_size`` blocks, hashed (SHA-256) as it is
+written, and rejected with a 413 as soon as it passes ``max_upload_size``.
+Disk writes run on a small dedicated thread pool, not the shared one sync
+endpoints run on.
+
+Once a file is complete its MIME type is sniffed from its content, and
+images are measured and thumbnailed, in a process pool
+(``app.utils.media``), so neither libmagic nor Pillow ever runs on the event
+loop. Files whose content is not a type their extension allows (a PDF
+named ``.png``, say) are refused. Accepted files are stored under a content
+address (``evidence/<sha256>.<ext>``): the same file uploaded twice, to any
+report, is stored once, and a report never lists the same file twice. Their
+metadata is appended to the report's ``evidence_files``.
+
+Each process takes at most ``max_concurrent_uploads`` uploads at a time and
+turns the rest away with a 503 and ``Retry-After``, so a burst of video
+uploads waits at the clients instead of piling up in API workers' memory,
+disk and worker pools.
+
+Backends: ``local`` (a directory) or ``s3`` (AWS S3, or an S3-compatible
+store such as MinIO given ``s3_endpoint_url``; needs ``boto3``).
+"""
+import asyncio
+from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor
+from concurrent.futures.process import BrokenProcessPool
+from contextlib import contextmanager
+from datetime import datetime, timezone
+from functools import lru_cache
+import hashlib
+import logging
+import multiprocessing
+import os
+from pathlib import Path
+import shutil
+import tempfile
+from typing import Any, BinaryIO, Callable, Dict, Iterator, List, Optional
+import uuid
+
+from fastapi import Request
+from sqlalchemy import select
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.config import get_settings
+from app.core.auth_cache import UserPrincipal
+from app.core.exceptions import (
+    BadRequestException,
+    ForbiddenException,
+    NotFoundException,
+    PayloadTooLargeException,
+    ServiceUnavailableException,
+)
+from app.core.metrics import registry
+from app.models.report import FlaggedReport
+from app.models.user import UserRole
+from app.schemas.report import EvidenceFile, EvidenceUploadResponse
+from app.utils.media import inspect_media
+from app.utils.multipart import PART_BEGIN, PART_DATA, PART_END, MultipartPart, iter_multipart
+
+settings = get_settings()
+logger = logging.getLogger(__name__)
+
+# Content types each allowed extension may hold, as sniffed by libmagic
+EXTENSION_CONTENT_TYPES = {
+    "pdf": {"application/pdf"},
+    "png": {"image/png"},
+    "jpg": {"image/jpeg"},
+    "jpeg": {"image/jpeg"},
+    "gif": {"image/gif"},
+    "mp4": {"video/mp4", "video/x-m4v"},
+    "mov": {"video/quicktime"},
+}
+CANONICAL_EXTENSIONS = {
+    "application/pdf": "pdf",
+    "image/png": "png",
+    "image/jpeg": "jpg",
+    "image/gif": "gif",
+    "video/mp4": "mp4",
+    "video/x-m4v": "mp4",
+    "video/quicktime": "mov",
+}
+# Room for multipart framing and form fields on top of the files themselves
+MULTIPART_OVERHEAD = 1024 * 1024
+
+
+def evidence_key(sha256: str, content_type: str) -> str:
+    return f"evidence/{sha256[:2]}/{sha256}.{CANONICAL_EXTENSIONS.get(content_type, 'bin')}"
+
+
+def thumbnail_key(sha256: str) -> str:
+    return f"thumbnails/{sha256[:2]}/{sha256}.jpg"
+
+
+# Storage backends
+
+class LocalStorage:
+    """Evidence stored in a local directory."""
+
+    def __init__(self, root: str):
+        self.root = Path(root)
+        # Spooling inside the root makes storing a file a rename
+        self.spool_dir = self.root / ".incoming"
+        self.spool_dir.mkdir(parents=True, exist_ok=True)
+
+    def _path(self, key: str) -> Path:
+        return self.root / key
+
+    def exists(self, key: str) -> bool:
+        return self._path(key).exists()
+
+    def put_file(self, source: str, key: str, content_type: str) -> bool:
+        """Move ``source`` to ``key``; returns False, leaving ``source``, if ``key`` is already stored."""
+        target = self._path(key)
+        if target.exists():
+            return False
+        target.parent.mkdir(parents=True, exist_ok=True)
+        shutil.move(source, target)
+        return True
+
+    def open(self, key: str) -> BinaryIO:
+        return open(self._path(key), "rb")
+
+    def delete(self, key: str) -> None:
+        self._path(key).unlink(missing_ok=True)
+
+
+class S3Storage:
+    """Evidence stored in an S3 bucket; large files go up as multipart uploads."""
+
+    def __init__(self, client: Any, bucket: str, part_size: int = 8 * 1024 * 1024):
+        from boto3.s3.transfer import TransferConfig
+
+        self.client = client
+        self.bucket = bucket
+        self.spool_dir = None
+        self.transfer_config = TransferConfig(multipart_threshold=part_size, multipart_chunksize=part_size)
+
+    def exists(self, key: str) -> bool:
+        from botocore.exceptions import ClientError
+
+        try:
+            self.client.head_object(Bucket=self.bucket, Key=key)
+        except ClientError as exc:
+            if exc.response.get("Error", {}).get("Code") in ("404", "NoSuchKey", "NotFound"):
+                return False
+            raise
+        return True
+
+    def put_file(self, source: str, key: str, content_type: str) -> bool:
+        """Upload ``source`` to ``key``; returns False if ``key`` is already stored."""
+        if self.exists(key):
+            return False
+        self.client.upload_file(
+            source, self.bucket, key, ExtraArgs={"ContentType": content_type}, Config=self.transfer_config
+        )
+        return True
+
+    def open(self, key: str) -> BinaryIO:
+        return self.client.get_object(Bucket=self.bucket, Key=key)["Body"]
+
+    def delete(self, key: str) -> None:
+        self.client.delete_object(Bucket=self.bucket, Key=key)
+
+
+@lru_cache()
+def get_storage():
+    """Get the configured evidence storage backend (``local`` or ``s3``)."""
+    if settings.storage_backend == "s3":
+        import boto3
+
+        client = boto3.client(
+            "s3",
+            endpoint_url=settings.s3_endpoint_url or None,
+            region_name=settings.aws_region,
+            aws_access_key_id=settings.aws_access_key_id or None,
+            aws_secret_access_key=settings.aws_secret_access_key or None,
+        )
+        return S3Storage(client, settings.s3_bucket_name)
+    return LocalStorage(settings.storage_local_path)
+
+
+# Worker pools
+
+_io_pool: Optional[ThreadPoolExecutor] = None
+_media_pool: Optional[ProcessPoolExecutor] = None
+
+
+def _io_executor() -> ThreadPoolExecutor:
+    global _io_pool
+    if _io_pool is None:
+        _io_pool = ThreadPoolExecutor(settings.max_concurrent_uploads, thread_name_prefix="evidence-io")
+    return _io_pool
+
+
+def _media_executor() -> ProcessPoolExecutor:
+    global _media_pool
+    if _media_pool is None:
+        # Spawned rather than forked: the parent is running an event loop,
+        # threads and database connections
+        _media_pool = ProcessPoolExecutor(
+            max_workers=settings.evidence_processing_workers,
+            mp_context=multiprocessing.get_context("spawn"),
+        )
+    return _media_pool
+
+
+async def _run_io(fn: Callable, *args: Any) -> Any:
+    return await asyncio.get_running_loop().run_in_executor(_io_executor(), fn, *args)
+
+
+async def _inspect(path: str, thumbnail_path: Optional[str]) -> Dict[str, Any]:
+    global _media_pool
+    try:
+        return await asyncio.get_running_loop().run_in_executor(
+            _media_executor(), inspect_media, path, thumbnail_path, settings.evidence_thumbnail_size
+        )
+    except BrokenProcessPool:
+        # A worker died (e.g. on a hostile image); start a fresh pool next time
+        logger.exception("Evidence processing pool broke; restarting it")
+        _media_pool = None
+        raise ServiceUnavailableException("Could not process the upload, try again shortly")
+
+
+def shutdown_evidence_workers() -> None:
+    """Stop the upload thread and process pools (on application shutdown)."""
+    global _io_pool, _media_pool
+    if _media_pool is not None:
+        _media_pool.shutdown(wait=True, cancel_futures=True)
+        _media_pool = None
+    if _io_pool is not None:
+        _io_pool.shutdown(wait=True)
+        _io_pool = None
+
+
+# Admission
+
+class UploadSlots:
+    """Uploads in progress in this process; only touched from the event loop."""
+
+    def __init__(self, limit: int):
+        self.limit = limit
+        self.active = 0
+
+    @contextmanager
+    def claim(self) -> Iterator[None]:
+        if self.active >= self.limit:
+            raise ServiceUnavailableException("Too many uploads in progress, try again shortly")
+        self.active += 1
+        try:
+            yield
+        finally:
+            self.active -= 1
+
+
+upload_slots = UploadSlots(settings.max_concurrent_uploads)
+registry.add_collector(lambda: [
+    ("evidence_uploads_in_progress", "gauge", "Evidence uploads being received.", {}, upload_slots.active),
+])
+
+
+# Spooling
+
+class UploadSpool:
+    """One file part written to disk in fixed-size blocks and hashed on the way."""
+
+    def __init__(self, filename: str, directory: Optional[Path] = None):
+        self.filename = filename
+        self.size = 0
+        self._buffer = bytearray()
+        self._hash = hashlib.sha256()
+        fd, self.path = tempfile.mkstemp(prefix="upload-", dir=directory)
+        self._file = os.fdopen(fd, "wb")
+
+    async def write(self, data: bytes) -> None:
+        self.size += len(data)
+        if self.size > settings.max_upload_size:
+            raise PayloadTooLargeException(f"{self.filename} is larger than {settings.max_upload_size} bytes")
+        self._buffer += data
+        chunk_size = settings.upload_chunk_size
+        while len(self._buffer) >= chunk_size:
+            block = bytes(self._buffer[:chunk_size])
+            del self._buffer[:chunk_size]
+            await _run_io(self._write_block, block)
+
+    def _write_block(self, block: bytes) -> None:
+        # hashlib releases the GIL on large blocks
+        self._hash.update(block)
+        self._file.write(block)
+
+    async def finish(self) -> str:
+        """Flush and close the file; returns its SHA-256."""
+        if self._buffer:
+            block = bytes(self._buffer)
+            self._buffer.clear()
+            await _run_io(self._write_block, block)
+        await _run_io(self._file.close)
+        return self._hash.hexdigest()
+
+    def discard(self) -> None:
+        self._file.close()
+        Path(self.path).unlink(missing_ok=True)
+
+
+def _safe_filename(filename: str) -> str:
+    return os.path.basename(filename.replace("\\", "/"))[:255] or "upload"
+
+
+def _extension(filename: str) -> str:
+    return filename.rsplit(".", 1)[-1].lower() if "." in filename else ""
+
+
+def _check_extension(filename: str) -> None:
+    extension = _extension(filename)
+    if extension not in settings.allowed_extensions_list:
+        raise BadRequestException(
+            f"{filename}: only {', '.join(settings.allowed_extensions_list)} files are accepted"
+        )
+
+
+async def store_upload(spool: UploadSpool, uploaded_by: Optional[uuid.UUID] = None) -> EvidenceFile:
+    """Validate a completed spool's content, thumbnail it and move it into storage."""
+    sha256 = await spool.finish()
+    storage = get_storage()
+    thumb_key = thumbnail_key(sha256)
+    has_thumbnail = await _run_io(storage.exists, thumb_key)
+    thumbnail_path = None if has_thumbnail else f"{spool.path}.thumb.jpg"
+    try:
+        media = await _inspect(spool.path, thumbnail_path)
+        content_type = media["content_type"]
+        if content_type not in EXTENSION_CONTENT_TYPES.get(_extension(spool.filename), set()):
+            raise BadRequestException(f"{spool.filename}: {content_type} content does not match its extension")
+        key = evidence_key(sha256, content_type)
+        await _run_io(storage.put_file, spool.path, key, content_type)
+        if media["thumbnail"]:
+            await _run_io(storage.put_file, thumbnail_path, thumb_key, "image/jpeg")
+            has_thumbnail = True
+    finally:
+        if thumbnail_path:
+            Path(thumbnail_path).unlink(missing_ok=True)
+
+    return EvidenceFile(
+        key=key,
+        filename=spool.filename,
+        content_type=content_type,
+        size=spool.size,
+        sha256=sha256,
+        thumbnail_key=thumb_key if has_thumbnail and content_type.startswith("image/") else None,
+        width=media["width"],
+        height=media["height"],
+        uploaded_by=uploaded_by,
+        uploaded_at=datetime.now(timezone.utc),
+    )
+
+
+# Reports
+
+async def attach_evidence(db: AsyncSession, report_id: uuid.UUID, files: List[EvidenceFile]) -> List[EvidenceFile]:
+    """
+    Append ``files`` to a report's ``evidence_files``, under a row lock so
+    concurrent uploads to one report do not overwrite each other. Files the
+    report already lists are returned as previously recorded.
+    """
+    report = (
+        await db.execute(select(FlaggedReport).where(FlaggedReport.id == report_id).with_for_update())
+    ).scalar_one_or_none()
+    if report is None:
+        raise NotFoundException("Report not found")
+    entries = list(report.evidence_files or [])
+    known = {entry["sha256"]: entry for entry in entries if isinstance(entry, dict) and "sha256" in entry}
+    attached = []
+    for file in files:
+        if file.sha256 in known:
+            attached.append(EvidenceFile.model_validate(known[file.sha256]))
+            continue
+        entry = file.model_dump(mode="json")
+        entries.append(entry)
+        known[file.sha256] = entry
+        attached.append(file)
+    report.evidence_files = entries
+    await db.commit()
+    return attached
+
+
+async def receive_evidence(
+    request: Request,
+    report_id: uuid.UUID,
+    user: UserPrincipal,
+    db: AsyncSession,
+) -> EvidenceUploadResponse:
+    """Stream the files of a multipart evidence upload into storage and attach them to a report."""
+    reporter = (
+        await db.execute(select(FlaggedReport.reporter_id).where(FlaggedReport.id == report_id))
+    ).one_or_none()
+    if reporter is None:
+        raise NotFoundException("Report not found")
+    if reporter.reporter_id != user.id and user.role not in (UserRole.MODERATOR, UserRole.ADMIN):
+        raise ForbiddenException("Only the reporter or a moderator can add evidence")
+    # Do not hold a database connection while the body streams in
+    await db.rollback()
+
+    declared = request.headers.get("content-length", "")
+    if declared.isdigit() and int(declared) > settings.max_upload_size * settings.max_evidence_files + MULTIPART_OVERHEAD:
+        raise PayloadTooLargeException()
+
+    spool_dir = get_storage().spool_dir
+    files: List[EvidenceFile] = []
+    with upload_slots.claim():
+        spool: Optional[UploadSpool] = None
+        try:
+            async for kind, payload in iter_multipart(request.headers.get("content-type"), request.stream()):
+                if kind == PART_BEGIN and isinstance(payload, MultipartPart) and payload.filename:
+                    if len(files) >= settings.max_evidence_files:
+                        raise BadRequestException(f"At most {settings.max_evidence_files} files per upload")
+                    filename = _safe_filename(payload.filename)
+                    _check_extension(filename)
+                    spool = UploadSpool(filename, spool_dir)
+                elif kind == PART_DATA and spool is not None:
+                    await spool.write(payload)
+                elif kind == PART_END and spool is not None:
+                    files.append(await store_upload(spool, user.id))
+                    spool.discard()
+                    spool = None
+        finally:
+            if spool is not None:
+                spool.discard()
+
+    if not files:
+        raise BadRequestException("No files uploaded")
+    attached = await attach_evidence(db, report_id, files)
+    logger.info(f"Attached {len(attached)} evidence files to report {report_id}")
+    return EvidenceUploadResponse(report_id=report_id, files=attached)
@@ -0,0 +1,268 @@
+"""
+Politician timelines.
+
+A timeline interleaves every dated event about a politician: cases filed and
+resolved, promises made and due, flagged reports, score recalculations and
+news mentions. Each kind of event is read by its own query, a bounded range
+of a ``(politician_id, <date column>, id)`` index in descending order,
+through a server-side cursor; ``heapq.merge`` combines the sources lazily,
+so only the rows actually emitted (plus one fetch batch per source) are
+ever loaded, however long the politician's history.
+
+Entries are ordered newest first by ``(occurred_at, kind, id)``. Date-only
+columns count as midnight UTC. A cursor is the last emitted entry's sort
+key; each source turns it into a predicate on its own columns, so paging
+never re-reads earlier rows. Responses are streamed as NDJSON, one entry
+per line and a final ``{"next_cursor": ...}`` line.
+"""
+from dataclasses import dataclass
+from datetime import date, datetime, time, timezone
+import heapq
+from itertools import islice
+import json
+import logging
+from typing import Any, Dict, Iterable, Iterator, List, Optional, Tuple
+import uuid
+
+from sqlalchemy import Select, select, tuple_
+from sqlalchemy.orm import Session
+
+from app.core.exceptions import BadRequestException, NotFoundException
+from app.database import SessionLocal
+from app.models.case import LegalCase
+from app.models.news import NewsMention
+from app.models.politician import Politician
+from app.models.promise import Promise
+from app.models.report import FlaggedReport
+from app.models.score import ScoreHistory
+from app.schemas.timeline import TimelineEntry, TimelineEventType
+from app.utils.pagination import decode_cursor, encode_cursor
+
+logger = logging.getLogger(__name__)
+
+CURSOR_KEY = "timeline"
+FETCH_SIZE = 50  # rows per server-side cursor round trip, per source
+
+
+@dataclass(frozen=True)
+class TimelineSource:
+    """One kind of timeline event: the column dating it and the fields it fills."""
+
+    kind: TimelineEventType
+    model: Any
+    column: Any
+    fields: Dict[str, Any]
+
+    @property
+    def is_date(self) -> bool:
+        return self.column.type.python_type is date
+
+
+TIMELINE_SOURCES: List[TimelineSource] = [
+    TimelineSource(
+        TimelineEventType.CASE_FILED, LegalCase, LegalCase.date_filed,
+        {"title": LegalCase.title, "status": LegalCase.status, "detail": LegalCase.court},
+    ),
+    TimelineSource(
+        TimelineEventType.CASE_RESOLVED, LegalCase, LegalCase.date_resolved,
+        {"title": LegalCase.title, "status": LegalCase.status, "detail": LegalCase.outcome},
+    ),
+    TimelineSource(
+        TimelineEventType.PROMISE_MADE, Promise, Promise.date_made,
+        {"title": Promise.title, "status": Promise.status, "detail": Promise.category},
+    ),
+    TimelineSource(
+        TimelineEventType.PROMISE_DEADLINE, Promise, Promise.deadline,
+        {"title": Promise.title, "status": Promise.status, "detail": Promise.category},
+    ),
+    TimelineSource(
+        TimelineEventType.REPORT_FLAGGED, FlaggedReport, FlaggedReport.date_reported,
+        {"title": FlaggedReport.title, "status": FlaggedReport.status, "detail": FlaggedReport.issue_type},
+    ),
+    TimelineSource(
+        TimelineEventType.SCORE_CALCULATED, ScoreHistory, ScoreHistory.calculated_at,
+        {"score": ScoreHistory.transparency_score, "detail": ScoreHistory.calculation_method},
+    ),
+    TimelineSource(
+        TimelineEventType.NEWS_MENTION, NewsMention, NewsMention.published_at,
+        {"title": NewsMention.title, "detail": NewsMention.source, "url": NewsMention.url},
+    ),
+]
+
+
+@dataclass(frozen=True)
+class TimelinePosition:
+    """Sort key of a timeline entry; the timeline continues strictly after it."""
+
+    occurred_at: datetime
+    kind: TimelineEventType
+    id: uuid.UUID
+
+
+def _as_utc(value: Any) -> datetime:
+    """Timeline time of a column value or bound; dates are midnight UTC, naive datetimes UTC."""
+    if not isinstance(value, datetime):
+        return datetime.combine(value, time.min, tzinfo=timezone.utc)
+    if value.tzinfo is None:
+        return value.replace(tzinfo=timezone.utc)
+    return value.astimezone(timezone.utc)
+
+
+def _sort_key(entry: TimelineEntry) -> Tuple[datetime, str, uuid.UUID]:
+    return entry.occurred_at, entry.kind.value, entry.id
+
+
+def encode_timeline_cursor(entry: TimelineEntry) -> str:
+    return encode_cursor(CURSOR_KEY, entry.occurred_at, f"{entry.kind.value}:{entry.id}")
+
+
+def decode_timeline_cursor(cursor: str) -> TimelinePosition:
+    occurred_at, row_key = decode_cursor(cursor, CURSOR_KEY)
+    try:
+        kind, row_id = row_key.split(":", 1)
+        if not isinstance(occurred_at, datetime):
+            raise ValueError("Timeline cursor time must be a datetime")
+        return TimelinePosition(_as_utc(occurred_at), TimelineEventType(kind), uuid.UUID(row_id))
+    except (AttributeError, TypeError, ValueError):
+        raise BadRequestException("Invalid pagination cursor")
+
+
+def _column_bound(source: TimelineSource, moment: datetime) -> Tuple[Any, bool]:
+    """
+    ``moment`` in the source column's domain, and whether it is exact.
+
+    A date column can only hold midnights, so for a moment later in a day
+    "before the moment" includes that whole day and "from the moment" starts
+    on the next one.
+    """
+    if not source.is_date:
+        return moment, True
+    day = moment.date()
+    return day, moment == _as_utc(day)
+
+
+def source_query(
+    source: TimelineSource,
+    politician_id: uuid.UUID,
+    since: Optional[datetime] = None,
+    until: Optional[datetime] = None,
+    after: Optional[TimelinePosition] = None,
+    limit: int = 20,
+) -> Select:
+    """
+    One source's events in ``[since, until)`` strictly after ``after``,
+    newest first; a single range scan of the source's timeline index.
+    """
+    model, column = source.model, source.column
+    stmt = (
+        select(model.id, column.label("occurred_at"), *(expr.label(name) for name, expr in source.fields.items()))
+        .where(model.politician_id == politician_id, column.is_not(None))
+        .order_by(column.desc(), model.id.desc())
+        .limit(limit)
+    )
+    if since is not None:
+        value, exact = _column_bound(source, since)
+        stmt = stmt.where(column >= value if exact else column > value)
+    if until is not None:
+        value, exact = _column_bound(source, until)
+        stmt = stmt.where(column < value if exact else column <= value)
+    if after is not None:
+        value, exact = _column_bound(source, after.occurred_at)
+        if source.kind.value < after.kind.value:
+            # Same-time entries of an earlier-sorting kind still follow the cursor
+            stmt = stmt.where(column <= value)
+        elif source.kind == after.kind and exact:
+            stmt = stmt.where(tuple_(column, model.id) < (value, after.id))
+        else:
+            stmt = stmt.where(column < value if exact else column <= value)
+    return stmt
+
+
+def _read_source(db: Session, source: TimelineSource, stmt: Select) -> Iterator[TimelineEntry]:
+    rows = db.execute(stmt.execution_options(yield_per=FETCH_SIZE)).mappings()
+    for row in rows:
+        status = row.get("status")
+        yield TimelineEntry(
+            kind=source.kind,
+            occurred_at=_as_utc(row["occurred_at"]),
+            id=row["id"],
+            title=row.get("title"),
+            status=status.value if status is not None else None,
+            detail=row.get("detail"),
+            url=row.get("url"),
+            score=row.get("score"),
+        )
+
+
+def iter_timeline(
+    db: Session,
+    politician_id: uuid.UUID,
+    since: Optional[datetime] = None,
+    until: Optional[datetime] = None,
+    kinds: Optional[Iterable[TimelineEventType]] = None,
+    after: Optional[TimelinePosition] = None,
+    limit: int = 20,
+) -> Iterator[TimelineEntry]:
+    """
+    Lazily merge up to ``limit`` timeline entries, newest first. Each source
+    is queried for at most ``limit`` rows, but rows are only fetched as the
+    merge consumes them.
+    """
+    wanted = set(kinds) if kinds else None
+    since = _as_utc(since) if since is not None else None
+    until = _as_utc(until) if until is not None else None
+    streams = [
+        _read_source(db, source, source_query(source, politician_id, since, until, after, limit))
+        for source in TIMELINE_SOURCES
+        if wanted is None or source.kind in wanted
+    ]
+    return islice(heapq.merge(*streams, key=_sort_key, reverse=True), limit)
+
+
+def _ndjson_lines(
+    politician_id: uuid.UUID,
+    since: Optional[datetime],
+    until: Optional[datetime],
+    kinds: Optional[List[TimelineEventType]],
+    after: Optional[TimelinePosition],
+    limit: int,
+) -> Iterator[str]:
+    # The stream outlives the request's session, so it opens its own
+    db = SessionLocal()
+    try:
+        # Ask for one extra entry to learn whether there is a next page
+        last = None
+        next_cursor = None
+        for emitted, entry in enumerate(iter_timeline(db, politician_id, since, until, kinds, after, limit + 1)):
+            if emitted == limit:
+                next_cursor = encode_timeline_cursor(last)
+                break
+            yield entry.model_dump_json() + "\n"
+            last = entry
+        yield json.dumps({"next_cursor": next_cursor}) + "\n"
+    except Exception:
+        logger.exception(f"Timeline stream for politician {politician_id} failed")
+        raise
+    finally:
+        db.close()
+
+
+def stream_timeline(
+    db: Session,
+    politician_id: uuid.UUID,
+    since: Optional[datetime] = None,
+    until: Optional[datetime] = None,
+    kinds: Optional[List[TimelineEventType]] = None,
+    cursor: Optional[str] = None,
+    limit: int = 20,
+) -> Iterator[str]:
+    """
+    Validate a timeline request and return its NDJSON lines.
+
+    Unknown politicians and bad cursors are rejected here, before the
+    response starts; the entries themselves are read as the lines are sent.
+    """
+    after = decode_timeline_cursor(cursor) if cursor else None
+    if db.scalar(select(Politician.id).where(Politician.id == politician_id)) is None:
+        raise NotFoundException("Politician not found")
+    return _ndjson_lines(politician_id, since, until, kinds, after, limit)
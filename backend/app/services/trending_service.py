@@ -0,0 +1,453 @@
+"""
+Trending politicians.
+
+Each politician has an exponentially decayed activity counter: news
+mentions, newly flagged reports and transparency score swings add weight,
+and everything loses half its weight every ``trending_half_life_hours``.
+
+Counters use forward decay: an event at time ``t`` adds
+``weight * exp(lambda * (t - landmark))`` for a fixed landmark, and a
+counter's value now is its stored total times ``exp(-lambda * (now -
+landmark))``. That factor is the same for every politician, so updates never
+touch other counters and the ranking only changes when an event arrives.
+Before the stored totals grow too large the landmark moves forward and every
+total is scaled down once, dropping counters decayed to nothing.
+
+Counters live in a Redis sorted set shared by every API and worker process
+(``trending_backend = "redis"``, the default) or in this process
+(``IncrementalTopK``, for ``memory`` or ``REDIS_URL=memory://``); either
+answers top-K queries without scanning events. Events arrive through the
+change feed, which only reaches the committing process. Shared counters see
+every process's events, including mentions stored by the Celery scraper.
+In-process counters only see this process's own events, so a
+``TrendingRebuilder`` recomputes them from the database every
+``trending_rebuild_interval_seconds``: each API worker then runs that
+aggregate query periodically, and its ranking lags other processes' writes
+by up to the interval. ``rebuild`` also recomputes the counters for a cold
+start.
+"""
+from collections import defaultdict
+from dataclasses import dataclass
+from datetime import datetime, timedelta, timezone
+from functools import lru_cache
+import logging
+import math
+import threading
+from typing import Any, Callable, Dict, Iterable, List, Optional, Tuple
+import uuid
+
+import redis
+from sqlalchemy import func, literal, select, union_all
+from sqlalchemy.orm import Session
+
+from app.config import get_settings
+from app.core.model_events import INSERT, ModelChange, subscribe
+from app.models.news import NewsMention
+from app.models.politician import Politician
+from app.models.report import FlaggedReport
+from app.models.score import ScoreHistory
+from app.schemas.politician import PoliticianCardResponse, TrendingPoliticianResponse
+from app.utils.query_options import LIST_CARD, politician_loading
+from app.database import SessionLocal
+from app.utils.redis_client import MEMORY_URL_SCHEME, decode_members, get_redis
+from app.utils.topk import IncrementalTopK
+
+settings = get_settings()
+logger = logging.getLogger(__name__)
+
+SCORES_KEY = "trending:scores"
+REBUILD_KEY = "trending:scores:rebuild"
+LANDMARK_KEY = "trending:landmark"
+LAST_SCORES_KEY = "trending:last_scores"
+
+# Move the landmark once exp(lambda * (t - landmark)) passes e**RESCALE_EXPONENT
+RESCALE_EXPONENT = 40.0
+# Counters below this (in current weight) are dropped when rescaling
+MIN_WEIGHT = 1e-4
+# Score changes smaller than this are not swings
+MIN_SCORE_SWING = 0.01
+MAX_ADD_ATTEMPTS = 5
+
+
+@dataclass(frozen=True)
+class TrendingEvent:
+    """Activity of weight ``weight`` concerning a politician at ``at``."""
+
+    politician_id: uuid.UUID
+    at: datetime
+    weight: float
+
+
+def _epoch(at: Optional[datetime]) -> Optional[float]:
+    if at is None:
+        return None
+    if at.tzinfo is None:
+        at = at.replace(tzinfo=timezone.utc)
+    return at.timestamp()
+
+
+# Counter stores: forward-decayed totals relative to a landmark (epoch seconds)
+
+class InProcessTrendingStore:
+    """Counters held in this process."""
+
+    def __init__(self):
+        self._counters: IncrementalTopK[uuid.UUID] = IncrementalTopK()
+        self._landmark: Optional[float] = None
+        self._last_scores: Dict[uuid.UUID, float] = {}
+        self._lock = threading.Lock()
+
+    def landmark(self) -> Optional[float]:
+        return self._landmark
+
+    def add(self, landmark: float, amounts: Dict[uuid.UUID, float]) -> bool:
+        with self._lock:
+            if self._landmark is None:
+                self._landmark = landmark
+            elif self._landmark != landmark:
+                return False
+            for politician_id, amount in amounts.items():
+                self._counters.add(politician_id, amount)
+            return True
+
+    def rescale(self, landmark: float, new_landmark: float, factor: float, floor: float) -> None:
+        with self._lock:
+            if self._landmark != landmark:
+                return
+            self._counters.rescale(factor, floor)
+            self._landmark = new_landmark
+
+    def replace(self, landmark: float, totals: Dict[uuid.UUID, float], last_scores: Dict[uuid.UUID, float]) -> None:
+        with self._lock:
+            self._counters.replace(totals)
+            self._landmark = landmark
+            self._last_scores = dict(last_scores)
+
+    def top(self, k: int) -> List[Tuple[uuid.UUID, float]]:
+        with self._lock:
+            return self._counters.top(k)
+
+    def swap_last_scores(self, scores: Dict[uuid.UUID, float]) -> Dict[uuid.UUID, Optional[float]]:
+        """Store the latest scores, returning the ones they replace."""
+        with self._lock:
+            previous = {politician_id: self._last_scores.get(politician_id) for politician_id in scores}
+            self._last_scores.update(scores)
+            return previous
+
+
+class RedisTrendingStore:
+    """
+    Counters in a Redis sorted set. Adds and rescales are optimistic
+    transactions on the landmark key, so an add never lands on totals scaled
+    for another landmark.
+    """
+
+    def __init__(self, client: Any):
+        self.client = client
+
+    def landmark(self) -> Optional[float]:
+        value = self.client.get(LANDMARK_KEY)
+        return float(value) if value is not None else None
+
+    def _transaction(self, landmark: Optional[float], commands) -> bool:
+        with self.client.pipeline() as pipe:
+            try:
+                pipe.watch(LANDMARK_KEY)
+                current = pipe.get(LANDMARK_KEY)
+                if current is not None and float(current) != landmark:
+                    return False
+                pipe.multi()
+                if current is None:
+                    pipe.set(LANDMARK_KEY, repr(landmark))
+                commands(pipe)
+                pipe.execute()
+                return True
+            except redis.WatchError:
+                return False
+
+    def add(self, landmark: float, amounts: Dict[uuid.UUID, float]) -> bool:
+        def commands(pipe):
+            for politician_id, amount in amounts.items():
+                pipe.zincrby(SCORES_KEY, amount, str(politician_id))
+
+        return self._transaction(landmark, commands)
+
+    def rescale(self, landmark: float, new_landmark: float, factor: float, floor: float) -> None:
+        def commands(pipe):
+            pipe.zunionstore(SCORES_KEY, {SCORES_KEY: factor})
+            pipe.zremrangebyscore(SCORES_KEY, "-inf", floor)
+            pipe.set(LANDMARK_KEY, repr(new_landmark))
+
+        self._transaction(landmark, commands)
+
+    def replace(self, landmark: float, totals: Dict[uuid.UUID, float], last_scores: Dict[uuid.UUID, float]) -> None:
+        self.client.delete(REBUILD_KEY)
+        members = [(str(politician_id), total) for politician_id, total in totals.items() if total > 0]
+        for start in range(0, len(members), 10000):
+            self.client.zadd(REBUILD_KEY, dict(members[start:start + 10000]))
+        with self.client.pipeline() as pipe:
+            if members:
+                pipe.rename(REBUILD_KEY, SCORES_KEY)
+            else:
+                pipe.delete(SCORES_KEY)
+            pipe.set(LANDMARK_KEY, repr(landmark))
+            pipe.delete(LAST_SCORES_KEY)
+            if last_scores:
+                pipe.hset(LAST_SCORES_KEY, mapping={str(k): v for k, v in last_scores.items()})
+            pipe.execute()
+
+    def top(self, k: int) -> List[Tuple[uuid.UUID, float]]:
+        rows = self.client.zrevrange(SCORES_KEY, 0, k - 1, withscores=True)
+        members = decode_members(member for member, _ in rows)
+        return [(uuid.UUID(member), score) for member, (_, score) in zip(members, rows)]
+
+    def swap_last_scores(self, scores: Dict[uuid.UUID, float]) -> Dict[uuid.UUID, Optional[float]]:
+        fields = [str(politician_id) for politician_id in scores]
+        with self.client.pipeline() as pipe:
+            pipe.hmget(LAST_SCORES_KEY, fields)
+            pipe.hset(LAST_SCORES_KEY, mapping={field: score for field, score in zip(fields, scores.values())})
+            previous, _ = pipe.execute()
+        return {
+            politician_id: float(value) if value is not None else None
+            for politician_id, value in zip(scores, previous)
+        }
+
+
+# Engine
+
+class TrendingEngine:
+    """Exponentially decayed activity counters over a counter store."""
+
+    def __init__(self, store: Any, half_life_hours: float):
+        self.store = store
+        self.decay_rate = math.log(2) / (half_life_hours * 3600)
+
+    def record(self, events: Iterable[TrendingEvent], now: Optional[datetime] = None) -> int:
+        """Add events (future timestamps count as now); returns how many were counted."""
+        events = [event for event in events if event.weight > 0]
+        if not events:
+            return 0
+        now_epoch = _epoch(now) if now else datetime.now(timezone.utc).timestamp()
+        for _ in range(MAX_ADD_ATTEMPTS):
+            landmark = self._current_landmark(now_epoch)
+            amounts: Dict[uuid.UUID, float] = defaultdict(float)
+            for event in events:
+                at = min(_epoch(event.at), now_epoch)
+                amounts[event.politician_id] += event.weight * math.exp(self.decay_rate * (at - landmark))
+            if self.store.add(landmark, amounts):
+                return len(events)
+        raise RuntimeError("Trending counters kept changing landmark; events not recorded")
+
+    def record_scores(self, scores: Dict[uuid.UUID, Tuple[float, datetime]], now: Optional[datetime] = None) -> int:
+        """Record newly calculated scores, counting the swing from each politician's previous score."""
+        previous = self.store.swap_last_scores({politician_id: score for politician_id, (score, _) in scores.items()})
+        events = []
+        for politician_id, (score, at) in scores.items():
+            before = previous.get(politician_id)
+            if before is not None and abs(score - before) >= MIN_SCORE_SWING:
+                events.append(TrendingEvent(politician_id, at, settings.trending_score_swing_weight * abs(score - before)))
+        return self.record(events, now=now)
+
+    def top(self, k: int, now: Optional[datetime] = None) -> List[Tuple[uuid.UUID, float]]:
+        """The ``k`` politicians with the highest current activity, best first."""
+        landmark = self.store.landmark()
+        if landmark is None or k <= 0:
+            return []
+        now_epoch = _epoch(now) if now else datetime.now(timezone.utc).timestamp()
+        decay = math.exp(-self.decay_rate * (now_epoch - landmark))
+        return [(politician_id, total * decay) for politician_id, total in self.store.top(k)]
+
+    def is_empty(self) -> bool:
+        return self.store.landmark() is None
+
+    def _current_landmark(self, now_epoch: float) -> float:
+        landmark = self.store.landmark()
+        if landmark is None:
+            return now_epoch
+        if self.decay_rate * (now_epoch - landmark) > RESCALE_EXPONENT:
+            factor = math.exp(-self.decay_rate * (now_epoch - landmark))
+            self.store.rescale(landmark, now_epoch, factor, MIN_WEIGHT)
+            landmark = self.store.landmark()
+        return landmark
+
+    def rebuild(self, db: Session, now: Optional[datetime] = None) -> int:
+        """
+        Recompute every counter from the last ``trending_rebuild_days`` of
+        mentions, reports and score history; returns the number of counters.
+        """
+        now = now or datetime.now(timezone.utc)
+        since = now - timedelta(days=settings.trending_rebuild_days)
+        landmark = now.timestamp()
+
+        def decayed(column):
+            return func.exp(self.decay_rate * (func.extract("epoch", column) - landmark))
+
+        swings = (
+            select(
+                ScoreHistory.politician_id,
+                ScoreHistory.calculated_at,
+                func.abs(
+                    ScoreHistory.transparency_score
+                    - func.lag(ScoreHistory.transparency_score).over(
+                        partition_by=ScoreHistory.politician_id, order_by=ScoreHistory.calculated_at
+                    )
+                ).label("swing"),
+            )
+            .where(ScoreHistory.calculated_at >= since)
+            .subquery()
+        )
+        events = union_all(
+            select(
+                NewsMention.politician_id.label("politician_id"),
+                (literal(settings.trending_mention_weight) * decayed(NewsMention.published_at)).label("weight"),
+            ).where(NewsMention.published_at >= since, NewsMention.published_at <= now),
+            select(
+                FlaggedReport.politician_id,
+                literal(settings.trending_report_weight) * decayed(FlaggedReport.date_reported),
+            ).where(FlaggedReport.date_reported >= since, FlaggedReport.date_reported <= now),
+            select(
+                swings.c.politician_id,
+                literal(settings.trending_score_swing_weight) * swings.c.swing * decayed(swings.c.calculated_at),
+            ).where(swings.c.swing >= MIN_SCORE_SWING),
+        ).subquery()
+        totals = {
+            politician_id: float(total)
+            for politician_id, total in db.execute(
+                select(events.c.politician_id, func.sum(events.c.weight)).group_by(events.c.politician_id)
+            )
+            if total and float(total) > MIN_WEIGHT
+        }
+        last_scores = {
+            politician_id: float(score)
+            for politician_id, score in db.execute(select(Politician.id, Politician.transparency_score))
+        }
+        self.store.replace(landmark, totals, last_scores)
+        return len(totals)
+
+
+def trending_is_shared() -> bool:
+    """Whether the counters are in Redis, shared by every process."""
+    return settings.trending_backend == "redis" and not settings.redis_url.startswith(MEMORY_URL_SCHEME)
+
+
+@lru_cache()
+def get_trending_engine() -> TrendingEngine:
+    """Get the configured trending engine (``redis`` or ``memory`` counters)."""
+    if trending_is_shared():
+        store: Any = RedisTrendingStore(get_redis())
+    else:
+        store = InProcessTrendingStore()
+    return TrendingEngine(store, settings.trending_half_life_hours)
+
+
+class TrendingRebuilder:
+    """
+    Background thread that periodically rebuilds in-process counters from
+    the database, so they include events committed by other processes.
+    """
+
+    def __init__(
+        self,
+        interval_seconds: float,
+        session_factory: Callable[[], Session] = SessionLocal,
+        engine: Optional[TrendingEngine] = None,
+    ):
+        self.interval_seconds = interval_seconds
+        self.session_factory = session_factory
+        self.engine = engine
+        self._stop = threading.Event()
+        self._thread: Optional[threading.Thread] = None
+
+    def start(self) -> None:
+        if self._thread is not None or self.interval_seconds <= 0:
+            return
+        self._stop.clear()
+        self._thread = threading.Thread(target=self._run, name="trending-rebuilder", daemon=True)
+        self._thread.start()
+
+    def stop(self, timeout: Optional[float] = None) -> None:
+        self._stop.set()
+        if self._thread is not None:
+            self._thread.join(timeout)
+            self._thread = None
+
+    def rebuild_once(self) -> int:
+        engine = self.engine if self.engine is not None else get_trending_engine()
+        db = self.session_factory()
+        try:
+            return engine.rebuild(db)
+        finally:
+            db.close()
+
+    def _run(self) -> None:
+        while not self._stop.wait(self.interval_seconds):
+            try:
+                self.rebuild_once()
+            except Exception:
+                logger.exception("Trending counters rebuild failed")
+
+
+# Change feed subscriber
+
+def _on_model_changes(changes: List[ModelChange]) -> None:
+    now = datetime.now(timezone.utc)
+    events: List[TrendingEvent] = []
+    scores: Dict[uuid.UUID, Tuple[float, datetime]] = {}
+    for change in changes:
+        if change.operation != INSERT or change.politician_id is None:
+            continue
+        if change.table == NewsMention.__tablename__:
+            events.append(TrendingEvent(
+                change.politician_id, change.values.get("published_at") or now, settings.trending_mention_weight
+            ))
+        elif change.table == FlaggedReport.__tablename__:
+            events.append(TrendingEvent(
+                change.politician_id, change.values.get("date_reported") or now, settings.trending_report_weight
+            ))
+        elif change.table == ScoreHistory.__tablename__ and change.values.get("transparency_score") is not None:
+            scores[change.politician_id] = (
+                float(change.values["transparency_score"]),
+                change.values.get("calculated_at") or now,
+            )
+    if not events and not scores:
+        return
+    engine = get_trending_engine()
+    engine.record(events, now=now)
+    if scores:
+        engine.record_scores(scores, now=now)
+
+
+def register_trending_listeners() -> None:
+    """Count committed mentions, reports and score changes towards trending."""
+    subscribe(_on_model_changes)
+
+
+def warm_start_trending(db: Session) -> None:
+    """Rebuild the counters from the database unless they already exist (e.g. in Redis)."""
+    engine = get_trending_engine()
+    if engine.is_empty():
+        counters = engine.rebuild(db)
+        logger.info(f"Rebuilt {counters} trending counters")
+
+
+def list_trending(db: Session, limit: int = 10) -> List[TrendingPoliticianResponse]:
+    """The most active politicians right now, as cards (1 query)."""
+    # Over-fetch a little: inactive politicians are skipped
+    ranked = get_trending_engine().top(limit + limit // 2 + 5)
+    if not ranked:
+        return []
+    stmt = (
+        select(Politician)
+        .options(*politician_loading(LIST_CARD))
+        .where(Politician.id.in_([politician_id for politician_id, _ in ranked]))
+        .where(Politician.is_active.is_(True))
+    )
+    politicians = {politician.id: politician for politician in db.scalars(stmt)}
+    return [
+        TrendingPoliticianResponse(
+            politician=PoliticianCardResponse.model_validate(politicians[politician_id]),
+            trending_score=round(score, 4),
+        )
+        for politician_id, score in ranked
+        if politician_id in politicians
+    ][:limit]
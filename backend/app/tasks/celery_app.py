@@ -0,0 +1,274 @@
+"""
+Celery application.
+
+Tasks are routed to one queue per workload, so each can get workers suited
+to it:
+
+- ``scoring``: CPU-bound score recalculation, fanned out in chunks,
+  statistics refreshes and search maintenance;
+- ``scraping``: long, I/O-bound crawls and sentiment scoring;
+- ``notifications``: short email tasks.
+
+Run a worker per queue, e.g.::
+
+    celery -A app.tasks.celery_app worker -Q scoring --concurrency 4
+    celery -A app.tasks.celery_app worker -Q scraping --concurrency 1
+    celery -A app.tasks.celery_app worker -Q notifications --concurrency 8
+    celery -A app.tasks.celery_app beat
+
+Long tasks are acknowledged late and prefetched one at a time, so a busy
+worker does not hoard queued chunks other workers could run; the prefetch
+multiplier of a worker is the smallest configured for the queues it
+consumes. Setting ``CELERY_TASK_ALWAYS_EAGER`` runs tasks inline, with no
+broker, for tests.
+
+Tasks about one politician derive from ``PoliticianTask``: enqueuing one
+while an identical one is still queued is a no-op, and two never run for the
+same politician at once.
+
+Exclusive runs are guarded by a ``RedisLease``: a Redis key holding its
+owner's token with a short TTL that the owner keeps renewing, so a lease
+held by a worker that died lapses within ``celery_lease_seconds``.
+"""
+from datetime import timedelta
+import logging
+import threading
+from typing import Any, Optional
+import uuid
+
+from celery import Celery, Task
+from celery.exceptions import MaxRetriesExceededError
+from celery.result import AsyncResult
+from celery.signals import celeryd_init, worker_process_init
+from kombu import Queue
+
+from app.config import get_settings
+from app.utils.redis_client import get_redis
+
+settings = get_settings()
+logger = logging.getLogger(__name__)
+
+SCORING_QUEUE = "scoring"
+SCRAPING_QUEUE = "scraping"
+NOTIFICATIONS_QUEUE = "notifications"
+
+QUEUE_PREFETCH = {
+    SCORING_QUEUE: settings.celery_scoring_prefetch,
+    SCRAPING_QUEUE: settings.celery_scraping_prefetch,
+    NOTIFICATIONS_QUEUE: settings.celery_notification_prefetch,
+}
+
+QUEUED_KEY = "tasks:queued:{task}:{politician_id}"
+RUNNING_KEY = "tasks:running:{task}:{politician_id}"
+
+celery_app = Celery(
+    "ketu",
+    broker=settings.celery_broker_url,
+    backend=settings.celery_result_backend,
+    include=[
+        "app.tasks.scoring_tasks",
+        "app.tasks.scraping_tasks",
+        "app.tasks.notification_tasks",
+        "app.tasks.stats_tasks",
+        "app.tasks.search_tasks",
+    ],
+)
+
+celery_app.conf.update(
+    task_serializer="json",
+    result_serializer="json",
+    accept_content=["json"],
+    timezone="Africa/Nairobi",
+    enable_utc=True,
+    task_queues=[Queue(name) for name in QUEUE_PREFETCH],
+    task_default_queue=SCORING_QUEUE,
+    task_routes={
+        "app.tasks.scoring_tasks.*": {"queue": SCORING_QUEUE},
+        "app.tasks.scraping_tasks.*": {"queue": SCRAPING_QUEUE},
+        "app.tasks.notification_tasks.*": {"queue": NOTIFICATIONS_QUEUE},
+        "app.tasks.stats_tasks.*": {"queue": SCORING_QUEUE},
+        "app.tasks.search_tasks.*": {"queue": SCORING_QUEUE},
+    },
+    # Redeliver tasks of a worker that dies mid-task; tasks are idempotent
+    task_acks_late=True,
+    task_reject_on_worker_lost=True,
+    worker_prefetch_multiplier=min(QUEUE_PREFETCH.values()),
+    # Recycle workers now and then; scoring holds sizable numpy arrays
+    worker_max_tasks_per_child=settings.celery_max_tasks_per_child,
+    result_expires=timedelta(hours=6),
+    task_always_eager=settings.celery_task_always_eager,
+    task_eager_propagates=True,
+    beat_schedule={
+        "flush-dirty-scores": {
+            "task": "app.tasks.scoring_tasks.flush_dirty_scores",
+            "schedule": timedelta(seconds=settings.score_flush_interval_seconds),
+        },
+        "recalculate-all-scores": {
+            "task": "app.tasks.scoring_tasks.recalculate_all_scores",
+            "schedule": timedelta(hours=settings.celery_full_rescore_interval_hours),
+        },
+        "compact-score-series": {
+            "task": "app.tasks.scoring_tasks.compact_score_series",
+            "schedule": timedelta(hours=settings.score_series_compact_interval_hours),
+        },
+        "scrape-news": {
+            "task": "app.tasks.scraping_tasks.scrape_news",
+            "schedule": timedelta(minutes=settings.scraper_interval_minutes),
+        },
+        "refresh-stats": {
+            "task": "app.tasks.stats_tasks.refresh_stats",
+            "schedule": timedelta(seconds=settings.stats_refresh_check_seconds),
+        },
+        "prune-search-tombstones": {
+            "task": "app.tasks.search_tasks.prune_search_tombstones",
+            "schedule": timedelta(days=1),
+        },
+    },
+)
+
+
+@celeryd_init.connect
+def configure_worker_prefetch(sender: Any = None, conf: Any = None, options: Any = None, **kwargs: Any) -> None:
+    """Use the smallest prefetch of the queues this worker consumes."""
+    queues = (options or {}).get("queues") or list(QUEUE_PREFETCH)
+    if isinstance(queues, str):
+        queues = queues.split(",")
+    prefetch = [QUEUE_PREFETCH[queue] for queue in queues if queue in QUEUE_PREFETCH]
+    if prefetch:
+        conf.worker_prefetch_multiplier = min(prefetch)
+
+
+@worker_process_init.connect
+def init_worker_process(**kwargs: Any) -> None:
+    """
+    Prepare a forked worker process: drop database connections inherited from
+    the parent, and publish committed changes to the caches other processes
+    read.
+    """
+    from app.database import engine
+    from app.core.auth_cache import register_auth_cache_listeners
+    from app.services.alert_feed import register_alert_listeners
+    from app.services.entity_linking_service import register_entity_linking_listeners
+    from app.services.profile_cache import register_profile_cache_listeners
+    from app.services.score_invalidation import register_score_listeners
+    from app.services.stats_service import register_stats_listeners
+    from app.services.trending_service import register_trending_listeners, trending_is_shared
+    from app.tasks.notification_tasks import register_notification_listeners
+
+    engine.dispose(close=False)
+    register_auth_cache_listeners()
+    register_notification_listeners()
+    register_profile_cache_listeners()
+    register_entity_linking_listeners()
+    register_stats_listeners()
+    if settings.score_dirty_set_backend == "redis":
+        register_score_listeners()
+    if trending_is_shared():
+        register_trending_listeners()
+    if settings.alert_feed_backend == "redis":
+        register_alert_listeners()
+
+
+class RedisLease:
+    """
+    An exclusive claim on a Redis key, held by whoever knows its token.
+
+    The key expires ``ttl_seconds`` after it was last renewed. ``keep_alive``
+    renews it from a background thread while the owner runs; owners spread
+    across several tasks pass the token along and ``renew`` as they make
+    progress. Renewal and release check the token first, so an owner whose
+    lease lapsed never extends or deletes a successor's.
+    """
+
+    def __init__(self, key: str, ttl_seconds: float, token: Optional[str] = None):
+        self.key = key
+        self.ttl_seconds = ttl_seconds
+        self.token = token or uuid.uuid4().hex
+        self._stop = threading.Event()
+        self._thread: Optional[threading.Thread] = None
+
+    def acquire(self) -> bool:
+        """Take the lease unless someone else holds it."""
+        return bool(get_redis().set(self.key, self.token, nx=True, ex=self.ttl_seconds))
+
+    def _held(self) -> bool:
+        value = get_redis().get(self.key)
+        return value is not None and (value.decode() if isinstance(value, bytes) else value) == self.token
+
+    def renew(self) -> bool:
+        """Push the expiry back; False if the lease is no longer ours."""
+        # Not atomic, but renewals happen long before the lease would lapse
+        return self._held() and bool(get_redis().expire(self.key, self.ttl_seconds))
+
+    def release(self) -> None:
+        """Stop renewing and drop the lease if it is still ours."""
+        self._stop.set()
+        if self._thread is not None:
+            self._thread.join()
+            self._thread = None
+        if self._held():
+            get_redis().delete(self.key)
+
+    def keep_alive(self) -> None:
+        """Renew the lease every third of its TTL until released."""
+        if self._thread is not None:
+            return
+        self._stop.clear()
+        self._thread = threading.Thread(target=self._renew_until_released, name=f"lease:{self.key}", daemon=True)
+        self._thread.start()
+
+    def _renew_until_released(self) -> None:
+        while not self._stop.wait(self.ttl_seconds / 3):
+            try:
+                if not self.renew():
+                    logger.warning(f"Lost the lease on {self.key}")
+                    return
+            except Exception:
+                logger.exception(f"Failed to renew the lease on {self.key}")
+
+
+class PoliticianTask(Task):
+    """
+    A task whose first argument is a politician id.
+
+    ``enqueue`` collapses duplicates: while a task for a politician is
+    queued, enqueuing another is a no-op. The marker is cleared when the task
+    starts, so changes made while it runs enqueue a fresh one. A task finding
+    another one running for its politician retries later, still queued; once
+    out of retries it gives up and clears the marker, so the next change
+    enqueues again.
+    """
+
+    abstract = True
+
+    def enqueue(self, politician_id: Any, *args: Any, **kwargs: Any) -> Optional[AsyncResult]:
+        """Queue the task unless one is already queued for ``politician_id``."""
+        key = QUEUED_KEY.format(task=self.name, politician_id=politician_id)
+        if not get_redis().set(key, "1", nx=True, ex=settings.celery_unique_task_ttl_seconds):
+            logger.debug(f"{self.name} already queued for politician {politician_id}")
+            return None
+        try:
+            return self.apply_async((str(politician_id),) + args, kwargs)
+        except Exception:
+            get_redis().delete(key)
+            raise
+
+    def __call__(self, politician_id: Any, *args: Any, **kwargs: Any) -> Any:
+        queued_key = QUEUED_KEY.format(task=self.name, politician_id=politician_id)
+        running_key = RUNNING_KEY.format(task=self.name, politician_id=politician_id)
+        lease = RedisLease(running_key, settings.celery_lease_seconds)
+        if not lease.acquire():
+            if self.request.called_directly or self.request.is_eager:
+                return None
+            # Still queued as far as enqueue is concerned, so duplicates keep collapsing
+            try:
+                raise self.retry(countdown=settings.celery_unique_task_retry_seconds)
+            except MaxRetriesExceededError:
+                get_redis().delete(queued_key)
+                raise
+        get_redis().delete(queued_key)
+        lease.keep_alive()
+        try:
+            return super().__call__(politician_id, *args, **kwargs)
+        finally:
+            lease.release()
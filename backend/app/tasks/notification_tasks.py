@@ -0,0 +1,132 @@
+"""
+Notification tasks.
+
+Emails go out through the SendGrid API. A send is keyed (by default on the
+recipient and subject); a key already sent is skipped, so a redelivered or
+duplicated task never emails twice. Transient failures are retried with
+backoff.
+
+Admins are emailed about a report of high or critical priority once it is
+committed, whichever process flagged or escalated it.
+"""
+import hashlib
+import logging
+from typing import Any, Dict, List, Optional
+import uuid
+
+import httpx
+from sqlalchemy import select
+
+from app.config import get_settings
+from app.core.model_events import INSERT, UPDATE, ModelChange, subscribe
+from app.database import SessionLocal
+from app.models.report import FlaggedReport, ReportPriority
+from app.models.user import User, UserRole
+from app.tasks.celery_app import celery_app
+from app.utils.redis_client import get_redis
+
+settings = get_settings()
+logger = logging.getLogger(__name__)
+
+SENDGRID_URL = "https://api.sendgrid.com/v3/mail/send"
+SENT_KEY = "notifications:sent:{key}"
+SENT_TTL_SECONDS = 7 * 24 * 3600
+
+# Reports of these priorities are emailed to admins as soon as they arrive
+URGENT_PRIORITIES = {ReportPriority.HIGH, ReportPriority.CRITICAL}
+
+
+class RetryableEmailError(Exception):
+    """The email provider failed in a way worth retrying."""
+
+
+def deliver_email(to: str, subject: str, body: str) -> None:
+    """Send one plain-text email through SendGrid."""
+    response = httpx.post(
+        SENDGRID_URL,
+        headers={"Authorization": f"Bearer {settings.sendgrid_api_key}"},
+        json={
+            "personalizations": [{"to": [{"email": to}]}],
+            "from": {"email": settings.email_from, "name": settings.email_from_name},
+            "subject": subject,
+            "content": [{"type": "text/plain", "value": body}],
+        },
+        timeout=15.0,
+    )
+    if response.status_code == 429 or response.status_code >= 500:
+        raise RetryableEmailError(f"SendGrid returned {response.status_code}")
+    response.raise_for_status()
+
+
+@celery_app.task(
+    autoretry_for=(RetryableEmailError, httpx.TransportError),
+    retry_backoff=True,
+    retry_backoff_max=600,
+    max_retries=6,
+)
+def send_email(to: str, subject: str, body: str, idempotency_key: Optional[str] = None) -> bool:
+    """Email ``to`` unless this key was already sent; returns whether it was sent."""
+    key = idempotency_key or hashlib.sha256(f"{to}\n{subject}".encode("utf-8")).hexdigest()
+    sent_key = SENT_KEY.format(key=key)
+    if not settings.sendgrid_api_key:
+        logger.warning(f"SENDGRID_API_KEY is not set; not emailing {to}: {subject}")
+        return False
+    client = get_redis()
+    # Claimed before sending, so a concurrent duplicate skips too
+    if not client.set(sent_key, "1", nx=True, ex=SENT_TTL_SECONDS):
+        logger.info(f"Email {key} already sent; skipping")
+        return False
+    try:
+        deliver_email(to, subject, body)
+    except Exception:
+        client.delete(sent_key)
+        raise
+    return True
+
+
+def _admin_emails() -> List[str]:
+    db = SessionLocal()
+    try:
+        return list(db.scalars(
+            select(User.email).where(User.role == UserRole.ADMIN).where(User.is_active.is_(True))
+        ))
+    finally:
+        db.close()
+
+
+@celery_app.task
+def notify_report_flagged(report_id: str) -> Dict[str, Any]:
+    """Email admins about a newly flagged report of high or critical priority."""
+    db = SessionLocal()
+    try:
+        report = db.get(FlaggedReport, uuid.UUID(report_id))
+        if report is None or report.priority not in URGENT_PRIORITIES:
+            return {"queued": 0}
+        subject = f"[{report.priority.value.upper()}] Report flagged: {report.title}"
+        body = f"{report.issue_type}: {report.title}\n\n{report.description}"
+    finally:
+        db.close()
+
+    recipients = _admin_emails()
+    for email in recipients:
+        send_email.delay(email, subject, body, idempotency_key=f"report-flagged:{report_id}:{email}")
+    return {"queued": len(recipients)}
+
+
+def _is_urgent(priority: Any) -> bool:
+    return priority is not None and ReportPriority(priority) in URGENT_PRIORITIES
+
+
+def _on_model_changes(changes: List[ModelChange]) -> None:
+    for change in changes:
+        if change.table != FlaggedReport.__tablename__:
+            continue
+        if change.operation == INSERT or (change.operation == UPDATE and "priority" in change.changed):
+            # A report escalated twice notifies twice; the email keys absorb it
+            if _is_urgent(change.values.get("priority")):
+                notify_report_flagged.delay(str(change.values["id"]))
+
+
+def register_notification_listeners() -> None:
+    """Email admins about reports flagged or escalated to an urgent priority."""
+    subscribe(_on_model_changes)
@@ -0,0 +1,139 @@
+"""
+Transparency score tasks.
+
+A full recalculation fans out as a chord: the active politicians are split
+into chunks of ``celery_score_chunk_size`` scored by separate tasks (and so
+by separate worker processes), and a final task sums up once every chunk is
+done. Each chunk is scored with the vectorized ``recalculate_scores``, which
+reads and writes a chunk in a handful of statements.
+
+Only one full recalculation runs at a time, so overlapping beat runs never
+score a politician twice or write duplicate score history. The run holds a
+``RedisLease`` that every finished chunk renews and the final task
+releases; if a chunk fails the final task never runs, and the lease lapses
+``celery_full_rescore_lease_seconds`` after the last chunk finished.
+
+``compact_score_series`` applies the score series retention policy every
+``score_series_compact_interval_hours``.
+"""
+import logging
+import time
+from typing import Any, Dict, List, Optional
+import uuid
+
+from celery import chord
+from sqlalchemy import select
+
+from app.config import get_settings
+from app.database import SessionLocal
+from app.models.politician import Politician
+from app.services import score_invalidation, score_series_service
+from app.services.scoring_service import recalculate_scores
+from app.tasks.celery_app import PoliticianTask, RedisLease, celery_app
+
+settings = get_settings()
+logger = logging.getLogger(__name__)
+
+FULL_RESCORE_KEY = "tasks:running:recalculate_all_scores"
+
+
+def full_rescore_lease(token: Optional[str] = None) -> RedisLease:
+    return RedisLease(FULL_RESCORE_KEY, settings.celery_full_rescore_lease_seconds, token)
+
+
+def active_politician_ids() -> List[uuid.UUID]:
+    db = SessionLocal()
+    try:
+        return list(db.scalars(select(Politician.id).where(Politician.is_active.is_(True)).order_by(Politician.id)))
+    finally:
+        db.close()
+
+
+@celery_app.task
+def recalculate_score_chunk(politician_ids: List[str], run_token: Optional[str] = None) -> int:
+    """Score one chunk of politicians; returns how many were scored."""
+    db = SessionLocal()
+    try:
+        scored = recalculate_scores(db, politician_ids=[uuid.UUID(politician_id) for politician_id in politician_ids])
+    finally:
+        db.close()
+    if run_token:
+        full_rescore_lease(run_token).renew()
+    return scored
+
+
+@celery_app.task
+def finish_score_recalculation(
+    chunk_counts: List[int], started_at: float, run_token: Optional[str] = None
+) -> Dict[str, Any]:
+    """Chord callback summing up a full recalculation."""
+    if run_token:
+        full_rescore_lease(run_token).release()
+    scored = sum(chunk_counts)
+    elapsed = time.time() - started_at
+    logger.info(f"Recalculated {scored} politician scores in {len(chunk_counts)} chunks in {elapsed:.1f}s")
+    return {"scored": scored, "chunks": len(chunk_counts), "elapsed_seconds": round(elapsed, 3)}
+
+
+@celery_app.task
+def recalculate_all_scores(chunk_size: Optional[int] = None) -> Dict[str, Any]:
+    """
+    Fan the recalculation of every active politician out over the scoring
+    workers, unless a previous recalculation is still running.
+    """
+    lease = full_rescore_lease()
+    if not lease.acquire():
+        logger.info("A full score recalculation is still running; skipping this one")
+        return {"skipped": True}
+    chunk_size = chunk_size or settings.celery_score_chunk_size
+    try:
+        politician_ids = [str(politician_id) for politician_id in active_politician_ids()]
+        chunks = [politician_ids[start:start + chunk_size] for start in range(0, len(politician_ids), chunk_size)]
+        if not chunks:
+            lease.release()
+            return {"politicians": 0, "chunks": 0}
+        result = chord(
+            (recalculate_score_chunk.s(chunk, lease.token) for chunk in chunks),
+            finish_score_recalculation.s(time.time(), lease.token),
+        ).apply_async()
+    except Exception:
+        lease.release()
+        raise
+    logger.info(f"Queued score recalculation of {len(politician_ids)} politicians in {len(chunks)} chunks")
+    return {"politicians": len(politician_ids), "chunks": len(chunks), "result_id": result.id}
+
+
+@celery_app.task(base=PoliticianTask, bind=True, max_retries=5)
+def recalculate_politician_score(self, politician_id: str) -> int:
+    """
+    Score one politician. Enqueue with ``recalculate_politician_score.enqueue``
+    so repeated requests for the same politician collapse.
+    """
+    db = SessionLocal()
+    try:
+        return recalculate_scores(db, politician_ids=[uuid.UUID(politician_id)])
+    finally:
+        db.close()
+
+
+@celery_app.task
+def flush_dirty_scores() -> int:
+    """Recompute the score components marked dirty by committed changes."""
+    db = SessionLocal()
+    try:
+        scored = score_invalidation.flush_dirty_scores(db)
+    finally:
+        db.close()
+    if scored:
+        logger.info(f"Flushed dirty scores of {scored} politicians")
+    return scored
+
+
+@celery_app.task(ignore_result=True)
+def compact_score_series() -> Dict[str, int]:
+    """Roll old score series points up into coarser resolutions and prune old score history."""
+    db = SessionLocal()
+    try:
+        return score_series_service.compact_score_series(db)
+    finally:
+        db.close()
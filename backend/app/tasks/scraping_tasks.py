@@ -0,0 +1,75 @@
+"""
+News scraping tasks.
+
+``scrape_news`` runs the whole pipeline: crawl the configured sources, link
+new articles to politicians and store them, then score the sentiment of
+mentions still without one. Each run gets its own event loop, so the async
+engine's connections are released before the loop closes.
+"""
+import asyncio
+import logging
+from typing import Any, Awaitable, Dict, List, TypeVar
+
+from app.config import get_settings
+from app.database import SessionLocal, async_engine
+from app.services.entity_linking_service import store_articles
+from app.services.scraper_service import NewsScraper, ScrapedArticle, load_seen_urls, load_sources
+from app.services.sentiment_service import score_pending_mentions
+from app.tasks.celery_app import celery_app
+
+settings = get_settings()
+logger = logging.getLogger(__name__)
+
+T = TypeVar("T")
+
+
+def run_async(awaitable: Awaitable[T]) -> T:
+    """Run a coroutine to completion in a fresh event loop."""
+    async def run() -> T:
+        try:
+            return await awaitable
+        finally:
+            # Pooled connections are bound to this loop
+            await async_engine.dispose()
+
+    return asyncio.run(run())
+
+
+def _store(articles: List[ScrapedArticle]) -> int:
+    db = SessionLocal()
+    try:
+        return store_articles(db, articles)
+    finally:
+        db.close()
+
+
+async def _scrape_and_store() -> Dict[str, Any]:
+    sources = load_sources(settings.scraper_sources_path)
+    async with NewsScraper(sources, seen=await load_seen_urls()) as scraper:
+        report = await scraper.scrape()
+    mentions = await asyncio.to_thread(_store, report.articles)
+    sentiment = await score_pending_mentions()
+    return {
+        "articles": len(report.articles),
+        "requests": report.requests,
+        "not_modified": report.not_modified,
+        "errors": report.errors,
+        "mentions": mentions,
+        "sentiment_scored": sentiment.updated,
+    }
+
+
+@celery_app.task(soft_time_limit=30 * 60)
+def scrape_news() -> Dict[str, Any]:
+    """Crawl the news sources and store what is new."""
+    if not settings.scraper_sources_path:
+        logger.info("No news sources configured (SCRAPER_SOURCES_PATH); skipping")
+        return {"articles": 0}
+    return run_async(_scrape_and_store())
+
+
+@celery_app.task
+def score_pending_sentiment(limit: int = 0) -> Dict[str, Any]:
+    """Score news mentions with no sentiment yet."""
+    report = run_async(score_pending_mentions(limit=limit or None))
+    return {"scored": report.updated, "articles_per_second": round(report.articles_per_second, 1)}
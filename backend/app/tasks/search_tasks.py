@@ -0,0 +1,26 @@
+"""
+Search maintenance tasks.
+
+``prune_search_tombstones`` runs daily, deleting the tombstones of rows
+deleted longer ago than every search index still catching up could need.
+"""
+import logging
+
+from app.database import SessionLocal
+from app.services.search_service import prune_search_tombstones as prune_tombstones
+from app.tasks.celery_app import celery_app
+
+logger = logging.getLogger(__name__)
+
+
+@celery_app.task(ignore_result=True)
+def prune_search_tombstones() -> int:
+    """Delete expired search tombstones; returns how many were deleted."""
+    db = SessionLocal()
+    try:
+        deleted = prune_tombstones(db)
+    finally:
+        db.close()
+    if deleted:
+        logger.info(f"Pruned {deleted} search tombstones")
+    return deleted
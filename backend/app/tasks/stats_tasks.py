@@ -0,0 +1,24 @@
+"""
+Statistics tasks.
+
+``refresh_stats`` runs every ``stats_refresh_check_seconds`` but only
+refreshes the views when ``stats_service.refresh_stats_if_needed`` finds
+them due, so the schedule can be frequent without repeating work.
+"""
+import logging
+
+from app.database import SessionLocal
+from app.services.stats_service import refresh_stats_if_needed
+from app.tasks.celery_app import celery_app
+
+logger = logging.getLogger(__name__)
+
+
+@celery_app.task(ignore_result=True)
+def refresh_stats(force: bool = False) -> bool:
+    """Refresh the statistics views if they are due; returns whether they were."""
+    db = SessionLocal()
+    try:
+        return refresh_stats_if_needed(db, force=force)
+    finally:
+        db.close()
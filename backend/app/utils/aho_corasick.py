@@ -0,0 +1,93 @@
+"""Aho-Corasick automaton for matching many patterns in one pass."""
+from collections import deque
+from typing import Dict, Generic, Iterable, Iterator, List, Tuple, TypeVar
+
+T = TypeVar("T")
+
+
+class AhoCorasick(Generic[T]):
+    """
+    Finds every occurrence of a set of string patterns in a text, in time
+    linear in the text plus the number of matches, however many patterns
+    there are.
+
+    Each pattern carries a value returned with its matches. With
+    ``separator`` set, patterns only match whole runs of words: a match
+    must start and end at the text boundaries or next to a separator.
+
+    The automaton is built from plain lists and dicts, so it pickles cheaply
+    (to ship to worker processes).
+    """
+
+    def __init__(self, patterns: Iterable[Tuple[str, T]], separator: str = " "):
+        self.separator = separator
+        # Node -> char -> child node
+        self._goto: List[Dict[str, int]] = [{}]
+        self._fail: List[int] = [0]
+        # Indexes into _patterns of the patterns ending at each node, own
+        # outputs only; _output_link chains to the next node with outputs
+        self._outputs: List[List[int]] = [[]]
+        self._output_link: List[int] = [-1]
+        self._patterns: List[Tuple[int, T]] = []
+
+        for pattern, value in patterns:
+            if not pattern:
+                continue
+            node = 0
+            for char in pattern:
+                child = self._goto[node].get(char)
+                if child is None:
+                    child = len(self._goto)
+                    self._goto[node][char] = child
+                    self._goto.append({})
+                    self._fail.append(0)
+                    self._outputs.append([])
+                    self._output_link.append(-1)
+                node = child
+            self._outputs[node].append(len(self._patterns))
+            self._patterns.append((len(pattern), value))
+        self._link()
+
+    def _link(self) -> None:
+        """Compute failure and output links breadth first."""
+        queue = deque(self._goto[0].values())
+        while queue:
+            node = queue.popleft()
+            for char, child in self._goto[node].items():
+                queue.append(child)
+                fallback = self._fail[node]
+                while fallback and char not in self._goto[fallback]:
+                    fallback = self._fail[fallback]
+                target = self._goto[fallback].get(char, 0)
+                self._fail[child] = target if target != child else 0
+                fail = self._fail[child]
+                self._output_link[child] = fail if self._outputs[fail] else self._output_link[fail]
+
+    def __len__(self) -> int:
+        return len(self._patterns)
+
+    def iter_matches(self, text: str) -> Iterator[Tuple[int, int, T]]:
+        """Yield ``(start, end, value)`` for every match, in order of end."""
+        goto, fail, outputs, output_link, patterns = (
+            self._goto, self._fail, self._outputs, self._output_link, self._patterns,
+        )
+        separator = self.separator
+        length = len(text)
+        node = 0
+        for position, char in enumerate(text):
+            while node and char not in goto[node]:
+                node = fail[node]
+            node = goto[node].get(char, 0)
+            if not node:
+                continue
+            end = position + 1
+            if separator and end < length and text[end] != separator:
+                continue
+            match_node = node if outputs[node] else output_link[node]
+            while match_node > 0:
+                for pattern in outputs[match_node]:
+                    pattern_length, value = patterns[pattern]
+                    start = end - pattern_length
+                    if not separator or start == 0 or text[start - 1] == separator:
+                        yield start, end, value
+                match_node = output_link[match_node]
@@ -0,0 +1,44 @@
+"""Bloom filter for compact set membership."""
+import hashlib
+import math
+from typing import Iterable
+
+
+class BloomFilter:
+    """
+    Probabilistic set of strings: ``in`` is never wrong for added items and
+    wrong for absent ones with probability ``false_positive_rate`` once
+    ``capacity`` items have been added.
+
+    Uses double hashing over one 128-bit BLAKE2b digest per item.
+    """
+
+    def __init__(self, capacity: int, false_positive_rate: float = 0.001):
+        capacity = max(1, capacity)
+        self.capacity = capacity
+        self.false_positive_rate = false_positive_rate
+        self.size = max(8, int(math.ceil(-capacity * math.log(false_positive_rate) / (math.log(2) ** 2))))
+        self.hash_count = max(1, int(round(self.size / capacity * math.log(2))))
+        self._bits = bytearray((self.size + 7) // 8)
+        self.count = 0
+
+    def _positions(self, item: str) -> Iterable[int]:
+        digest = hashlib.blake2b(item.encode("utf-8"), digest_size=16).digest()
+        first = int.from_bytes(digest[:8], "little")
+        second = int.from_bytes(digest[8:], "little") | 1
+        return ((first + i * second) % self.size for i in range(self.hash_count))
+
+    def add(self, item: str) -> None:
+        for position in self._positions(item):
+            self._bits[position >> 3] |= 1 << (position & 7)
+        self.count += 1
+
+    def update(self, items: Iterable[str]) -> None:
+        for item in items:
+            self.add(item)
+
+    def __contains__(self, item: str) -> bool:
+        return all(self._bits[position >> 3] & (1 << (position & 7)) for position in self._positions(item))
+
+    def __len__(self) -> int:
+        return self.count
@@ -0,0 +1,32 @@
+"""Application-wide constants."""
+
+# Transparency score component weights (see BACKEND_GUIDE.md)
+SCORE_COMPONENT_WEIGHTS = {
+    "legal_record": 0.30,
+    "promise_fulfillment": 0.30,
+    "public_sentiment": 0.25,
+    "credential_verification": 0.15,
+}
+
+# Score assigned to a component when there is no data to judge it by
+NEUTRAL_COMPONENT_SCORE = 50.0
+
+# Points deducted from the legal record score per case, by severity
+CASE_SEVERITY_WEIGHTS = {
+    "low": 5.0,
+    "medium": 10.0,
+    "high": 20.0,
+    "critical": 35.0,
+}
+DEFAULT_CASE_SEVERITY_WEIGHT = CASE_SEVERITY_WEIGHTS["medium"]
+
+# Ongoing cases deduct a fraction of their severity weight
+ONGOING_CASE_DEDUCTION_FACTOR = 0.5
+
+# Only news mentions published within this window feed public sentiment
+SENTIMENT_WINDOW_DAYS = 90
+
+# Number of evidence records at which confidence reaches ~63%
+CONFIDENCE_SATURATION = 20.0
+
+SCORE_CALCULATION_METHOD = "weighted_v1"
@@ -0,0 +1,93 @@
+"""Small shared helpers."""
+import re
+from typing import List, Optional
+import unicodedata
+from urllib.parse import parse_qsl, urlencode, urlsplit, urlunsplit
+
+_TOKEN_PATTERN = re.compile(r"[a-z0-9]+")
+
+# Query parameters that only track where a click came from
+_TRACKING_PARAMS = {"fbclid", "gclid", "dclid", "msclkid", "mc_cid", "mc_eid", "igshid", "ref", "ref_src", "cmpid"}
+_DEFAULT_PORTS = {"http": 80, "https": 443}
+
+
+def etag_matches(if_none_match: Optional[str], etag: str) -> bool:
+    """Check an ``If-None-Match`` header against an entity tag (weak comparison)."""
+    if not if_none_match:
+        return False
+    if if_none_match.strip() == "*":
+        return True
+    target = etag[2:] if etag.startswith("W/") else etag
+    for candidate in if_none_match.split(","):
+        candidate = candidate.strip()
+        if candidate.startswith("W/"):
+            candidate = candidate[2:]
+        if candidate == target:
+            return True
+    return False
+
+
+def canonicalize_url(url: str) -> str:
+    """
+    Normalize a URL so different spellings of the same page compare equal.
+    Lowercases the scheme and host, drops ``www.``, default ports, fragments
+    and tracking parameters, sorts the query and trims trailing slashes.
+    """
+    parts = urlsplit(url.strip())
+    scheme = parts.scheme.lower() or "https"
+    host = (parts.hostname or "").lower()
+    if host.startswith("www."):
+        host = host[4:]
+    netloc = host
+    if parts.port and parts.port != _DEFAULT_PORTS.get(scheme):
+        netloc = f"{host}:{parts.port}"
+    path = re.sub(r"/{2,}", "/", parts.path or "/")
+    if len(path) > 1:
+        path = path.rstrip("/")
+    query = sorted(
+        (key, value)
+        for key, value in parse_qsl(parts.query, keep_blank_values=True)
+        if not key.lower().startswith("utm_") and key.lower() not in _TRACKING_PARAMS
+    )
+    return urlunsplit((scheme, netloc, path, urlencode(query), ""))
+
+
+def normalize_text(text: str) -> str:
+    """Lowercase ``text`` and strip accents."""
+    decomposed = unicodedata.normalize("NFKD", text.lower())
+    return "".join(char for char in decomposed if not unicodedata.combining(char))
+
+
+def tokenize(text: Optional[str]) -> List[str]:
+    """Split text into normalized alphanumeric tokens."""
+    if not text:
+        return []
+    return _TOKEN_PATTERN.findall(normalize_text(text))
+
+
+def bounded_levenshtein(a: str, b: str, max_distance: int, prefix: bool = False) -> Optional[int]:
+    """
+    Edit distance between ``a`` and ``b``, or None if it exceeds
+    ``max_distance``. With ``prefix``, the distance between ``a`` and the
+    closest prefix of ``b``.
+    """
+    if len(a) - len(b) > max_distance or (not prefix and len(b) - len(a) > max_distance):
+        return None
+    if a == b or (prefix and b.startswith(a)):
+        return 0
+    if prefix:
+        b = b[:len(a) + max_distance]
+    previous = list(range(len(b) + 1))
+    for i, char_a in enumerate(a, 1):
+        current = [i]
+        for j, char_b in enumerate(b, 1):
+            current.append(min(
+                previous[j] + 1,
+                current[j - 1] + 1,
+                previous[j - 1] + (char_a != char_b),
+            ))
+        if min(current) > max_distance:
+            return None
+        previous = current
+    distance = min(previous) if prefix else previous[-1]
+    return distance if distance <= max_distance else None
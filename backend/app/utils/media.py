@@ -0,0 +1,44 @@
+"""
+Evidence file inspection, run in worker processes.
+
+Kept free of application imports so spawned workers start quickly: only
+libmagic (``python-magic``) and Pillow are loaded.
+"""
+from typing import Any, Dict, Optional
+
+import magic
+from PIL import Image, UnidentifiedImageError
+
+SNIFF_BYTES = 8192
+
+
+def inspect_media(path: str, thumbnail_path: Optional[str] = None, thumbnail_size: int = 320) -> Dict[str, Any]:
+    """
+    Sniff the MIME type of the file at ``path`` from its content and, for
+    images, read their dimensions; when ``thumbnail_path`` is given, also
+    write a JPEG thumbnail no larger than ``thumbnail_size`` there.
+
+    Returns ``content_type``, ``width``, ``height`` and ``thumbnail``
+    (whether one was written). Images Pillow cannot decode report no
+    dimensions.
+    """
+    with open(path, "rb") as handle:
+        header = handle.read(SNIFF_BYTES)
+    content_type = magic.from_buffer(header, mime=True)
+    result: Dict[str, Any] = {"content_type": content_type, "width": None, "height": None, "thumbnail": False}
+    if not content_type.startswith("image/"):
+        return result
+
+    try:
+        with Image.open(path) as image:
+            result["width"], result["height"] = image.size
+            if thumbnail_path:
+                # Lets JPEGs decode straight at a reduced scale
+                image.draft("RGB", (thumbnail_size, thumbnail_size))
+                image.thumbnail((thumbnail_size, thumbnail_size))
+                image.convert("RGB").save(thumbnail_path, "JPEG", quality=80, optimize=True)
+                result["thumbnail"] = True
+    except (UnidentifiedImageError, OSError, Image.DecompressionBombError):
+        result["width"] = result["height"] = None
+        result["thumbnail"] = False
+    return result
@@ -0,0 +1,113 @@
+"""
+Streaming multipart/form-data reader.
+
+Starlette's form parser spools every file of a request before the endpoint
+runs. ``iter_multipart`` instead parses the body as it arrives and yields
+each part's start, data and end as events, so the caller decides where the
+bytes go (and can reject a part mid-stream) while holding no more than one
+received chunk in memory.
+"""
+from dataclasses import dataclass, field
+from typing import AsyncIterator, List, Optional, Tuple, Union
+
+from multipart.exceptions import MultipartParseError
+from multipart.multipart import MultipartParser, parse_options_header
+
+from app.core.exceptions import BadRequestException
+
+PART_BEGIN = "begin"
+PART_DATA = "data"
+PART_END = "end"
+
+
+@dataclass
+class MultipartPart:
+    """A form field or file part; ``filename`` is None for plain fields."""
+
+    name: str
+    filename: Optional[str] = None
+    content_type: Optional[str] = None
+    headers: List[Tuple[bytes, bytes]] = field(default_factory=list)
+
+
+Event = Tuple[str, Union[MultipartPart, bytes]]
+
+
+class _Callbacks:
+    """Collects parser callbacks into events between two ``write`` calls."""
+
+    def __init__(self):
+        self.events: List[Event] = []
+        self._headers: List[Tuple[bytes, bytes]] = []
+        self._field = b""
+        self._value = b""
+        self._part: Optional[MultipartPart] = None
+
+    def as_dict(self):
+        return {
+            "on_part_begin": self.on_part_begin,
+            "on_part_data": self.on_part_data,
+            "on_part_end": self.on_part_end,
+            "on_header_field": self.on_header_field,
+            "on_header_value": self.on_header_value,
+            "on_header_end": self.on_header_end,
+            "on_headers_finished": self.on_headers_finished,
+        }
+
+    def on_part_begin(self) -> None:
+        self._headers = []
+
+    def on_header_field(self, data: bytes, start: int, end: int) -> None:
+        self._field += data[start:end]
+
+    def on_header_value(self, data: bytes, start: int, end: int) -> None:
+        self._value += data[start:end]
+
+    def on_header_end(self) -> None:
+        self._headers.append((self._field.lower(), self._value))
+        self._field = self._value = b""
+
+    def on_headers_finished(self) -> None:
+        headers = dict(self._headers)
+        _, options = parse_options_header(headers.get(b"content-disposition", b""))
+        if b"name" not in options:
+            raise BadRequestException('Multipart part without a "name" in its Content-Disposition')
+        filename = options.get(b"filename")
+        content_type = headers.get(b"content-type")
+        self._part = MultipartPart(
+            name=options[b"name"].decode("utf-8", "replace"),
+            filename=filename.decode("utf-8", "replace") if filename is not None else None,
+            content_type=content_type.decode("latin-1") if content_type else None,
+            headers=self._headers,
+        )
+        self.events.append((PART_BEGIN, self._part))
+
+    def on_part_data(self, data: bytes, start: int, end: int) -> None:
+        self.events.append((PART_DATA, data[start:end]))
+
+    def on_part_end(self) -> None:
+        self.events.append((PART_END, self._part))
+
+
+async def iter_multipart(content_type: Optional[str], stream: AsyncIterator[bytes]) -> AsyncIterator[Event]:
+    """
+    Parse a multipart body from ``stream`` (e.g. ``request.stream()``),
+    yielding ``(PART_BEGIN, part)``, ``(PART_DATA, bytes)`` and
+    ``(PART_END, part)`` events in order.
+    """
+    kind, params = parse_options_header(content_type or "")
+    if kind != b"multipart/form-data" or b"boundary" not in params:
+        raise BadRequestException("Expected a multipart/form-data body")
+    callbacks = _Callbacks()
+    parser = MultipartParser(params[b"boundary"], callbacks.as_dict())
+    async for chunk in stream:
+        try:
+            parser.write(chunk)
+        except MultipartParseError:
+            raise BadRequestException("Malformed multipart body")
+        events, callbacks.events = callbacks.events, []
+        for event in events:
+            yield event
+    parser.finalize()
+    for event in callbacks.events:
+        yield event
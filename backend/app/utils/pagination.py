@@ -0,0 +1,115 @@
+"""
+Keyset (cursor) pagination.
+
+Pages are ordered by ``(sort column, id)`` and each page continues strictly
+after the last row of the previous one, using a row-value comparison that a
+composite ``(sort column, id)`` index answers directly. Unlike ``OFFSET``,
+the cost of a page does not grow with its depth.
+
+Cursors are opaque url-safe strings encoding the last row's sort key and id,
+plus the sort column's name so a cursor cannot be replayed against a
+different ordering. The sort column must be non-nullable.
+"""
+import base64
+import binascii
+from dataclasses import dataclass
+from datetime import date, datetime
+from decimal import Decimal
+import json
+from typing import Any, Generic, List, Optional, Tuple, TypeVar
+import uuid
+
+from sqlalchemy import Select, tuple_
+from sqlalchemy.orm import Session
+
+from app.core.exceptions import BadRequestException
+
+T = TypeVar("T")
+
+
+@dataclass
+class KeysetPage(Generic[T]):
+    """One page of results and the cursor for the next one."""
+
+    items: List[T]
+    next_cursor: Optional[str]
+
+
+def _encode_value(value: Any) -> Any:
+    if isinstance(value, datetime):
+        return {"dt": value.isoformat()}
+    if isinstance(value, date):
+        return {"d": value.isoformat()}
+    if isinstance(value, Decimal):
+        return {"dec": str(value)}
+    if isinstance(value, uuid.UUID):
+        return {"uuid": str(value)}
+    return value
+
+
+def _decode_value(value: Any) -> Any:
+    if isinstance(value, dict):
+        (tag, raw), = value.items()
+        if tag == "dt":
+            return datetime.fromisoformat(raw)
+        if tag == "d":
+            return date.fromisoformat(raw)
+        if tag == "dec":
+            return Decimal(raw)
+        if tag == "uuid":
+            return uuid.UUID(raw)
+        raise ValueError(f"Unknown cursor value tag: {tag}")
+    return value
+
+
+def encode_cursor(sort_key: str, sort_value: Any, row_id: Any) -> str:
+    """Encode a position in a ``(sort_key, id)`` ordering as an opaque cursor."""
+    payload = json.dumps([sort_key, _encode_value(sort_value), _encode_value(row_id)], separators=(",", ":"))
+    return base64.urlsafe_b64encode(payload.encode()).decode().rstrip("=")
+
+
+def decode_cursor(cursor: str, sort_key: str) -> Tuple[Any, Any]:
+    """Decode a cursor produced by ``encode_cursor`` for the same sort key."""
+    try:
+        padded = cursor + "=" * (-len(cursor) % 4)
+        cursor_key, sort_value, row_id = json.loads(base64.urlsafe_b64decode(padded.encode()))
+        if cursor_key != sort_key:
+            raise ValueError("Cursor belongs to a different ordering")
+        return _decode_value(sort_value), _decode_value(row_id)
+    except (ValueError, TypeError, binascii.Error):
+        raise BadRequestException("Invalid pagination cursor")
+
+
+def keyset_paginate(
+    db: Session,
+    stmt: Select,
+    sort_column: Any,
+    id_column: Any,
+    limit: int,
+    cursor: Optional[str] = None,
+    descending: bool = True,
+) -> KeysetPage:
+    """
+    Fetch one page of ``stmt`` (a select of ORM entities) in keyset order.
+
+    Filters already applied to ``stmt`` are kept; ordering, the cursor
+    predicate and the limit are added here.
+    """
+    sort_key = sort_column.key
+    key = tuple_(sort_column, id_column)
+    if cursor:
+        position = decode_cursor(cursor, sort_key)
+        stmt = stmt.where(key < position if descending else key > position)
+
+    if descending:
+        stmt = stmt.order_by(sort_column.desc(), id_column.desc())
+    else:
+        stmt = stmt.order_by(sort_column.asc(), id_column.asc())
+
+    rows = list(db.scalars(stmt.limit(limit + 1)))
+    items = rows[:limit]
+    next_cursor = None
+    if len(rows) > limit:
+        last = items[-1]
+        next_cursor = encode_cursor(sort_key, getattr(last, sort_key), getattr(last, id_column.key))
+    return KeysetPage(items=items, next_cursor=next_cursor)
@@ -0,0 +1,59 @@
+"""
+SQL statement counting.
+
+``count_queries`` records every statement executed by any engine while the
+block runs; ``assert_max_queries`` additionally fails when a threshold is
+exceeded, for pinning the query budget of an endpoint in tests:
+
+    with assert_max_queries(3):
+        client.get("/api/v1/politicians?page_size=100")
+"""
+from contextlib import contextmanager
+import threading
+from typing import Iterator, List
+
+from sqlalchemy import event
+from sqlalchemy.engine import Engine
+
+
+class QueryCounter:
+    """Collects the SQL statements executed while it is attached."""
+
+    def __init__(self):
+        self.statements: List[str] = []
+        self._lock = threading.Lock()
+
+    def _before_cursor_execute(self, conn, cursor, statement, parameters, context, executemany):
+        with self._lock:
+            self.statements.append(statement)
+
+    @property
+    def count(self) -> int:
+        return len(self.statements)
+
+    def attach(self) -> None:
+        event.listen(Engine, "before_cursor_execute", self._before_cursor_execute)
+
+    def detach(self) -> None:
+        event.remove(Engine, "before_cursor_execute", self._before_cursor_execute)
+
+
+@contextmanager
+def count_queries() -> Iterator[QueryCounter]:
+    """Count SQL statements executed inside the block."""
+    counter = QueryCounter()
+    counter.attach()
+    try:
+        yield counter
+    finally:
+        counter.detach()
+
+
+@contextmanager
+def assert_max_queries(max_queries: int) -> Iterator[QueryCounter]:
+    """Fail with the executed statements if the block runs more than ``max_queries``."""
+    with count_queries() as counter:
+        yield counter
+    if counter.count > max_queries:
+        statements = "\n".join(f"  {i}. {sql}" for i, sql in enumerate(counter.statements, 1))
+        raise AssertionError(f"Expected at most {max_queries} queries, executed {counter.count}:\n{statements}")
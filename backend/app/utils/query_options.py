@@ -0,0 +1,101 @@
+"""
+Named loading strategies for ``Politician`` queries.
+
+Each strategy loads exactly the relationships and columns one kind of view
+serializes, with collections fetched by ``selectinload`` (one extra query per
+relationship, however many politicians are loaded) and every other
+relationship set to ``raiseload`` so an accidental lazy load fails loudly
+instead of silently issuing N+1 queries.
+
+    stmt = select(Politician).options(*politician_loading(FULL_PROFILE))
+"""
+from typing import List, Type
+
+from sqlalchemy.orm import joinedload, load_only, raiseload, selectinload
+from sqlalchemy.orm.interfaces import ORMOption
+
+from app.models.case import LegalCase
+from app.models.news import NewsMention
+from app.models.politician import Politician
+from app.models.promise import Promise
+from app.models.report import FlaggedReport
+from app.models.score import ScoreHistory
+
+LIST_CARD = "list_card"
+FULL_PROFILE = "full_profile"
+TIMELINE = "timeline"
+
+# Politician columns shown on list pages and cards
+CARD_COLUMNS = (
+    Politician.id,
+    Politician.name,
+    Politician.position,
+    Politician.party,
+    Politician.county,
+    Politician.photo_url,
+    Politician.transparency_score,
+    Politician.confidence_level,
+    Politician.is_active,
+    Politician.created_at,
+    Politician.updated_at,
+)
+
+
+def _list_card() -> List[ORMOption]:
+    return [load_only(*CARD_COLUMNS), raiseload("*")]
+
+
+def _full_profile() -> List[ORMOption]:
+    return [
+        selectinload(Politician.cases),
+        selectinload(Politician.promises),
+        selectinload(Politician.linkages),
+        selectinload(Politician.score_history),
+        selectinload(Politician.news_mentions),
+        raiseload("*"),
+    ]
+
+
+def _timeline() -> List[ORMOption]:
+    return [
+        load_only(Politician.id, Politician.name, Politician.updated_at),
+        selectinload(Politician.cases).load_only(
+            LegalCase.id, LegalCase.title, LegalCase.status, LegalCase.date_filed, LegalCase.date_resolved
+        ),
+        selectinload(Politician.promises).load_only(
+            Promise.id, Promise.title, Promise.status, Promise.date_made, Promise.deadline
+        ),
+        selectinload(Politician.reports).load_only(
+            FlaggedReport.id, FlaggedReport.title, FlaggedReport.status, FlaggedReport.date_reported
+        ),
+        selectinload(Politician.score_history).load_only(
+            ScoreHistory.id, ScoreHistory.transparency_score, ScoreHistory.calculated_at
+        ),
+        selectinload(Politician.news_mentions).load_only(
+            NewsMention.id, NewsMention.title, NewsMention.source, NewsMention.url, NewsMention.published_at
+        ),
+        raiseload("*"),
+    ]
+
+
+STRATEGIES = {
+    LIST_CARD: _list_card,
+    FULL_PROFILE: _full_profile,
+    TIMELINE: _timeline,
+}
+
+
+def politician_loading(strategy: str) -> List[ORMOption]:
+    """Return the loader options for a named strategy."""
+    try:
+        return STRATEGIES[strategy]()
+    except KeyError:
+        raise ValueError(f"Unknown politician loading strategy: {strategy}")
+
+
+def with_politician_card(model: Type) -> List[ORMOption]:
+    """
+    Options for child-row feeds (news, reports) that show their politician.
+    Joins the politician in the same query, restricted to card columns.
+    """
+    return [joinedload(model.politician).load_only(*CARD_COLUMNS), raiseload("*")]
@@ -0,0 +1,167 @@
+"""
+Redis client access.
+
+``get_redis`` returns a shared client for ``settings.redis_url``. Setting
+``REDIS_URL=memory://`` swaps in ``InMemoryRedis``, a small single-process
+stand-in implementing the subset of commands the app uses, so services and
+tests can run without a Redis server.
+"""
+from functools import lru_cache
+import threading
+import time
+from typing import Any, Dict, Iterable, List, Optional, Set, Union
+
+import redis
+
+from app.config import get_settings
+
+MEMORY_URL_SCHEME = "memory://"
+
+
+class InMemoryRedis:
+    """Thread-safe in-process stand-in for the Redis commands used by the app."""
+
+    def __init__(self):
+        self._data: Dict[str, Any] = {}
+        self._expires: Dict[str, float] = {}
+        self._lock = threading.RLock()
+
+    # Internal helpers
+
+    def _expired(self, key: str) -> bool:
+        deadline = self._expires.get(key)
+        if deadline is not None and deadline <= time.monotonic():
+            self._data.pop(key, None)
+            self._expires.pop(key, None)
+            return True
+        return False
+
+    def _get(self, key: str, default: Any = None) -> Any:
+        if self._expired(key):
+            return default
+        return self._data.get(key, default)
+
+    @staticmethod
+    def _encode(value: Any) -> bytes:
+        if isinstance(value, bytes):
+            return value
+        return str(value).encode()
+
+    # Keys
+
+    def exists(self, *keys: str) -> int:
+        with self._lock:
+            return sum(1 for key in keys if not self._expired(key) and key in self._data)
+
+    def delete(self, *keys: str) -> int:
+        with self._lock:
+            removed = 0
+            for key in keys:
+                if self._data.pop(key, None) is not None:
+                    removed += 1
+                self._expires.pop(key, None)
+            return removed
+
+    def expire(self, key: str, seconds: Union[int, float]) -> bool:
+        with self._lock:
+            if self._get(key) is None:
+                return False
+            self._expires[key] = time.monotonic() + seconds
+            return True
+
+    def flushdb(self) -> bool:
+        with self._lock:
+            self._data.clear()
+            self._expires.clear()
+            return True
+
+    # Strings
+
+    def get(self, key: str) -> Optional[bytes]:
+        with self._lock:
+            return self._get(key)
+
+    def mget(self, keys: Iterable[str]) -> List[Optional[bytes]]:
+        with self._lock:
+            return [self._get(key) for key in keys]
+
+    def set(
+        self,
+        key: str,
+        value: Any,
+        ex: Optional[Union[int, float]] = None,
+        px: Optional[int] = None,
+        nx: bool = False,
+    ) -> Optional[bool]:
+        with self._lock:
+            if nx and self._get(key) is not None:
+                return None
+            self._data[key] = self._encode(value)
+            self._expires.pop(key, None)
+            if ex is not None:
+                self._expires[key] = time.monotonic() + ex
+            elif px is not None:
+                self._expires[key] = time.monotonic() + px / 1000.0
+            return True
+
+    def incr(self, key: str, amount: int = 1) -> int:
+        with self._lock:
+            value = int(self._get(key, b"0")) + amount
+            self._data[key] = self._encode(value)
+            return value
+
+    # Sets
+
+    def sadd(self, key: str, *members: Any) -> int:
+        with self._lock:
+            members_set: Set[bytes] = self._get(key, set())
+            before = len(members_set)
+            members_set.update(self._encode(member) for member in members)
+            self._data[key] = members_set
+            return len(members_set) - before
+
+    def srem(self, key: str, *members: Any) -> int:
+        with self._lock:
+            members_set: Set[bytes] = self._get(key, set())
+            before = len(members_set)
+            members_set.difference_update(self._encode(member) for member in members)
+            return before - len(members_set)
+
+    def smembers(self, key: str) -> Set[bytes]:
+        with self._lock:
+            return set(self._get(key, set()))
+
+    def spop(self, key: str, count: Optional[int] = None) -> Union[bytes, List[bytes], None]:
+        with self._lock:
+            members_set: Set[bytes] = self._get(key, set())
+            popped = [members_set.pop() for _ in range(min(count or 1, len(members_set)))]
+            if not members_set:
+                self._data.pop(key, None)
+            if count is None:
+                return popped[0] if popped else None
+            return popped
+
+    def scard(self, key: str) -> int:
+        with self._lock:
+            return len(self._get(key, set()))
+
+    def ping(self) -> bool:
+        return True
+
+
+def create_redis(url: str) -> Any:
+    """Create a Redis client for ``url``, or an in-memory stand-in for ``memory://``."""
+    if url.startswith(MEMORY_URL_SCHEME):
+        return InMemoryRedis()
+    return redis.Redis.from_url(url)
+
+
+@lru_cache()
+def get_redis() -> Any:
+    """Get the shared Redis client."""
+    return create_redis(get_settings().redis_url)
+
+
+def decode_members(members: Iterable[Any]) -> List[str]:
+    """Decode Redis bytes replies to strings."""
+    return [member.decode() if isinstance(member, bytes) else str(member) for member in members]
@@ -0,0 +1,82 @@
+"""
+Top-K over counters that only grow.
+
+``IncrementalTopK`` keeps a score per key and a max-heap of (score, key)
+entries. An increment pushes a fresh entry and leaves the old one in place;
+since scores only grow, an entry is stale exactly when its score is below the
+key's current score. ``top(k)`` pops entries off the heap until it has k live
+ones, discarding stale ones for good, then pushes the live ones back. Each
+stale entry is popped once, so a query costs O(k log n) amortized, and the
+heap is rebuilt if stale entries ever outnumber live ones.
+"""
+import heapq
+from typing import Dict, Generic, Hashable, Iterable, List, Tuple, TypeVar
+
+K = TypeVar("K", bound=Hashable)
+
+
+class IncrementalTopK(Generic[K]):
+    """Growing per-key scores answering top-k queries."""
+
+    def __init__(self, compact_ratio: float = 2.0):
+        self.compact_ratio = compact_ratio
+        self._scores: Dict[K, float] = {}
+        self._heap: List[Tuple[float, int, K]] = []
+        self._sequence = 0  # tie-breaker, so keys are never compared
+
+    def __len__(self) -> int:
+        return len(self._scores)
+
+    def __contains__(self, key: K) -> bool:
+        return key in self._scores
+
+    def get(self, key: K, default: float = 0.0) -> float:
+        return self._scores.get(key, default)
+
+    def items(self) -> Iterable[Tuple[K, float]]:
+        return self._scores.items()
+
+    def add(self, key: K, amount: float) -> float:
+        """Increase ``key``'s score by ``amount`` (which must be positive)."""
+        if amount <= 0:
+            raise ValueError("IncrementalTopK scores can only grow")
+        previous = self._scores.get(key, 0.0)
+        score = previous + amount
+        if score == previous:  # lost to rounding
+            return score
+        self._scores[key] = score
+        self._push(key, score)
+        if len(self._heap) > self.compact_ratio * len(self._scores) + 64:
+            self._rebuild_heap()
+        return score
+
+    def top(self, k: int) -> List[Tuple[K, float]]:
+        """The ``k`` highest scoring keys, best first."""
+        live: List[Tuple[float, int, K]] = []
+        while self._heap and len(live) < k:
+            entry = heapq.heappop(self._heap)
+            if self._scores.get(entry[2]) == -entry[0]:
+                live.append(entry)
+        for entry in live:
+            heapq.heappush(self._heap, entry)
+        return [(key, -neg_score) for neg_score, _, key in live]
+
+    def replace(self, scores: Dict[K, float]) -> None:
+        """Replace every score."""
+        self._scores = {key: score for key, score in scores.items() if score > 0}
+        self._rebuild_heap()
+
+    def rescale(self, factor: float, floor: float = 0.0) -> None:
+        """Multiply every score by ``factor``, dropping keys left at or below ``floor``."""
+        self.replace({key: score * factor for key, score in self._scores.items() if score * factor > floor})
+
+    def _push(self, key: K, score: float) -> None:
+        self._sequence += 1
+        heapq.heappush(self._heap, (-score, self._sequence, key))
+
+    def _rebuild_heap(self) -> None:
+        self._heap = []
+        for key, score in self._scores.items():
+            self._sequence += 1
+            self._heap.append((-score, self._sequence, key))
+        heapq.heapify(self._heap)
@@ -0,0 +1,142 @@
+"""
+Benchmark authenticated request latency under concurrency.
+
+Serves two otherwise identical endpoints from one in-process ASGI app: one
+authenticates with the async ``get_current_user`` dependency, the other
+with the previous blocking pattern (a sync ``Session`` queried inside an
+``async def`` dependency). Concurrent authenticated requests are fired at
+each while a probe measures the latency of an unauthenticated endpoint
+sharing the same event loop.
+
+A throwaway user is created in the target database and removed afterwards:
+
+    python scripts/benchmark_auth_latency.py --requests 2000 --concurrency 100
+"""
+import argparse
+import asyncio
+import statistics
+import sys
+import time
+import uuid
+from pathlib import Path
+from typing import List
+
+sys.path.insert(0, str(Path(__file__).resolve().parents[1]))
+
+import httpx  # noqa: E402
+from fastapi import Depends, FastAPI, HTTPException  # noqa: E402
+from fastapi.security import HTTPAuthorizationCredentials  # noqa: E402
+from sqlalchemy import delete  # noqa: E402
+from sqlalchemy.orm import Session  # noqa: E402
+
+from app.core.auth_cache import UserPrincipal  # noqa: E402
+from app.core.security import create_access_token, decode_token, get_password_hash  # noqa: E402
+from app.database import SessionLocal, async_engine, get_db  # noqa: E402
+from app.dependencies import get_current_user, security  # noqa: E402
+from app.models.user import User  # noqa: E402
+
+
+async def blocking_current_user(
+    credentials: HTTPAuthorizationCredentials = Depends(security),
+    db: Session = Depends(get_db),
+) -> User:
+    """The pre-async dependency: a blocking query on the event loop."""
+    payload = decode_token(credentials.credentials)
+    if payload is None:
+        raise HTTPException(status_code=401)
+    user = db.query(User).filter(User.id == uuid.UUID(payload["sub"])).first()
+    if user is None:
+        raise HTTPException(status_code=404)
+    return user
+
+
+def build_app() -> FastAPI:
+    app = FastAPI()
+
+    @app.get("/async-auth")
+    async def async_auth(user: UserPrincipal = Depends(get_current_user)):
+        return {"id": str(user.id)}
+
+    @app.get("/blocking-auth")
+    async def blocking_auth(user: User = Depends(blocking_current_user)):
+        return {"id": str(user.id)}
+
+    @app.get("/ping")
+    async def ping():
+        return {"ok": True}
+
+    return app
+
+
+def percentile(samples: List[float], pct: float) -> float:
+    ordered = sorted(samples)
+    return ordered[min(len(ordered) - 1, int(len(ordered) * pct))]
+
+
+async def run(client: httpx.AsyncClient, path: str, token: str, requests: int, concurrency: int) -> None:
+    semaphore = asyncio.Semaphore(concurrency)
+    latencies: List[float] = []
+    probe_latencies: List[float] = []
+    done = asyncio.Event()
+
+    async def one() -> None:
+        async with semaphore:
+            start = time.perf_counter()
+            response = await client.get(path, headers={"Authorization": f"Bearer {token}"})
+            latencies.append(time.perf_counter() - start)
+            response.raise_for_status()
+
+    async def probe() -> None:
+        while not done.is_set():
+            start = time.perf_counter()
+            await client.get("/ping")
+            probe_latencies.append(time.perf_counter() - start)
+            await asyncio.sleep(0.005)
+
+    probe_task = asyncio.create_task(probe())
+    start = time.perf_counter()
+    await asyncio.gather(*(one() for _ in range(requests)))
+    elapsed = time.perf_counter() - start
+    done.set()
+    await probe_task
+
+    print(f"{path}: {requests} requests, concurrency {concurrency}")
+    print(f"  throughput:   {requests / elapsed:10.1f} req/s")
+    for label, samples in (("auth", latencies), ("/ping", probe_latencies)):
+        print(
+            f"  {label:<6} p50 {statistics.median(samples) * 1000:8.2f} ms"
+            f"  p95 {percentile(samples, 0.95) * 1000:8.2f} ms"
+            f"  p99 {percentile(samples, 0.99) * 1000:8.2f} ms"
+        )
+
+
+async def main_async(requests: int, concurrency: int) -> None:
+    with SessionLocal() as db:
+        user = User(email=f"bench-{uuid.uuid4().hex}@example.com", hashed_password=get_password_hash("benchmark"))
+        db.add(user)
+        db.commit()
+        user_id = user.id
+    token = create_access_token({"sub": str(user_id)})
+
+    try:
+        transport = httpx.ASGITransport(app=build_app())
+        async with httpx.AsyncClient(transport=transport, base_url="http://benchmark") as client:
+            for path in ("/blocking-auth", "/async-auth"):
+                await run(client, path, token, requests, concurrency)
+    finally:
+        await async_engine.dispose()
+        with SessionLocal() as db:
+            db.execute(delete(User).where(User.id == user_id))
+            db.commit()
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--requests", type=int, default=1000)
+    parser.add_argument("--concurrency", type=int, default=50)
+    args = parser.parse_args()
+    asyncio.run(main_async(args.requests, args.concurrency))
+
+
+if __name__ == "__main__":
+    main()
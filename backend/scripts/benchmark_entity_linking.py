@@ -0,0 +1,127 @@
+"""
+Benchmark politician entity linking.
+
+Builds synthetic politicians (with aliases) and articles mentioning a few of
+them (no database), then links the articles:
+
+1. with one compiled regex per politician name and alias, the naive
+   O(articles x politicians) approach (on a sample; extrapolated);
+2. with the Aho-Corasick linker in this process;
+3. with the linker across a process pool.
+
+Also times building the automaton:
+
+    python scripts/benchmark_entity_linking.py --politicians 2000 --articles 20000 --processes 4
+"""
+import argparse
+import random
+import re
+import sys
+import time
+import uuid
+from pathlib import Path
+from typing import List, Tuple
+
+sys.path.insert(0, str(Path(__file__).resolve().parents[1]))
+
+from app.services.entity_linking_service import (  # noqa: E402
+    EntityLinker,
+    PoliticianEntity,
+    link_texts,
+    linking_pool,
+)
+
+SYLLABLES = ["wa", "ki", "mu", "nya", "ja", "ru", "to", "ode", "nga", "ka", "li", "mo", "chi", "be", "ri", "so"]
+WORDS = [
+    "the", "county", "government", "said", "on", "monday", "budget", "road", "hospital", "tender",
+    "assembly", "senate", "court", "ruled", "that", "funds", "were", "released", "to", "residents",
+    "of", "and", "a", "in", "new", "project", "audit", "report", "showed", "missing", "millions",
+]
+
+
+def random_word(rng: random.Random) -> str:
+    return "".join(rng.choice(SYLLABLES) for _ in range(rng.randint(2, 4))).capitalize()
+
+
+def build_entities(count: int, rng: random.Random) -> List[PoliticianEntity]:
+    entities = []
+    for _ in range(count):
+        name = " ".join(random_word(rng) for _ in range(rng.randint(2, 3)))
+        aliases = tuple(random_word(rng) for _ in range(rng.randint(0, 2)))
+        entities.append(PoliticianEntity(id=uuid.uuid4(), name=name, aliases=aliases))
+    return entities
+
+
+def build_articles(
+    count: int, entities: List[PoliticianEntity], rng: random.Random
+) -> List[Tuple[str, str]]:
+    articles = []
+    for _ in range(count):
+        mentioned = rng.sample(entities, rng.randint(1, 3))
+        words = [rng.choice(WORDS) for _ in range(rng.randint(150, 400))]
+        for entity in mentioned:
+            for _ in range(rng.randint(1, 4)):
+                words.insert(rng.randrange(len(words)), rng.choice((entity.name,) + entity.aliases))
+        title = f"{mentioned[0].name} {' '.join(rng.choice(WORDS) for _ in range(6))}"
+        articles.append((title, " ".join(words) + "."))
+    return articles
+
+
+def regex_link(patterns: List[Tuple[uuid.UUID, "re.Pattern[str]"]], title: str, body: str) -> int:
+    text = f"{title}\n{body}"
+    return len({politician_id for politician_id, pattern in patterns if pattern.search(text)})
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--politicians", type=int, default=2000)
+    parser.add_argument("--articles", type=int, default=20000)
+    parser.add_argument("--regex-sample", type=int, default=200, help="articles linked with regexes")
+    parser.add_argument("--processes", type=int, default=4)
+    parser.add_argument("--seed", type=int, default=7)
+    args = parser.parse_args()
+
+    rng = random.Random(args.seed)
+    entities = build_entities(args.politicians, rng)
+    articles = build_articles(args.articles, entities, rng)
+    print(f"{len(entities)} politicians, {len(articles)} articles")
+
+    started = time.perf_counter()
+    linker = EntityLinker(entities)
+    print(f"automaton build:  {(time.perf_counter() - started) * 1000:.0f}ms")
+
+    patterns = [
+        (entity.id, re.compile(r"\b" + re.escape(name) + r"\b", re.IGNORECASE))
+        for entity in entities
+        for name in (entity.name,) + entity.aliases
+    ]
+    sample = articles[:args.regex_sample]
+    started = time.perf_counter()
+    for title, body in sample:
+        regex_link(patterns, title, body)
+    regex_rate = len(sample) / (time.perf_counter() - started)
+    print(f"regex per name:   {regex_rate:8.0f} articles/s")
+
+    started = time.perf_counter()
+    links = link_texts(linker, articles)
+    single_rate = len(articles) / (time.perf_counter() - started)
+    linked = sum(1 for article_links in links if article_links)
+    print(
+        f"aho-corasick:     {single_rate:8.0f} articles/s ({single_rate / regex_rate:.0f}x), "
+        f"{linked} articles linked, {sum(map(len, links))} links"
+    )
+
+    with linking_pool(linker, args.processes) as executor:
+        # Start the workers before timing
+        list(executor.map(abs, range(args.processes)))
+        started = time.perf_counter()
+        pooled = link_texts(linker, articles, executor=executor)
+        pooled_rate = len(articles) / (time.perf_counter() - started)
+    assert [[link.politician_id for link in article_links] for article_links in pooled] == [
+        [link.politician_id for link in article_links] for article_links in links
+    ]
+    print(f"{args.processes} processes:      {pooled_rate:8.0f} articles/s ({pooled_rate / single_rate:.1f}x one process)")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,202 @@
+"""
+Benchmark Postgres full-text search against ILIKE on seeded news mentions.
+
+Seeds synthetic politicians and news mentions (100k by default) into the
+database given by ``--database-url``, which must already be migrated
+(``alembic upgrade head``), then times the same queries (common words, rare
+words and word pairs) searched four ways:
+
+* ``ILIKE '%word%'`` on title and summary, the approach this replaces
+* a bare ``search_vector @@ query`` lookup (GIN tsvector index only)
+* ``advanced_search`` over news (tsvector and trigram indexes, ranked)
+* ``advanced_search`` over news filtered by party and transparency score
+
+The seeded rows are deleted afterwards unless ``--keep`` is given:
+
+    python scripts/benchmark_fulltext_search.py --database-url postgresql://... --news 100000
+"""
+import argparse
+import datetime
+import os
+import random
+import statistics
+import sys
+import time
+import uuid
+from pathlib import Path
+from typing import Callable, List, Tuple
+
+sys.path.insert(0, str(Path(__file__).resolve().parents[1]))
+
+MARKER = "FTS Benchmark"
+PARTIES = ["UDA", "ODM", "Jubilee", "Wiper", "ANC", "Ford Kenya", "DAP-K", "KANU", "Independent"]
+COUNTIES = ["Nairobi", "Mombasa", "Kisumu", "Nakuru", "Kiambu", "Machakos", "Kakamega", "Meru"]
+SOURCES = ["Daily Nation", "The Standard", "The Star", "Citizen Digital", "Capital FM", "KBC"]
+SYLLABLES = ["wa", "ki", "mu", "nya", "ja", "ru", "to", "ode", "nga", "ka", "li", "mo", "chi", "be", "ri", "so"]
+WORDS = [
+    "road", "hospital", "school", "water", "electricity", "market", "procurement", "tender", "bursary",
+    "housing", "fraud", "land", "audit", "stadium", "dam", "jobs", "youth", "fund", "budget", "county",
+    "assembly", "senate", "court", "petition", "corruption", "contract", "farmers", "fertiliser", "tax",
+    "revenue", "health", "doctors", "strike", "teachers", "loan", "debt", "bridge", "railway", "port",
+    "airport", "drought", "relief", "security", "police", "election", "campaign", "rally", "manifesto",
+]
+FILLER = ["the", "a", "on", "for", "over", "after", "with", "in", "to", "and", "says", "announces", "plans"]
+
+
+def random_name(rng: random.Random) -> str:
+    return " ".join(
+        "".join(rng.choice(SYLLABLES) for _ in range(rng.randint(2, 4))).capitalize() for _ in range(2)
+    )
+
+
+def random_sentence(rng: random.Random, vocabulary: List[str], length: int) -> str:
+    # Zipf-like word choice so some words are common and most are rare
+    words = [vocabulary[min(len(vocabulary) - 1, int(rng.paretovariate(1.0)) - 1)] if rng.random() < 0.6
+             else rng.choice(FILLER) for _ in range(length)]
+    return " ".join(words).capitalize()
+
+
+def percentile(samples: List[float], pct: float) -> float:
+    ordered = sorted(samples)
+    return ordered[min(len(ordered) - 1, int(len(ordered) * pct / 100))]
+
+
+def report(label: str, samples: List[float], results: List[int]) -> None:
+    print(
+        f"{label:<28} mean {statistics.mean(samples):8.2f}  p50 {percentile(samples, 50):8.2f}  "
+        f"p95 {percentile(samples, 95):8.2f}  max {max(samples):8.2f} ms   avg hits {statistics.mean(results):.1f}"
+    )
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--database-url", required=True)
+    parser.add_argument("--news", type=int, default=100000)
+    parser.add_argument("--politicians", type=int, default=2000)
+    parser.add_argument("--queries", type=int, default=200)
+    parser.add_argument("--chunk-size", type=int, default=5000)
+    parser.add_argument("--seed", type=int, default=42)
+    parser.add_argument("--explain", action="store_true", help="print the plan of one full-text query")
+    parser.add_argument("--keep", action="store_true", help="keep the seeded rows")
+    args = parser.parse_args()
+
+    # app.database builds its engines from settings at import time
+    os.environ.setdefault("DATABASE_URL", args.database_url)
+    from sqlalchemy import cast, create_engine, delete, func, insert, or_, select, text
+    from sqlalchemy.dialects.postgresql import REGCONFIG
+    from sqlalchemy.orm import Session
+
+    from app import models  # noqa: F401
+    from app.models.news import NewsMention
+    from app.models.politician import Politician
+    from app.services.fulltext_search_service import SearchScope, advanced_search
+
+    rng = random.Random(args.seed)
+    vocabulary = WORDS + ["".join(rng.choice(SYLLABLES) for _ in range(3)) for _ in range(5000)]
+    engine = create_engine(args.database_url)
+
+    with Session(engine) as db:
+        started = time.perf_counter()
+        politician_ids = []
+        politician_rows = []
+        for _ in range(args.politicians):
+            politician_id = uuid.uuid4()
+            politician_ids.append(politician_id)
+            politician_rows.append({
+                "id": politician_id,
+                "name": random_name(rng),
+                "position": MARKER,
+                "party": rng.choice(PARTIES),
+                "county": rng.choice(COUNTIES),
+                "bio": random_sentence(rng, vocabulary, 20),
+                "transparency_score": round(rng.uniform(0, 100), 2),
+                "confidence_level": 0,
+                "is_active": True,
+            })
+        db.execute(insert(Politician), politician_rows)
+
+        now = datetime.datetime.now(datetime.timezone.utc)
+        for offset in range(0, args.news, args.chunk_size):
+            db.execute(insert(NewsMention), [
+                {
+                    "id": uuid.uuid4(),
+                    "politician_id": rng.choice(politician_ids),
+                    "title": random_sentence(rng, vocabulary, rng.randint(6, 12)),
+                    "source": rng.choice(SOURCES),
+                    "url": f"https://example.com/{offset + number}",
+                    "content_summary": random_sentence(rng, vocabulary, rng.randint(30, 60)),
+                    "published_at": now - datetime.timedelta(minutes=offset + number),
+                }
+                for number in range(min(args.chunk_size, args.news - offset))
+            ])
+        db.commit()
+        db.execute(text("ANALYZE politicians"))
+        db.execute(text("ANALYZE news_mentions"))
+        print(f"Seeded {args.politicians} politicians and {args.news} news mentions in "
+              f"{time.perf_counter() - started:.1f}s")
+
+        rare_words = vocabulary[len(WORDS) * 4:]
+        queries = [rng.choice(WORDS) for _ in range(args.queries // 3)]
+        queries += [rng.choice(rare_words) for _ in range(args.queries // 3)]
+        queries += [" ".join(rng.sample(WORDS, 2)) for _ in range(args.queries - len(queries))]
+
+        def ilike(query: str) -> int:
+            conditions = [
+                or_(NewsMention.title.ilike(f"%{word}%"), NewsMention.content_summary.ilike(f"%{word}%"))
+                for word in query.split()
+            ]
+            stmt = (
+                select(NewsMention.id, NewsMention.title)
+                .where(*conditions)
+                .order_by(NewsMention.published_at.desc())
+                .limit(20)
+            )
+            return len(db.execute(stmt).all())
+
+        def tsvector_only(query: str) -> int:
+            stmt = (
+                select(NewsMention.id, NewsMention.title)
+                .where(NewsMention.search_vector.op("@@")(func.websearch_to_tsquery(cast("english", REGCONFIG), query)))
+                .order_by(NewsMention.published_at.desc())
+                .limit(20)
+            )
+            return len(db.execute(stmt).all())
+
+        def fulltext(query: str) -> int:
+            return len(advanced_search(db, query, scope=SearchScope.NEWS, page_size=20).items)
+
+        def filtered(query: str) -> int:
+            page = advanced_search(db, query, scope=SearchScope.NEWS, party="ODM", min_score=50, page_size=20)
+            return len(page.items)
+
+        runners: List[Tuple[str, Callable[[str], int]]] = [
+            ("ILIKE title/summary", ilike),
+            ("tsvector match", tsvector_only),
+            ("ranked full-text", fulltext),
+            ("ranked full-text + filters", filtered),
+        ]
+        for label, run in runners:
+            run(queries[0])
+            samples, results = [], []
+            for query in queries:
+                started = time.perf_counter()
+                results.append(run(query))
+                samples.append((time.perf_counter() - started) * 1000)
+            report(label, samples, results)
+
+        if args.explain:
+            tsquery = "websearch_to_tsquery('english', :q)"
+            plan = db.execute(
+                text(f"EXPLAIN ANALYZE SELECT id FROM news_mentions WHERE search_vector @@ {tsquery}"),
+                {"q": queries[0]},
+            ).scalars().all()
+            print("\n".join(plan))
+
+        if not args.keep:
+            db.execute(delete(Politician).where(Politician.position == MARKER))
+            db.commit()
+            print("Removed seeded rows")
+
+
+if __name__ == "__main__":
+    main()
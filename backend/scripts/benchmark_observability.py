@@ -0,0 +1,109 @@
+"""
+Benchmark the per-request overhead of request instrumentation.
+
+Drives a minimal FastAPI app in process (through ``httpx.ASGITransport``)
+three ways: with no middleware, behind the previous ``BaseHTTPMiddleware``
+request logger (two formatted log lines per request), and behind
+``ObservabilityMiddleware``. Logging is configured at INFO to a null
+handler, so formatting and handler dispatch are paid but no I/O is:
+
+    python scripts/benchmark_observability.py --requests 5000
+"""
+import argparse
+import asyncio
+import logging
+import os
+import statistics
+import sys
+import time
+from pathlib import Path
+from typing import Callable, List
+
+sys.path.insert(0, str(Path(__file__).resolve().parents[1]))
+
+os.environ.setdefault("SECRET_KEY", "benchmark")
+os.environ.setdefault("JWT_SECRET_KEY", "benchmark")
+os.environ.setdefault("DATABASE_URL", "postgresql://localhost/benchmark")
+
+import httpx  # noqa: E402
+from fastapi import FastAPI, Request, Response  # noqa: E402
+from starlette.middleware.base import BaseHTTPMiddleware  # noqa: E402
+
+from app.core.middleware import ObservabilityMiddleware  # noqa: E402
+
+logger = logging.getLogger("benchmark.requests")
+
+
+class PreviousLoggingMiddleware(BaseHTTPMiddleware):
+    """The request logger ObservabilityMiddleware replaced."""
+
+    async def dispatch(self, request: Request, call_next: Callable) -> Response:
+        start_time = time.time()
+        logger.info(f"Request: {request.method} {request.url.path}")
+        response = await call_next(request)
+        process_time = time.time() - start_time
+        response.headers["X-Process-Time"] = str(process_time)
+        logger.info(
+            f"Response: {request.method} {request.url.path} - "
+            f"Status: {response.status_code} - Time: {process_time:.4f}s"
+        )
+        return response
+
+
+def build_app(middleware: type = None) -> FastAPI:
+    app = FastAPI()
+
+    @app.get("/items/{item_id}")
+    async def item(item_id: int):
+        return {"id": item_id}
+
+    if middleware is not None:
+        app.add_middleware(middleware)
+    return app
+
+
+def percentile(samples: List[float], pct: float) -> float:
+    ordered = sorted(samples)
+    return ordered[min(len(ordered) - 1, int(len(ordered) * pct / 100))]
+
+
+async def measure(app: FastAPI, requests: int) -> List[float]:
+    samples = []
+    transport = httpx.ASGITransport(app=app)
+    async with httpx.AsyncClient(transport=transport, base_url="http://benchmark") as client:
+        for number in range(200):
+            await client.get(f"/items/{number}")
+        for number in range(requests):
+            started = time.perf_counter_ns()
+            await client.get(f"/items/{number}")
+            samples.append((time.perf_counter_ns() - started) / 1000)
+    return samples
+
+
+async def run(requests: int) -> None:
+    baseline = None
+    for label, middleware in (
+        ("no middleware", None),
+        ("BaseHTTPMiddleware logger", PreviousLoggingMiddleware),
+        ("ObservabilityMiddleware", ObservabilityMiddleware),
+    ):
+        samples = await measure(build_app(middleware), requests)
+        p50, p99 = percentile(samples, 50), percentile(samples, 99)
+        line = f"{label:<28} mean {statistics.mean(samples):7.1f}  p50 {p50:7.1f}  p99 {p99:7.1f} us"
+        if baseline is None:
+            baseline = (p50, p99)
+        else:
+            line += f"  (+{p50 - baseline[0]:.1f} / +{p99 - baseline[1]:.1f})"
+        print(line)
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--requests", type=int, default=5000)
+    args = parser.parse_args()
+    logging.basicConfig(level=logging.INFO, handlers=[logging.NullHandler()])
+    asyncio.run(run(args.requests))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,139 @@
+"""
+Benchmark login bursts against the latency of unrelated requests.
+
+Serves two otherwise identical login endpoints from one in-process ASGI app:
+one verifies the password with the blocking ``verify_password`` inside an
+``async def`` handler (the pattern hashing replaced), the other awaits
+``verify_password_async`` on the bounded hashing pool. Concurrent logins are
+fired at each while a probe requests a trivial endpoint sharing the same
+event loop every 10ms, timed from when each probe was due. Logins the pool
+sheds (503) are counted.
+
+No database is needed: every login checks one precomputed hash, so only
+hashing and the event loop are measured:
+
+    python scripts/benchmark_password_hashing.py --logins 100 --concurrency 20
+"""
+import argparse
+import asyncio
+import os
+import statistics
+import sys
+import time
+from pathlib import Path
+from typing import List
+
+sys.path.insert(0, str(Path(__file__).resolve().parents[1]))
+
+os.environ.setdefault("SECRET_KEY", "benchmark")
+os.environ.setdefault("JWT_SECRET_KEY", "benchmark")
+os.environ.setdefault("DATABASE_URL", "postgresql://localhost/benchmark")
+
+import httpx  # noqa: E402
+from fastapi import FastAPI, HTTPException  # noqa: E402
+from pydantic import BaseModel  # noqa: E402
+
+from app.core.security import get_password_hash, password_hasher, verify_password, verify_password_async  # noqa: E402
+
+PASSWORD = "correct horse battery staple"
+PROBE_INTERVAL = 0.01
+
+
+class Credentials(BaseModel):
+    password: str
+
+
+def build_app(hashed_password: str) -> FastAPI:
+    app = FastAPI()
+
+    @app.post("/blocking-login")
+    async def blocking_login(credentials: Credentials):
+        if not verify_password(credentials.password, hashed_password):
+            raise HTTPException(status_code=401)
+        return {"ok": True}
+
+    @app.post("/login")
+    async def login(credentials: Credentials):
+        if not await verify_password_async(credentials.password, hashed_password):
+            raise HTTPException(status_code=401)
+        return {"ok": True}
+
+    @app.get("/ping")
+    async def ping():
+        return {"ok": True}
+
+    return app
+
+
+def percentile(samples: List[float], pct: float) -> float:
+    ordered = sorted(samples)
+    return ordered[min(len(ordered) - 1, int(len(ordered) * pct))]
+
+
+async def run(client: httpx.AsyncClient, path: str, logins: int, concurrency: int) -> None:
+    semaphore = asyncio.Semaphore(concurrency)
+    latencies: List[float] = []
+    probe_latencies: List[float] = []
+    shed = 0
+    done = asyncio.Event()
+
+    async def one() -> None:
+        nonlocal shed
+        async with semaphore:
+            start = time.perf_counter()
+            response = await client.post(path, json={"password": PASSWORD})
+            if response.status_code == 503:
+                shed += 1
+                return
+            response.raise_for_status()
+            latencies.append(time.perf_counter() - start)
+
+    async def probe() -> None:
+        # Timed from when each probe was due, so a stalled loop counts
+        # against it just as it would against a request arriving then
+        due = time.perf_counter()
+        while not done.is_set():
+            due += PROBE_INTERVAL
+            await asyncio.sleep(max(0.0, due - time.perf_counter()))
+            await client.get("/ping")
+            probe_latencies.append(time.perf_counter() - due)
+            due = max(due, time.perf_counter())
+
+    probe_task = asyncio.create_task(probe())
+    start = time.perf_counter()
+    await asyncio.gather(*(one() for _ in range(logins)))
+    elapsed = time.perf_counter() - start
+    done.set()
+    await probe_task
+
+    print(f"{path}: {logins} logins, concurrency {concurrency}, {shed} shed")
+    print(f"  throughput:   {len(latencies) / elapsed:10.1f} logins/s")
+    for label, samples in (("login", latencies), ("/ping", probe_latencies)):
+        if samples:
+            print(
+                f"  {label:<6} p50 {statistics.median(samples) * 1000:8.2f} ms"
+                f"  p95 {percentile(samples, 0.95) * 1000:8.2f} ms"
+                f"  p99 {percentile(samples, 0.99) * 1000:8.2f} ms"
+            )
+
+
+async def main_async(logins: int, concurrency: int) -> None:
+    hashed_password = get_password_hash(PASSWORD)
+    transport = httpx.ASGITransport(app=build_app(hashed_password))
+    async with httpx.AsyncClient(transport=transport, base_url="http://benchmark", timeout=None) as client:
+        for path in ("/blocking-login", "/login"):
+            await run(client, path, logins, concurrency)
+    print(f"hashing pool: {password_hasher.stats()}")
+    password_hasher.shutdown()
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--logins", type=int, default=100)
+    parser.add_argument("--concurrency", type=int, default=20)
+    args = parser.parse_args()
+    asyncio.run(main_async(args.logins, args.concurrency))
+
+
+if __name__ == "__main__":
+    main()
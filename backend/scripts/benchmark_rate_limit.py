@@ -0,0 +1,128 @@
+"""
+Benchmark the per-request overhead of ``RateLimitMiddleware``.
+
+Drives a minimal ASGI app directly (no HTTP server or client, so only the
+middleware's own cost is measured) with and without the middleware in
+front, and reports the added latency per request. Requests carry a bearer
+token for one of ``--users`` users or come anonymously from one of as many
+client IPs. The in-process limiter is always measured; ``--redis-url`` also
+measures the shared Redis limiter (one Lua round trip per request):
+
+    python scripts/benchmark_rate_limit.py --requests 20000 --redis-url redis://localhost:6379/15
+
+Limits are set high enough that no request is refused. Keys written to
+Redis expire within the hour.
+"""
+import argparse
+import asyncio
+import os
+import random
+import statistics
+import sys
+import time
+import uuid
+from pathlib import Path
+from typing import Callable, List
+
+sys.path.insert(0, str(Path(__file__).resolve().parents[1]))
+
+os.environ.setdefault("SECRET_KEY", "benchmark")
+os.environ.setdefault("JWT_SECRET_KEY", "benchmark")
+os.environ.setdefault("DATABASE_URL", "postgresql://localhost/benchmark")
+
+from app.core.middleware import RateLimitMiddleware  # noqa: E402
+from app.core.rate_limit import RateLimiter, RateLimitRule, RedisRateLimitStore, limits  # noqa: E402
+from app.core.security import create_access_token  # noqa: E402
+
+
+def percentile(samples: List[float], pct: float) -> float:
+    ordered = sorted(samples)
+    return ordered[min(len(ordered) - 1, int(len(ordered) * pct / 100))]
+
+
+def report(label: str, samples: List[float]) -> None:
+    print(
+        f"{label:<26} mean {statistics.mean(samples):7.1f}  p50 {percentile(samples, 50):7.1f}  "
+        f"p99 {percentile(samples, 99):7.1f}  max {max(samples):8.1f} us"
+    )
+
+
+async def endpoint(scope, receive, send) -> None:
+    await send({"type": "http.response.start", "status": 200, "headers": [(b"content-type", b"text/plain")]})
+    await send({"type": "http.response.body", "body": b"ok"})
+
+
+async def receive() -> dict:
+    return {"type": "http.request", "body": b"", "more_body": False}
+
+
+async def send(message: dict) -> None:
+    pass
+
+
+def build_scopes(count: int, users: int, seed: int) -> List[dict]:
+    rng = random.Random(seed)
+    tokens = [create_access_token({"sub": str(uuid.uuid4())}) for _ in range(users)]
+    scopes = []
+    for _ in range(count):
+        headers = [(b"host", b"testserver")]
+        if rng.random() < 0.5:
+            headers.append((b"authorization", f"Bearer {rng.choice(tokens)}".encode()))
+        scopes.append({
+            "type": "http",
+            "method": "GET",
+            "path": "/api/v1/politicians",
+            "headers": headers,
+            "client": (f"10.0.{rng.randrange(users) // 256}.{rng.randrange(users) % 256}", 50000),
+        })
+    return scopes
+
+
+async def measure(app: Callable, scopes: List[dict]) -> List[float]:
+    for scope in scopes[:200]:
+        await app(scope, receive, send)
+    samples = []
+    for scope in scopes:
+        started = time.perf_counter_ns()
+        await app(scope, receive, send)
+        samples.append((time.perf_counter_ns() - started) / 1000)
+    return samples
+
+
+async def run(args: argparse.Namespace) -> None:
+    scopes = build_scopes(args.requests, args.users, args.seed)
+    rule = RateLimitRule("benchmark", limits(10**6, 10**7), path_prefix="/api/")
+    baseline = await measure(endpoint, scopes)
+    report("no middleware", baseline)
+    base_p50, base_p99 = percentile(baseline, 50), percentile(baseline, 99)
+
+    limiters = [("in-process limiter", RateLimiter([rule], None, args.users * 4))]
+    client = None
+    if args.redis_url:
+        import redis.asyncio as aioredis
+
+        client = aioredis.from_url(args.redis_url)
+        limiters.append(("redis limiter", RateLimiter([rule], RedisRateLimitStore(client), args.users * 4)))
+
+    for label, limiter in limiters:
+        samples = await measure(RateLimitMiddleware(endpoint, limiter), scopes)
+        report(label, samples)
+        print(
+            f"{'  overhead':<26} p50 {percentile(samples, 50) - base_p50:7.1f}  "
+            f"p99 {percentile(samples, 99) - base_p99:7.1f} us"
+        )
+    if client is not None:
+        await client.aclose()
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--requests", type=int, default=20000)
+    parser.add_argument("--users", type=int, default=5000, help="distinct users and client IPs")
+    parser.add_argument("--redis-url", default="")
+    parser.add_argument("--seed", type=int, default=42)
+    asyncio.run(run(parser.parse_args()))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,175 @@
+"""
+Benchmark the score time series against charting from score_history.
+
+Seeds synthetic politicians with ``--days`` of history at ``--per-day``
+recalculations a day into the database given by ``--database-url``, which
+must already be migrated (``alembic upgrade head``). Each recalculation is
+written the way scoring writes it: a full ``score_history`` row plus
+``append_score_points``. Scores move on roughly ``--change-rate`` of the
+recalculations. The series is then compacted as the retention task would,
+and the script reports:
+
+* the on-disk size of the seeded rows in each table (``pg_column_size``)
+* the latency of a whole-history monthly chart of one politician, read from
+  ``score_history`` (every row, JSONB breakdown included, bucketed in
+  Python) and from ``load_score_series``
+
+The seeded rows are deleted afterwards unless ``--keep`` is given:
+
+    python scripts/benchmark_score_series.py --database-url postgresql://... --politicians 50 --days 1095
+"""
+import argparse
+from collections import defaultdict
+import datetime
+import os
+import random
+import statistics
+import sys
+import time
+import uuid
+from pathlib import Path
+from typing import List
+
+sys.path.insert(0, str(Path(__file__).resolve().parents[1]))
+
+MARKER = "Score Series Benchmark"
+
+
+def percentile(samples: List[float], pct: float) -> float:
+    ordered = sorted(samples)
+    return ordered[min(len(ordered) - 1, int(len(ordered) * pct / 100))]
+
+
+def report(label: str, samples: List[float]) -> None:
+    print(
+        f"{label:<28} mean {statistics.mean(samples):8.2f}  p50 {percentile(samples, 50):8.2f}  "
+        f"p95 {percentile(samples, 95):8.2f}  max {max(samples):8.2f} ms"
+    )
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--database-url", required=True)
+    parser.add_argument("--politicians", type=int, default=50)
+    parser.add_argument("--days", type=int, default=1095)
+    parser.add_argument("--per-day", type=int, default=4, help="recalculations per day")
+    parser.add_argument("--change-rate", type=float, default=0.3, help="share of recalculations that move the score")
+    parser.add_argument("--queries", type=int, default=50)
+    parser.add_argument("--seed", type=int, default=42)
+    parser.add_argument("--keep", action="store_true", help="keep the seeded rows")
+    args = parser.parse_args()
+
+    # app.database builds its engines from settings at import time
+    os.environ.setdefault("DATABASE_URL", args.database_url)
+    from sqlalchemy import create_engine, delete, func, insert, select, text
+    from sqlalchemy.orm import Session
+
+    from app import models  # noqa: F401
+    from app.models.politician import Politician
+    from app.models.score import ScoreHistory, ScoreSeriesPoint, SeriesResolution
+    from app.services.score_series_service import (
+        COMPONENTS,
+        append_score_points,
+        load_score_series,
+        roll_up_score_series,
+    )
+
+    rng = random.Random(args.seed)
+    engine = create_engine(args.database_url)
+    now = datetime.datetime.now(datetime.timezone.utc)
+    start = now - datetime.timedelta(days=args.days)
+    step = datetime.timedelta(days=1) / args.per_day
+
+    with Session(engine) as db:
+        started = time.perf_counter()
+        politician_ids = [uuid.uuid4() for _ in range(args.politicians)]
+        db.execute(insert(Politician), [
+            {"id": politician_id, "name": f"Politician {number}", "position": MARKER, "is_active": True}
+            for number, politician_id in enumerate(politician_ids)
+        ])
+        components = {politician_id: [rng.uniform(30, 70) for _ in COMPONENTS] for politician_id in politician_ids}
+        for tick in range(args.days * args.per_day):
+            calculated_at = start + tick * step
+            rows = []
+            for politician_id in politician_ids:
+                values = components[politician_id]
+                if rng.random() < args.change_rate:
+                    index = rng.randrange(len(values))
+                    values[index] = min(100.0, max(0.0, values[index] + rng.uniform(-5, 5)))
+                breakdown = {name: round(value, 2) for name, value in zip(COMPONENTS, values)}
+                rows.append({
+                    "id": uuid.uuid4(),
+                    "politician_id": politician_id,
+                    "transparency_score": round(sum(breakdown.values()) / len(breakdown), 2),
+                    "score_breakdown": breakdown,
+                    "factors_analyzed": {"legal_cases": 3, "promises": 12, "news_mentions": 40, "credentials": 2},
+                    "calculation_method": "weighted_v1",
+                    "calculated_at": calculated_at,
+                })
+            db.execute(insert(ScoreHistory), rows)
+            append_score_points(db, rows)
+        db.commit()
+        roll_up_score_series(db, now)
+        db.commit()
+        db.execute(text("ANALYZE score_history"))
+        db.execute(text("ANALYZE score_series"))
+        print(
+            f"Seeded {args.politicians} politicians x {args.days} days x {args.per_day} recalculations "
+            f"in {time.perf_counter() - started:.1f}s"
+        )
+
+        def table_size(table: str) -> tuple:
+            return db.execute(
+                text(f"SELECT count(*), coalesce(sum(pg_column_size(t.*)), 0) FROM {table} t "
+                     "WHERE politician_id = ANY(:ids)"),
+                {"ids": politician_ids},
+            ).one()
+
+        history_rows, history_bytes = table_size("score_history")
+        series_rows, series_bytes = table_size("score_series")
+        print(f"score_history  {history_rows:9d} rows  {history_bytes / 1e6:8.2f} MB")
+        print(f"score_series   {series_rows:9d} rows  {series_bytes / 1e6:8.2f} MB  "
+              f"({history_bytes / max(series_bytes, 1):.0f}x smaller)")
+        by_resolution = db.execute(
+            select(ScoreSeriesPoint.resolution, func.count())
+            .where(ScoreSeriesPoint.politician_id.in_(politician_ids))
+            .group_by(ScoreSeriesPoint.resolution)
+        ).all()
+        print("  " + ", ".join(f"{resolution.value}: {count}" for resolution, count in sorted(by_resolution)))
+
+        def from_history(politician_id: uuid.UUID) -> int:
+            rows = db.execute(
+                select(ScoreHistory.calculated_at, ScoreHistory.transparency_score, ScoreHistory.score_breakdown)
+                .where(ScoreHistory.politician_id == politician_id)
+                .order_by(ScoreHistory.calculated_at)
+            ).all()
+            months = defaultdict(list)
+            for calculated_at, score, breakdown in rows:
+                months[(calculated_at.year, calculated_at.month)].append(
+                    (float(score), *(breakdown[name] for name in COMPONENTS))
+                )
+            return len({month: [sum(column) / len(column) for column in zip(*values)] for month, values in months.items()})
+
+        def from_series(politician_id: uuid.UUID) -> int:
+            series = load_score_series(db, politician_id, since=start, until=now, interval=SeriesResolution.MONTH)
+            return len(series.points)
+
+        runners: List[tuple] = [("score_history + JSONB", from_history), ("score series", from_series)]
+        targets = [rng.choice(politician_ids) for _ in range(args.queries)]
+        for label, run in runners:
+            run(targets[0])
+            samples = []
+            for politician_id in targets:
+                began = time.perf_counter()
+                run(politician_id)
+                samples.append((time.perf_counter() - began) * 1000)
+            report(f"monthly chart, {label}", samples)
+
+        if not args.keep:
+            db.execute(delete(Politician).where(Politician.position == MARKER))
+            db.commit()
+            print("Removed seeded rows")
+
+
+if __name__ == "__main__":
+    main()
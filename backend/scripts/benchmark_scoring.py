@@ -0,0 +1,189 @@
+"""
+Benchmark batch transparency scoring against the per-politician path.
+
+Compute-only mode (no database) compares the vectorized formula with a loop
+that scores politicians one at a time:
+
+    python scripts/benchmark_scoring.py --politicians 50000
+
+Database mode seeds synthetic politicians into the given database, times
+``recalculate_scores`` against ``calculate_politician_score`` for each
+politician, and removes the seeded rows afterwards. Never point it at a
+production database:
+
+    python scripts/benchmark_scoring.py --database-url postgresql://... --politicians 2000
+"""
+import argparse
+import random
+import sys
+import time
+import uuid
+from datetime import datetime, timedelta, timezone
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parents[1]))
+
+import numpy as np  # noqa: E402
+from sqlalchemy import create_engine, delete, select  # noqa: E402
+from sqlalchemy.orm import sessionmaker  # noqa: E402
+
+from app.database import Base  # noqa: E402
+from app.models import (  # noqa: E402
+    Politician,
+    LegalCase,
+    CaseStatus,
+    CaseSeverity,
+    Promise,
+    PromiseStatus,
+    NewsMention,
+)
+from app.services.scoring_service import (  # noqa: E402
+    ScoreAggregates,
+    compute_component_scores,
+    compute_transparency_scores,
+    compute_confidence_levels,
+    recalculate_scores,
+    calculate_politician_score,
+)
+
+SEED_PREFIX = "bench-scoring-"
+
+
+def synthetic_aggregates(n: int, rng: np.random.Generator) -> ScoreAggregates:
+    aggregates = ScoreAggregates.empty([uuid.uuid4() for _ in range(n)])
+    aggregates.case_count[:] = rng.poisson(2, n)
+    aggregates.case_deductions[:] = aggregates.case_count * rng.uniform(0, 20, n)
+    aggregates.promise_total[:] = rng.poisson(6, n)
+    aggregates.promise_fulfilled[:] = np.floor(aggregates.promise_total * rng.uniform(0, 0.6, n))
+    aggregates.promise_partial[:] = np.floor(
+        (aggregates.promise_total - aggregates.promise_fulfilled) * rng.uniform(0, 0.5, n)
+    )
+    aggregates.sentiment_count[:] = rng.poisson(15, n)
+    aggregates.sentiment_avg[:] = rng.uniform(-1, 1, n)
+    aggregates.credential_total[:] = rng.integers(0, 5, n)
+    aggregates.credential_verified[:] = np.floor(aggregates.credential_total * rng.uniform(0, 1, n))
+    return aggregates
+
+
+def score_vectorized(aggregates: ScoreAggregates) -> None:
+    components = compute_component_scores(aggregates)
+    compute_transparency_scores(components)
+    compute_confidence_levels(aggregates)
+
+
+def score_one_at_a_time(aggregates: ScoreAggregates) -> None:
+    for i in range(len(aggregates)):
+        single = ScoreAggregates(
+            politician_ids=[aggregates.politician_ids[i]],
+            **{
+                field: getattr(aggregates, field)[i:i + 1]
+                for field in ScoreAggregates.__dataclass_fields__
+                if field != "politician_ids"
+            },
+        )
+        score_vectorized(single)
+
+
+def run_compute_benchmark(n: int) -> None:
+    aggregates = synthetic_aggregates(n, np.random.default_rng(42))
+
+    start = time.perf_counter()
+    score_vectorized(aggregates)
+    vectorized = time.perf_counter() - start
+
+    start = time.perf_counter()
+    score_one_at_a_time(aggregates)
+    per_politician = time.perf_counter() - start
+
+    print(f"compute-only, {n} politicians")
+    print(f"  vectorized:      {vectorized * 1000:10.2f} ms")
+    print(f"  per-politician:  {per_politician * 1000:10.2f} ms")
+    print(f"  speedup:         {per_politician / vectorized:10.1f}x")
+
+
+def seed(session, n: int, rng: random.Random) -> None:
+    now = datetime.now(timezone.utc)
+    for i in range(n):
+        politician = Politician(
+            name=f"{SEED_PREFIX}{i}",
+            position="Member of Parliament",
+            education=[{"degree": "BA", "verified": rng.random() < 0.6} for _ in range(rng.randint(0, 3))],
+        )
+        for _ in range(rng.randint(0, 4)):
+            politician.cases.append(
+                LegalCase(
+                    title="Synthetic case",
+                    status=rng.choice(list(CaseStatus)),
+                    severity=rng.choice(list(CaseSeverity)),
+                    outcome=rng.choice(["guilty", "acquitted", None]),
+                )
+            )
+        for _ in range(rng.randint(0, 8)):
+            politician.promises.append(
+                Promise(
+                    title="Synthetic promise",
+                    description="Synthetic promise",
+                    date_made=now.date(),
+                    status=rng.choice(list(PromiseStatus)),
+                )
+            )
+        for _ in range(rng.randint(0, 20)):
+            politician.news_mentions.append(
+                NewsMention(
+                    title="Synthetic mention",
+                    source="benchmark",
+                    url="https://example.com/",
+                    sentiment=round(rng.uniform(-1, 1), 2),
+                    published_at=now - timedelta(days=rng.randint(0, 120)),
+                )
+            )
+        session.add(politician)
+    session.commit()
+
+
+def run_database_benchmark(database_url: str, n: int) -> None:
+    engine = create_engine(database_url)
+    Base.metadata.create_all(bind=engine)
+    Session = sessionmaker(bind=engine, autoflush=False)
+
+    with Session() as session:
+        seed(session, n, random.Random(42))
+        ids = session.scalars(select(Politician.id).where(Politician.name.like(f"{SEED_PREFIX}%"))).all()
+
+    try:
+        with Session() as session:
+            start = time.perf_counter()
+            recalculate_scores(session, politician_ids=ids)
+            batch = time.perf_counter() - start
+
+        with Session() as session:
+            start = time.perf_counter()
+            for politician in session.scalars(select(Politician).where(Politician.id.in_(ids))):
+                calculate_politician_score(session, politician, commit=False)
+            session.commit()
+            per_politician = time.perf_counter() - start
+
+        print(f"database, {n} politicians")
+        print(f"  batch engine:    {batch * 1000:10.2f} ms")
+        print(f"  per-politician:  {per_politician * 1000:10.2f} ms")
+        print(f"  speedup:         {per_politician / batch:10.1f}x")
+    finally:
+        with Session() as session:
+            session.execute(delete(Politician).where(Politician.id.in_(ids)))
+            session.commit()
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--politicians", type=int, default=10000)
+    parser.add_argument("--database-url", help="Seed and benchmark against this database")
+    args = parser.parse_args()
+
+    if args.database_url:
+        run_database_benchmark(args.database_url, args.politicians)
+    else:
+        run_compute_benchmark(args.politicians)
+
+
+if __name__ == "__main__":
+    main()
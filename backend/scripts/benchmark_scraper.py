@@ -0,0 +1,169 @@
+"""
+Benchmark the news scraper against a local stand-in news server.
+
+Starts an HTTP server on 127.0.0.1, in a separate process, imitating many
+news sites (half RSS feeds, half HTML listing pages with linked article
+pages); each response is delayed to simulate network latency and carries an
+ETag. Then crawls it:
+
+1. one source after another, one request at a time (the naive loop);
+2. every source concurrently with the pooled scraper;
+3. again, with the validators and stored URLs of run 2 (conditional GETs
+   answered 304, known articles skipped).
+
+    python scripts/benchmark_scraper.py --sources 40 --articles 20 --latency 0.05
+"""
+import argparse
+import asyncio
+import hashlib
+import multiprocessing
+import sys
+import time
+from pathlib import Path
+from typing import List, Set, Tuple
+
+sys.path.insert(0, str(Path(__file__).resolve().parents[1]))
+
+from app.services.scraper_service import NewsScraper, NewsSource, SeenUrls, SourceKind  # noqa: E402
+
+
+def render(path: str, articles: int) -> Tuple[str, str]:
+    """Body and content type of a stand-in page."""
+    parts = path.split("?")[0].strip("/").split("/")
+    site = parts[0]
+    if parts[1:] == ["feed.xml"]:
+        items = "".join(
+            f"<item><title>{site} story {i}</title><link>/{site}/articles/{i}?utm_source=rss</link>"
+            f"<description>&lt;p&gt;Summary of {site} story {i}&lt;/p&gt;</description>"
+            f"<pubDate>Mon, 05 Oct 2026 08:{i % 60:02d}:00 GMT</pubDate></item>"
+            for i in range(articles)
+        )
+        return f"<rss><channel>{items}</channel></rss>", "application/rss+xml"
+    if len(parts) == 1:
+        links = "".join(f'<article><a href="/{site}/articles/{i}">Story {i}</a></article>' for i in range(articles))
+        return f"<html><body>{links}<a href='https://elsewhere.test/x'>ad</a></body></html>", "text/html"
+    number = parts[-1]
+    return (
+        f"<html><head><title>{site} {number}</title>"
+        f'<meta property="og:title" content="{site} article {number}">'
+        f'<meta name="description" content="What happened in {site} article {number}.">'
+        f'<meta property="article:published_time" content="2026-10-05T08:00:00+03:00">'
+        f"</head><body><article><p>Body text</p></article></body></html>"
+    ), "text/html"
+
+
+async def handle_connection(reader: asyncio.StreamReader, writer: asyncio.StreamWriter, articles: int, latency: float):
+    """Serve keep-alive HTTP/1.1 GETs on one connection."""
+    try:
+        while True:
+            request_line = await reader.readline()
+            if not request_line:
+                break
+            headers = {}
+            while True:
+                line = await reader.readline()
+                if line in (b"\r\n", b"\n", b""):
+                    break
+                name, _, value = line.decode("latin-1").partition(":")
+                headers[name.strip().lower()] = value.strip()
+            await asyncio.sleep(latency)
+
+            body, content_type = render(request_line.split()[1].decode(), articles)
+            payload = body.encode()
+            etag = '"' + hashlib.md5(payload).hexdigest() + '"'
+            if headers.get("if-none-match") == etag:
+                status, payload = "304 Not Modified", b""
+            else:
+                status = "200 OK"
+            writer.write(
+                f"HTTP/1.1 {status}\r\nContent-Type: {content_type}\r\nETag: {etag}\r\n"
+                f"Content-Length: {len(payload)}\r\n\r\n".encode() + payload
+            )
+            await writer.drain()
+    except ConnectionError:
+        pass
+    finally:
+        writer.close()
+
+
+def serve(articles: int, latency: float, ports: "multiprocessing.Queue[int]") -> None:
+    """Run the stand-in news server (in its own process)."""
+    async def main() -> None:
+        server = await asyncio.start_server(
+            lambda reader, writer: handle_connection(reader, writer, articles, latency), "127.0.0.1", 0, backlog=1024
+        )
+        ports.put(server.sockets[0].getsockname()[1])
+        await server.serve_forever()
+
+    asyncio.run(main())
+
+
+def build_sources(base_url: str, count: int, concurrency: int, rate: float) -> List[NewsSource]:
+    sources = []
+    for number in range(count):
+        feed = number % 2 == 0
+        sources.append(NewsSource(
+            name=f"site{number}",
+            url=f"{base_url}/site{number}/feed.xml" if feed else f"{base_url}/site{number}",
+            kind=SourceKind.FEED if feed else SourceKind.HTML,
+            max_concurrency=concurrency,
+            requests_per_second=rate,
+        ))
+    return sources
+
+
+async def run(args: argparse.Namespace, base_url: str) -> None:
+    stored: Set[str] = set()
+
+    async def confirm(urls: List[str]) -> Set[str]:
+        # Stands in for the database lookup
+        return {url for url in urls if url in stored}
+
+    sequential_sources = build_sources(base_url, args.sources, 1, args.rate)
+    async with NewsScraper(sequential_sources, seen=SeenUrls(100000, confirm=confirm)) as scraper:
+        started = time.perf_counter()
+        count = 0
+        for source in sequential_sources:
+            count += len(await scraper.scrape_source(source))
+        sequential_seconds = time.perf_counter() - started
+    print(f"sequential:  {count} articles, {scraper.report.requests} requests in {sequential_seconds:.2f}s")
+
+    sources = build_sources(base_url, args.sources, args.concurrency, args.rate)
+    seen = SeenUrls(100000, confirm=confirm)
+    async with NewsScraper(sources, seen=seen) as scraper:
+        report = await scraper.scrape()
+        print(
+            f"concurrent:  {len(report.articles)} articles, {report.requests} requests in "
+            f"{report.elapsed_seconds:.2f}s ({sequential_seconds / report.elapsed_seconds:.1f}x faster)"
+        )
+        stored.update(article.url for article in report.articles)
+
+        report = await scraper.scrape()
+        print(
+            f"second pass: {len(report.articles)} articles, {report.requests} requests "
+            f"({report.not_modified} not modified, {report.skipped_seen} already stored) in "
+            f"{report.elapsed_seconds:.2f}s"
+        )
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--sources", type=int, default=40)
+    parser.add_argument("--articles", type=int, default=20, help="articles per source")
+    parser.add_argument("--latency", type=float, default=0.05, help="seconds added to every response")
+    parser.add_argument("--concurrency", type=int, default=4, help="requests in flight per source")
+    parser.add_argument("--rate", type=float, default=50.0, help="requests per second per source")
+    args = parser.parse_args()
+
+    # The server runs in its own process so it does not compete with the scraper for the GIL
+    ports: "multiprocessing.Queue[int]" = multiprocessing.Queue()
+    server = multiprocessing.Process(target=serve, args=(args.articles, args.latency, ports), daemon=True)
+    server.start()
+    try:
+        asyncio.run(run(args, f"http://127.0.0.1:{ports.get(timeout=10)}"))
+    finally:
+        server.terminate()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,142 @@
+"""
+Benchmark autocomplete on the in-memory search index.
+
+Builds an index of synthetic politicians, cases and promises (no database),
+then replays typing: every prefix of each sampled query is searched, as an
+autocomplete box would on each keystroke. A share of the queries carry a
+typo. Also times building the index against restoring it from a snapshot:
+
+    python scripts/benchmark_search.py --politicians 20000 --queries 2000
+"""
+import argparse
+import os
+import random
+import statistics
+import string
+import sys
+import tempfile
+import time
+import uuid
+from pathlib import Path
+from typing import List
+
+sys.path.insert(0, str(Path(__file__).resolve().parents[1]))
+
+from app.services.search_service import SearchDocument, SearchIndex, SearchKind  # noqa: E402
+
+PARTIES = ["UDA", "ODM", "Jubilee", "Wiper", "ANC", "Ford Kenya", "DAP-K", "KANU", "Independent"]
+COUNTIES = [
+    "Nairobi", "Mombasa", "Kisumu", "Nakuru", "Kiambu", "Machakos", "Kakamega", "Uasin Gishu",
+    "Meru", "Kilifi", "Garissa", "Nyeri", "Bungoma", "Kericho", "Turkana", "Migori",
+]
+POSITIONS = ["Senator", "Governor", "Member of Parliament", "MCA", "Woman Representative"]
+SYLLABLES = ["wa", "ki", "mu", "nya", "ja", "ru", "to", "ode", "nga", "ka", "li", "mo", "chi", "be", "ri", "so"]
+SUBJECTS = [
+    "road", "hospital", "school", "water", "electricity", "market", "procurement", "tender",
+    "bursary", "housing", "fraud", "land", "audit", "stadium", "dam", "jobs", "youth", "fund",
+]
+
+
+def random_name(rng: random.Random) -> str:
+    return " ".join(
+        "".join(rng.choice(SYLLABLES) for _ in range(rng.randint(2, 4))).capitalize()
+        for _ in range(rng.randint(2, 3))
+    )
+
+
+def random_title(rng: random.Random) -> str:
+    return " ".join(rng.choice(SUBJECTS) for _ in range(rng.randint(3, 6))).capitalize()
+
+
+def build_documents(politicians: int, rng: random.Random) -> List[SearchDocument]:
+    documents = []
+    for _ in range(politicians):
+        politician_id = uuid.uuid4()
+        documents.append(SearchDocument(
+            kind=SearchKind.POLITICIAN,
+            id=politician_id,
+            politician_id=politician_id,
+            fields={
+                "name": random_name(rng),
+                "party": rng.choice(PARTIES),
+                "county": rng.choice(COUNTIES),
+                "position": rng.choice(POSITIONS),
+            },
+        ))
+        for kind in (SearchKind.CASE, SearchKind.PROMISE):
+            for _ in range(rng.randint(0, 3)):
+                documents.append(SearchDocument(
+                    kind=kind, id=uuid.uuid4(), politician_id=politician_id, fields={"title": random_title(rng)}
+                ))
+    return documents
+
+
+def add_typo(word: str, rng: random.Random) -> str:
+    position = rng.randrange(len(word))
+    return word[:position] + rng.choice(string.ascii_lowercase) + word[position + 1:]
+
+
+def percentile(samples: List[float], pct: float) -> float:
+    ordered = sorted(samples)
+    return ordered[min(len(ordered) - 1, int(len(ordered) * pct / 100))]
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--politicians", type=int, default=20000)
+    parser.add_argument("--queries", type=int, default=2000)
+    parser.add_argument("--typo-rate", type=float, default=0.2)
+    parser.add_argument("--seed", type=int, default=42)
+    args = parser.parse_args()
+
+    rng = random.Random(args.seed)
+    documents = build_documents(args.politicians, rng)
+
+    started = time.perf_counter()
+    index = SearchIndex()
+    for document in documents:
+        index.add(document)
+    build_seconds = time.perf_counter() - started
+    print(f"Indexed {len(index)} documents in {build_seconds:.2f}s")
+
+    with tempfile.TemporaryDirectory() as directory:
+        path = os.path.join(directory, "search.idx")
+        started = time.perf_counter()
+        index.snapshot(path)
+        snapshot_seconds = time.perf_counter() - started
+        started = time.perf_counter()
+        restored = SearchIndex()
+        restored.restore(path)
+        restore_seconds = time.perf_counter() - started
+        size_mb = os.path.getsize(path) / 1e6
+    print(f"Snapshot {size_mb:.1f}MB written in {snapshot_seconds:.2f}s, restored in {restore_seconds:.2f}s")
+
+    politicians = [document for document in documents if document.kind == SearchKind.POLITICIAN]
+    latencies = []
+    typo_queries = typo_hits = 0
+    for _ in range(args.queries):
+        target = rng.choice(politicians)
+        words = target.fields["name"].lower().split()
+        typo = rng.random() < args.typo_rate
+        if typo:
+            words[-1] = add_typo(words[-1], rng)
+            typo_queries += 1
+        query = " ".join(words)
+        for length in range(1, len(query) + 1):
+            started = time.perf_counter()
+            hits = index.search(query[:length], limit=10)
+            latencies.append((time.perf_counter() - started) * 1000)
+        if typo and any(hit.document.id == target.id for hit in hits):
+            typo_hits += 1
+
+    print(f"{len(latencies)} keystrokes over {args.queries} queries")
+    print(
+        f"latency ms: mean {statistics.mean(latencies):.3f}  p50 {percentile(latencies, 50):.3f}  "
+        f"p95 {percentile(latencies, 95):.3f}  p99 {percentile(latencies, 99):.3f}  max {max(latencies):.3f}"
+    )
+    if typo_queries:
+        print(f"typo queries finding their target in the top 10: {typo_hits}/{typo_queries}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,113 @@
+"""
+Benchmark the sentiment stage, with no network.
+
+Scores synthetic news summaries (no database, in-memory cache):
+
+1. with the offline lexicon scorer;
+2. with a stand-in API scorer (fixed latency per call plus a little per
+   text) called once per article, the naive approach;
+3. with the same stand-in batched and called concurrently;
+4. again, re-scraped: every text is a cache hit.
+
+    python scripts/benchmark_sentiment.py --articles 5000 --latency 0.4
+"""
+import argparse
+import asyncio
+import random
+import sys
+from pathlib import Path
+from typing import List
+
+sys.path.insert(0, str(Path(__file__).resolve().parents[1]))
+
+from app.services.sentiment_service import (  # noqa: E402
+    LEXICON,
+    LexiconSentimentScorer,
+    SentimentReport,
+    SentimentService,
+)
+from app.utils.redis_client import InMemoryRedis  # noqa: E402
+
+FILLER = [
+    "the", "governor", "county", "senator", "said", "on", "monday", "residents", "of", "project",
+    "budget", "assembly", "in", "a", "statement", "to", "and", "national", "government", "funds",
+]
+
+
+class StandInApiScorer:
+    """Lexicon scores, delivered with the latency of a remote model."""
+
+    name = "stand-in-api"
+
+    def __init__(self, latency: float, per_text: float):
+        self.latency = latency
+        self.per_text = per_text
+        self.lexicon = LexiconSentimentScorer()
+        self.calls = 0
+
+    async def score_batch(self, texts: List[str]) -> List[float]:
+        self.calls += 1
+        await asyncio.sleep(self.latency + self.per_text * len(texts))
+        return await self.lexicon.score_batch(texts)
+
+
+def build_texts(count: int, rng: random.Random) -> List[str]:
+    words = list(LEXICON)
+    texts = []
+    for number in range(count):
+        body = [rng.choice(FILLER) for _ in range(rng.randint(30, 80))]
+        for _ in range(rng.randint(1, 5)):
+            body.insert(rng.randrange(len(body)), rng.choice(words))
+        texts.append(f"Story {number}: " + " ".join(body) + ".")
+    return texts
+
+
+def show(label: str, report: SentimentReport, calls: int = 0) -> None:
+    detail = f", {calls} API calls" if calls else ""
+    print(
+        f"{label:<22} {report.texts} articles in {report.elapsed_seconds:7.2f}s "
+        f"({report.articles_per_second:9.0f} articles/s, {report.cache_hits} cached{detail})"
+    )
+
+
+async def run(args: argparse.Namespace) -> None:
+    texts = build_texts(args.articles, random.Random(args.seed))
+
+    report = SentimentReport()
+    await SentimentService(LexiconSentimentScorer(), batch_size=args.batch_size).score(texts, report)
+    show("lexicon (offline)", report)
+
+    naive_texts = texts[:args.naive_sample]
+    scorer = StandInApiScorer(args.latency, args.per_text)
+    report = SentimentReport()
+    await SentimentService(scorer, batch_size=1, max_concurrency=1).score(naive_texts, report)
+    show("api, one per call", report, scorer.calls)
+
+    scorer = StandInApiScorer(args.latency, args.per_text)
+    service = SentimentService(
+        scorer, cache=InMemoryRedis(), batch_size=args.batch_size, max_concurrency=args.concurrency
+    )
+    report = SentimentReport()
+    await service.score(texts, report)
+    show("api, batched", report, scorer.calls)
+
+    scorer.calls = 0
+    report = SentimentReport()
+    await service.score(texts, report)
+    show("api, re-scraped", report, scorer.calls)
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--articles", type=int, default=5000)
+    parser.add_argument("--naive-sample", type=int, default=50, help="articles scored one call each")
+    parser.add_argument("--latency", type=float, default=0.4, help="seconds per stand-in API call")
+    parser.add_argument("--per-text", type=float, default=0.01, help="extra seconds per text in a call")
+    parser.add_argument("--batch-size", type=int, default=50)
+    parser.add_argument("--concurrency", type=int, default=4)
+    parser.add_argument("--seed", type=int, default=7)
+    asyncio.run(run(parser.parse_args()))
+
+
+if __name__ == "__main__":
+    main()
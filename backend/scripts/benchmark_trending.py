@@ -0,0 +1,133 @@
+"""
+Benchmark the trending engine.
+
+Replays a synthetic month of news mentions (no database) in time order, in
+commit-sized batches, into the trending engine, asking for the top politicians
+once per simulated hour as the endpoint would. Compares the top-K query with
+the naive approach, a decayed sum over every mention of the last
+``--window-days`` (a vectorized scan standing in for a query on the news
+table), and checks both rank the same politicians:
+
+    python scripts/benchmark_trending.py --politicians 2000 --mentions 1000000
+
+Pass ``--redis-url`` to replay into Redis sorted sets instead of in-process
+counters.
+"""
+import argparse
+from datetime import datetime, timezone
+import random
+import sys
+import time
+import uuid
+from pathlib import Path
+
+import numpy as np
+
+sys.path.insert(0, str(Path(__file__).resolve().parents[1]))
+
+from app.services.trending_service import (  # noqa: E402
+    InProcessTrendingStore,
+    RedisTrendingStore,
+    TrendingEngine,
+    TrendingEvent,
+)
+
+START = datetime(2024, 6, 1, tzinfo=timezone.utc)
+MONTH_SECONDS = 30 * 24 * 3600
+
+
+def build_mentions(politicians: int, mentions: int, rng: np.random.Generator):
+    """Mention times (sorted epoch seconds) and politician indexes, with Zipf popularity and bursts."""
+    popularity = 1.0 / np.arange(1, politicians + 1) ** 1.1
+    rng.shuffle(popularity)
+    times = np.sort(rng.uniform(0, MONTH_SECONDS, mentions))
+    who = rng.choice(politicians, size=mentions, p=popularity / popularity.sum())
+    # A few politicians are in the news for a day or two
+    for _ in range(20):
+        burst_start = rng.uniform(0, MONTH_SECONDS)
+        in_burst = (times >= burst_start) & (times < burst_start + rng.uniform(1, 2) * 86400)
+        who[in_burst & (rng.random(mentions) < 0.2)] = rng.integers(politicians)
+    return times + START.timestamp(), who
+
+
+def naive_top(times: np.ndarray, who: np.ndarray, now: float, politicians: int, k: int, decay_rate: float, window: float):
+    since = np.searchsorted(times, now - window)
+    until = np.searchsorted(times, now, side="right")
+    weights = np.exp(-decay_rate * (now - times[since:until]))
+    totals = np.bincount(who[since:until], weights=weights, minlength=politicians)
+    best = np.argsort(-totals)[:k]
+    return [int(index) for index in best if totals[index] > 0]
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--politicians", type=int, default=2000)
+    parser.add_argument("--mentions", type=int, default=1_000_000)
+    parser.add_argument("--batch", type=int, default=200, help="mentions per commit")
+    parser.add_argument("--top", type=int, default=10)
+    parser.add_argument("--half-life-hours", type=float, default=24.0)
+    parser.add_argument("--window-days", type=float, default=14.0, help="mentions the naive query scans")
+    parser.add_argument("--redis-url", default="")
+    parser.add_argument("--seed", type=int, default=7)
+    args = parser.parse_args()
+
+    rng = np.random.default_rng(args.seed)
+    times, who = build_mentions(args.politicians, args.mentions, rng)
+    ids = [uuid.UUID(int=random.Random(args.seed + index).getrandbits(128)) for index in range(args.politicians)]
+    index_of = {politician_id: index for index, politician_id in enumerate(ids)}
+    print(f"{args.politicians} politicians, {args.mentions} mentions over 30 days")
+
+    if args.redis_url:
+        import redis
+
+        client = redis.Redis.from_url(args.redis_url)
+        client.delete("trending:scores", "trending:landmark", "trending:last_scores")
+        store = RedisTrendingStore(client)
+    else:
+        store = InProcessTrendingStore()
+    engine = TrendingEngine(store, args.half_life_hours)
+    window = args.window_days * 86400
+
+    record_seconds = 0.0
+    query_seconds = 0.0
+    naive_seconds = 0.0
+    queries = 0
+    mismatches = 0
+    next_query = times[0] + 3600
+    for start in range(0, len(times), args.batch):
+        batch_times = times[start:start + args.batch].tolist()
+        batch_who = who[start:start + args.batch].tolist()
+        now = datetime.fromtimestamp(batch_times[-1], timezone.utc)
+        events = [
+            TrendingEvent(ids[index], datetime.fromtimestamp(at, timezone.utc), 1.0)
+            for at, index in zip(batch_times, batch_who)
+        ]
+        started = time.perf_counter()
+        engine.record(events, now=now)
+        record_seconds += time.perf_counter() - started
+
+        if batch_times[-1] >= next_query:
+            next_query += 3600
+            queries += 1
+            started = time.perf_counter()
+            top = engine.top(args.top, now=now)
+            query_seconds += time.perf_counter() - started
+            started = time.perf_counter()
+            expected = naive_top(
+                times, who, batch_times[-1], args.politicians, args.top, engine.decay_rate, window
+            )
+            naive_seconds += time.perf_counter() - started
+            if [index_of[politician_id] for politician_id, _ in top][:3] != expected[:3]:
+                mismatches += 1
+
+    print(f"replay:           {args.mentions / record_seconds:10.0f} mentions/s (batches of {args.batch})")
+    print(f"top-{args.top} query:     {query_seconds / queries * 1e6:10.1f}us ({queries} hourly queries)")
+    print(
+        f"naive scan:       {naive_seconds / queries * 1e6:10.1f}us "
+        f"({naive_seconds / query_seconds:.0f}x slower, over {args.window_days:g} days of mentions)"
+    )
+    print(f"top-3 disagreements with the scan: {mismatches}/{queries}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,53 @@
+"""
+Shared fixtures.
+
+Settings are read once, when ``app`` is first imported, so the environment
+is set up here before any test module imports it. Tests that need a database
+run against ``TEST_DATABASE_URL`` (a Postgres database whose tables are
+emptied after every test, never a database holding real data) and are
+skipped when it is unreachable. Redis is replaced by its in-process stand-in
+and Celery runs tasks eagerly.
+"""
+import os
+
+os.environ.setdefault("SECRET_KEY", "test-secret")
+os.environ.setdefault("JWT_SECRET_KEY", "test-jwt-secret")
+os.environ.setdefault(
+    "DATABASE_URL", os.environ.get("TEST_DATABASE_URL", "postgresql://postgres@localhost:5432/ketu_test")
+)
+os.environ.setdefault("REDIS_URL", "memory://")
+os.environ.setdefault("CELERY_TASK_ALWAYS_EAGER", "true")
+os.environ.setdefault("RATE_LIMIT_ENABLED", "false")
+
+import pytest  # noqa: E402
+from sqlalchemy import inspect, text  # noqa: E402
+from sqlalchemy.exc import OperationalError  # noqa: E402
+
+from app.database import Base, SessionLocal, engine, init_db  # noqa: E402
+
+
+@pytest.fixture(scope="session")
+def database():
+    """The test database, created from the models if it is empty."""
+    try:
+        with engine.connect() as conn:
+            empty = not inspect(conn).has_table("politicians")
+    except OperationalError as exc:
+        pytest.skip(f"test database unavailable: {exc.orig}")
+    if empty:
+        init_db()
+    return engine
+
+
+@pytest.fixture
+def db(database):
+    """A session on the test database; every table is emptied afterwards."""
+    session = SessionLocal()
+    try:
+        yield session
+    finally:
+        session.rollback()
+        session.close()
+        tables = ", ".join(table.name for table in Base.metadata.sorted_tables)
+        with database.begin() as conn:
+            conn.execute(text(f"TRUNCATE {tables} CASCADE"))
@@ -0,0 +1,70 @@
+"""Builders for model rows with just enough fields filled in to be valid."""
+from datetime import date, datetime, timezone
+from itertools import count
+from typing import Any
+
+from sqlalchemy.orm import Session
+
+from app.models import FlaggedReport, LegalCase, NewsMention, Politician, Promise, PromiseStatus
+
+_sequence = count(1)
+
+
+def make_politician(db: Session, **fields: Any) -> Politician:
+    n = next(_sequence)
+    politician = Politician(**{"name": f"Politician {n}", "position": "Member of Parliament", **fields})
+    db.add(politician)
+    db.flush()
+    return politician
+
+
+def make_case(db: Session, politician: Politician, **fields: Any) -> LegalCase:
+    n = next(_sequence)
+    legal_case = LegalCase(**{"politician_id": politician.id, "title": f"Case {n}", **fields})
+    db.add(legal_case)
+    db.flush()
+    return legal_case
+
+
+def make_promise(db: Session, politician: Politician, **fields: Any) -> Promise:
+    n = next(_sequence)
+    promise = Promise(**{
+        "politician_id": politician.id,
+        "title": f"Promise {n}",
+        "description": "Build a road",
+        "date_made": date(2022, 8, 9),
+        "status": PromiseStatus.PENDING,
+        **fields,
+    })
+    db.add(promise)
+    db.flush()
+    return promise
+
+
+def make_mention(db: Session, politician: Politician, **fields: Any) -> NewsMention:
+    n = next(_sequence)
+    mention = NewsMention(**{
+        "politician_id": politician.id,
+        "title": f"Article {n}",
+        "source": "Daily Nation",
+        "url": f"https://news.example/{n}",
+        "published_at": datetime.now(timezone.utc),
+        **fields,
+    })
+    db.add(mention)
+    db.flush()
+    return mention
+
+
+def make_report(db: Session, politician: Politician, **fields: Any) -> FlaggedReport:
+    n = next(_sequence)
+    report = FlaggedReport(**{
+        "politician_id": politician.id,
+        "issue_type": "fraud",
+        "title": f"Report {n}",
+        "description": "Irregular tender award",
+        **fields,
+    })
+    db.add(report)
+    db.flush()
+    return report
@@ -0,0 +1,53 @@
+"""The Aho-Corasick automaton against a brute-force scan."""
+import random
+
+import pytest
+
+from app.utils.aho_corasick import AhoCorasick
+
+
+def brute_force(patterns, text, separator):
+    matches = []
+    for pattern, value in patterns:
+        start = text.find(pattern)
+        while start >= 0:
+            end = start + len(pattern)
+            if not separator or (
+                (start == 0 or text[start - 1] == separator) and (end == len(text) or text[end] == separator)
+            ):
+                matches.append((start, end, value))
+            start = text.find(pattern, start + 1)
+    return sorted(matches)
+
+
+@pytest.mark.parametrize("separator", [" ", ""])
+def test_matches_agree_with_brute_force(separator):
+    rng = random.Random(7)
+    alphabet = "ab "
+    for _ in range(200):
+        patterns = {"".join(rng.choice(alphabet) for _ in range(rng.randint(1, 5))).strip() for _ in range(8)}
+        patterns = [(pattern, number) for number, pattern in enumerate(sorted(patterns)) if pattern]
+        text = "".join(rng.choice(alphabet) for _ in range(rng.randint(0, 40)))
+        found = list(AhoCorasick(patterns, separator=separator).iter_matches(text))
+        assert sorted(found) == brute_force(patterns, text, separator), (patterns, text)
+        assert [end for _, end, _ in found] == sorted(end for _, end, _ in found)
+
+
+def test_nested_and_overlapping_patterns_all_match():
+    automaton = AhoCorasick([("raila odinga", "full"), ("odinga", "surname"), ("odinga said", "phrase")])
+    assert list(automaton.iter_matches("raila odinga said")) == [
+        (0, 12, "full"),
+        (6, 12, "surname"),
+        (6, 17, "phrase"),
+    ]
+
+
+def test_only_whole_words_match():
+    automaton = AhoCorasick([("moi", 1)])
+    assert [match[:2] for match in automaton.iter_matches("moi moiben gideon moi")] == [(0, 3), (18, 21)]
+
+
+def test_empty_patterns_are_ignored():
+    automaton = AhoCorasick([("", 1), ("ruto", 2)])
+    assert len(automaton) == 1
+    assert list(automaton.iter_matches("")) == []
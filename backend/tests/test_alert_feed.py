@@ -0,0 +1,76 @@
+"""Turning committed changes into alert events."""
+import threading
+
+import pytest
+
+from app.core.model_events import unsubscribe
+from app.models import CaseSeverity, CaseStatus, ReportPriority, ReportStatus
+from app.services import alert_feed
+from app.services.alert_feed import REPORT_FLAGGED, REPORT_UPDATED, SCORE_UPDATED
+from app.services.scoring_service import recalculate_scores
+from tests.factories import make_case, make_politician, make_report
+
+
+@pytest.fixture
+def published(monkeypatch):
+    batches = []
+    monkeypatch.setattr(alert_feed, "publish_alerts", batches.append)
+    alert_feed.register_alert_listeners()
+    yield batches
+    unsubscribe(alert_feed._on_model_changes)
+    alert_feed.shutdown_alert_publisher()
+
+
+def alerts(published):
+    # Wait for the publisher thread to drain
+    alert_feed._publisher_executor().submit(lambda: None).result(timeout=5)
+    return [(alert_type, politician_id) for batch in published for alert_type, politician_id, _ in batch]
+
+
+def test_reports_alert_when_flagged_and_when_status_changes(db, published):
+    politician = make_politician(db)
+    report = make_report(db, politician, priority=ReportPriority.HIGH)
+    db.commit()
+    report.status = ReportStatus.RESOLVED
+    db.commit()
+    report.admin_notes = "Called the county office"
+    db.commit()
+
+    assert alerts(published) == [(REPORT_FLAGGED, politician.id), (REPORT_UPDATED, politician.id)]
+    assert published[1][0][2]["changed"] == ["status"]
+
+
+def test_scores_alert_only_when_they_move(db, published):
+    politician = make_politician(db)
+    db.commit()
+
+    recalculate_scores(db, politician_ids=[politician.id])
+    first = alerts(published)
+    assert first == [(SCORE_UPDATED, politician.id)]
+    assert published[0][0][2]["previous_score"] == 0.0
+
+    # Nothing changed: the score is the same
+    recalculate_scores(db, politician_ids=[politician.id])
+    assert alerts(published) == first
+
+    make_case(db, politician, status=CaseStatus.ONGOING, severity=CaseSeverity.CRITICAL)
+    db.commit()
+    recalculate_scores(db, politician_ids=[politician.id])
+    assert alerts(published) == first + [(SCORE_UPDATED, politician.id)]
+    moved = published[-1][0][2]
+    assert moved["transparency_score"] < moved["previous_score"]
+
+
+def test_publishing_happens_off_the_committing_thread(db, monkeypatch):
+    threads = []
+    monkeypatch.setattr(alert_feed, "publish_alerts", lambda batch: threads.append(threading.current_thread()))
+    alert_feed.register_alert_listeners()
+    try:
+        make_report(db, make_politician(db))
+        db.commit()
+        alert_feed._publisher_executor().submit(lambda: None).result(timeout=5)
+    finally:
+        unsubscribe(alert_feed._on_model_changes)
+        alert_feed.shutdown_alert_publisher()
+
+    assert len(threads) == 1 and threads[0] is not threading.current_thread()
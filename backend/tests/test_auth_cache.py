@@ -0,0 +1,92 @@
+"""Principal cache eviction, locally and across processes."""
+import uuid
+
+import pytest
+from sqlalchemy import update
+
+from app.core import auth_cache
+from app.core.auth_cache import (
+    ALL_PRINCIPALS,
+    INVALIDATIONS_CHANNEL,
+    UserPrincipal,
+    _apply_invalidation,
+    _on_model_changes,
+    cache_principal,
+    get_cached_principal,
+    invalidate_principal,
+    principal_cache,
+    register_auth_cache_listeners,
+)
+from app.core.model_events import unsubscribe
+from app.models import User, UserRole
+
+
+@pytest.fixture
+def listeners(database):
+    register_auth_cache_listeners()
+    principal_cache.clear()
+    yield
+    unsubscribe(_on_model_changes)
+    principal_cache.clear()
+
+
+def make_user(db, **fields):
+    user = User(email=f"{uuid.uuid4().hex[:12]}@example.com", hashed_password="x", **fields)
+    db.add(user)
+    db.commit()
+    cache_principal(UserPrincipal.from_user(user))
+    return user
+
+
+def test_committed_role_change_evicts_the_principal(db, listeners):
+    user, other = make_user(db), make_user(db)
+
+    user.full_name = "Renamed"
+    db.commit()
+    assert get_cached_principal(user.id) is not None
+
+    user.role = UserRole.MODERATOR
+    db.flush()
+    assert get_cached_principal(user.id) is not None  # not before commit
+    db.commit()
+    assert get_cached_principal(user.id) is None
+    assert get_cached_principal(other.id) is not None
+
+
+def test_bulk_update_evicts_every_principal(db, listeners):
+    first, second = make_user(db), make_user(db)
+
+    db.execute(update(User).where(User.id == first.id).values(is_active=False))
+    assert get_cached_principal(first.id) is not None
+    db.commit()
+
+    assert get_cached_principal(first.id) is None
+    assert get_cached_principal(second.id) is None
+
+
+def test_invalidations_are_broadcast_when_redis_is_shared(monkeypatch):
+    published = []
+
+    class Client:
+        def publish(self, channel, message):
+            published.append((channel, message))
+
+    monkeypatch.setattr(auth_cache.settings, "redis_url", "redis://cache:6379/0")
+    monkeypatch.setattr(auth_cache, "get_redis", lambda: Client())
+    user_id = uuid.uuid4()
+    invalidate_principal(user_id)
+
+    assert published == [(INVALIDATIONS_CHANNEL, str(user_id))]
+
+
+def test_received_invalidations_evict_locally():
+    principals = [UserPrincipal(uuid.uuid4(), UserRole.USER, True, True) for _ in range(3)]
+    for principal in principals:
+        cache_principal(principal)
+
+    _apply_invalidation(str(principals[0].id))
+    assert get_cached_principal(principals[0].id) is None
+    assert get_cached_principal(principals[1].id) is not None
+
+    _apply_invalidation(ALL_PRINCIPALS)
+    assert len(principal_cache) == 0
@@ -0,0 +1,101 @@
+"""Linking articles to the politicians they mention."""
+from decimal import Decimal
+import uuid
+
+from app.services.entity_linking_service import (
+    EntityLinker,
+    PoliticianEntity,
+    extract_aliases,
+    link_texts,
+)
+
+RUTO = PoliticianEntity(uuid.uuid4(), "William Samoei Ruto", ("Bill",))
+ODINGA = PoliticianEntity(uuid.uuid4(), "Raila Odinga", ("Baba", "@RailaOdinga"))
+UHURU = PoliticianEntity(uuid.uuid4(), "Uhuru Kenyatta")
+JOMO = PoliticianEntity(uuid.uuid4(), "Jomo Kenyatta")
+KIBAKI = PoliticianEntity(uuid.uuid4(), "Mwai Kibaki")
+MOI = PoliticianEntity(uuid.uuid4(), "Gideon Moi")
+
+
+def linker(*entities, **options):
+    return EntityLinker(list(entities or (RUTO, ODINGA, UHURU, JOMO, KIBAKI, MOI)), **options)
+
+
+def linked(links):
+    return {link.politician_id: link for link in links}
+
+
+def test_full_name_first_last_and_unique_surname_link():
+    links = linked(linker().link("Ruto meets Raila", "William Ruto and Kibaki's allies met Raila Odinga."))
+    assert set(links) == {RUTO.id, ODINGA.id, KIBAKI.id}
+    assert links[RUTO.id].mentions == 2
+    assert links[ODINGA.id].mentions == 1
+    assert links[KIBAKI.id].mentions == 1
+
+
+def test_aliases_and_handles_link():
+    links = linked(linker().link("Baba speaks", "He was absent, said @RailaOdinga on X."))
+    assert set(links) == {ODINGA.id}
+    assert links[ODINGA.id].mentions == 2
+
+
+def test_short_single_words_are_not_patterns():
+    assert linker().link("Moi family gathers", "Moi was remembered.") == []
+    assert MOI.id in linked(linker().link("Gideon Moi", None))
+
+
+def test_shared_surname_links_nobody_alone():
+    assert linker().link("Kenyatta family gathers", "Kenyatta was remembered.") == []
+
+
+def test_shared_surname_counts_for_politicians_otherwise_mentioned():
+    links = linked(linker().link("Uhuru Kenyatta campaigns", "He toured Kiambu. Kenyatta promised roads."))
+    assert set(links) == {UHURU.id}
+    assert links[UHURU.id].mentions == 2
+
+
+def test_surname_inside_another_politicians_full_name_is_dropped():
+    mama = PoliticianEntity(uuid.uuid4(), "Ngina Muhoho", ("Kenyatta",))
+    assert set(linked(linker(UHURU, mama).link(None, "Kenyatta spoke."))) == {mama.id}
+    # The alias also appears inside Uhuru's full name, which takes precedence
+    assert set(linked(linker(UHURU, mama).link(None, "Uhuru Kenyatta spoke."))) == {UHURU.id}
+
+
+def test_title_mentions_and_early_body_mentions_rank_higher():
+    body = "Raila Odinga opened the clinic. " + "Filler words. " * 40 + "Kibaki sent greetings."
+    links = linker().link("Raila Odinga opens clinic", body)
+    assert [link.politician_id for link in links] == [ODINGA.id, KIBAKI.id]
+    assert links[0].relevance > Decimal("0.5") > links[1].relevance
+
+    late = linker().link(None, "Filler words. " * 40 + "Kibaki sent greetings.")[0]
+    early = linker().link(None, "Kibaki sent greetings. " + "Filler words. " * 40)[0]
+    assert early.relevance > late.relevance
+
+
+def test_relevance_is_bounded_and_quantized():
+    link = linker().link("Mwai Kibaki Kibaki", " ".join(["Mwai Kibaki"] * 30))[0]
+    assert link.relevance == Decimal("1.00")
+    assert link.relevance.as_tuple().exponent == -2
+
+
+def test_min_relevance_filters_passing_mentions():
+    body = "Filler words. " * 40 + "Kibaki sent greetings."
+    assert linker(min_relevance=0.3).link("Roads budget", body) == []
+
+
+def test_no_match_across_title_and_body():
+    assert linker(RUTO).link("Minister William", "Ruto spoke") == linker(RUTO).link(None, "Ruto spoke")
+
+
+def test_extract_aliases_reads_alias_keys_and_handles():
+    aliases = extract_aliases(
+        {"twitter": "https://twitter.com/WilliamsRuto", "nicknames": ["Hustler", "Bill"]},
+        {"aka": "Zakayo", "email": "ruto@example.com"},
+    )
+    assert aliases == ("Hustler", "Bill", "Zakayo", "WilliamsRuto")
+
+
+def test_link_texts_matches_linking_each_text():
+    texts = [("Raila Odinga", None), (None, "Gideon Moi and William Ruto"), ("Weather", "Rain")]
+    one_by_one = [linker().link(title, body) for title, body in texts]
+    assert link_texts(linker(), texts, chunk_size=1) == one_by_one
@@ -0,0 +1,169 @@
+"""Streaming evidence uploads into local storage."""
+import io
+import os
+import uuid
+
+import httpx
+import pytest
+from PIL import Image
+
+from app.core.auth_cache import UserPrincipal
+from app.database import async_engine
+from app.dependencies import get_current_active_user
+from app.main import app
+from app.models import FlaggedReport
+from app.models.user import UserRole
+from app.services import storage_service
+from app.services.storage_service import get_storage, shutdown_evidence_workers
+from tests.factories import make_politician, make_report
+
+BOUNDARY = "evidence-boundary"
+PDF = b"%PDF-1.4\n1 0 obj\n<< /Type /Catalog >>\nendobj\ntrailer\n<< /Root 1 0 R >>\n%%EOF\n"
+
+
+def png(size=(40, 30), color="red"):
+    buffer = io.BytesIO()
+    Image.new("RGB", size, color).save(buffer, "PNG")
+    return buffer.getvalue()
+
+
+def multipart(*files):
+    body = b""
+    for filename, content in files:
+        body += (
+            f"--{BOUNDARY}\r\n"
+            f'Content-Disposition: form-data; name="files"; filename="{filename}"\r\n'
+            f"Content-Type: application/octet-stream\r\n\r\n"
+        ).encode() + content + b"\r\n"
+    return body + f"--{BOUNDARY}--\r\n".encode()
+
+
+@pytest.fixture
+def storage(tmp_path, monkeypatch):
+    monkeypatch.setattr(storage_service.settings, "storage_local_path", str(tmp_path))
+    get_storage.cache_clear()
+    yield get_storage()
+    get_storage.cache_clear()
+    shutdown_evidence_workers()
+
+
+@pytest.fixture
+def report(db):
+    report = make_report(db, make_politician(db))
+    db.commit()
+    return report
+
+
+@pytest.fixture
+async def client(database, storage):
+    principal = UserPrincipal(id=uuid.uuid4(), role=UserRole.MODERATOR, is_active=True, is_verified=True)
+    app.dependency_overrides[get_current_active_user] = lambda: principal
+    transport = httpx.ASGITransport(app=app)
+    async with httpx.AsyncClient(transport=transport, base_url="http://test") as client:
+        yield client
+    app.dependency_overrides.pop(get_current_active_user)
+    # Its pooled connections belong to this test's event loop
+    await async_engine.dispose()
+
+
+async def upload(client, report, body):
+    return await client.post(
+        f"/api/v1/reports/{report.id}/evidence",
+        content=body,
+        headers={"Content-Type": f"multipart/form-data; boundary={BOUNDARY}"},
+    )
+
+
+def stored_files(storage):
+    return sorted(
+        os.path.relpath(os.path.join(path, name), storage.root)
+        for path, _, names in os.walk(storage.root) for name in names
+    )
+
+
+async def test_every_file_of_an_upload_is_stored_and_attached(db, client, storage, report):
+    image = png()
+    response = await upload(client, report, multipart(("scan.pdf", PDF), ("photo.png", image)))
+    assert response.status_code == 201
+    pdf, photo = response.json()["files"]
+    assert (pdf["content_type"], pdf["size"], pdf["thumbnail_key"]) == ("application/pdf", len(PDF), None)
+    assert (photo["content_type"], photo["width"], photo["height"]) == ("image/png", 40, 30)
+    assert stored_files(storage) == sorted([pdf["key"], photo["key"], photo["thumbnail_key"]])
+    with storage.open(photo["key"]) as handle:
+        assert handle.read() == image
+
+    db.expire_all()
+    assert [entry["sha256"] for entry in db.get(FlaggedReport, report.id).evidence_files] == [
+        pdf["sha256"], photo["sha256"],
+    ]
+
+
+async def test_an_oversized_part_is_refused_mid_stream(db, client, storage, report, monkeypatch):
+    monkeypatch.setattr(storage_service.settings, "max_upload_size", 4096)
+    monkeypatch.setattr(storage_service.settings, "upload_chunk_size", 1024)
+    body = multipart(("huge.png", png()[:64] + os.urandom(64 * 1024)))
+    sent = []
+
+    async def chunks():
+        for start in range(0, len(body), 1024):
+            sent.append(start)
+            yield body[start:start + 1024]
+
+    response = await client.post(
+        f"/api/v1/reports/{report.id}/evidence",
+        content=chunks(),
+        headers={"Content-Type": f"multipart/form-data; boundary={BOUNDARY}"},
+    )
+    assert response.status_code == 413
+    # The rest of the body was never read, and the spooled blocks are gone
+    assert len(sent) < len(body) // 1024
+    assert stored_files(storage) == []
+    db.expire_all()
+    assert db.get(FlaggedReport, report.id).evidence_files is None
+
+
+@pytest.mark.parametrize("filename, content", [("photo.png", PDF), ("notes.pdf", b"plain text, not a PDF\n")])
+async def test_content_not_matching_its_extension_is_refused(db, client, storage, report, filename, content):
+    response = await upload(client, report, multipart((filename, content)))
+    assert response.status_code == 400
+    assert "does not match its extension" in response.json()["detail"]
+    assert stored_files(storage) == []
+
+
+async def test_a_disallowed_extension_is_refused_before_spooling(client, storage, report):
+    response = await upload(client, report, multipart(("run.exe", PDF)))
+    assert response.status_code == 400
+    assert response.json()["detail"].startswith("run.exe: only pdf")
+    assert stored_files(storage) == []
+
+
+async def test_the_same_file_is_stored_and_listed_once(db, client, storage, report):
+    first = await upload(client, report, multipart(("scan.pdf", PDF)))
+    # Again under another name, and twice within one upload
+    second = await upload(client, report, multipart(("copy.pdf", PDF), ("again.pdf", PDF)))
+    assert first.status_code == second.status_code == 201
+    [original] = first.json()["files"]
+    assert [file["filename"] for file in second.json()["files"]] == ["scan.pdf", "scan.pdf"]
+    assert stored_files(storage) == [original["key"]]
+
+    db.expire_all()
+    [entry] = db.get(FlaggedReport, report.id).evidence_files
+    assert entry["sha256"] == original["sha256"]
+
+
+@pytest.mark.parametrize("content_type, body, detail", [
+    (f"multipart/form-data; boundary={BOUNDARY}", b"not a multipart body at all", "Malformed multipart body"),
+    (
+        f"multipart/form-data; boundary={BOUNDARY}",
+        multipart(("scan.pdf", PDF)).replace(b'name="files"; ', b""),
+        'Multipart part without a "name" in its Content-Disposition',
+    ),
+    ("application/json", b'{"files": []}', "Expected a multipart/form-data body"),
+])
+async def test_a_malformed_body_is_a_bad_request(client, storage, report, content_type, body, detail):
+    response = await client.post(
+        f"/api/v1/reports/{report.id}/evidence", content=body, headers={"Content-Type": content_type}
+    )
+    assert response.status_code == 400
+    assert response.json()["detail"] == detail
+    assert stored_files(storage) == []
@@ -0,0 +1,27 @@
+"""Full-text search in Postgres."""
+import pytest
+from sqlalchemy import text
+
+from app.services.fulltext_search_service import SearchScope, advanced_search
+from tests.factories import make_case, make_mention, make_politician, make_promise
+
+
+@pytest.fixture
+def trigram_db(db):
+    if db.execute(text("SELECT 1 FROM pg_extension WHERE extname = 'pg_trgm'")).first() is None:
+        pytest.skip("pg_trgm is not installed in the test database")
+    return db
+
+
+@pytest.mark.parametrize("scope", list(SearchScope))
+def test_deactivated_politicians_and_their_records_are_hidden(trigram_db, scope):
+    db = trigram_db
+    for is_active in (True, False):
+        politician = make_politician(db, name=f"Wanjiku {'Active' if is_active else 'Retired'}", is_active=is_active)
+        make_case(db, politician, title="Wanjiku procurement case")
+        make_promise(db, politician, title="Wanjiku water promise")
+        make_mention(db, politician, title="Wanjiku opens a clinic")
+    db.commit()
+
+    page = advanced_search(db, "Wanjiku", scope=scope)
+    assert [hit.politician.name for hit in page.items] == ["Wanjiku Active"]
@@ -0,0 +1,105 @@
+"""Bulk data import: natural keys and the change feed."""
+import io
+import json
+
+import pytest
+from sqlalchemy import func, select
+
+from app.core.model_events import INSERT, UPDATE, subscribe, unsubscribe
+from app.models import NewsMention, Politician, Promise
+from app.services.import_service import ImportEntity, ImportFormat, import_records
+from tests.factories import make_politician
+
+
+@pytest.fixture
+def changes(database):
+    received = []
+
+    def collect(batch):
+        received.extend(batch)
+
+    subscribe(collect)
+    yield received
+    unsubscribe(collect)
+
+
+def ndjson(*records):
+    return io.BytesIO("".join(json.dumps(record, default=str) + "\n" for record in records).encode())
+
+
+def run_import(db, entity, *records, batch_size=None):
+    return import_records(db, entity, ndjson(*records), ImportFormat.NDJSON, batch_size=batch_size)
+
+
+@pytest.mark.parametrize("batch_size", [None, 1])
+def test_reimporting_a_file_updates_instead_of_duplicating(db, batch_size):
+    politician = make_politician(db, name="Jane Wanjiru")
+    db.commit()
+    records = {
+        ImportEntity.POLITICIANS: [{"name": "John Mbadi", "position": "Senator"}],
+        ImportEntity.PROMISES: [{
+            "politician_name": "Jane Wanjiru", "title": "Tarmac roads", "description": "All wards",
+            "date_made": "2022-08-09",
+        }],
+        ImportEntity.NEWS: [{
+            "politician_id": str(politician.id), "title": "Roads", "source": "Nation",
+            "url": "https://news.example/roads", "published_at": "2024-10-01T08:00:00+00:00",
+        }],
+    }
+    for entity, rows in records.items():
+        first = run_import(db, entity, *rows, batch_size=batch_size)
+        assert (first.inserted, first.updated) == (1, 0)
+        if entity == ImportEntity.NEWS:
+            rows = [dict(row, title="Updated") for row in rows]
+        second = run_import(db, entity, *rows, batch_size=batch_size)
+        assert (second.inserted, second.updated, second.failed) == (0, 1, 0)
+
+    assert db.scalar(select(func.count()).select_from(Politician)) == 2
+    assert db.scalar(select(func.count()).select_from(Promise)) == 1
+    assert db.scalar(select(NewsMention.title)) == "Updated"
+
+
+def test_an_explicit_id_is_matched_before_the_natural_key(db):
+    politician = make_politician(db, name="Jane Wanjiru", position="Senator")
+    db.commit()
+    row = {"id": str(politician.id), "name": "Jane Wanjiru", "position": "Governor"}
+    report = run_import(db, ImportEntity.POLITICIANS, row)
+    assert (report.inserted, report.updated) == (0, 1)
+    db.expire_all()
+    assert db.get(Politician, politician.id).position == "Governor"
+
+
+@pytest.mark.parametrize("batch_size", [None, 1])
+def test_moving_a_row_reports_its_previous_owner(db, changes, batch_size):
+    old_owner = make_politician(db)
+    new_owner = make_politician(db)
+    db.commit()
+    row = {
+        "politician_id": str(old_owner.id), "title": "Roads", "source": "Nation",
+        "url": "https://news.example/roads", "published_at": "2024-10-01T08:00:00+00:00",
+    }
+    run_import(db, ImportEntity.NEWS, row, batch_size=batch_size)
+    mention_id = db.scalar(select(NewsMention.id))
+    changes.clear()
+
+    moved = dict(row, id=str(mention_id), politician_id=str(new_owner.id))
+    run_import(db, ImportEntity.NEWS, moved, batch_size=batch_size)
+    [change] = changes
+    assert change.operation == UPDATE
+    assert change.previous == {"politician_id": old_owner.id}
+    assert set(change.politician_ids()) == {old_owner.id, new_owner.id}
+
+
+def test_rows_matched_on_a_key_including_the_politician_report_no_move(db, changes):
+    politician = make_politician(db)
+    db.commit()
+    changes.clear()
+    row = {
+        "politician_id": str(politician.id), "title": "Roads", "source": "Nation",
+        "url": "https://news.example/roads", "published_at": "2024-10-01T08:00:00+00:00",
+    }
+    run_import(db, ImportEntity.NEWS, row)
+    run_import(db, ImportEntity.NEWS, row)
+    assert [change.operation for change in changes] == [INSERT, UPDATE]
+    assert changes[1].previous == {}
+    assert changes[1].politician_ids() == [politician.id]
@@ -0,0 +1,88 @@
+"""Path queries on the in-memory linkage graph."""
+import math
+import random
+import uuid
+
+import pytest
+
+from app.services.linkage_graph_service import LinkageGraph
+
+
+def build(politicians, links):
+    """A graph of politicians linked to each other by ``(a, b, strength)``."""
+    ids = {name: uuid.uuid4() for name in politicians}
+    graph = LinkageGraph()
+    graph.load(
+        [(politician_id, name) for name, politician_id in ids.items()],
+        [
+            {"id": uuid.uuid4(), "politician_id": ids[a], "linked_entity_id": ids[b], "strength": strength}
+            for a, b, strength in links
+        ],
+    )
+    return graph, ids
+
+
+def path_names(path):
+    return [node.name for node in path.nodes]
+
+
+def test_hop_limit_keeps_a_costlier_but_shorter_route():
+    graph, ids = build("SABT", [("S", "A", 0.5), ("A", "T", 0.5), ("S", "B", 1.0), ("B", "A", 1.0)])
+
+    limited = graph.strongest_path(ids["S"], ids["T"], max_hops=2)
+    assert limited.found
+    assert path_names(limited) == ["S", "A", "T"]
+    assert limited.strength == pytest.approx(0.25)
+
+    unlimited = graph.strongest_path(ids["S"], ids["T"], max_hops=3)
+    assert path_names(unlimited) == ["S", "B", "A", "T"]
+    assert unlimited.strength == pytest.approx(0.5)
+
+
+def test_no_path_within_the_hop_limit():
+    graph, ids = build("SABT", [("S", "A", 0.9), ("A", "B", 0.9), ("B", "T", 0.9)])
+    assert not graph.strongest_path(ids["S"], ids["T"], max_hops=2).found
+    assert graph.strongest_path(ids["S"], ids["T"], max_hops=3).found
+
+
+def best_strength_by_search(links, source, target, max_hops):
+    adjacency = {}
+    for a, b, strength in links:
+        adjacency.setdefault(a, []).append((b, strength))
+        adjacency.setdefault(b, []).append((a, strength))
+    best = 0.0
+
+    def walk(node, product, visited, hops):
+        nonlocal best
+        if node == target:
+            best = max(best, product)
+            return
+        if hops == max_hops:
+            return
+        for neighbour, strength in adjacency.get(node, []):
+            if neighbour not in visited:
+                walk(neighbour, product * strength, visited | {neighbour}, hops + 1)
+
+    walk(source, 1.0, {source}, 0)
+    return best
+
+
+def test_strongest_path_matches_exhaustive_search():
+    rng = random.Random(3)
+    names = [f"P{i}" for i in range(9)]
+    for _ in range(60):
+        links = [
+            (a, b, round(rng.uniform(0.05, 1.0), 2))
+            for i, a in enumerate(names) for b in names[i + 1:] if rng.random() < 0.3
+        ]
+        graph, ids = build(names, links)
+        for max_hops in (1, 2, 3, 4):
+            expected = best_strength_by_search(links, "P0", "P8", max_hops)
+            path = graph.strongest_path(ids["P0"], ids["P8"], max_hops=max_hops)
+            assert path.found == (expected > 0)
+            if path.found:
+                assert path.strength == pytest.approx(expected, abs=1e-6)
+                assert len(path.edges) <= max_hops
+                assert path_names(path)[0] == "P0" and path_names(path)[-1] == "P8"
+                product = math.prod(edge.strength for edge in path.edges)
+                assert product == pytest.approx(expected, abs=1e-6)
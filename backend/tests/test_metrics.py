@@ -0,0 +1,61 @@
+"""The metrics registry and the per-process metrics server."""
+import os
+from urllib.error import HTTPError
+from urllib.request import Request, urlopen
+
+import pytest
+
+from app.core.metrics import MetricsServer, Registry
+
+
+@pytest.fixture
+def metrics():
+    metrics = Registry()
+    metrics.counter("ketu_test_total", "Test events", ["kind"]).inc(labels=("a",))
+    metrics.add_collector(lambda: [("ketu_test_pool", "gauge", "Test pool", {}, 3)])
+    return metrics
+
+
+def scrape(port, token=None):
+    request = Request(f"http://127.0.0.1:{port}/metrics")
+    if token is not None:
+        request.add_header("Authorization", f"Bearer {token}")
+    with urlopen(request, timeout=5) as response:
+        return response.read().decode()
+
+
+def test_constant_labels_are_added_to_every_sample(metrics):
+    metrics.constant_labels["pid"] = "42"
+    text = metrics.render()
+    assert 'ketu_test_total{pid="42",kind="a"} 1' in text
+    assert 'ketu_test_pool{pid="42"} 3' in text
+
+
+def test_server_labels_samples_by_pid_and_requires_the_token(metrics):
+    server = MetricsServer("127.0.0.1", 0, token="secret", metrics=metrics)
+    server.start()
+    try:
+        with pytest.raises(HTTPError) as missing:
+            scrape(server.bound_port)
+        assert missing.value.code == 401
+        with pytest.raises(HTTPError) as wrong:
+            scrape(server.bound_port, "guess")
+        assert wrong.value.code == 401
+        assert f'ketu_test_total{{pid="{os.getpid()}",kind="a"}} 1' in scrape(server.bound_port, "secret")
+    finally:
+        server.stop()
+
+
+def test_each_process_takes_the_next_free_port(metrics):
+    first = MetricsServer("127.0.0.1", 0, metrics=metrics)
+    first.start()
+    try:
+        second = MetricsServer("127.0.0.1", first.bound_port, port_count=2, metrics=metrics)
+        second.start()
+        try:
+            assert second.bound_port == first.bound_port + 1
+            assert "ketu_test_pool" in scrape(second.bound_port)
+        finally:
+            second.stop()
+    finally:
+        first.stop()
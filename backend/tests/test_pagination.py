@@ -0,0 +1,94 @@
+"""Keyset cursor pagination."""
+from datetime import date, datetime, timedelta, timezone
+from decimal import Decimal
+import uuid
+
+import pytest
+from sqlalchemy import select
+
+from app.core.exceptions import BadRequestException
+from app.models import NewsMention, Politician
+from app.services.politician_service import list_politician_news, list_politicians
+from app.utils.pagination import decode_cursor, encode_cursor, keyset_paginate
+from tests.factories import make_mention, make_politician
+
+
+@pytest.mark.parametrize("value", [
+    datetime(2024, 5, 1, 12, 30, tzinfo=timezone.utc),
+    date(2024, 5, 1),
+    Decimal("87.25"),
+    uuid.uuid4(),
+    42,
+    "text",
+])
+def test_cursor_round_trips_sort_values(value):
+    row_id = uuid.uuid4()
+    assert decode_cursor(encode_cursor("sort", value, row_id), "sort") == (value, row_id)
+
+
+@pytest.mark.parametrize("cursor", ["not-a-cursor", "", encode_cursor("published_at", 1, 2)[:-3]])
+def test_malformed_cursors_are_bad_requests(cursor):
+    with pytest.raises(BadRequestException):
+        decode_cursor(cursor, "published_at")
+
+
+def test_cursor_for_another_ordering_is_rejected():
+    with pytest.raises(BadRequestException):
+        decode_cursor(encode_cursor("transparency_score", Decimal("1"), uuid.uuid4()), "published_at")
+
+
+def test_pages_cover_every_row_once_despite_ties(db):
+    # Few distinct scores, so pages must break ties on id
+    for i in range(25):
+        make_politician(db, transparency_score=Decimal(i % 4))
+    db.commit()
+    expected = db.execute(
+        select(Politician.id).order_by(Politician.transparency_score.desc(), Politician.id.desc())
+    ).scalars().all()
+
+    seen, cursor = [], None
+    while True:
+        page = list_politicians(db, cursor=cursor, limit=7)
+        seen.extend(card.id for card in page.items)
+        cursor = page.next_cursor
+        if cursor is None:
+            break
+    assert seen == expected
+
+
+def test_rows_inserted_ahead_of_the_cursor_do_not_shift_later_pages(db):
+    politician = make_politician(db)
+    start = datetime(2024, 1, 1, tzinfo=timezone.utc)
+    for i in range(6):
+        make_mention(db, politician, published_at=start + timedelta(days=i))
+    db.commit()
+
+    first = list_politician_news(db, politician.id, limit=3)
+    make_mention(db, politician, published_at=start + timedelta(days=30))
+    db.commit()
+    second = list_politician_news(db, politician.id, cursor=first.next_cursor, limit=3)
+
+    published = [mention.published_at for mention in first.items + second.items]
+    assert published == sorted(published, reverse=True)
+    assert len(set(published)) == 6
+    assert second.next_cursor is None
+
+
+def test_ascending_order_and_filters(db):
+    politician, other = make_politician(db), make_politician(db)
+    start = datetime(2024, 1, 1, tzinfo=timezone.utc)
+    for i in range(5):
+        make_mention(db, politician, published_at=start + timedelta(hours=i))
+        make_mention(db, other, published_at=start + timedelta(hours=i))
+    db.commit()
+
+    stmt = select(NewsMention).where(NewsMention.politician_id == politician.id)
+    first = keyset_paginate(db, stmt, NewsMention.published_at, NewsMention.id, limit=4, descending=False)
+    rest = keyset_paginate(
+        db, stmt, NewsMention.published_at, NewsMention.id, limit=4, cursor=first.next_cursor, descending=False
+    )
+
+    items = first.items + rest.items
+    assert [mention.published_at for mention in items] == [start + timedelta(hours=i) for i in range(5)]
+    assert {mention.politician_id for mention in items} == {politician.id}
+    assert rest.next_cursor is None
@@ -0,0 +1,73 @@
+"""Two-tier profile cache coherence across workers."""
+from datetime import datetime, timezone
+import threading
+import uuid
+
+from pydantic import BaseModel
+
+from app.services.profile_cache import ProfileCache
+from app.utils.redis_client import InMemoryRedis
+
+
+class Profile(BaseModel):
+    name: str
+    updated_at: datetime
+
+
+def loader_for(name: str, calls: list):
+    def load():
+        calls.append(name)
+        return Profile(name=name, updated_at=datetime(2024, 1, 1, tzinfo=timezone.utc))
+
+    return load
+
+
+def test_other_workers_stop_serving_local_entries_after_an_invalidation():
+    redis = InMemoryRedis()
+    worker_a, worker_b = ProfileCache(redis, local_ttl=60), ProfileCache(redis, local_ttl=60)
+    politician_id = uuid.uuid4()
+    calls = []
+
+    first = worker_a.get(politician_id, loader_for("v1", calls))
+    assert worker_b.get(politician_id, loader_for("unused", calls)).body == first.body
+    assert calls == ["v1"]
+
+    worker_a.invalidate(politician_id)
+    fresh = worker_b.get(politician_id, loader_for("v2", calls))
+
+    assert b"v2" in fresh.body
+    assert fresh.etag != first.etag
+    assert worker_a.get(politician_id, loader_for("unused", calls)).body == fresh.body
+    assert calls == ["v1", "v2"]
+
+
+def test_a_load_finishing_after_an_invalidation_is_not_served():
+    cache = ProfileCache(InMemoryRedis(), local_ttl=60)
+    politician_id = uuid.uuid4()
+    loading, invalidated = threading.Event(), threading.Event()
+
+    def slow_load():
+        loading.set()
+        invalidated.wait(5)
+        return Profile(name="before", updated_at=datetime(2024, 1, 1, tzinfo=timezone.utc))
+
+    loader = threading.Thread(target=cache.get, args=(politician_id, slow_load))
+    loader.start()
+    loading.wait(5)
+    cache.invalidate(politician_id)
+    invalidated.set()
+    loader.join(5)
+
+    calls = []
+    assert b"after" in cache.get(politician_id, loader_for("after", calls)).body
+    assert calls == ["after"]
+
+
+def test_missing_politicians_are_not_cached():
+    cache = ProfileCache(InMemoryRedis())
+    politician_id = uuid.uuid4()
+
+    assert cache.get(politician_id, lambda: None) is None
+    calls = []
+    assert cache.get(politician_id, loader_for("created", calls)) is not None
+    assert calls == ["created"]
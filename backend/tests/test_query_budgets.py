@@ -0,0 +1,89 @@
+"""Query budgets of the named politician loading strategies."""
+from datetime import date
+
+import pytest
+from sqlalchemy import select
+from sqlalchemy.exc import InvalidRequestError
+
+from app.models import FlaggedReport, Politician, PromiseStatus, ScoreHistory
+from app.services.politician_service import get_politician_profile, list_politicians
+from app.utils.query_counter import assert_max_queries, count_queries
+from app.utils.query_options import FULL_PROFILE, LIST_CARD, TIMELINE, politician_loading
+from tests.factories import make_case, make_mention, make_politician, make_promise
+
+
+@pytest.fixture
+def politicians(db):
+    politicians = []
+    for i in range(12):
+        politician = make_politician(db, transparency_score=i, party="ODM" if i % 2 else "UDA")
+        for _ in range(3):
+            make_case(db, politician, date_filed=date(2021, 1, 1))
+            make_promise(db, politician, status=PromiseStatus.IN_PROGRESS)
+            make_mention(db, politician)
+        db.add(ScoreHistory(politician_id=politician.id, transparency_score=i, score_breakdown={}))
+        db.add(FlaggedReport(politician_id=politician.id, issue_type="fraud", title="Report", description="..."))
+        politicians.append(politician)
+    db.commit()
+    ids = [politician.id for politician in politicians]
+    db.expunge_all()
+    return ids
+
+
+def test_assert_max_queries_reports_the_statements_over_budget(db):
+    with pytest.raises(AssertionError, match="Expected at most 1 queries, executed 2"):
+        with assert_max_queries(1):
+            db.execute(select(1))
+            db.execute(select(2))
+
+
+def test_list_card_page_is_one_query(db, politicians):
+    with assert_max_queries(1):
+        page = list_politicians(db, limit=10)
+    assert len(page.items) == 10
+    assert page.next_cursor is not None
+
+    with assert_max_queries(1):
+        list_politicians(db, party="ODM", cursor=page.next_cursor, limit=10)
+
+
+def test_list_card_never_lazy_loads(db, politicians):
+    politician = db.scalars(select(Politician).options(*politician_loading(LIST_CARD)).limit(1)).one()
+    with pytest.raises(InvalidRequestError):
+        politician.cases
+
+
+def test_full_profile_is_six_queries(db, politicians):
+    with assert_max_queries(6):
+        profile = get_politician_profile(db, politicians[0])
+    assert len(profile.cases) == 3
+    assert len(profile.promises) == 3
+
+
+def test_timeline_loads_any_number_of_politicians_in_six_queries(db, politicians):
+    with assert_max_queries(6) as counter:
+        loaded = db.scalars(select(Politician).options(*politician_loading(TIMELINE))).all()
+        entries = [
+            (item.title, moment)
+            for politician in loaded
+            for items, moment_of in (
+                (politician.cases, lambda case: case.date_filed),
+                (politician.promises, lambda promise: promise.date_made),
+                (politician.reports, lambda report: report.date_reported),
+                (politician.news_mentions, lambda mention: mention.published_at),
+            )
+            for item in items
+            for moment in [moment_of(item)]
+        ]
+        scores = [history.transparency_score for politician in loaded for history in politician.score_history]
+    assert counter.count == 6
+    assert len(loaded) == len(politicians)
+    assert len(entries) == len(politicians) * 10
+    assert len(scores) == len(politicians)
+
+
+def test_full_profile_budget_does_not_grow_with_politicians(db, politicians):
+    with count_queries() as counter:
+        loaded = db.scalars(select(Politician).options(*politician_loading(FULL_PROFILE))).all()
+        assert sum(len(politician.linkages) for politician in loaded) == 0
+    assert counter.count == 6
@@ -0,0 +1,73 @@
+"""GCRA rate limiting with the in-process store."""
+import redis
+
+from app.core.rate_limit import (
+    MICROSECONDS,
+    Limit,
+    LocalRateLimitStore,
+    RateLimiter,
+    RateLimitRule,
+    default_rules,
+    gcra,
+)
+
+
+def test_gcra_allows_a_burst_of_count_then_refills_continuously():
+    limits = [Limit(3, 60)]
+    tats, now = [None], 0
+    for remaining in (2, 1, 0):
+        result, tats = gcra(tats, now, limits)
+        assert result.allowed and result.remaining == remaining
+    refused, _ = gcra(tats, now, limits)
+    assert not refused.allowed and refused.retry_after == 20
+    # One emission interval later exactly one more request fits
+    result, _ = gcra(tats, now + 20 * MICROSECONDS, limits)
+    assert result.allowed and result.remaining == 0
+
+
+def test_gcra_reports_the_binding_limit():
+    limits = [Limit(10, 60), Limit(2, 3600)]
+    result, tats = gcra([None, None], 0, limits)
+    assert result.allowed and result.limit == 2 and result.remaining == 1
+    result, tats = gcra(tats, 0, limits)
+    refused, _ = gcra(tats, 0, limits)
+    assert not refused.allowed and refused.limit == 2 and refused.retry_after == 1800
+
+
+def test_local_store_keeps_only_max_keys_and_skips_refused_requests():
+    store = LocalRateLimitStore(max_keys=2)
+    limits = [Limit(1, 60)]
+    assert store.hit(["a"], limits).allowed
+    tat = store._tats["a"]
+    assert not store.hit(["a"], limits).allowed
+    assert store._tats["a"] == tat
+    store.hit(["b"], limits)
+    store.hit(["c"], limits)
+    assert list(store._tats) == ["b", "c"]
+
+
+def test_default_rules_limit_anonymous_auth_posts_separately():
+    limiter = RateLimiter(default_rules())
+    auth = limiter.rule_for("POST", "/api/v1/auth/login", anonymous=True)
+    assert auth is not None and auth.name == "anonymous-auth"
+    assert limiter.rule_for("POST", "/api/v1/auth/login", anonymous=False).name == "api"
+    assert limiter.rule_for("GET", "/api/v1/politicians", anonymous=True).name == "api"
+    assert limiter.rule_for("GET", "/health", anonymous=True) is None
+
+
+class FailingRedisStore:
+    calls = 0
+
+    async def hit(self, keys, limits):
+        self.calls += 1
+        raise redis.ConnectionError("down")
+
+
+async def test_limiter_falls_back_to_the_local_store_when_redis_fails():
+    store = FailingRedisStore()
+    rule = RateLimitRule("test", (Limit(1, 60),))
+    limiter = RateLimiter([rule], redis_store=store)
+    assert (await limiter.hit("ip:1", rule)).allowed
+    assert not (await limiter.hit("ip:1", rule)).allowed
+    # Redis is not retried until rate_limit_redis_retry_seconds have passed
+    assert store.calls == 1
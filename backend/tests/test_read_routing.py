@@ -0,0 +1,119 @@
+"""Routing request sessions between the primary and a read replica."""
+from fastapi import Response
+import pytest
+from sqlalchemy import Column, Integer, String, create_engine, insert, select
+from sqlalchemy.orm import Session, declarative_base
+from starlette.requests import Request
+
+from app import database
+from app.database import READ_REPLICA, REPLICA_PIN_COOKIE, RoutingSession
+
+Base = declarative_base()
+
+
+class Item(Base):
+    __tablename__ = "items"
+
+    id = Column(Integer, primary_key=True)
+    source = Column(String)
+
+
+items = Item.__table__
+
+
+@pytest.fixture
+def engines(tmp_path):
+    """Two SQLite databases whose rows say which one answered."""
+    engines = {}
+    for name in ("primary", "replica"):
+        engine = engines[name] = create_engine(f"sqlite:///{tmp_path / name}.db")
+        Base.metadata.create_all(engine)
+        with engine.begin() as conn:
+            conn.execute(insert(items).values(id=1, source=name))
+    yield engines
+    for engine in engines.values():
+        engine.dispose()
+
+
+@pytest.fixture
+def make_session(engines):
+    class TwoDatabaseSession(RoutingSession):
+        primary = engines["primary"]
+        replicas = [engines["replica"]]
+
+    sessions = []
+
+    def make_session(info):
+        session = TwoDatabaseSession(info=info)
+        sessions.append(session)
+        return session
+
+    yield make_session
+    for session in sessions:
+        session.close()
+
+
+def answered_by(session, statement=None):
+    return session.execute(statement if statement is not None else select(items.c.source)).scalar_one()
+
+
+def test_sessions_read_the_primary_unless_replica_reads_are_enabled(make_session):
+    assert answered_by(make_session({})) == "primary"
+    assert answered_by(make_session({READ_REPLICA: True})) == "replica"
+
+
+def test_locking_reads_and_flushes_go_to_the_primary_and_pin_the_client(make_session):
+    response = Response()
+    session = make_session({READ_REPLICA: True, database.PIN_RESPONSE: response})
+    assert answered_by(session) == "replica"
+    assert answered_by(session, select(items.c.source).with_for_update()) == "primary"
+    # The session now stays on the primary and the client is pinned to it
+    assert answered_by(session) == "primary"
+    assert REPLICA_PIN_COOKIE in response.headers["set-cookie"]
+
+
+def test_a_flush_routes_the_rest_of_the_session_to_the_primary(make_session):
+    response = Response()
+    session = make_session({READ_REPLICA: True, database.PIN_RESPONSE: response})
+    assert answered_by(session) == "replica"
+    session.add(Item(id=2, source="written"))
+    session.flush()
+    assert answered_by(session, select(items.c.source).where(items.c.id == 1)) == "primary"
+    session.commit()
+    with Session(session.primary) as primary:
+        assert primary.get(Item, 2).source == "written"
+    assert REPLICA_PIN_COOKIE in response.headers["set-cookie"]
+
+
+def request(method, cookies=""):
+    headers = [(b"cookie", cookies.encode())] if cookies else []
+    return Request({"type": "http", "method": method, "path": "/", "headers": headers})
+
+
+def test_only_unpinned_safe_requests_read_replicas(engines, monkeypatch):
+    monkeypatch.setattr(database, "replica_engines", [engines["replica"]])
+    response = Response()
+    assert database._routing_info(request("GET"), response)[READ_REPLICA]
+    assert READ_REPLICA not in database._routing_info(request("POST"), response)
+    assert READ_REPLICA not in database._routing_info(request("GET", f"{REPLICA_PIN_COOKIE}=1"), response)
+    monkeypatch.setattr(database, "replica_engines", [])
+    assert database._routing_info(request("GET"), response) == {}
+
+
+def test_a_write_request_reads_the_primary_and_pins_the_client(engines, make_session, monkeypatch):
+    monkeypatch.setattr(database, "replica_engines", [engines["replica"]])
+    response = Response()
+    session = make_session(database._routing_info(request("POST"), response))
+    assert answered_by(session) == "primary"
+    assert "set-cookie" not in response.headers
+    session.add(Item(id=2, source="written"))
+    session.flush()
+    assert REPLICA_PIN_COOKIE in response.headers["set-cookie"]
+
+
+def test_a_pinned_client_that_writes_again_extends_its_pin(engines, make_session, monkeypatch):
+    monkeypatch.setattr(database, "replica_engines", [engines["replica"]])
+    response = Response()
+    session = make_session(database._routing_info(request("DELETE", f"{REPLICA_PIN_COOKIE}=1"), response))
+    session.execute(items.delete().where(items.c.id == 1))
+    assert REPLICA_PIN_COOKIE in response.headers["set-cookie"]
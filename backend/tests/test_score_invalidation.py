@@ -0,0 +1,127 @@
+"""Dirty score components: marking on commit and flushing."""
+import uuid
+
+import pytest
+from sqlalchemy import select
+
+from app.core.model_events import unsubscribe
+from app.models import PromiseStatus, ScoreHistory
+from app.services import score_invalidation
+from app.services.score_invalidation import (
+    InProcessDirtySet,
+    RedisDirtySet,
+    _on_model_changes,
+    flush_dirty_scores,
+    get_dirty_set,
+    register_score_listeners,
+)
+from app.services.scoring_service import recalculate_scores
+from app.utils.redis_client import get_redis
+from tests.factories import make_case, make_politician, make_promise
+
+
+@pytest.fixture
+def dirty_set(database):
+    register_score_listeners()
+    dirty = get_dirty_set()
+    dirty.drain()
+    yield dirty
+    unsubscribe(_on_model_changes)
+    dirty.drain()
+
+
+def latest_scores(db):
+    rows = db.scalars(select(ScoreHistory).order_by(ScoreHistory.calculated_at)).all()
+    return {row.politician_id: row for row in rows}
+
+
+def test_committed_evidence_marks_only_its_component(db, dirty_set):
+    politician = make_politician(db)
+    db.commit()
+    dirty_set.drain()
+
+    make_promise(db, politician, status=PromiseStatus.FULFILLED)
+    assert len(dirty_set) == 0  # nothing is published before commit
+    db.commit()
+
+    assert dirty_set.drain() == {politician.id: {"promise_fulfillment"}}
+
+
+def test_untracked_columns_and_rollbacks_mark_nothing(db, dirty_set):
+    politician = make_politician(db)
+    promise = make_promise(db, politician)
+    db.commit()
+    dirty_set.drain()
+
+    promise.title = "Renamed promise"
+    db.commit()
+    assert dirty_set.drain() == {}
+
+    promise.status = PromiseStatus.BROKEN
+    db.flush()
+    db.rollback()
+    assert dirty_set.drain() == {}
+
+
+def test_moving_a_case_marks_both_politicians(db, dirty_set):
+    first, second = make_politician(db), make_politician(db)
+    legal_case = make_case(db, first)
+    db.commit()
+    dirty_set.drain()
+
+    legal_case.politician_id = second.id
+    db.commit()
+
+    assert dirty_set.drain() == {first.id: {"legal_record"}, second.id: {"legal_record"}}
+
+
+def test_flush_recomputes_dirty_components_and_reuses_the_rest(db, dirty_set):
+    politician = make_politician(db, education=[{"degree": "LLB", "verified": True}])
+    make_promise(db, politician, status=PromiseStatus.FULFILLED)
+    db.commit()
+    recalculate_scores(db)
+    before = latest_scores(db)[politician.id]
+    dirty_set.drain()
+
+    make_promise(db, politician, status=PromiseStatus.BROKEN)
+    db.commit()
+    assert flush_dirty_scores(db, dirty_set) == 1
+
+    after = latest_scores(db)[politician.id]
+    assert after.id != before.id
+    assert before.score_breakdown["promise_fulfillment"] == 100.0
+    assert after.score_breakdown["promise_fulfillment"] == 50.0
+    for component in ("legal_record", "public_sentiment", "credential_verification"):
+        assert after.score_breakdown[component] == before.score_breakdown[component]
+    assert after.factors_analyzed["promises"] == 2
+
+    # The same result as rescoring everything
+    recalculate_scores(db)
+    assert latest_scores(db)[politician.id].transparency_score == after.transparency_score
+    assert flush_dirty_scores(db, dirty_set) == 0
+
+
+def test_failed_flush_requeues_its_marks(db, monkeypatch):
+    dirty = InProcessDirtySet()
+    politician_id = uuid.uuid4()
+    dirty.add_many([(politician_id, "legal_record"), (politician_id, "public_sentiment")])
+
+    def fail(db, dirty):
+        raise RuntimeError("database went away")
+
+    monkeypatch.setattr(score_invalidation, "recalculate_partial_scores", fail)
+    with pytest.raises(RuntimeError):
+        flush_dirty_scores(db, dirty)
+
+    assert dirty.drain() == {politician_id: {"legal_record", "public_sentiment"}}
+
+
+def test_redis_dirty_set_round_trip():
+    dirty = RedisDirtySet(get_redis(), key=f"test:scores:dirty:{uuid.uuid4()}", batch_size=2)
+    first, second = uuid.uuid4(), uuid.uuid4()
+    dirty.add_many([(first, "legal_record"), (first, "promise_fulfillment"), (second, "public_sentiment")])
+    dirty.add_many([(first, "legal_record")])
+
+    assert len(dirty) == 3
+    assert dirty.drain() == {first: {"legal_record", "promise_fulfillment"}, second: {"public_sentiment"}}
+    assert len(dirty) == 0
@@ -0,0 +1,157 @@
+"""Score series: deduplicated writes, rollups and chart resampling."""
+from datetime import datetime, timedelta, timezone
+
+import pytest
+from sqlalchemy import select
+
+from app.models import ScoreSeriesPoint
+from app.models.score import SeriesResolution
+from app.services.score_series_service import (
+    append_score_points,
+    bucket_edges,
+    load_score_series,
+    roll_up_score_series,
+)
+from tests.factories import make_politician
+
+
+def at(*args):
+    return datetime(*args, tzinfo=timezone.utc)
+
+
+def history_row(politician, calculated_at, score, **components):
+    return {
+        "politician_id": politician.id,
+        "calculated_at": calculated_at,
+        "transparency_score": score,
+        "score_breakdown": components,
+    }
+
+
+def series(db, politician, resolution=None):
+    stmt = select(ScoreSeriesPoint).where(ScoreSeriesPoint.politician_id == politician.id)
+    if resolution is not None:
+        stmt = stmt.where(ScoreSeriesPoint.resolution == resolution)
+    return db.scalars(stmt.order_by(ScoreSeriesPoint.period_start)).all()
+
+
+def test_points_repeating_the_latest_values_are_not_written(db):
+    politician = make_politician(db)
+    start = at(2026, 10, 1, 8)
+    # Out of order within a batch: they are compared in calculated_at order
+    added = append_score_points(db, [
+        history_row(politician, start + timedelta(hours=2), 50.004, legal_record=40),
+        history_row(politician, start, 50, legal_record=40),
+        history_row(politician, start + timedelta(hours=1), 50, legal_record=40),
+    ])
+    assert added == 1
+    # A component moving is a new point even though the score did not
+    assert append_score_points(db, [history_row(politician, start + timedelta(hours=3), 50, legal_record=45)]) == 1
+    assert append_score_points(db, [history_row(politician, start + timedelta(hours=4), 50, legal_record=45)]) == 0
+    assert append_score_points(db, [history_row(politician, start + timedelta(hours=5), 55, legal_record=45)]) == 1
+
+    points = series(db, politician)
+    assert [(point.period_start, point.score_last, point.legal_record) for point in points] == [
+        (start, 50, 40), (start + timedelta(hours=3), 50, 45), (start + timedelta(hours=5), 55, 45),
+    ]
+    assert {point.resolution for point in points} == {SeriesResolution.RAW}
+
+
+def test_old_points_roll_up_to_months_merging_into_existing_rollups(db):
+    politician = make_politician(db)
+    db.add(ScoreSeriesPoint(
+        politician_id=politician.id, resolution=SeriesResolution.MONTH, period_start=at(2024, 8, 1),
+        samples=2, score_avg=50, score_min=45, score_max=55, score_last=55, legal_record=20,
+    ))
+    db.flush()
+    append_score_points(db, [
+        history_row(politician, at(2024, 8, 5, 10), 40, legal_record=30),
+        history_row(politician, at(2024, 8, 20, 10), 60, legal_record=50),
+        history_row(politician, at(2024, 9, 10, 10), 70),
+        # Its week starts on Monday 30 September, so it rolls into September
+        history_row(politician, at(2024, 10, 1, 9), 80, legal_record=10),
+        history_row(politician, at(2026, 10, 10, 9), 90, legal_record=10),
+    ])
+
+    rolled = roll_up_score_series(db, now=at(2026, 10, 18, 12))
+    assert rolled == {"raw": 4, "day": 4, "week": 4}
+    db.expire_all()
+
+    august, september = series(db, politician, SeriesResolution.MONTH)
+    assert (august.period_start, september.period_start) == (at(2024, 8, 1), at(2024, 9, 1))
+    assert (august.samples, august.score_min, august.score_max, august.score_last) == (4, 40, 60, 60)
+    assert august.score_avg == pytest.approx(50)
+    assert august.legal_record == pytest.approx(30)
+    assert (september.samples, september.score_min, september.score_max, september.score_last) == (2, 70, 80, 80)
+    assert september.score_avg == pytest.approx(75)
+    # Only the point that had the component counts towards its mean
+    assert september.legal_record == pytest.approx(10)
+
+    assert series(db, politician, SeriesResolution.WEEK) == series(db, politician, SeriesResolution.DAY) == []
+    [recent] = series(db, politician, SeriesResolution.RAW)
+    assert recent.period_start == at(2026, 10, 10, 9)
+
+
+def test_a_late_point_merges_into_its_day_rollup(db):
+    politician = make_politician(db)
+    now = at(2026, 10, 18, 12)
+    append_score_points(db, [
+        history_row(politician, at(2026, 9, 1, 8), 40),
+        history_row(politician, at(2026, 9, 1, 9), 50),
+    ])
+    roll_up_score_series(db, now=now)
+    # Written after its day was rolled up
+    append_score_points(db, [history_row(politician, at(2026, 9, 1, 20), 70)])
+    assert roll_up_score_series(db, now=now)["raw"] == 1
+    db.expire_all()
+
+    [day] = series(db, politician)
+    assert (day.resolution, day.period_start) == (SeriesResolution.DAY, at(2026, 9, 1))
+    assert (day.samples, day.score_min, day.score_max, day.score_last) == (3, 40, 70, 70)
+    assert day.score_avg == pytest.approx(160 / 3)
+
+
+def test_bucket_edges_are_calendar_aligned_and_until_is_exclusive():
+    def edges(since, until, interval):
+        return [datetime.fromtimestamp(int(edge), timezone.utc) for edge in bucket_edges(since, until, interval)]
+
+    assert edges(at(2026, 1, 15, 6), at(2026, 4, 1), SeriesResolution.MONTH) == [
+        at(2026, 1, 1), at(2026, 2, 1), at(2026, 3, 1),
+    ]
+    # 14 January 2026 is a Wednesday
+    assert edges(at(2026, 1, 14), at(2026, 1, 26, 0, 0, 1), SeriesResolution.WEEK) == [
+        at(2026, 1, 12), at(2026, 1, 19), at(2026, 1, 26),
+    ]
+    assert edges(at(2026, 1, 14, 23), at(2026, 1, 16), SeriesResolution.DAY) == [at(2026, 1, 14), at(2026, 1, 15)]
+
+
+@pytest.fixture
+def scored(db):
+    politician = make_politician(db)
+    append_score_points(db, [
+        history_row(politician, at(2026, 9, 2, 8), 50, legal_record=40),
+        history_row(politician, at(2026, 9, 4, 8), 70, legal_record=60),
+        history_row(politician, at(2026, 9, 4, 18), 60),
+    ])
+    db.commit()
+    return politician
+
+
+def test_the_score_is_carried_across_empty_buckets(db, scored):
+    response = load_score_series(db, scored.id, at(2026, 9, 1), at(2026, 9, 6), SeriesResolution.DAY)
+    assert [(point.period_start.day, point.samples, point.score) for point in response.points] == [
+        (1, 0, None), (2, 1, 50), (3, 0, 50), (4, 2, 60), (5, 0, 60),
+    ]
+    empty, first, carried, busy, _ = response.points
+    assert (empty.average, carried.average, carried.minimum) == (None, None, None)
+    assert (busy.average, busy.minimum, busy.maximum) == (65, 60, 70)
+    assert busy.components["legal_record"] == 60
+    assert carried.components["legal_record"] is None
+    assert first.components["legal_record"] == 40
+
+
+def test_a_range_starting_after_a_point_begins_with_its_score(db, scored):
+    response = load_score_series(db, scored.id, at(2026, 9, 3), at(2026, 9, 5), SeriesResolution.DAY)
+    assert [(point.period_start.day, point.samples, point.score) for point in response.points] == [
+        (3, 0, 50), (4, 2, 60),
+    ]
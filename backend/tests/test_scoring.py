@@ -0,0 +1,141 @@
+"""The vectorized scoring engine against the per-politician path."""
+from datetime import datetime, timedelta, timezone
+import uuid
+
+import numpy as np
+import pytest
+from sqlalchemy import select
+from sqlalchemy.orm import selectinload
+
+from app.models import CaseSeverity, CaseStatus, Politician, PromiseStatus, ScoreHistory
+from app.services.scoring_service import (
+    ScoreAggregates,
+    aggregates_from_politician,
+    calculate_politician_score,
+    compute_component_scores,
+    compute_confidence_levels,
+    compute_transparency_scores,
+    load_score_aggregates,
+    recalculate_scores,
+)
+from tests.factories import make_case, make_mention, make_politician, make_promise
+
+
+def random_aggregates(n: int, seed: int = 7) -> ScoreAggregates:
+    rng = np.random.default_rng(seed)
+    aggregates = ScoreAggregates.empty([uuid.uuid4() for _ in range(n)])
+    aggregates.case_count[:] = rng.poisson(2, n)
+    aggregates.case_deductions[:] = aggregates.case_count * rng.uniform(0, 40, n)
+    aggregates.promise_total[:] = rng.poisson(3, n)
+    aggregates.promise_fulfilled[:] = np.floor(aggregates.promise_total * rng.uniform(0, 0.6, n))
+    aggregates.promise_partial[:] = np.floor((aggregates.promise_total - aggregates.promise_fulfilled) * 0.5)
+    aggregates.sentiment_count[:] = rng.poisson(1, n)
+    aggregates.sentiment_avg[:] = np.where(aggregates.sentiment_count > 0, rng.uniform(-1, 1, n), 0)
+    aggregates.credential_total[:] = rng.integers(0, 4, n)
+    aggregates.credential_verified[:] = np.floor(aggregates.credential_total * rng.uniform(0, 1, n))
+    return aggregates
+
+
+def score(aggregates: ScoreAggregates):
+    components = compute_component_scores(aggregates)
+    return components, compute_transparency_scores(components), compute_confidence_levels(aggregates)
+
+
+def test_batch_scores_match_scoring_each_politician_alone():
+    aggregates = random_aggregates(500)
+    components, scores, confidence = score(aggregates)
+
+    for i in range(len(aggregates)):
+        single = ScoreAggregates(
+            politician_ids=[aggregates.politician_ids[i]],
+            **{
+                name: getattr(aggregates, name)[i:i + 1]
+                for name in ScoreAggregates.__dataclass_fields__
+                if name != "politician_ids"
+            },
+        )
+        one_components, one_score, one_confidence = score(single)
+        assert one_score[0] == scores[i]
+        assert one_confidence[0] == confidence[i]
+        for name, values in components.items():
+            assert one_components[name][0] == pytest.approx(values[i])
+
+
+def test_components_without_evidence_are_neutral():
+    components, scores, confidence = score(ScoreAggregates.empty([uuid.uuid4()]))
+
+    assert components["legal_record"][0] == 100.0
+    assert components["promise_fulfillment"][0] == 50.0
+    assert components["public_sentiment"][0] == 50.0
+    assert components["credential_verification"][0] == 50.0
+    assert scores[0] == 65.0
+    assert confidence[0] == 0.0
+
+
+def seed_politicians(db):
+    now = datetime.now(timezone.utc)
+    clean = make_politician(db, education=[{"degree": "LLB", "verified": True}])
+    make_promise(db, clean, status=PromiseStatus.FULFILLED)
+    make_promise(db, clean, status=PromiseStatus.PARTIALLY_FULFILLED)
+    make_mention(db, clean, sentiment=0.6)
+
+    convicted = make_politician(db, education=[{"degree": "MBA", "verified": False}, {"degree": "BA"}])
+    make_case(db, convicted, status=CaseStatus.RESOLVED, outcome=" Guilty ", severity=CaseSeverity.HIGH)
+    make_case(db, convicted, status=CaseStatus.ONGOING, severity=CaseSeverity.CRITICAL)
+    make_case(db, convicted, status=CaseStatus.DISMISSED, severity=CaseSeverity.LOW)
+    make_promise(db, convicted, status=PromiseStatus.BROKEN)
+    make_mention(db, convicted, sentiment=-0.8)
+    # Outside the sentiment window, so ignored
+    make_mention(db, convicted, sentiment=1.0, published_at=now - timedelta(days=365))
+
+    no_evidence = make_politician(db)
+    make_politician(db, is_active=False)
+    db.commit()
+    return [clean, convicted, no_evidence]
+
+
+def test_sql_aggregates_match_orm_aggregates(db):
+    politicians = seed_politicians(db)
+    now = datetime.now(timezone.utc)
+
+    batch = load_score_aggregates(db, now=now)
+    assert sorted(batch.politician_ids) == sorted(p.id for p in politicians)
+    batch_components, batch_scores, batch_confidence = score(batch)
+
+    loaded = db.scalars(
+        select(Politician)
+        .where(Politician.id.in_([p.id for p in politicians]))
+        .options(
+            selectinload(Politician.cases),
+            selectinload(Politician.promises),
+            selectinload(Politician.news_mentions),
+        )
+    ).all()
+    for politician in loaded:
+        i = batch.politician_ids.index(politician.id)
+        components, scores, confidence = score(aggregates_from_politician(politician, now=now))
+        assert scores[0] == batch_scores[i]
+        assert confidence[0] == batch_confidence[i]
+        for name, values in components.items():
+            assert values[0] == pytest.approx(batch_components[name][i])
+
+
+def test_recalculate_scores_writes_the_same_scores_as_one_at_a_time(db):
+    politicians = seed_politicians(db)
+
+    assert recalculate_scores(db) == len(politicians)
+    batch = {row.politician_id: row for row in db.scalars(select(ScoreHistory))}
+    assert len(batch) == len(politicians)
+
+    for politician in politicians:
+        db.refresh(politician)
+        single = calculate_politician_score(db, politician)
+        assert single.transparency_score == batch[politician.id].transparency_score
+        assert single.score_breakdown == batch[politician.id].score_breakdown
+        assert single.factors_analyzed == batch[politician.id].factors_analyzed
+        assert float(politician.transparency_score) == float(single.transparency_score)
+
+    convicted = batch[politicians[1].id]
+    # 100 - 20 (guilty, high) - 35 * 0.5 (ongoing, critical)
+    assert convicted.score_breakdown["legal_record"] == 62.5
+    assert convicted.factors_analyzed["news_mentions"] == 1
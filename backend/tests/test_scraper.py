@@ -0,0 +1,109 @@
+"""The news scraper, against sites served in process by ``httpx.MockTransport``."""
+import httpx
+
+from app.services.scraper_service import NewsScraper, NewsSource, SeenUrls, SourceKind
+
+FEED = b"""<?xml version="1.0"?>
+<rss version="2.0"><channel>
+  <item>
+    <title>Governor opens hospital</title>
+    <link>https://news.example/hospital?utm_source=rss</link>
+    <description>&lt;p&gt;A new wing&lt;/p&gt;</description>
+    <pubDate>Tue, 01 Oct 2024 08:00:00 GMT</pubDate>
+  </item>
+  <item>
+    <title>Governor opens hospital (again)</title>
+    <link>https://news.example/hospital</link>
+  </item>
+  <item><title>Already stored</title><link>https://news.example/stored</link></item>
+</channel></rss>"""
+
+LISTING = b"""<html><body>
+  <article><a href="/senator">Senator</a></article>
+  <article><a href="https://elsewhere.example/ad">Advert</a></article>
+  <article><a href="/untitled">Untitled</a></article>
+</body></html>"""
+
+ARTICLE = b"""<html><head>
+  <meta property="og:title" content="Senator questioned">
+  <meta property="og:description" content="Over the tender">
+  <meta property="article:published_time" content="2024-10-02T09:30:00+03:00">
+</head><body></body></html>"""
+
+
+class Site:
+    """Serves fixed pages, answering conditional GETs with a 304."""
+
+    def __init__(self, pages):
+        self.pages = pages
+        self.requests = []
+
+    def __call__(self, request: httpx.Request) -> httpx.Response:
+        self.requests.append(str(request.url))
+        content = self.pages.get(str(request.url))
+        if content is None:
+            return httpx.Response(404)
+        etag = f'"{hash(content)}"'
+        if request.headers.get("If-None-Match") == etag:
+            return httpx.Response(304)
+        return httpx.Response(200, content=content, headers={"ETag": etag})
+
+
+async def stored(urls):
+    return {url for url in urls if url.endswith("/stored")}
+
+
+def scraper(site, sources, seen=None):
+    client = httpx.AsyncClient(transport=httpx.MockTransport(site))
+    return NewsScraper(sources, seen=seen, client=client, parse_workers=1), client
+
+
+async def test_feed_articles_are_canonicalized_deduplicated_and_checked_against_stored_urls():
+    site = Site({"https://news.example/feed": FEED})
+    seen = SeenUrls(1000, confirm=stored)
+    seen.add_stored("https://news.example/stored")
+    news, client = scraper(site, [NewsSource("example", "https://news.example/feed")], seen)
+    async with client, news:
+        report = await news.scrape()
+    assert [article.url for article in report.articles] == ["https://news.example/hospital"]
+    article = report.articles[0]
+    assert article.title == "Governor opens hospital"
+    assert article.summary == "A new wing"
+    assert article.published_at.isoformat() == "2024-10-01T08:00:00+00:00"
+    assert report.skipped_seen == 1
+
+
+async def test_unchanged_pages_cost_a_304_and_no_articles():
+    site = Site({"https://news.example/feed": FEED})
+    news, client = scraper(site, [NewsSource("example", "https://news.example/feed", requests_per_second=100)])
+    async with client, news:
+        assert (await news.scrape()).articles
+        again = await news.scrape()
+    assert again.articles == [] and again.not_modified == 1
+
+
+async def test_listing_pages_follow_same_site_links_and_skip_untitled_articles():
+    site = Site({
+        "https://news.example/politics": LISTING,
+        "https://news.example/senator": ARTICLE,
+        "https://news.example/untitled": b"<html><body></body></html>",
+    })
+    source = NewsSource("listing", "https://news.example/politics", kind=SourceKind.HTML, requests_per_second=100)
+    news, client = scraper(site, [source])
+    async with client, news:
+        report = await news.scrape()
+    assert "https://elsewhere.example/ad" not in site.requests
+    assert [(article.url, article.title) for article in report.articles] == [
+        ("https://news.example/senator", "Senator questioned"),
+    ]
+    assert report.articles[0].summary == "Over the tender"
+
+
+async def test_a_failing_source_does_not_stop_the_others():
+    site = Site({"https://news.example/feed": FEED})
+    sources = [NewsSource("broken", "https://news.example/missing"), NewsSource("example", "https://news.example/feed")]
+    news, client = scraper(site, sources)
+    async with client, news:
+        report = await news.scrape()
+    assert list(report.errors) == ["broken"]
+    assert report.articles
@@ -0,0 +1,116 @@
+"""The in-memory autocomplete index."""
+from datetime import datetime, timedelta, timezone
+import os
+import uuid
+
+from sqlalchemy import delete, func, select, update
+
+from app.models import LegalCase, Politician, SearchTombstone
+from app.services.search_service import (
+    SearchDocument,
+    SearchIndex,
+    SearchIndexRefresher,
+    SearchKind,
+    prune_search_tombstones,
+)
+from tests.factories import make_case, make_politician, make_promise
+
+
+def politician_document(name: str, **fields: str) -> SearchDocument:
+    politician_id = uuid.uuid4()
+    return SearchDocument(
+        kind=SearchKind.POLITICIAN, id=politician_id, politician_id=politician_id, fields={"name": name, **fields}
+    )
+
+
+def test_prefix_matches_completions_beyond_the_expansion_cap():
+    index = SearchIndex(max_expansions=3)
+    for i in range(10):
+        index.add(politician_document(f"Otieno Chagua{i}"))
+    target = politician_document("Wanjiru Chebet")
+    index.add(target)
+
+    hits = index.search("wanjiru ch")
+    assert [hit.document.id for hit in hits] == [target.id]
+
+
+def test_typo_in_a_word_still_finds_the_document():
+    index = SearchIndex()
+    target = politician_document("Wanjiru Kamau", county="Nyeri")
+    index.add(target)
+    index.add(politician_document("Otieno Odhiambo", county="Kisumu"))
+
+    assert index.search("wanjru nyeri ")[0].document.id == target.id
+
+
+def test_snapshot_round_trip_leaves_no_temporary_files(tmp_path):
+    index = SearchIndex()
+    documents = [politician_document(name) for name in ("Wanjiru Kamau", "Otieno Odhiambo")]
+    for document in documents:
+        index.add(document)
+    path = str(tmp_path / "search.idx")
+
+    index.snapshot(path)
+    index.snapshot(path)
+
+    assert os.listdir(tmp_path) == ["search.idx"]
+    restored = SearchIndex()
+    assert restored.restore(path)
+    assert sorted(restored.keys()) == sorted(document.key for document in documents)
+    assert restored.search("otieno")[0].document.id == documents[1].id
+
+
+def test_refresher_picks_up_rows_written_elsewhere(db):
+    index = SearchIndex()
+    refresher = SearchIndexRefresher(0, index=index)
+    politician = make_politician(db, name="Wanjiru Kamau")
+    politician_id = politician.id
+    db.commit()
+    refresher.refresh_once()
+    assert index.search("wanjiru")[0].document.id == politician_id
+
+    # Written without the model change feed, as by another process
+    case_id = make_case(db, politician, title="Bursary fund audit").id
+    politician.is_active = False
+    db.commit()
+    refresher.refresh_once()
+
+    assert index.get((SearchKind.POLITICIAN, politician_id)) is None
+    assert index.get((SearchKind.CASE, case_id)) is not None
+
+
+def test_refresher_drops_deleted_rows_by_their_tombstones(db):
+    index = SearchIndex()
+    refresher = SearchIndexRefresher(0, index=index)
+    kept = make_politician(db, name="Wanjiru Kamau")
+    removed = make_politician(db, name="Otieno Ouma")
+    case_id = make_case(db, kept, title="Bursary fund audit").id
+    promise_id = make_promise(db, removed, title="Tarmac roads").id
+    db.commit()
+    refresher.refresh_once()
+    assert len(index) == 4
+
+    # Deleted in bulk, by another process; the promise goes by cascade
+    db.execute(delete(LegalCase).where(LegalCase.id == case_id))
+    db.execute(delete(Politician).where(Politician.id == removed.id))
+    db.commit()
+    assert db.scalar(select(func.count()).select_from(SearchTombstone)) == 3
+    refresher.refresh_once()
+
+    assert set(index.keys()) == {(SearchKind.POLITICIAN, kept.id)}
+    assert index.get((SearchKind.PROMISE, promise_id)) is None
+
+
+def test_an_index_older_than_the_tombstones_reloads_in_full(db):
+    index = SearchIndex()
+    politician = make_politician(db, name="Wanjiru Kamau")
+    db.commit()
+    SearchIndexRefresher(0, index=index).refresh_once()
+    db.execute(delete(Politician).where(Politician.id == politician.id))
+    db.execute(update(SearchTombstone).values(deleted_at=datetime.now(timezone.utc) - timedelta(days=30)))
+    db.commit()
+    assert prune_search_tombstones(db) == 1
+
+    index.watermark = datetime.now(timezone.utc) - timedelta(days=30)
+    SearchIndexRefresher(0, index=index).refresh_once()
+    assert len(index) == 0
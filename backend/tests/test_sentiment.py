@@ -0,0 +1,37 @@
+"""The offline lexicon sentiment scorer."""
+import pytest
+
+from app.services.sentiment_service import LexiconSentimentScorer
+
+
+@pytest.fixture
+def scorer():
+    return LexiconSentimentScorer()
+
+
+def test_won_as_a_verb_is_not_a_negation(scorer):
+    assert scorer.score_text("Governor won praise for delivering bursaries") > 0
+
+
+@pytest.mark.parametrize("text", [
+    "The governor won't improve the hospital",
+    "The governor can't improve the hospital",
+    "The governor didn't improve the hospital",
+    "The governor did not improve the hospital",
+])
+def test_negations_flip_valence(scorer, text):
+    assert scorer.score_text("The governor will improve the hospital") > 0
+    assert scorer.score_text(text) < 0
+
+
+def test_intensifiers_scale_and_scores_stay_bounded(scorer):
+    plain = scorer.score_text("corruption")
+    assert scorer.score_text("massive corruption") < plain < 0
+    assert -1 < scorer.score_text(" ".join(["corruption"] * 100)) < -0.99
+    assert scorer.score_text("The committee met on Tuesday") == 0
+
+
+def test_extra_lexicon_words_change_the_cache_name():
+    custom = LexiconSentimentScorer({"harambee": 2.0})
+    assert custom.score_text("harambee") > 0
+    assert custom.name != LexiconSentimentScorer.name
@@ -0,0 +1,195 @@
+"""Celery tasks, run eagerly against the in-process Redis stand-in."""
+import time
+import uuid
+
+from celery.exceptions import MaxRetriesExceededError
+import pytest
+from sqlalchemy import func, select
+
+from app.core.model_events import unsubscribe
+from app.models import ReportPriority, ScoreHistory
+from app.tasks import notification_tasks, scoring_tasks
+from app.tasks.celery_app import QUEUED_KEY, RUNNING_KEY, RedisLease
+from app.utils.redis_client import get_redis
+from tests.factories import make_case, make_politician, make_report
+
+
+@pytest.fixture(autouse=True)
+def redis():
+    client = get_redis()
+    client.flushdb()
+    yield client
+    client.flushdb()
+
+
+def score_rows(db):
+    db.expire_all()
+    return db.scalar(select(func.count()).select_from(ScoreHistory))
+
+
+# Leases
+
+def test_lease_is_exclusive_until_released():
+    lease = RedisLease("lease:test", 10)
+    assert lease.acquire()
+    assert not RedisLease("lease:test", 10).acquire()
+    lease.release()
+    assert RedisLease("lease:test", 10).acquire()
+
+
+def test_lapsed_lease_is_not_renewed_or_released_by_its_old_owner(redis):
+    stale = RedisLease("lease:test", 0.05)
+    assert stale.acquire()
+    time.sleep(0.1)
+    successor = RedisLease("lease:test", 10)
+    assert successor.acquire()
+
+    assert not stale.renew()
+    stale.release()
+    assert redis.get("lease:test") == successor.token.encode()
+
+
+def test_keep_alive_renews_until_released(redis):
+    lease = RedisLease("lease:test", 0.15)
+    assert lease.acquire()
+    lease.keep_alive()
+    time.sleep(0.4)
+    assert redis.get("lease:test") == lease.token.encode()
+    lease.release()
+    assert redis.get("lease:test") is None
+
+
+# Per-politician tasks
+
+def test_enqueue_runs_once_and_clears_its_markers(db, redis):
+    politician = make_politician(db)
+    db.commit()
+    task = scoring_tasks.recalculate_politician_score
+
+    result = task.enqueue(politician.id)
+
+    assert result.get() == 1
+    assert score_rows(db) == 1
+    assert redis.get(QUEUED_KEY.format(task=task.name, politician_id=politician.id)) is None
+    assert redis.get(RUNNING_KEY.format(task=task.name, politician_id=politician.id)) is None
+
+
+def test_enqueue_is_a_no_op_while_queued(db, redis):
+    politician = make_politician(db)
+    db.commit()
+    task = scoring_tasks.recalculate_politician_score
+    redis.set(QUEUED_KEY.format(task=task.name, politician_id=politician.id), "1")
+
+    assert task.enqueue(politician.id) is None
+    assert score_rows(db) == 0
+
+
+def test_exhausted_retries_clear_the_queued_marker(db, redis):
+    politician = make_politician(db)
+    db.commit()
+    task = scoring_tasks.recalculate_politician_score
+    queued_key = QUEUED_KEY.format(task=task.name, politician_id=politician.id)
+    redis.set(queued_key, "1")
+    # Another worker is scoring this politician
+    assert RedisLease(RUNNING_KEY.format(task=task.name, politician_id=politician.id), 60).acquire()
+
+    task.push_request(id="retrying", called_directly=False, is_eager=False, retries=task.max_retries)
+    try:
+        with pytest.raises(MaxRetriesExceededError):
+            task(str(politician.id))
+    finally:
+        task.pop_request()
+
+    assert redis.get(queued_key) is None
+    assert score_rows(db) == 0
+
+
+# Full recalculation
+
+def test_full_recalculation_scores_every_chunk_and_releases_its_lease(db, redis):
+    for _ in range(5):
+        make_case(db, make_politician(db))
+    db.commit()
+
+    summary = scoring_tasks.recalculate_all_scores.delay(chunk_size=2).get()
+
+    assert summary["politicians"] == 5 and summary["chunks"] == 3
+    assert score_rows(db) == 5
+    assert redis.get(scoring_tasks.FULL_RESCORE_KEY) is None
+
+
+def test_overlapping_full_recalculation_is_skipped(db):
+    make_politician(db)
+    db.commit()
+    running = scoring_tasks.full_rescore_lease()
+    assert running.acquire()
+
+    assert scoring_tasks.recalculate_all_scores.delay().get() == {"skipped": True}
+    assert score_rows(db) == 0
+
+
+# Report notifications
+
+@pytest.fixture
+def notified(monkeypatch):
+    report_ids = []
+    monkeypatch.setattr(notification_tasks.notify_report_flagged, "delay", report_ids.append)
+    notification_tasks.register_notification_listeners()
+    yield report_ids
+    unsubscribe(notification_tasks._on_model_changes)
+
+
+def test_urgent_reports_notify_once_committed(db, notified):
+    politician = make_politician(db)
+    urgent = make_report(db, politician, priority=ReportPriority.CRITICAL)
+    make_report(db, politician, priority=ReportPriority.MEDIUM)
+    assert notified == []
+
+    db.commit()
+    assert notified == [str(urgent.id)]
+
+
+def test_escalated_reports_notify(db, notified):
+    politician = make_politician(db)
+    report = make_report(db, politician, priority=ReportPriority.MEDIUM)
+    db.commit()
+
+    report.priority = ReportPriority.LOW
+    db.commit()
+    assert notified == []
+
+    report.priority = ReportPriority.HIGH
+    db.commit()
+    assert notified == [str(report.id)]
+
+
+# Admin endpoint
+
+@pytest.fixture
+def admin_client():
+    from fastapi.testclient import TestClient
+
+    from app.dependencies import get_current_admin_user
+    from app.main import app
+
+    app.dependency_overrides[get_current_admin_user] = lambda: None
+    yield TestClient(app)
+    app.dependency_overrides.pop(get_current_admin_user)
+
+
+def test_admin_can_queue_a_score_recalculation(db, admin_client, redis):
+    politician = make_politician(db)
+    db.commit()
+
+    response = admin_client.post(f"/api/v1/admin/politicians/{politician.id}/score")
+    assert response.status_code == 202
+    assert response.json() == {"politician_id": str(politician.id), "queued": True}
+    assert score_rows(db) == 1
+
+    task = scoring_tasks.recalculate_politician_score
+    redis.set(QUEUED_KEY.format(task=task.name, politician_id=politician.id), "1")
+    assert admin_client.post(f"/api/v1/admin/politicians/{politician.id}/score").json()["queued"] is False
+
+
+def test_queueing_a_missing_politician_is_not_found(database, admin_client):
+    assert admin_client.post(f"/api/v1/admin/politicians/{uuid.uuid4()}/score").status_code == 404
@@ -0,0 +1,100 @@
+"""Timeline paging across sources sharing timestamps and dates."""
+from datetime import date, datetime, timedelta, timezone
+import json
+
+import pytest
+
+from app.models import ScoreHistory
+from app.schemas.timeline import TimelineEventType
+from app.services.timeline_service import stream_timeline
+from tests.factories import make_case, make_mention, make_politician, make_promise, make_report
+
+DAY = date(2024, 10, 1)
+MIDNIGHT = datetime(2024, 10, 1, tzinfo=timezone.utc)
+NOON = MIDNIGHT + timedelta(hours=12)
+
+
+@pytest.fixture
+def politician(db):
+    """
+    Three events of every kind at midnight of ``DAY``, the datetime kinds
+    also three at noon, and the date kinds also three on the next day.
+    """
+    politician = make_politician(db)
+    next_day = DAY + timedelta(days=1)
+    for day in (DAY, next_day):
+        for _ in range(3):
+            make_case(db, politician, date_filed=day, date_resolved=day)
+            make_promise(db, politician, date_made=day, deadline=day)
+    for moment in (MIDNIGHT, NOON):
+        for _ in range(3):
+            make_report(db, politician, date_reported=moment)
+            make_mention(db, politician, published_at=moment)
+            db.add(ScoreHistory(
+                politician_id=politician.id, transparency_score=50, score_breakdown={}, calculated_at=moment,
+            ))
+    db.commit()
+    return politician
+
+
+def read_page(db, politician, cursor=None, limit=20, **filters):
+    lines = [json.loads(line) for line in stream_timeline(db, politician.id, cursor=cursor, limit=limit, **filters)]
+    return lines[:-1], lines[-1]["next_cursor"]
+
+
+def read_all_pages(db, politician, limit, **filters):
+    entries, cursor = read_page(db, politician, limit=limit, **filters)
+    while cursor is not None:
+        assert len(entries) % limit == 0
+        page, cursor = read_page(db, politician, cursor=cursor, limit=limit, **filters)
+        assert page
+        entries += page
+    return entries
+
+
+def sort_key(entry):
+    return datetime.fromisoformat(entry["occurred_at"]), entry["kind"], entry["id"]
+
+
+def keys(entries):
+    return [(entry["kind"], entry["id"]) for entry in entries]
+
+
+def test_a_single_page_is_ordered_by_time_kind_and_id(db, politician):
+    entries, cursor = read_page(db, politician, limit=100)
+    assert cursor is None
+    assert len(entries) == 4 * 3 * 2 + 3 * 3 * 2
+    assert [sort_key(entry) for entry in entries] == sorted(map(sort_key, entries), reverse=True)
+    assert len(set(keys(entries))) == len(entries)
+
+
+@pytest.mark.parametrize("limit", [1, 2, 3, 4, 5, 7, 11])
+def test_paging_neither_repeats_nor_skips_entries(db, politician, limit):
+    everything, _ = read_page(db, politician, limit=100)
+    assert keys(read_all_pages(db, politician, limit)) == keys(everything)
+
+
+@pytest.mark.parametrize("limit", [1, 4])
+def test_paging_a_filtered_range_neither_repeats_nor_skips_entries(db, politician, limit):
+    filters = {
+        "since": MIDNIGHT,
+        "until": NOON,
+        "kinds": [TimelineEventType.PROMISE_MADE, TimelineEventType.NEWS_MENTION, TimelineEventType.SCORE_CALCULATED],
+    }
+    everything, _ = read_page(db, politician, limit=100, **filters)
+    assert {(entry["kind"], entry["occurred_at"]) for entry in everything} == {
+        ("promise_made", "2024-10-01T00:00:00Z"),
+        ("news_mention", "2024-10-01T00:00:00Z"),
+        ("score_calculated", "2024-10-01T00:00:00Z"),
+    }
+    assert len(everything) == 9
+    assert keys(read_all_pages(db, politician, limit, **filters)) == keys(everything)
+
+
+def test_date_columns_bound_by_a_moment_inside_a_day(db, politician):
+    # A date-only event on DAY counts as its midnight: before noon, not after it
+    later, _ = read_page(db, politician, limit=100, since=NOON, kinds=[TimelineEventType.CASE_FILED])
+    assert {entry["occurred_at"] for entry in later} == {"2024-10-02T00:00:00Z"}
+    earlier, _ = read_page(db, politician, limit=100, until=NOON, kinds=[TimelineEventType.CASE_FILED])
+    assert {entry["occurred_at"] for entry in earlier} == {"2024-10-01T00:00:00Z"}
+    assert len(later) == len(earlier) == 3
@@ -0,0 +1,36 @@
+"""Trending counters kept in process and rebuilt from the database."""
+from datetime import datetime, timedelta, timezone
+
+from app.config import get_settings
+from app.services.trending_service import (
+    InProcessTrendingStore,
+    TrendingEngine,
+    TrendingRebuilder,
+    get_trending_engine,
+    trending_is_shared,
+)
+from tests.factories import make_mention, make_politician
+
+
+def test_the_memory_redis_stand_in_keeps_counters_in_process():
+    assert get_settings().redis_url.startswith("memory://")
+    assert not trending_is_shared()
+    assert isinstance(get_trending_engine().store, InProcessTrendingStore)
+
+
+def test_rebuilder_picks_up_mentions_committed_by_other_processes(db):
+    engine = TrendingEngine(InProcessTrendingStore(), half_life_hours=24)
+    quiet = make_politician(db)
+    busy = make_politician(db)
+    now = datetime.now(timezone.utc)
+    make_mention(db, quiet, published_at=now - timedelta(days=3))
+    for hours in (1, 2, 3):
+        make_mention(db, busy, published_at=now - timedelta(hours=hours))
+    # Written with no trending listener, as by a Celery worker
+    db.commit()
+    assert engine.top(5) == []
+
+    assert TrendingRebuilder(60, engine=engine).rebuild_once() == 2
+    ranked = engine.top(5)
+    assert [politician_id for politician_id, _ in ranked] == [busy.id, quiet.id]
+    assert ranked[0][1] > 2 > 0.25 > ranked[1][1]